@@ -237,6 +237,19 @@ specific_announcements = {
             "name": "替换名称",
             "description": "用于TTS发音的替换名称，留空则使用默认发音",
         },
+        "presynthesis": {
+            "name": "预生成语音",
+            "description": "在后台为所选班级/奖池生成全部播报语音并缓存，抽取时无需等待在线合成（仅 Edge TTS）",
+            "pushbutton_name": "开始生成",
+        },
+        "presynthesis_button": {
+            "cancel": "取消 ({done}/{total})",
+        },
+        "presynthesis_notification": {
+            "finished": "语音预生成完成：新生成{generated}条，已缓存{cached}条，失败{failed}条",
+            "cancelled": "语音预生成已取消：新生成{generated}条",
+            "unavailable": "当前未使用 Edge TTS 语音播报，无需预生成",
+        },
     },
     "EN_US": {
         "title": {
@@ -289,6 +302,19 @@ specific_announcements = {
             "name": "Replacement",
             "description": "Replacement names for TTS pronunciation. Leave a blank to use default pronunciation",
         },
+        "presynthesis": {
+            "name": "Pre-generate speech",
+            "description": "Generate and cache speech for the whole selected class/pool in background so drawing does not wait for online synthesis (Edge TTS only)",
+            "pushbutton_name": "Start",
+        },
+        "presynthesis_button": {
+            "cancel": "Cancel ({done}/{total})",
+        },
+        "presynthesis_notification": {
+            "finished": "Speech pre-generation finished: {generated} generated, {cached} already cached, {failed} failed",
+            "cancelled": "Speech pre-generation cancelled: {generated} generated",
+            "unavailable": "Edge TTS speech is not in use, nothing to pre-generate",
+        },
     },
     "JA_JP": {
         "title": {
@@ -341,5 +367,18 @@ specific_announcements = {
             "name": "置換",
             "description": "TTS発音用の置換名。空白の場合はデフォルト発音を使用",
         },
+        "presynthesis": {
+            "name": "音声の事前生成",
+            "description": "選択したクラス/賞プールの全アナウンス音声をバックグラウンドで生成してキャッシュし、抽選時にオンライン合成を待たないようにします（Edge TTS のみ）",
+            "pushbutton_name": "生成開始",
+        },
+        "presynthesis_button": {
+            "cancel": "キャンセル ({done}/{total})",
+        },
+        "presynthesis_notification": {
+            "finished": "音声の事前生成が完了しました：新規生成{generated}件、キャッシュ済み{cached}件、失敗{failed}件",
+            "cancelled": "音声の事前生成をキャンセルしました：新規生成{generated}件",
+            "unavailable": "Edge TTS 音声アナウンスを使用していないため、事前生成は不要です",
+        },
     },
 }
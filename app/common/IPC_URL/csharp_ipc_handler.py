@@ -1,7 +1,7 @@
 import sys
 import asyncio
 import threading
-from typing import Optional, Any, TypedDict
+from typing import Callable, Optional, Any, TypedDict
 from loguru import logger
 
 from app.tools.path_utils import get_data_path
@@ -87,6 +87,7 @@ if CSHARP_AVAILABLE:
             self._no_plugin_logged = False
             self._last_on_class_left_log_time = 0  # 上次记录距离上课时间的时间
             self._last_known_subject_name: Optional[str] = None
+            self._time_state_listeners: list[Callable[[], None]] = []
 
         def start_ipc_client(self) -> bool:
             """
@@ -389,6 +390,22 @@ if CSHARP_AVAILABLE:
             except Exception:
                 return 0
 
+        def add_time_state_listener(self, listener: Callable[[], None]):
+            """注册 ClassIsland 时间状态变化（上课、课间、放学）监听器
+
+            监听器在 IPC 线程中调用，需要自行切换到目标线程
+            """
+            if listener not in self._time_state_listeners:
+                self._time_state_listeners.append(listener)
+
+        def _notify_time_state_changed(self):
+            """通知时间状态变化监听器"""
+            for listener in list(self._time_state_listeners):
+                try:
+                    listener()
+                except Exception as e:
+                    logger.warning(f"时间状态变化监听器执行失败: {e}")
+
         def _on_class_test(self):
             lessonSc = GeneratedIpcFactory.CreateIpcProxy[IPublicLessonsService](
                 self.ipc_client.Provider, self.ipc_client.PeerProxy
@@ -415,6 +432,17 @@ if CSHARP_AVAILABLE:
                     IpcRoutedNotifyIds.OnClassNotifyId,
                     Action(lambda: self._on_class_test()),
                 )
+                for notify_name in (
+                    "OnClassNotifyId",
+                    "OnBreakingTimeNotifyId",
+                    "OnAfterSchoolNotifyId",
+                    "CurrentTimeStateChangedNotifyId",
+                ):
+                    notify_id = getattr(IpcRoutedNotifyIds, notify_name, None)
+                    if notify_id is not None:
+                        self.ipc_client.JsonIpcProvider.AddNotifyHandler(
+                            notify_id, Action(self._notify_time_state_changed)
+                        )
 
                 task = self.ipc_client.Connect()
                 await self.loop.run_in_executor(None, lambda: task.Wait())
@@ -562,6 +590,10 @@ else:
             self.is_running = False
             self.is_connected = False
 
+        def add_time_state_listener(self, listener: Callable[[], None]):
+            """注册 ClassIsland 时间状态变化（上课、课间、放学）监听器"""
+            pass
+
         def start_ipc_client(self) -> bool:
             """
             启动 C# IPC 客户端
@@ -373,14 +373,10 @@ class URLCommandHandler(QObject):
 
         is_non_class_time = False
         try:
-            if kind == "roll_call":
-                from app.common.roll_call.roll_call_manager import _is_non_class_time
+            if kind in ("roll_call", "lottery"):
+                from app.common.extraction import class_schedule
 
-                is_non_class_time = bool(_is_non_class_time())
-            elif kind == "lottery":
-                from app.common.lottery.lottery_manager import _is_non_class_time
-
-                is_non_class_time = bool(_is_non_class_time())
+                is_non_class_time = bool(class_schedule.is_non_class_time())
         except Exception:
             is_non_class_time = False
 
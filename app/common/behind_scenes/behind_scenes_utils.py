@@ -1,18 +1,128 @@
 # ==================================================
 # 内幕工具类
 # ==================================================
-import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
 from loguru import logger
 
-from app.common.safety.secure_store import read_behind_scenes_settings
+from app.common.safety.secure_store import (
+    read_behind_scenes_settings,
+    register_behind_scenes_write_listener,
+)
+from app.tools.path_utils import get_file_signature, get_settings_path
+
+# 必中人员/奖品使用的权重
+GUARANTEED_WEIGHT = 1000.0
+
+
+# ==================================================
+# 编译后的内幕权重表
+# ==================================================
+@dataclass(frozen=True, slots=True)
+class BehindScenesWeightTable:
+    """按 (模式, 奖池) 编译的内幕权重表
+
+    只记录权重不为 1.0 的名称，权重为 0 表示排除，GUARANTEED_WEIGHT 表示必中。
+    点名模式的内幕设置按姓名保存，与班级无关，所有班级共用同一张表
+    """
+
+    # 名称→权重（点名模式为学生，抽奖模式为该奖池中的奖品）
+    weights: Dict[str, float] = field(default_factory=dict)
+    # 抽奖模式：奖品→(指定该奖品的学生→奖品被抽中时的权重)
+    prize_students: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    def get_student_weights(self, mode, prize_list=None) -> Dict[str, float]:
+        """获取学生的权重映射
+
+        点名模式直接返回权重表；抽奖模式下只有指定的奖品被抽中的学生权重变化
+        """
+        if mode == 0:
+            return self.weights
+        if not prize_list or not self.prize_students:
+            return {}
+        merged = {}
+        for prize_name in set(prize_list):
+            students = self.prize_students.get(prize_name)
+            if students:
+                merged.update(students)
+        return merged
+
+
+_EMPTY_WEIGHT_TABLE = BehindScenesWeightTable()
+
+
+def _compile_weight(prob_settings, probability=None) -> float:
+    """把一条概率设置转换为最终权重（与逐条应用设置的规则一致）"""
+    if not prob_settings.get("enabled", False):
+        return 1.0
+    if probability is None:
+        probability = prob_settings.get("probability", 1.0)
+    if probability == 0:
+        return 0.0
+    if probability >= 1000:
+        return GUARANTEED_WEIGHT
+    return float(probability)
+
+
+def _compile_weight_table(settings, mode, pool_name=None) -> BehindScenesWeightTable:
+    """根据解密后的内幕设置编译权重表，每个 (模式, 奖池) 只在设置变化后编译一次"""
+    if not isinstance(settings, dict) or not settings.get("enabled_global", True):
+        return _EMPTY_WEIGHT_TABLE
+
+    weights = {}
+    prize_students = {}
+    for name, person_settings in settings.items():
+        # 跳过 enabled_global 等非人员条目
+        if not isinstance(person_settings, dict):
+            continue
+        if mode == 0:
+            prob_settings = person_settings.get("roll_call", {})
+            weight = _compile_weight(prob_settings)
+            if weight != 1.0:
+                weights[name] = weight
+            continue
+
+        pool_settings = person_settings.get("lottery", {}).get(pool_name)
+        if not pool_name or not isinstance(pool_settings, dict):
+            continue
+        # 作为奖品时的权重
+        weight = _compile_weight(pool_settings)
+        if weight != 1.0:
+            weights[name] = weight
+        # 作为学生时，只有指定的奖品被抽中才提高权重（必中以外的权重乘以 10）
+        assigned_prize = pool_settings.get("prize", "")
+        if assigned_prize:
+            probability = pool_settings.get("probability", 1.0)
+            if probability < 1000:
+                probability = probability * 10
+            prize_students.setdefault(assigned_prize, {})[name] = _compile_weight(
+                pool_settings, probability
+            )
+
+    return BehindScenesWeightTable(weights, prize_students)
+
+
+def _apply_weight_map(items, weight_map):
+    """按权重映射为列表生成权重，并排除权重为 0 的条目"""
+    if not weight_map:
+        return items, [1.0] * len(items)
+    get_weight = weight_map.get
+    weights = [get_weight(item.get("name", ""), 1.0) for item in items]
+    if 0.0 not in weights:
+        return items, weights
+    kept = [index for index, weight in enumerate(weights) if weight != 0.0]
+    return [items[index] for index in kept], [weights[index] for index in kept]
 
 
 class BehindScenesUtils:
     """内幕工具类，提供内幕设置相关功能"""
 
+    # 解密后的内幕设置，按设置文件的版本标识（修改时间、大小）校验，文件不变时不再解密
     _settings_cache = None
-    _cache_timestamp = 0
-    _cache_ttl = 5.0
+    _cache_signature = None
+    # 由缓存的内幕设置编译的权重表，键为 (模式, 奖池名称)
+    _weight_tables: Dict[Tuple[int, Optional[str]], BehindScenesWeightTable] = {}
 
     @staticmethod
     def get_behind_scenes_settings(use_cache=True):
@@ -24,19 +134,20 @@ class BehindScenesUtils:
         Returns:
             dict: 内幕设置数据字典
         """
-        current_time = time.time()
+        signature = get_file_signature(get_settings_path("behind_scenes.json"))
 
-        if use_cache and BehindScenesUtils._settings_cache is not None:
-            if (
-                current_time - BehindScenesUtils._cache_timestamp
-                < BehindScenesUtils._cache_ttl
-            ):
-                return BehindScenesUtils._settings_cache
+        if (
+            use_cache
+            and BehindScenesUtils._settings_cache is not None
+            and BehindScenesUtils._cache_signature == signature
+        ):
+            return BehindScenesUtils._settings_cache
 
         try:
             settings = read_behind_scenes_settings()
             BehindScenesUtils._settings_cache = settings
-            BehindScenesUtils._cache_timestamp = current_time
+            BehindScenesUtils._cache_signature = signature
+            BehindScenesUtils._weight_tables = {}
             return settings
         except Exception as e:
             logger.error(f"读取内幕设置失败: {e}")
@@ -44,9 +155,36 @@ class BehindScenesUtils:
 
     @staticmethod
     def clear_cache():
-        """清除缓存"""
+        """清除缓存（内幕设置写入后自动调用）"""
         BehindScenesUtils._settings_cache = None
-        BehindScenesUtils._cache_timestamp = 0
+        BehindScenesUtils._cache_signature = None
+        BehindScenesUtils._weight_tables = {}
+
+    @staticmethod
+    def get_weight_table(mode, pool_name=None, settings=None):
+        """获取编译后的内幕权重表
+
+        Args:
+            mode: 模式（0=点名, 1=抽奖）
+            pool_name: 奖池名称（仅在抽奖模式下使用）
+            settings: 本次抽取已读取的内幕设置，为空时自动读取
+
+        Returns:
+            BehindScenesWeightTable: 权重表，设置未变化时直接返回缓存的结果
+        """
+        if settings is None:
+            settings = BehindScenesUtils.get_behind_scenes_settings()
+        key = (0, None) if mode == 0 else (1, pool_name)
+        if settings is not BehindScenesUtils._settings_cache:
+            # 不是缓存中的设置（如调用方自行读取），编译结果不缓存
+            return _compile_weight_table(settings, *key)
+
+        tables = BehindScenesUtils._weight_tables
+        table = tables.get(key)
+        if table is None:
+            table = _compile_weight_table(settings, *key)
+            tables[key] = table
+        return table
 
     @staticmethod
     def get_probability_settings(name, mode, pool_name=None):
@@ -90,7 +228,12 @@ class BehindScenesUtils:
 
     @staticmethod
     def apply_probability_weights(
-        students_dict_list, mode, class_name, pool_name=None, prize_list=None
+        students_dict_list,
+        mode,
+        class_name,
+        pool_name=None,
+        prize_list=None,
+        settings=None,
     ):
         """应用内幕设置到学生列表
 
@@ -100,93 +243,16 @@ class BehindScenesUtils:
             class_name: 班级名称（用于日志）
             pool_name: 奖池名称（仅在抽奖模式下使用）
             prize_list: 奖品列表（用于提高指定该奖品的学生的权重）
+            settings: 本次抽取已读取的内幕设置，为空时自动读取
 
         Returns:
             tuple: (过滤后的学生列表, 权重列表)
         """
         try:
-            settings = BehindScenesUtils.get_behind_scenes_settings()
-            if (
-                settings
-                and isinstance(settings, dict)
-                and not settings.get("enabled_global", True)
-            ):
-                return students_dict_list, [1.0] * len(students_dict_list)
-
-            # 构建抽中奖品集合（用于快速查找）
-            drawn_prizes = set(prize_list) if prize_list else set()
-
-            # 如果有奖品-学生关联，记录日志
-            if prize_list and pool_name:
-                prize_to_students = {}
-                for prize_name in prize_list:
-                    for student_name, student_settings in settings.items():
-                        lottery_settings = student_settings.get("lottery", {})
-                        if pool_name in lottery_settings:
-                            pool_setting = lottery_settings[pool_name]
-                            assigned_prize = pool_setting.get("prize", "")
-                            if assigned_prize == prize_name:
-                                if prize_name not in prize_to_students:
-                                    prize_to_students[prize_name] = []
-                                prize_to_students[prize_name].append(student_name)
-
-            filtered_students = []
-            weights = []
-
-            for student in students_dict_list:
-                name = student.get("name", "")
-
-                if name in settings:
-                    if mode == 0:
-                        # 点名模式
-                        prob_settings = settings[name].get("roll_call", {})
-                        enabled = prob_settings.get("enabled", False)
-                        probability = prob_settings.get("probability", 1.0)
-                    else:
-                        # 抽奖模式
-                        lottery_settings = settings[name].get("lottery", {})
-                        if pool_name in lottery_settings:
-                            prob_settings = lottery_settings[pool_name]
-                            enabled = prob_settings.get("enabled", False)
-                            probability = prob_settings.get("probability", 1.0)
-
-                            # 检查该学生指定的奖品是否在抽中的奖品列表中
-                            assigned_prize = prob_settings.get("prize", "")
-                            if assigned_prize and assigned_prize in drawn_prizes:
-                                # 指定的奖品被抽中，提高该学生的权重
-                                if probability < 1000:
-                                    # 如果不是必中，则提高权重
-                                    probability = probability * 10
-                            else:
-                                # 指定的奖品未被抽中，使用正常权重
-                                probability = 1.0
-                        else:
-                            # 未设置该奖池的权重，使用默认值
-                            enabled = False
-                            probability = 1.0
-
-                    if enabled:
-                        if probability == 0:
-                            # 禁用：排除该学生
-                            continue
-                        elif probability >= 1000:
-                            # 必中：设置极高权重
-                            filtered_students.append(student)
-                            weights.append(1000.0)
-                        else:
-                            # 直接使用用户输入的权重值
-                            filtered_students.append(student)
-                            weights.append(probability)
-                    else:
-                        # 未启用：正常权重
-                        filtered_students.append(student)
-                        weights.append(1.0)
-                else:
-                    # 未设置：正常权重
-                    filtered_students.append(student)
-                    weights.append(1.0)
-
-            return filtered_students, weights
+            table = BehindScenesUtils.get_weight_table(mode, pool_name, settings)
+            return _apply_weight_map(
+                students_dict_list, table.get_student_weights(mode, prize_list)
+            )
         except Exception as e:
             logger.error(f"应用内幕设置失败: {e}")
             return students_dict_list, [1.0] * len(students_dict_list)
@@ -204,58 +270,11 @@ class BehindScenesUtils:
             tuple: (过滤后的奖品列表, 权重列表)
         """
         try:
-            settings = BehindScenesUtils.get_behind_scenes_settings()
-            if (
-                settings
-                and isinstance(settings, dict)
-                and not settings.get("enabled_global", True)
-            ):
+            if mode == 0 or not pool_name:
+                # 奖品不使用点名模式
                 return items, [1.0] * len(items)
-
-            filtered_items = []
-            weights = []
-
-            for item in items:
-                name = item.get("name", "")
-                if name in settings:
-                    if mode == 0:
-                        # 点名模式（奖品不使用点名模式）
-                        filtered_items.append(item)
-                        weights.append(1.0)
-                    else:
-                        # 抽奖模式
-                        lottery_settings = settings[name].get("lottery", {})
-                        if pool_name and pool_name in lottery_settings:
-                            prob_settings = lottery_settings[pool_name]
-                            enabled = prob_settings.get("enabled", False)
-                            probability = prob_settings.get("probability", 1.0)
-                        else:
-                            # 未设置该奖池的权重，使用默认值
-                            enabled = False
-                            probability = 1.0
-
-                        if enabled:
-                            if probability == 0:
-                                # 禁用：排除该奖品
-                                continue
-                            elif probability >= 1000:
-                                # 必中：设置极高权重
-                                filtered_items.append(item)
-                                weights.append(1000.0)
-                            else:
-                                # 直接使用用户输入的权重值
-                                filtered_items.append(item)
-                                weights.append(probability)
-                        else:
-                            # 未启用：正常权重
-                            filtered_items.append(item)
-                            weights.append(1.0)
-                else:
-                    # 未设置：正常权重
-                    filtered_items.append(item)
-                    weights.append(1.0)
-
-            return filtered_items, weights
+            table = BehindScenesUtils.get_weight_table(mode, pool_name)
+            return _apply_weight_map(items, table.weights)
         except Exception as e:
             logger.error(f"应用内幕设置失败: {e}")
             return items, [1.0] * len(items)
@@ -276,18 +295,17 @@ class BehindScenesUtils:
             list: 选中的学生列表（如果存在必中人员）
         """
         try:
-            guaranteed_students = []
-            for i, (student, weight) in enumerate(
-                zip(students_with_weight, weights, strict=True)
-            ):
-                if weight == 1000.0:
-                    guaranteed_students.append(student)
-
-            if guaranteed_students:
-                names = [s.get("name", "") for s in guaranteed_students]
-                return guaranteed_students
-
-            return None
+            # 权重列表由权重表查找生成，没有必中权重时无需逐个比较
+            if GUARANTEED_WEIGHT not in weights:
+                return None
+            return [
+                student
+                for student, weight in zip(students_with_weight, weights, strict=True)
+                if weight == GUARANTEED_WEIGHT
+            ]
         except Exception as e:
             logger.error(f"确保必中人员失败: {e}")
             return None
+
+
+register_behind_scenes_write_listener(BehindScenesUtils.clear_cache)
@@ -2,7 +2,8 @@
 # 导入模块
 # ==================================================
 import json
-from typing import List, Dict, Any, Tuple
+import threading
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
 from loguru import logger
 
 from app.tools.path_utils import *
@@ -48,53 +49,146 @@ def get_class_name_list() -> List[str]:
         return []
 
 
-def get_student_list(class_name: str) -> List[Dict[str, Any]]:
-    """获取指定班级的学生列表
+class RosterStudent(NamedTuple):
+    """班级名单中的一名学生（不可变记录，由名单缓存共享）"""
+
+    name: str
+    id: Any
+    gender: str
+    group: str
+    exist: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为 get_student_list 返回的字典格式"""
+        return {
+            "name": self.name,
+            "id": self.id,
+            "gender": self.gender,
+            "group": self.group,
+            "exist": self.exist,
+        }
+
+
+class ClassRoster(NamedTuple):
+    """解析后的班级名单及其小组、性别索引"""
+
+    signature: Tuple[int, int]
+    students: Tuple[RosterStudent, ...]
+    group_members: Dict[str, Tuple[RosterStudent, ...]]
+    gender_members: Dict[str, Tuple[RosterStudent, ...]]
+    group_list: Tuple[str, ...]
+    gender_list: Tuple[str, ...]
+
+
+# 按班级缓存解析后的名单，以名单文件的版本标识（修改时间、大小）为键
+_roster_cache: Dict[str, ClassRoster] = {}
+_roster_lock = threading.RLock()
+
+
+def _build_class_roster(
+    student_data: Dict[str, Any], signature: Tuple[int, int]
+) -> ClassRoster:
+    """把名单文件内容解析为按 ID 排序的学生记录，并建立小组和性别索引"""
+    students = [
+        RosterStudent(
+            name,
+            info.get("id", 0),
+            info.get("gender", "未知"),
+            info.get("group", "未分组"),
+            info.get("exist", True),
+        )
+        for name, info in student_data.items()
+    ]
+    # 按ID排序
+    students.sort(key=lambda x: x.id)
 
-    从 data/list/roll_call_list 文件夹中读取指定班级的名单文件，
-    并返回学生列表
+    group_members: Dict[str, List[RosterStudent]] = {}
+    gender_members: Dict[str, List[RosterStudent]] = {}
+    for student in students:
+        group_members.setdefault(student.group, []).append(student)
+        gender_members.setdefault(student.gender, []).append(student)
+
+    return ClassRoster(
+        signature=signature,
+        students=tuple(students),
+        group_members={k: tuple(v) for k, v in group_members.items()},
+        gender_members={k: tuple(v) for k, v in gender_members.items()},
+        group_list=tuple(sorted(group_members, key=str)),
+        gender_list=tuple(sorted(gender_members, key=str)),
+    )
+
+
+def get_class_roster(class_name: str) -> Optional[ClassRoster]:
+    """获取班级名单缓存
+
+    名单文件的修改时间或大小变化后重新读取，文件监视器也会主动使缓存失效
 
     Args:
         class_name: 班级名称
 
     Returns:
-        List[Dict[str, Any]]: 学生列表，每个学生是一个字典，包含姓名、ID、性别、小组等信息
+        Optional[ClassRoster]: 解析后的名单（共享对象，不可修改），文件不存在或读取失败时返回 None
     """
     try:
         # 获取班级名单文件路径
         roll_call_list_dir = get_data_path("list", "roll_call_list")
         class_file_path = roll_call_list_dir / f"{class_name}.json"
 
-        # 如果文件不存在，返回空列表
-        if not class_file_path.exists():
-            logger.warning(f"班级名单文件不存在: {class_file_path}")
-            return []
+        with _roster_lock:
+            signature = get_file_signature(class_file_path)
+            # 如果文件不存在，返回空
+            if signature is None:
+                _roster_cache.pop(class_name, None)
+                logger.warning(f"班级名单文件不存在: {class_file_path}")
+                return None
 
-        # 读取JSON文件
-        with open(class_file_path, "r", encoding="utf-8") as f:
-            student_data = json.load(f)
-
-        # 将字典数据转换为列表形式
-        student_list = []
-        for name, info in student_data.items():
-            student = {
-                "name": name,
-                "id": info.get("id", 0),
-                "gender": info.get("gender", "未知"),
-                "group": info.get("group", "未分组"),
-                "exist": info.get("exist", True),
-            }
-            student_list.append(student)
+            roster = _roster_cache.get(class_name)
+            if roster is not None and roster.signature == signature:
+                return roster
 
-        # 按ID排序
-        student_list.sort(key=lambda x: x["id"])
+            # 读取JSON文件
+            with open(class_file_path, "r", encoding="utf-8") as f:
+                student_data = json.load(f)
 
-        # logger.debug(f"班级 {class_name} 共有 {len(student_list)} 名学生")
-        return student_list
+            roster = _build_class_roster(student_data, signature)
+            _roster_cache[class_name] = roster
+            # logger.debug(f"班级 {class_name} 共有 {len(roster.students)} 名学生")
+            return roster
 
     except Exception as e:
         logger.error(f"获取学生列表失败: {e}")
+        return None
+
+
+def invalidate_roster_cache(class_name: Optional[str] = None):
+    """使名单缓存失效
+
+    Args:
+        class_name: 班级名称，为空时清空所有班级的缓存
+    """
+    with _roster_lock:
+        if class_name is None:
+            _roster_cache.clear()
+        else:
+            _roster_cache.pop(class_name, None)
+
+
+def get_student_list(class_name: str) -> List[Dict[str, Any]]:
+    """获取指定班级的学生列表
+
+    从 data/list/roll_call_list 文件夹中读取指定班级的名单文件，
+    并返回学生列表（名单解析结果会被缓存，每次返回新的字典）
+
+    Args:
+        class_name: 班级名称
+
+    Returns:
+        List[Dict[str, Any]]: 学生列表，每个学生是一个字典，包含姓名、ID、性别、小组等信息
+    """
+    roster = get_class_roster(class_name)
+    if roster is None:
         return []
+    return [student.to_dict() for student in roster.students]
 
 
 def get_group_list(class_name: str) -> List[Dict[str, Any]]:
@@ -109,15 +203,10 @@ def get_group_list(class_name: str) -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: 小组列表，每个小组是一个字典，包含小组名称、学生列表等信息
     """
-    student_list = get_student_list(class_name)
-    group_set = set()  # 使用集合确保不重复
-    for student in student_list:
-        group_name = student["group"]
-        group_set.add(group_name)
-
-    # 转换为列表并排序
-    group_list = sorted(list(group_set))
-    return group_list
+    roster = get_class_roster(class_name)
+    if roster is None:
+        return []
+    return list(roster.group_list)
 
 
 def get_gender_list(class_name: str) -> List[str]:
@@ -132,15 +221,10 @@ def get_gender_list(class_name: str) -> List[str]:
     Returns:
         List[str]: 性别列表，包含所有学生的性别
     """
-    student_list = get_student_list(class_name)
-    gender_set = set()  # 使用集合确保不重复
-    for student in student_list:
-        gender = student["gender"]
-        gender_set.add(gender)
-
-    # 转换为列表并排序
-    gender_list = sorted(list(gender_set))
-    return gender_list
+    roster = get_class_roster(class_name)
+    if roster is None:
+        return []
+    return list(roster.gender_list)
 
 
 def get_group_members(class_name: str, group_name: str) -> List[Dict[str, Any]]:
@@ -156,16 +240,27 @@ def get_group_members(class_name: str, group_name: str) -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: 小组成员列表，每个成员是一个字典，包含姓名、ID、性别、小组等信息
     """
-    student_list = get_student_list(class_name)
-    group_members = []
+    roster = get_class_roster(class_name)
+    if roster is None:
+        return []
+    # 名单已按ID排序
+    return [student.to_dict() for student in roster.group_members.get(group_name, ())]
 
-    for student in student_list:
-        if student["group"] == group_name:
-            group_members.append(student)
 
-    # 按ID排序
-    group_members.sort(key=lambda x: x["id"])
-    return group_members
+def get_gender_members(class_name: str, gender: str) -> List[Dict[str, Any]]:
+    """获取指定班级中指定性别的学生列表
+
+    Args:
+        class_name: 班级名称
+        gender: 性别
+
+    Returns:
+        List[Dict[str, Any]]: 学生列表，按ID排序
+    """
+    roster = get_class_roster(class_name)
+    if roster is None:
+        return []
+    return [student.to_dict() for student in roster.gender_members.get(gender, ())]
 
 
 # ==================================================
@@ -208,11 +303,16 @@ def get_pool_name_list() -> List[str]:
         return []
 
 
+# 按奖池缓存解析后的奖品列表 {奖池名称: (名单文件版本标识, 按ID排序的奖品)}
+_pool_cache: Dict[str, Tuple[Tuple[int, int], Tuple[Dict[str, Any], ...]]] = {}
+_pool_lock = threading.RLock()
+
+
 def get_pool_list(pool_name: str) -> List[Dict[str, Any]]:
     """获取指定奖池的奖品列表
 
     从 data/list/lottery_list 文件夹中读取指定奖池的名单文件，
-    并返回奖品列表
+    并返回奖品列表（名单解析结果按文件版本标识缓存，每次返回新的字典）
 
     Args:
         pool_name: 奖池名称
@@ -225,37 +325,57 @@ def get_pool_list(pool_name: str) -> List[Dict[str, Any]]:
         lottery_list_dir = get_data_path("list/lottery_list")
         pool_file_path = lottery_list_dir / f"{pool_name}.json"
 
-        # 如果文件不存在，返回空列表
-        if not pool_file_path.exists():
-            logger.warning(f"奖池名单文件不存在: {pool_file_path}")
-            return []
-
-        # 读取JSON文件
-        with open(pool_file_path, "r", encoding="utf-8") as f:
-            pool_data = json.load(f)
-
-        # 将字典数据转换为列表形式
-        pool_list = []
-        for name, info in pool_data.items():
-            pool = {
-                "name": name,
-                "id": info.get("id", 0),
-                "weight": info.get("weight", 1),
-                "exist": info.get("exist", True),
-            }
-            pool_list.append(pool)
-
-        # 按ID排序
-        pool_list.sort(key=lambda x: x["id"])
-
-        # logger.debug(f"奖池 {pool_name} 共有 {len(pool_list)} 个奖品")
-        return pool_list
+        with _pool_lock:
+            signature = get_file_signature(pool_file_path)
+            # 如果文件不存在，返回空列表
+            if signature is None:
+                _pool_cache.pop(pool_name, None)
+                logger.warning(f"奖池名单文件不存在: {pool_file_path}")
+                return []
+
+            cached = _pool_cache.get(pool_name)
+            if cached is None or cached[0] != signature:
+                # 读取JSON文件
+                with open(pool_file_path, "r", encoding="utf-8") as f:
+                    pool_data = json.load(f)
+
+                # 将字典数据转换为列表形式
+                prizes = [
+                    {
+                        "name": name,
+                        "id": info.get("id", 0),
+                        "weight": info.get("weight", 1),
+                        "exist": info.get("exist", True),
+                    }
+                    for name, info in pool_data.items()
+                ]
+
+                # 按ID排序
+                prizes.sort(key=lambda x: x["id"])
+                cached = (signature, tuple(prizes))
+                _pool_cache[pool_name] = cached
+
+        # logger.debug(f"奖池 {pool_name} 共有 {len(cached[1])} 个奖品")
+        return [dict(prize) for prize in cached[1]]
 
     except Exception as e:
         logger.error(f"获取奖池列表失败: {e}")
         return []
 
 
+def invalidate_pool_cache(pool_name: Optional[str] = None):
+    """使奖池名单缓存失效
+
+    Args:
+        pool_name: 奖池名称，为空时清空所有奖池的缓存
+    """
+    with _pool_lock:
+        if pool_name is None:
+            _pool_cache.clear()
+        else:
+            _pool_cache.pop(pool_name, None)
+
+
 # ==================================================
 # 学生数据处理函数
 # ==================================================
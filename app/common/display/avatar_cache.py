@@ -0,0 +1,212 @@
+# ==================================================
+# 导入库
+# ==================================================
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+from PySide6.QtCore import QSize, Qt
+from PySide6.QtGui import QImageReader, QPixmap
+
+from app.tools.path_utils import get_data_path
+from app.tools.variable import (
+    AVATAR_PIXMAP_CACHE_SIZE,
+    IMAGE_INDEX_RECHECK_INTERVAL,
+    SUPPORTED_IMAGE_EXTENSIONS,
+)
+
+
+# ==================================================
+# 图片目录索引
+# ==================================================
+class ImageIndex:
+    """图片目录索引（名称 → 图片路径）
+
+    扫描一次目录代替每次按扩展名逐个检查文件是否存在，同名图片按
+    SUPPORTED_IMAGE_EXTENSIONS 的顺序优先。名称按 os.path.normcase 比较，
+    与文件系统一致（Windows 上不区分大小写）。目录变化时由文件监视器标记失效，
+    下次查找时重新扫描；目录不存在时每隔 IMAGE_INDEX_RECHECK_INTERVAL 秒重新检查
+    """
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.directory = str(get_data_path("images", folder))
+        self._paths: Dict[str, str] = {}
+        self._valid = False
+        self._missing_checked_at: Optional[float] = None
+        self._watching = False
+        self._lock = threading.Lock()
+
+    def _scan(self):
+        """扫描目录，生成名称到路径的映射"""
+        priority = {ext: i for i, ext in enumerate(SUPPORTED_IMAGE_EXTENSIONS)}
+        found: Dict[str, Tuple[int, str]] = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    name, ext = os.path.splitext(entry.name)
+                    rank = priority.get(ext.lower())
+                    if rank is None or not entry.is_file():
+                        continue
+                    key = os.path.normcase(name)
+                    current = found.get(key)
+                    if current is None or rank < current[0]:
+                        found[key] = (rank, entry.path)
+            self._missing_checked_at = None
+        except FileNotFoundError:
+            self._missing_checked_at = time.monotonic()
+        except OSError as e:
+            logger.warning(f"扫描图片目录失败 {self.directory}: {e}")
+            self._missing_checked_at = time.monotonic()
+
+        self._paths = {name: path for name, (_, path) in found.items()}
+        self._valid = True
+
+    def refresh(self):
+        """立即重新扫描目录（可在后台线程调用）"""
+        with self._lock:
+            self._scan()
+
+    def invalidate(self, *_):
+        """标记索引失效，下次查找时重新扫描"""
+        self._valid = False
+        invalidate_avatar_pixmaps(self.directory)
+
+    def _ensure_watching(self):
+        """注册目录监视（需要在主线程调用）
+
+        目录不存在时移除监视，目录重新创建后再次注册
+        """
+        is_missing = self._missing_checked_at is not None
+        if self._watching is not is_missing:
+            # 监视状态已与目录是否存在一致
+            return
+        from app.view.settings.list_management.shared_file_watcher import (
+            get_shared_file_watcher,
+        )
+
+        watcher = get_shared_file_watcher()
+        if is_missing:
+            watcher.remove_watcher(self.directory, self.invalidate)
+            self._watching = False
+        else:
+            # 注册失败（目录刚被删除）时同样视为已注册，避免每次查找都重试，
+            # 下次扫描发现目录不存在时会移除
+            watcher.add_watcher(self.directory, self.invalidate)
+            self._watching = True
+
+    def find(self, name: str) -> Optional[str]:
+        """
+        查找图片路径
+
+        Args:
+            name: 图片名称（不含扩展名）
+
+        Returns:
+            Optional[str]: 图片路径，没有对应图片时返回None
+        """
+        with self._lock:
+            if not self._valid or (
+                self._missing_checked_at is not None
+                and time.monotonic() - self._missing_checked_at
+                >= IMAGE_INDEX_RECHECK_INTERVAL
+            ):
+                self._scan()
+            self._ensure_watching()
+            return self._paths.get(os.path.normcase(name))
+
+
+_image_indexes: Dict[str, ImageIndex] = {}
+_image_indexes_lock = threading.Lock()
+
+
+def get_image_index(folder: str) -> ImageIndex:
+    """
+    获取图片目录索引
+
+    Args:
+        folder: data/images 下的目录名（student_images / prize_images）
+
+    Returns:
+        ImageIndex: 图片目录索引
+    """
+    index = _image_indexes.get(folder)
+    if index is None:
+        with _image_indexes_lock:
+            index = _image_indexes.get(folder)
+            if index is None:
+                index = ImageIndex(folder)
+                _image_indexes[folder] = index
+    return index
+
+
+# ==================================================
+# 缩放后的头像图片缓存
+# ==================================================
+_pixmap_cache: "OrderedDict[Tuple[str, int, float], QPixmap]" = OrderedDict()
+
+
+def _load_scaled_pixmap(path: str, size: int, dpr: float) -> QPixmap:
+    """读取图片并缩放到头像大小（按比例填满，与头像绘制方式一致）"""
+    target = QSize(max(1, round(size * dpr)), max(1, round(size * dpr)))
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    source_size = reader.size()
+    if source_size.isValid() and (
+        source_size.width() > target.width() or source_size.height() > target.height()
+    ):
+        # 解码时直接缩小，避免解码整张大图
+        reader.setScaledSize(
+            source_size.scaled(target, Qt.AspectRatioMode.KeepAspectRatioByExpanding)
+        )
+    image = reader.read()
+    if image.isNull():
+        logger.warning(f"读取头像图片失败 {path}: {reader.errorString()}")
+        return QPixmap()
+
+    pixmap = QPixmap.fromImage(image)
+    pixmap.setDevicePixelRatio(dpr)
+    return pixmap
+
+
+def get_avatar_pixmap(path: str, size: int, dpr: float = 1.0) -> QPixmap:
+    """
+    获取缩放到头像大小的图片（LRU 缓存，只能在主线程调用）
+
+    Args:
+        path: 图片路径
+        size: 头像边长（逻辑像素）
+        dpr: 设备像素比
+
+    Returns:
+        QPixmap: 缩放后的图片，读取失败时为空图片
+    """
+    key = (path, int(size), round(float(dpr), 2))
+    pixmap = _pixmap_cache.get(key)
+    if pixmap is not None:
+        _pixmap_cache.move_to_end(key)
+        return pixmap
+
+    pixmap = _load_scaled_pixmap(path, key[1], key[2])
+    _pixmap_cache[key] = pixmap
+    while len(_pixmap_cache) > AVATAR_PIXMAP_CACHE_SIZE:
+        _pixmap_cache.popitem(last=False)
+    return pixmap
+
+
+def invalidate_avatar_pixmaps(directory: Optional[str] = None):
+    """
+    清除头像图片缓存
+
+    Args:
+        directory: 只清除该目录下的图片，为None时全部清除
+    """
+    if directory is None:
+        _pixmap_cache.clear()
+        return
+    prefix = os.path.join(directory, "")
+    for key in [key for key in _pixmap_cache if key[0].startswith(prefix)]:
+        del _pixmap_cache[key]
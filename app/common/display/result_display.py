@@ -4,6 +4,8 @@
 import random
 import colorsys
 import weakref
+from dataclasses import dataclass
+from typing import Any, List, Optional
 from loguru import logger
 
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QMenu, QSizePolicy
@@ -14,7 +16,6 @@ from qfluentwidgets import BodyLabel, AvatarWidget, ElevatedCardWidget, qconfig
 from app.tools.variable import (
     STUDENT_ID_FORMAT,
     NAME_SPACING,
-    SUPPORTED_IMAGE_EXTENSIONS,
     AVATAR_LABEL_SPACING,
     DEFAULT_MIN_SATURATION,
     DEFAULT_MAX_SATURATION,
@@ -30,10 +31,10 @@ from app.tools.variable import (
     DARK_THEME_MAX_VALUE,
     RGB_COLOR_FORMAT,
 )
-from app.tools.path_utils import file_exists, get_data_path
 from app.tools.personalised import is_dark_theme
 from app.tools.settings_access import readme_settings_async
 from app.common.data.list import get_group_members
+from app.common.display.avatar_cache import get_avatar_pixmap, get_image_index
 
 from random import SystemRandom
 
@@ -214,26 +215,44 @@ class ResultDisplayUtils:
             ResultDisplayUtils._theme_listener_initialized = True
 
     @staticmethod
-    def _create_avatar_widget(image_path, name, font_size):
+    def _create_avatar_widget(image_path, name, radius):
         """
         创建头像组件
 
         参数:
             image_path: 图片路径
             name: 学生姓名
-            font_size: 字体大小
+            radius: 头像半径
 
         返回:
             AvatarWidget: 创建的头像组件
         """
+        avatar = AvatarWidget()
+        avatar.setRadius(radius)
+        ResultDisplayUtils._set_avatar_image(avatar, image_path, name)
+        return avatar
+
+    @staticmethod
+    def _set_avatar_image(avatar, image_path, name):
+        """
+        设置头像图片，图片按头像大小缩放后缓存，没有图片时显示姓名
+
+        参数:
+            avatar: 头像组件
+            image_path: 图片路径
+            name: 学生姓名
+        """
+        pixmap = None
         if image_path is not None:
-            avatar = AvatarWidget(image_path)
-        else:
-            avatar = AvatarWidget()
+            pixmap = get_avatar_pixmap(
+                image_path, avatar.height(), avatar.devicePixelRatioF()
+            )
+            if pixmap.isNull():
+                pixmap = None
+        avatar.setImage(pixmap)
+        if pixmap is None:
             avatar.setText(name)
 
-        return avatar
-
     @staticmethod
     def _format_student_text(
         class_name,
@@ -327,8 +346,11 @@ class ResultDisplayUtils:
         layout.setSpacing(AVATAR_LABEL_SPACING)
         layout.setContentsMargins(0, 0, 0, 0)
 
-        avatar = ResultDisplayUtils._create_avatar_widget(image_path, name, font_size)
-        avatar.setRadius(font_size * 2 if draw_count == 1 else int(font_size * 1.5))
+        avatar = ResultDisplayUtils._create_avatar_widget(
+            image_path,
+            name,
+            font_size * 2 if draw_count == 1 else int(font_size * 1.5),
+        )
 
         text_label = BodyLabel(text)
 
@@ -397,9 +419,9 @@ class ResultDisplayUtils:
         fixed_color = readme_settings_async(settings_group, "animation_fixed_color")
         color_str = ResultDisplayUtils._get_style_color(animation_color, fixed_color)
 
-        style_sheet = f"font-size: {font_size}pt; color: {color_str} !important;"
-        if custom_font and use_global_font == 1:
-            style_sheet = f"font-family: '{custom_font}'; {style_sheet}"
+        style_sheet = ResultDisplayUtils._build_label_style_sheet(
+            font_size, color_str, custom_font if use_global_font == 1 else ""
+        )
 
         def apply_to_widget(widget):
             if isinstance(widget, BodyLabel):
@@ -417,14 +439,64 @@ class ResultDisplayUtils:
         if isinstance(label, QWidget):
             apply_to_widget(label)
 
+    @staticmethod
+    def _build_label_style_sheet(font_size, color_str, font_family=""):
+        """生成标签样式表（font_family 为空时使用全局字体）"""
+        style_sheet = f"font-size: {font_size}pt; color: {color_str} !important;"
+        if font_family:
+            style_sheet = f"font-family: '{font_family}'; {style_sheet}"
+        return style_sheet
+
+    @staticmethod
+    def _build_label_text(
+        class_name, num, selected, draw_count, display_format, group_index, show_random
+    ):
+        """
+        生成标签显示的名称与文本
+
+        返回:
+            tuple: (名称, 显示文本)
+        """
+        # 处理学号格式化
+        student_id_str = STUDENT_ID_FORMAT.format(num=num) if num is not None else ""
+
+        # 处理不同模式下的名称显示
+        name = (
+            f"{str(selected)[0]}{NAME_SPACING}{str(selected)[1]}"
+            if len(str(selected)) == 2 and group_index == 0
+            else str(selected)
+        )
+
+        text = ResultDisplayUtils._format_student_text(
+            class_name,
+            display_format,
+            student_id_str,
+            name,
+            draw_count,
+            is_group_mode=(group_index == 1),
+            show_random=show_random,
+        )
+        return name, text
+
+    @staticmethod
+    def _get_image_dir(settings_group):
+        """获取设置组对应的图片目录"""
+        return (
+            "prize_images" if settings_group == "lottery_settings" else "student_images"
+        )
+
+    @staticmethod
+    def _get_image_name(settings_group, selected):
+        """获取查找图片使用的名称（奖品只取第一行）"""
+        image_name = str(selected)
+        if settings_group == "lottery_settings":
+            image_name = image_name.splitlines()[0] if image_name else image_name
+        return image_name
+
     @staticmethod
     def _find_student_image(image_dir, image_name):
-        """查找学生图片"""
-        for ext in SUPPORTED_IMAGE_EXTENSIONS:
-            path = get_data_path("images", f"{image_dir}/{image_name}{ext}")
-            if file_exists(path):
-                return str(path)
-        return None
+        """查找学生图片（使用目录索引，不逐个检查文件）"""
+        return get_image_index(image_dir).find(image_name)
 
     @staticmethod
     def create_student_label(
@@ -470,9 +542,7 @@ class ResultDisplayUtils:
         student_labels = [None] * len(selected_students)
 
         # 确定图片目录
-        image_dir = (
-            "prize_images" if settings_group == "lottery_settings" else "student_images"
-        )
+        image_dir = ResultDisplayUtils._get_image_dir(settings_group)
         if display_style is None:
             try:
                 display_style = readme_settings_async(settings_group, "display_style")
@@ -500,35 +570,19 @@ class ResultDisplayUtils:
         for i, (num, selected, exist) in enumerate(selected_students):
             current_image_path = None
             if show_student_image:
-                image_name = str(selected)
-                if settings_group == "lottery_settings":
-                    image_name = (
-                        image_name.splitlines()[0] if image_name else image_name
-                    )
                 current_image_path = ResultDisplayUtils._find_student_image(
-                    image_dir, image_name
+                    image_dir,
+                    ResultDisplayUtils._get_image_name(settings_group, selected),
                 )
 
-            # 处理学号格式化
-            student_id_str = (
-                STUDENT_ID_FORMAT.format(num=num) if num is not None else ""
-            )
-
-            # 处理不同模式下的名称显示
-            name = (
-                f"{str(selected)[0]}{NAME_SPACING}{str(selected)[1]}"
-                if len(str(selected)) == 2 and group_index == 0
-                else str(selected)
-            )
-
-            text = ResultDisplayUtils._format_student_text(
+            name, text = ResultDisplayUtils._build_label_text(
                 class_name,
-                display_format,
-                student_id_str,
-                name,
+                num,
+                selected,
                 draw_count,
-                is_group_mode=(group_index == 1),
-                show_random=show_random,
+                display_format,
+                group_index,
+                show_random,
             )
             # 使用支持触屏的容器包装所有内容，确保整个区域都能响应触屏操作
             touch_container = TouchResultWidget()
@@ -970,3 +1024,241 @@ class ResultDisplayUtils:
         # gc.collect()
 
         logger.debug("ResultDisplayUtils内存清理完成")
+
+
+# ==================================================
+# 动画帧渲染
+# ==================================================
+def _to_int(value, default=0):
+    try:
+        return int(value)
+    except Exception:
+        return default
+
+
+@dataclass(frozen=True, slots=True)
+class DisplaySnapshot:
+    """一次抽取过程中不变的显示设置快照，动画期间不再重复读取设置"""
+
+    settings_group: str
+    font_size: int
+    animation_color: int
+    fixed_color: str
+    display_format: int
+    display_style: int
+    show_student_image: bool
+    image_position: int
+    show_random: int
+    font_family: str = ""
+
+    @classmethod
+    def from_settings(cls, settings_group, display_settings):
+        """
+        根据显示设置字典创建快照
+
+        参数:
+            settings_group: 设置组名称
+            display_settings: 显示设置字典（create_display_settings / get_render_settings 的结果）
+
+        返回:
+            DisplaySnapshot: 显示设置快照
+        """
+        font_family = ""
+        if readme_settings_async(settings_group, "use_global_font") == 1:
+            font_family = readme_settings_async(settings_group, "custom_font") or ""
+
+        return cls(
+            settings_group=settings_group,
+            font_size=display_settings["font_size"],
+            animation_color=_to_int(display_settings.get("animation_color")),
+            fixed_color=readme_settings_async(settings_group, "animation_fixed_color"),
+            display_format=_to_int(display_settings.get("display_format")),
+            display_style=_to_int(display_settings.get("display_style")),
+            show_student_image=bool(display_settings.get("show_student_image")),
+            image_position=_to_int(display_settings.get("image_position")),
+            show_random=_to_int(display_settings.get("show_random")),
+            font_family=str(font_family),
+        )
+
+
+@dataclass(slots=True)
+class _FrameSlot:
+    """预先创建的结果标签槽位，记录上一帧写入的内容以跳过重复设置"""
+
+    container: QWidget
+    label: Optional[BodyLabel]
+    avatar: Optional[AvatarWidget]
+    text: Optional[str] = None
+    style_sheet: Optional[str] = None
+    avatar_text: Optional[str] = None
+    image_path: Optional[str] = None
+
+
+class AnimationFrameRenderer:
+    """滚动动画帧渲染器
+
+    每次抽取（快照、人数或数量变化，或网格被其他显示替换）时创建一组标签槽位，
+    之后每一帧只修改已有组件的文本、颜色和头像，不再创建和销毁组件
+    """
+
+    def __init__(self, result_grid):
+        self.result_grid = result_grid
+        self._slots: List[_FrameSlot] = []
+        self._layout_key: Optional[tuple] = None
+        self._static_color: Optional[str] = None
+
+    def reset(self):
+        """丢弃槽位，下一帧重新创建"""
+        self._slots = []
+        self._layout_key = None
+
+    def _owns_grid(self) -> bool:
+        """网格中的组件是否仍然是当前的槽位"""
+        widgets = ResultDisplayUtils.collect_grid_widgets(self.result_grid)
+        if len(widgets) != len(self._slots):
+            return False
+        return all(
+            widget is slot.container
+            for widget, slot in zip(widgets, self._slots, strict=True)
+        )
+
+    @staticmethod
+    def _find_slot_widgets(container):
+        """在槽位组件树中查找文本标签和头像"""
+        label = None
+        avatar = None
+        pending = [container]
+        while pending:
+            widget = pending.pop()
+            if isinstance(widget, AvatarWidget):
+                avatar = widget
+                continue
+            if isinstance(widget, BodyLabel):
+                label = widget
+                continue
+            layout = widget.layout() if isinstance(widget, QWidget) else None
+            if layout is None:
+                continue
+            for i in range(layout.count()):
+                item = layout.itemAt(i)
+                child = item.widget() if item is not None else None
+                if child is not None:
+                    pending.append(child)
+        return label, avatar
+
+    def _build_slots(
+        self, snapshot, class_name, selected_students, draw_count, group_index
+    ):
+        """创建槽位并放入网格"""
+        labels = ResultDisplayUtils.create_student_label(
+            class_name=class_name,
+            selected_students=selected_students,
+            draw_count=draw_count,
+            font_size=snapshot.font_size,
+            animation_color=snapshot.animation_color,
+            display_format=snapshot.display_format,
+            display_style=snapshot.display_style,
+            show_student_image=snapshot.show_student_image,
+            image_position=snapshot.image_position,
+            group_index=group_index,
+            show_random=snapshot.show_random,
+            settings_group=snapshot.settings_group,
+            custom_font_family=snapshot.font_family,
+        )
+        ResultDisplayUtils.display_results_in_grid(self.result_grid, labels)
+
+        self._slots = []
+        for container, (_num, selected, _exist) in zip(
+            labels, selected_students, strict=True
+        ):
+            slot = _FrameSlot(container, *self._find_slot_widgets(container))
+            if slot.avatar is not None:
+                # 与创建头像时查找到的图片相同
+                slot.image_path = self._find_image(snapshot, selected)
+            self._slots.append(slot)
+        # 随机颜色每帧生成，其余颜色模式在一次抽取中不变
+        self._static_color = (
+            None
+            if snapshot.animation_color == 1
+            else ResultDisplayUtils._get_style_color(
+                snapshot.animation_color, snapshot.fixed_color
+            )
+        )
+
+    @staticmethod
+    def _find_image(snapshot, selected) -> Optional[str]:
+        return ResultDisplayUtils._find_student_image(
+            ResultDisplayUtils._get_image_dir(snapshot.settings_group),
+            ResultDisplayUtils._get_image_name(snapshot.settings_group, selected),
+        )
+
+    def render(
+        self,
+        snapshot: DisplaySnapshot,
+        class_name: str,
+        selected_students: List[Any],
+        draw_count: int,
+        group_index: int = 0,
+    ) -> bool:
+        """
+        渲染一帧动画
+
+        参数:
+            snapshot: 显示设置快照
+            class_name: 班级或奖池名称
+            selected_students: 本帧显示的列表 [(num, selected, exist), ...]
+            draw_count: 抽取人数
+            group_index: 小组索引 (0:全班, 1:随机小组, >1:指定小组)
+
+        返回:
+            bool: 是否重新创建了槽位
+        """
+        if selected_students is None:
+            logger.warning("AnimationFrameRenderer: selected_students 为 None")
+            return False
+
+        layout_key = (snapshot, draw_count, len(selected_students))
+        rebuilt = layout_key != self._layout_key or not self._owns_grid()
+        if rebuilt:
+            self._build_slots(
+                snapshot, class_name, selected_students, draw_count, group_index
+            )
+            self._layout_key = layout_key
+
+        for slot, (num, selected, _exist) in zip(
+            self._slots, selected_students, strict=True
+        ):
+            name, text = ResultDisplayUtils._build_label_text(
+                class_name,
+                num,
+                selected,
+                draw_count,
+                snapshot.display_format,
+                group_index,
+                snapshot.show_random,
+            )
+            if slot.label is not None:
+                if text != slot.text:
+                    slot.label.setText(text)
+                    slot.text = text
+                color_str = (
+                    self._static_color or ResultDisplayUtils._generate_vibrant_color()
+                )
+                style_sheet = ResultDisplayUtils._build_label_style_sheet(
+                    snapshot.font_size, color_str, snapshot.font_family
+                )
+                if style_sheet != slot.style_sheet:
+                    slot.label.setStyleSheet(style_sheet)
+                    slot.style_sheet = style_sheet
+
+            if slot.avatar is not None:
+                image_path = self._find_image(snapshot, selected)
+                if image_path != slot.image_path:
+                    ResultDisplayUtils._set_avatar_image(slot.avatar, image_path, name)
+                    slot.image_path = image_path
+                    slot.avatar_text = name
+                elif image_path is None and name != slot.avatar_text:
+                    slot.avatar.setText(name)
+                    slot.avatar_text = name
+
+        return rebuilt
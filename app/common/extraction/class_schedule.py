@@ -0,0 +1,416 @@
+# ==================================================
+# 导入库
+# ==================================================
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import (
+    QCoreApplication,
+    QFileSystemWatcher,
+    QObject,
+    QThread,
+    QTimer,
+    Qt,
+    Signal,
+)
+from loguru import logger
+
+from app.common.IPC_URL.csharp_ipc_handler import CSharpIPCHandler
+from app.common.extraction.cses_timetable import (
+    get_compiled_timetable,
+    get_cses_file_path,
+)
+from app.common.extraction.extract import (
+    _get_break_assignment_class_info,
+    _get_current_class_info,
+    _get_current_day_of_week,
+    _get_current_time_in_seconds,
+    _get_day_timetable,
+    _is_non_class_time,
+)
+from app.tools.settings_access import get_settings_signals, readme_settings_async
+from app.tools.variable import (
+    CLASS_SCHEDULE_BOUNDARY_SLACK_MS,
+    CLASS_SCHEDULE_CLOCK_JUMP_TOLERANCE,
+    CLASS_SCHEDULE_IPC_INTERVAL_MS,
+    CLASS_SCHEDULE_MAX_INTERVAL_MS,
+    CLASS_SCHEDULE_WATCHDOG_INTERVAL_MS,
+)
+
+# 一天的秒数（午夜为课程表的天然边界）
+SECONDS_PER_DAY = 24 * 3600
+
+
+# ==================================================
+# 课程状态快照
+# ==================================================
+@dataclass(frozen=True, slots=True)
+class ClassScheduleState:
+    """某一时刻计算出的课程状态，在下一个课程边界之前保持不变"""
+
+    data_source: int  # 数据源 (0: 不使用, 1: CSES, 2: ClassIsland)
+    in_class: bool  # 是否处于上课时间段
+    class_info: Dict  # 当前课程信息，课间为空字典
+    non_class_time: bool  # 是否处于非上课时间（课间禁用判断结果）
+    subject_class_info: Dict  # 科目历史过滤使用的课程信息（课间为课间归属课程）
+    seconds_to_next_class: int  # 距离下一节课的秒数，没有下一节课时为0
+    computed_at: float  # 计算时间（time.time()）
+    valid_until: float  # 下一个课程边界（time.time()），之后需要重新计算
+    timetable: object  # 计算时使用的CSES课程表，课程表变化后快照失效
+
+
+def _get_linkage_offsets() -> Tuple[int, int]:
+    """获取上课前提前解禁时间和下课后延迟禁用时间（秒）"""
+    pre_class_enable_time = (
+        readme_settings_async("linkage_settings", "pre_class_enable_time") or 0
+    )
+    post_class_disable_delay = (
+        readme_settings_async("linkage_settings", "post_class_disable_delay") or 0
+    )
+    return int(pre_class_enable_time), int(post_class_disable_delay)
+
+
+def _get_subject_class_info(
+    data_source: int, class_info: Dict, non_class_time: bool
+) -> Dict:
+    """获取科目历史过滤使用的课程信息
+
+    ClassIsland 数据源只使用 ClassIsland 提供的当前课程；没有当前课程且处于
+    非上课时间时，使用课间归属的课程信息
+    """
+    if data_source == 2:
+        current_class_info = CSharpIPCHandler.instance().get_current_class_info()
+    elif data_source == 1:
+        current_class_info = class_info
+    else:
+        current_class_info = {}
+
+    if not current_class_info and non_class_time:
+        current_class_info = _get_break_assignment_class_info()
+    return current_class_info or {}
+
+
+def _compute_subject_class_info() -> Dict:
+    """直接计算科目历史过滤使用的课程信息（不使用课程状态快照）"""
+    data_source = readme_settings_async("linkage_settings", "data_source") or 0
+    class_info = _get_current_class_info() if data_source == 1 else {}
+    return _get_subject_class_info(data_source, class_info, _is_non_class_time())
+
+
+def _get_cses_boundaries(current_seconds: int) -> List[int]:
+    """获取今天剩余的CSES课程边界（从午夜开始的秒数）
+
+    包括每节课的提前解禁时刻、上课、下课和下课后延迟禁用的起止时刻
+    （延迟禁用判断不包含下课的那一秒，结束时刻包含最后一秒）
+    """
+    pre_class_enable_time, post_class_disable_delay = _get_linkage_offsets()
+    boundaries = [SECONDS_PER_DAY]
+    for period in _get_day_timetable(_get_current_day_of_week()).periods:
+        for boundary in (
+            period.start - pre_class_enable_time,
+            period.start,
+            period.end,
+            period.end + 1,
+            period.end + post_class_disable_delay + 1,
+        ):
+            if current_seconds < boundary < SECONDS_PER_DAY:
+                boundaries.append(boundary)
+    return boundaries
+
+
+def compute_class_schedule_state() -> Tuple[ClassScheduleState, int]:
+    """计算当前课程状态和距离下一个课程边界的毫秒数
+
+    Returns:
+        Tuple[ClassScheduleState, int]: (课程状态, 下一次需要重新计算的延迟毫秒数)
+    """
+    data_source = readme_settings_async("linkage_settings", "data_source") or 0
+    now = time.time()
+    current_seconds = _get_current_time_in_seconds()
+    timetable = get_compiled_timetable() if data_source == 1 else None
+
+    class_info = _get_current_class_info() if data_source else {}
+    non_class_time = _is_non_class_time()
+
+    if data_source == 2:
+        ipc_handler = CSharpIPCHandler.instance()
+        try:
+            in_class = ipc_handler.is_connected and not ipc_handler.is_breaking()
+        except Exception:
+            in_class = False
+        seconds_to_next_class = ipc_handler.get_on_class_left_time()
+        pre_class_enable_time, _ = _get_linkage_offsets()
+        delays = [
+            seconds
+            for seconds in (
+                seconds_to_next_class - pre_class_enable_time,
+                seconds_to_next_class,
+            )
+            if seconds > 0
+        ]
+        # 下课等边界由 ClassIsland 的时间状态通知触发，兜底定时刷新
+        delay_ms = min(
+            [seconds * 1000 for seconds in delays] + [CLASS_SCHEDULE_IPC_INTERVAL_MS]
+        )
+    elif data_source == 1:
+        day_timetable = _get_day_timetable(_get_current_day_of_week())
+        in_class = day_timetable.is_in_class(current_seconds)
+        next_period = day_timetable.next_period(current_seconds)
+        seconds_to_next_class = (
+            next_period.start - current_seconds if next_period else 0
+        )
+        delay_ms = (min(_get_cses_boundaries(current_seconds)) - current_seconds) * 1000
+    else:
+        in_class = False
+        seconds_to_next_class = 0
+        delay_ms = CLASS_SCHEDULE_MAX_INTERVAL_MS
+
+    # 当前时间精确到秒，额外等待当前秒的剩余部分，确保定时器触发时已越过边界
+    delay_ms = int(delay_ms - (now % 1) * 1000) + CLASS_SCHEDULE_BOUNDARY_SLACK_MS
+    delay_ms = max(CLASS_SCHEDULE_BOUNDARY_SLACK_MS, delay_ms)
+    delay_ms = min(delay_ms, CLASS_SCHEDULE_MAX_INTERVAL_MS)
+
+    state = ClassScheduleState(
+        data_source=data_source,
+        in_class=bool(in_class),
+        class_info=class_info or {},
+        non_class_time=bool(non_class_time),
+        subject_class_info=_get_subject_class_info(
+            data_source, class_info, non_class_time
+        ),
+        seconds_to_next_class=max(0, int(seconds_to_next_class or 0)),
+        computed_at=now,
+        valid_until=now + delay_ms / 1000,
+        timetable=timetable,
+    )
+    return state, delay_ms
+
+
+# ==================================================
+# 课程时间调度服务
+# ==================================================
+class ClassScheduleService(QObject):
+    """课程时间调度服务
+
+    根据CSES课程表或 ClassIsland 的时间状态计算下一个课程边界，只在边界时刻
+    通过单次定时器唤醒并发出信号，两个边界之间不会重复计算课程表。
+    课程表文件变化时立即重新计算；另有低频定时器检查系统时间跳变（手动调整
+    时间、从睡眠中恢复）和快照过期，发现后重新计算并重新定时。
+    查询接口在边界之前直接返回缓存的课程状态，可以在任意线程中调用
+    """
+
+    periodStarted = Signal(dict)  # 上课（参数为当前课程信息）
+    breakStarted = Signal()  # 下课
+    preClassWindowEntered = Signal(int)  # 进入上课前提前解禁时间（参数为距离上课秒数）
+    nonClassTimeChanged = Signal(bool)  # 非上课时间状态变化
+    stateChanged = Signal()  # 课程状态重新计算
+    _refreshRequested = Signal()  # 跨线程请求重新计算（在服务所在线程中执行）
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._state: Optional[ClassScheduleState] = None
+        self._refresh_pending = False
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self.refresh)
+
+        # 系统时间跳变或睡眠恢复后，边界定时器的触发时间不再可靠
+        self._clock_reference = (time.time(), time.monotonic())
+        self._watchdog = QTimer(self)
+        self._watchdog.timeout.connect(self._check_clock)
+        self._watchdog.start(CLASS_SCHEDULE_WATCHDOG_INTERVAL_MS)
+
+        # 编辑器保存时可能替换文件，同时监视所在目录以便重新添加监视
+        self._file_watcher = QFileSystemWatcher(self)
+        self._file_watcher.fileChanged.connect(self._on_timetable_file_changed)
+        self._file_watcher.directoryChanged.connect(self._on_timetable_file_changed)
+        self._watch_timetable_file()
+
+        self._refreshRequested.connect(self.refresh, Qt.ConnectionType.QueuedConnection)
+        get_settings_signals().settingChanged.connect(self._on_setting_changed)
+        CSharpIPCHandler.instance().add_time_state_listener(self.request_refresh)
+
+        self.refresh()
+
+    def refresh(self):
+        """重新计算课程状态，发出状态变化信号，并在下一个课程边界重新定时"""
+        self._refresh_pending = False
+        self._clock_reference = (time.time(), time.monotonic())
+        previous = self._state
+        try:
+            state, delay_ms = compute_class_schedule_state()
+        except Exception as e:
+            logger.exception(f"计算课程状态失败: {e}")
+            self._state = None
+            self._timer.start(CLASS_SCHEDULE_IPC_INTERVAL_MS)
+            return
+
+        self._state = state
+        self._timer.start(delay_ms)
+        logger.debug(
+            f"课程状态已更新: 上课={state.in_class}, 非上课时间={state.non_class_time}, "
+            f"{delay_ms / 1000:.1f}秒后重新计算"
+        )
+        self._emit_transitions(previous, state)
+
+    def request_refresh(self):
+        """请求重新计算课程状态（可在任意线程中调用，重复请求会合并）"""
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        self._refreshRequested.emit()
+
+    def _emit_transitions(
+        self, previous: Optional[ClassScheduleState], state: ClassScheduleState
+    ):
+        """比较前后两次课程状态并发出对应的信号"""
+        if previous is not None:
+            if state.in_class and (
+                not previous.in_class or state.class_info != previous.class_info
+            ):
+                self.periodStarted.emit(dict(state.class_info))
+            elif previous.in_class and not state.in_class:
+                self.breakStarted.emit()
+
+            pre_class_enable_time, _ = _get_linkage_offsets()
+            was_in_window = (
+                0 < previous.seconds_to_next_class <= pre_class_enable_time
+                and not previous.in_class
+            )
+            is_in_window = (
+                0 < state.seconds_to_next_class <= pre_class_enable_time
+                and not state.in_class
+            )
+            if is_in_window and not was_in_window:
+                self.preClassWindowEntered.emit(state.seconds_to_next_class)
+
+        if previous is None or previous.non_class_time != state.non_class_time:
+            self.nonClassTimeChanged.emit(state.non_class_time)
+        self.stateChanged.emit()
+
+    def _check_clock(self):
+        """检查系统时间是否跳变、课程状态快照是否过期，必要时重新计算"""
+        wall_time, monotonic_time = time.time(), time.monotonic()
+        previous_wall, previous_monotonic = self._clock_reference
+        self._clock_reference = (wall_time, monotonic_time)
+        drift = (wall_time - previous_wall) - (monotonic_time - previous_monotonic)
+        if abs(drift) > CLASS_SCHEDULE_CLOCK_JUMP_TOLERANCE:
+            logger.info(f"检测到系统时间变化 {drift:+.1f} 秒，重新计算课程状态")
+            self.request_refresh()
+            return
+        # 快照过期（如边界定时器在睡眠期间未触发）或课程表变化时请求重新计算
+        self._get_valid_state()
+        # 课程表目录在启动后才创建时补充监视
+        self._watch_timetable_file()
+
+    def _watch_timetable_file(self):
+        """监视CSES课程表文件及其所在目录（已监视或不存在的路径跳过）"""
+        cses_file_path = get_cses_file_path()
+        watched = set(self._file_watcher.files() + self._file_watcher.directories())
+        for path in (cses_file_path.parent, cses_file_path):
+            if str(path) not in watched and path.exists():
+                self._file_watcher.addPath(str(path))
+
+    def _on_timetable_file_changed(self, path: str):
+        """课程表文件变化后重新计算"""
+        self._watch_timetable_file()
+        if self._state is not None and self._state.data_source == 1:
+            self.request_refresh()
+
+    def _on_setting_changed(self, first_level_key: str, second_level_key: str, value):
+        """课程联动设置变化后重新计算"""
+        if first_level_key == "linkage_settings":
+            self.request_refresh()
+
+    def _get_valid_state(self) -> Optional[ClassScheduleState]:
+        """获取仍然有效的课程状态快照
+
+        ClassIsland 数据源的状态由外部程序决定，不使用快照；时间越过下一个
+        课程边界、系统时间被调整或课程表文件变化时快照失效，并请求重新计算
+        """
+        state = self._state
+        if state is None or state.data_source == 2:
+            return None
+        now = time.time()
+        if not state.computed_at <= now < state.valid_until or (
+            state.data_source == 1 and get_compiled_timetable() is not state.timetable
+        ):
+            self.request_refresh()
+            return None
+        return state
+
+    def get_state(self) -> Optional[ClassScheduleState]:
+        """获取当前有效的课程状态，快照失效时返回None"""
+        return self._get_valid_state()
+
+    def is_non_class_time(self) -> bool:
+        """当前是否处于非上课时间（课间禁用判断）"""
+        state = self._get_valid_state()
+        if state is None:
+            return _is_non_class_time()
+        return state.non_class_time
+
+    def get_current_class_info(self) -> Dict:
+        """获取当前课程信息，课间返回空字典"""
+        state = self._get_valid_state()
+        if state is None:
+            return _get_current_class_info()
+        return dict(state.class_info)
+
+    def get_subject_class_info(self) -> Dict:
+        """获取科目历史过滤使用的课程信息（课间为课间归属课程）"""
+        state = self._get_valid_state()
+        if state is None:
+            return _compute_subject_class_info()
+        return dict(state.subject_class_info)
+
+
+# ==================================================
+# 全局实例与便捷函数
+# ==================================================
+_class_schedule_service: Optional[ClassScheduleService] = None
+
+
+def get_class_schedule_service() -> Optional[ClassScheduleService]:
+    """获取课程时间调度服务
+
+    服务的定时器需要运行在主线程中，因此只在主线程中首次调用时创建；
+    在其他线程中调用且服务尚未创建时返回None
+
+    Returns:
+        Optional[ClassScheduleService]: 课程时间调度服务
+    """
+    global _class_schedule_service
+    if _class_schedule_service is None:
+        app = QCoreApplication.instance()
+        if app is not None and QThread.currentThread() == app.thread():
+            _class_schedule_service = ClassScheduleService()
+            logger.debug("课程时间调度服务已启动")
+    return _class_schedule_service
+
+
+def is_non_class_time() -> bool:
+    """当前是否处于非上课时间（服务未启动时直接计算）"""
+    service = _class_schedule_service
+    if service is None:
+        return _is_non_class_time()
+    return service.is_non_class_time()
+
+
+def get_current_class_info() -> Dict:
+    """获取当前课程信息（服务未启动时直接计算）"""
+    service = _class_schedule_service
+    if service is None:
+        return _get_current_class_info()
+    return service.get_current_class_info()
+
+
+def get_subject_class_info() -> Dict:
+    """获取科目历史过滤使用的课程信息（服务未启动时直接计算）"""
+    service = _class_schedule_service
+    if service is None:
+        return _compute_subject_class_info()
+    return service.get_subject_class_info()
@@ -236,6 +236,7 @@ class CSESParser:
                     "teacher": timeslot.get("teacher", ""),
                     "location": timeslot.get("location", ""),
                     "day_of_week": timeslot.get("day_of_week", ""),
+                    "weeks": timeslot.get("weeks", "all"),
                 }
                 class_info.append(info)
 
@@ -322,6 +323,7 @@ class CSESParser:
                                 "teacher": teacher,
                                 "location": cls.get("room", ""),
                                 "day_of_week": day_schedule.get("enable_day"),
+                                "weeks": day_schedule.get("weeks", "all"),
                             }
                             timeslots.append(timeslot)
 
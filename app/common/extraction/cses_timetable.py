@@ -0,0 +1,212 @@
+# ==================================================
+# 导入库
+# ==================================================
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from app.common.extraction.cses_parser import CSESParser
+from app.tools.path_utils import get_data_path, get_file_signature
+
+# 单双周类型，"all" 表示不区分单双周（包含所有课程）
+WEEK_TYPES = ("all", "odd", "even")
+
+# 缓存的课程表 {"signature": 文件版本标识, "timetable": 编译结果}，为空表示尚未加载
+_timetable_cache: Dict[str, object] = {}
+_timetable_lock = threading.RLock()
+
+
+# ==================================================
+# 上课时间段
+# ==================================================
+@dataclass(frozen=True, slots=True)
+class ClassPeriod:
+    """一节课的上课时间段"""
+
+    start: int  # 开始时间（从午夜开始的秒数）
+    end: int  # 结束时间（从午夜开始的秒数）
+    name: str  # 课程名称
+    order: int  # 在课程表文件中的顺序
+
+
+class DayTimetable:
+    """某一天的上课时间段（按开始时间排序），查询均为二分查找"""
+
+    __slots__ = ("periods", "_starts", "_max_ends", "_by_end", "_ends")
+
+    def __init__(self, periods: List[ClassPeriod]):
+        self.periods = sorted(periods, key=lambda p: (p.start, p.order))
+        self._starts = [p.start for p in self.periods]
+        # 前缀最大结束时间，用于在时间段重叠时判断是否处于上课时间
+        self._max_ends = []
+        max_end = -1
+        for period in self.periods:
+            max_end = max(max_end, period.end)
+            self._max_ends.append(max_end)
+        self._by_end = sorted(self.periods, key=lambda p: (p.end, -p.order))
+        self._ends = [p.end for p in self._by_end]
+
+    def __bool__(self) -> bool:
+        return bool(self.periods)
+
+    def current_period(self, seconds: int) -> Optional[ClassPeriod]:
+        """获取包含指定时间的课程，多节课重叠时返回课程表中靠前的一节"""
+        index = bisect_right(self._starts, seconds) - 1
+        current = None
+        while index >= 0 and self._max_ends[index] > seconds:
+            period = self.periods[index]
+            if period.end > seconds and (
+                current is None or period.order < current.order
+            ):
+                current = period
+            index -= 1
+        return current
+
+    def is_in_class(self, seconds: int) -> bool:
+        """指定时间是否处于上课时间段内"""
+        index = bisect_right(self._starts, seconds) - 1
+        return index >= 0 and self._max_ends[index] > seconds
+
+    def next_period(self, seconds: int) -> Optional[ClassPeriod]:
+        """获取开始时间晚于指定时间的第一节课"""
+        index = bisect_right(self._starts, seconds)
+        if index >= len(self.periods):
+            return None
+        return self.periods[index]
+
+    def previous_period(self, seconds: int) -> Optional[ClassPeriod]:
+        """获取结束时间不晚于指定时间的最后一节课"""
+        index = bisect_right(self._ends, seconds) - 1
+        if index < 0:
+            return None
+        return self._by_end[index]
+
+
+class CompiledTimetable:
+    """编译后的CSES课程表，按星期几和单双周分别保存排好序的上课时间段"""
+
+    def __init__(self, days: Dict[Tuple[int, str], DayTimetable]):
+        self._days = days
+
+    def get_day(self, day_of_week: int, week_type: str = "all") -> DayTimetable:
+        """获取指定星期几的上课时间段
+
+        Args:
+            day_of_week: 星期几（1=星期一，7=星期日）
+            week_type: 周数类型（"all"=所有周，"odd"=单数周，"even"=双数周）
+        """
+        return self._days.get((day_of_week, week_type), _EMPTY_DAY)
+
+
+_EMPTY_DAY = DayTimetable([])
+
+
+# ==================================================
+# 课程表编译
+# ==================================================
+def _parse_time_to_seconds(time_str: str) -> int:
+    """将 "HH:MM:SS" 或 "HH:MM" 格式的时间转换为总秒数"""
+    time_parts = list(map(int, time_str.split(":")))
+    if len(time_parts) < 2 or len(time_parts) > 3:
+        raise ValueError(f"时间字符串格式不正确: {time_str}")
+    seconds = time_parts[2] if len(time_parts) > 2 else 0
+    return time_parts[0] * 3600 + time_parts[1] * 60 + seconds
+
+
+def compile_timetable(parser: CSESParser) -> CompiledTimetable:
+    """把已加载的CSES课程表编译为按星期几和单双周索引的时间段
+
+    Args:
+        parser: 已加载课程表的解析器
+
+    Returns:
+        CompiledTimetable: 编译后的课程表
+    """
+    periods_by_key: Dict[Tuple[int, str], List[ClassPeriod]] = {}
+    for order, class_info in enumerate(parser.get_class_info()):
+        day_of_week = class_info.get("day_of_week")
+        start_time_str = class_info.get("start_time", "")
+        end_time_str = class_info.get("end_time", "")
+        if not isinstance(day_of_week, int) or not start_time_str or not end_time_str:
+            continue
+        try:
+            period = ClassPeriod(
+                start=_parse_time_to_seconds(start_time_str),
+                end=_parse_time_to_seconds(end_time_str),
+                name=class_info.get("name", "") or "",
+                order=order,
+            )
+        except ValueError as e:
+            logger.warning(f"跳过无法解析的上课时间段: {class_info}, 错误: {e}")
+            continue
+
+        weeks = class_info.get("weeks", "all")
+        for week_type in WEEK_TYPES:
+            if week_type == "all" or weeks == "all" or weeks == week_type:
+                periods_by_key.setdefault((day_of_week, week_type), []).append(period)
+
+    return CompiledTimetable(
+        {key: DayTimetable(periods) for key, periods in periods_by_key.items()}
+    )
+
+
+# ==================================================
+# 课程表缓存
+# ==================================================
+def get_cses_file_path() -> Path:
+    """获取CSES课程表文件路径"""
+    return get_data_path("CSES", "cses_schedule.yml")
+
+
+def get_compiled_timetable() -> Optional[CompiledTimetable]:
+    """获取编译后的CSES课程表
+
+    按课程表文件的修改时间和大小缓存，文件变化后重新解析并编译
+
+    Returns:
+        Optional[CompiledTimetable]: 编译后的课程表，课程表文件不存在或无法加载时返回None
+    """
+    cses_file_path = get_cses_file_path()
+    signature = get_file_signature(cses_file_path)
+
+    with _timetable_lock:
+        if _timetable_cache and _timetable_cache["signature"] == signature:
+            return _timetable_cache["timetable"]
+
+        timetable = None
+        if signature is None:
+            logger.info("CSES文件不存在")
+        else:
+            parser = CSESParser()
+            if parser.load_from_file(str(cses_file_path)):
+                timetable = compile_timetable(parser)
+                logger.debug("已编译CSES课程表")
+            else:
+                logger.error(f"加载CSES文件失败: {str(cses_file_path)}")
+
+        _timetable_cache["signature"] = signature
+        _timetable_cache["timetable"] = timetable
+        return timetable
+
+
+def get_day_timetable(day_of_week: int, week_type: str = "all") -> DayTimetable:
+    """获取指定星期几的上课时间段，没有课程表时返回空的时间段
+
+    Args:
+        day_of_week: 星期几（1=星期一，7=星期日）
+        week_type: 周数类型（"all"=所有周，"odd"=单数周，"even"=双数周）
+    """
+    timetable = get_compiled_timetable()
+    if timetable is None:
+        return _EMPTY_DAY
+    return timetable.get_day(day_of_week, week_type)
+
+
+def invalidate_compiled_timetable():
+    """使编译后的课程表缓存失效（导入新的课程表文件后调用）"""
+    with _timetable_lock:
+        _timetable_cache.clear()
@@ -11,6 +11,11 @@ from qfluentwidgets import *
 from app.Language.obtain_language import get_content_name_async
 from app.common.IPC_URL.csharp_ipc_handler import CSharpIPCHandler
 from app.common.extraction.cses_parser import CSESParser
+from app.common.extraction.cses_timetable import (
+    DayTimetable,
+    get_day_timetable,
+    invalidate_compiled_timetable,
+)
 from app.tools.path_utils import *
 from app.tools.settings_access import readme_settings_async
 
@@ -45,44 +50,19 @@ def _get_break_assignment_class_info() -> Dict:
             logger.debug("未启用数据源，无法获取课间归属课程信息")
             return {}
 
-        parser = _get_cses_parser()
-        if not parser:
-            return {}
-
-        current_day_of_week = _get_current_day_of_week()
+        day_timetable = _get_day_timetable(_get_current_day_of_week())
         current_total_seconds = _get_current_time_in_seconds()
 
-        class_info_list = parser.get_class_info()
-
         if assignment == 1:
-            best_end_seconds = None
-            best_class_name = ""
-            for class_info in class_info_list:
-                if class_info.get("day_of_week") != current_day_of_week:
-                    continue
-                end_time_str = class_info.get("end_time", "")
-                if not end_time_str:
-                    continue
-                end_seconds = _parse_time_string_to_seconds(end_time_str)
-                if end_seconds <= current_total_seconds and (
-                    best_end_seconds is None or end_seconds > best_end_seconds
-                ):
-                    best_end_seconds = end_seconds
-                    best_class_name = class_info.get("name", "") or ""
-            if best_class_name:
-                logger.info(f"课间归属到上节课: {best_class_name}")
-                return {"name": best_class_name}
+            previous_period = day_timetable.previous_period(current_total_seconds)
+            if previous_period and previous_period.name:
+                logger.info(f"课间归属到上节课: {previous_period.name}")
+                return {"name": previous_period.name}
         else:
-            for class_info in class_info_list:
-                if class_info.get("day_of_week") != current_day_of_week:
-                    continue
-                start_time_str = class_info.get("start_time", "")
-                if start_time_str:
-                    start_seconds = _parse_time_string_to_seconds(start_time_str)
-                    if start_seconds > current_total_seconds:
-                        class_name = class_info.get("name", "")
-                        logger.info(f"课间归属到下节课: {class_name}")
-                        return {"name": class_name}
+            next_period = day_timetable.next_period(current_total_seconds)
+            if next_period:
+                logger.info(f"课间归属到下节课: {next_period.name}")
+                return {"name": next_period.name}
 
         logger.debug("无法获取课间归属课程信息")
         return {}
@@ -152,19 +132,21 @@ def _is_non_class_time() -> bool:
 
             return is_breaking
 
-        current_day_of_week = _get_current_day_of_week()
-        class_times = _get_class_times_by_day(current_day_of_week)
-        if not class_times or not isinstance(class_times, dict):
+        day_timetable = _get_day_timetable(_get_current_day_of_week())
+        if not day_timetable:
             return False
 
         current_total_seconds = _get_current_time_in_seconds()
         logger.debug(f"当前时间总秒数: {current_total_seconds}")
 
-        is_in_class_time = _is_time_in_ranges(current_total_seconds, class_times)
+        is_in_class_time = day_timetable.is_in_class(current_total_seconds)
         logger.debug(f"当前时间是否在上课时间段内: {is_in_class_time}")
 
         # 获取距离下一节课的时间
-        seconds_to_next_class = _get_seconds_to_next_class()
+        next_period = day_timetable.next_period(current_total_seconds)
+        seconds_to_next_class = (
+            next_period.start - current_total_seconds if next_period else 0
+        )
         logger.debug(f"距离下一节课时间: {seconds_to_next_class}秒")
 
         # 如果距离上课时间小于等于提前解禁时间，则提前解禁
@@ -179,7 +161,7 @@ def _is_non_class_time() -> bool:
             and seconds_to_next_class > 0
             and post_class_disable_delay > 0
             and 0
-            < _get_seconds_since_last_class_end(current_day_of_week)
+            < _get_seconds_since_last_class_end(day_timetable, current_total_seconds)
             <= post_class_disable_delay
         ):
             return False
@@ -216,62 +198,6 @@ def _get_current_day_of_week() -> int:
     return day_of_week
 
 
-def _parse_time_string_to_seconds(time_str: str) -> int:
-    """将时间字符串转换为总秒数
-
-    Args:
-        time_str: 时间字符串，格式为 "HH:MM:SS" 或 "HH:MM"
-
-    Returns:
-        int: 时间的总秒数
-
-    Raises:
-        ValueError: 如果时间字符串格式不正确
-    """
-    time_parts = list(map(int, time_str.split(":")))
-
-    if len(time_parts) < 2 or len(time_parts) > 3:
-        raise ValueError(f"时间字符串格式不正确: {time_str}")
-
-    hours = time_parts[0]
-    minutes = time_parts[1]
-    seconds = time_parts[2] if len(time_parts) > 2 else 0
-
-    return hours * 3600 + minutes * 60 + seconds
-
-
-def _is_time_in_ranges(current_seconds: int, time_ranges: Dict[str, str]) -> bool:
-    """检查当前时间是否在任何一个时间范围内
-
-    Args:
-        current_seconds: 当前时间的总秒数
-        time_ranges: 时间范围字典，格式为 {"name": "HH:MM:SS-HH:MM:SS"}
-
-    Returns:
-        bool: 如果当前时间在任何一个时间范围内返回True，否则返回False
-    """
-    for range_name, time_range in time_ranges.items():
-        try:
-            start_end = time_range.split("-")
-            if len(start_end) != 2:
-                logger.warning(f"时间范围格式错误: {range_name} = {time_range}")
-                continue
-
-            start_time_str, end_time_str = start_end
-
-            start_total_seconds = _parse_time_string_to_seconds(start_time_str)
-            end_total_seconds = _parse_time_string_to_seconds(end_time_str)
-
-            if start_total_seconds <= current_seconds < end_total_seconds:
-                return True
-
-        except Exception as e:
-            logger.error(f"解析时间段失败: {range_name} = {time_range}, 错误: {e}")
-            continue
-
-    return False
-
-
 def _get_cses_parser() -> CSESParser | None:
     """获取CSES解析器实例
 
@@ -302,27 +228,16 @@ def _get_cses_parser() -> CSESParser | None:
         return None
 
 
-def _get_class_times_by_day(day_of_week: int) -> Dict[str, str]:
-    """获取指定星期几的上课时间段
+def _get_day_timetable(day_of_week: int) -> DayTimetable:
+    """获取指定星期几的上课时间段（编译后的CSES课程表，按文件修改时间缓存）
 
     Args:
         day_of_week: 星期几（1=星期一，7=星期日）
 
     Returns:
-        Dict[str, str]: 上课时间段字典，格式为 {"name": "HH:MM:SS-HH:MM:SS"}
+        DayTimetable: 按开始时间排序的上课时间段，没有课程表时为空
     """
-    parser = _get_cses_parser()
-    if not parser:
-        return {}
-
-    try:
-        class_times = parser.get_class_times_by_day_with_week(day_of_week, "all")
-        if class_times:
-            return class_times
-    except Exception:
-        pass
-
-    return parser.get_class_times_by_day(day_of_week)
+    return get_day_timetable(day_of_week)
 
 
 def _get_current_class_info() -> Dict:
@@ -348,28 +263,12 @@ def _get_current_class_info() -> Dict:
             return {}
 
         # 从 CSES 文件获取课程信息
-        parser = _get_cses_parser()
-        if not parser:
-            return {}
-
-        current_day_of_week = _get_current_day_of_week()
-        current_total_seconds = _get_current_time_in_seconds()
-
-        class_info_list = parser.get_class_info()
-
-        for class_info in class_info_list:
-            if class_info.get("day_of_week") == current_day_of_week:
-                start_time_str = class_info.get("start_time", "")
-                end_time_str = class_info.get("end_time", "")
-
-                if start_time_str and end_time_str:
-                    start_seconds = _parse_time_string_to_seconds(start_time_str)
-                    end_seconds = _parse_time_string_to_seconds(end_time_str)
-
-                    if start_seconds <= current_total_seconds < end_seconds:
-                        class_name = class_info.get("name", "")
-                        logger.info(f"当前课程: {class_name}")
-                        return {"name": class_name}
+        current_period = _get_day_timetable(_get_current_day_of_week()).current_period(
+            _get_current_time_in_seconds()
+        )
+        if current_period:
+            logger.info(f"当前课程: {current_period.name}")
+            return {"name": current_period.name}
 
         logger.debug("当前时间不在任何上课时间段内")
         return {}
@@ -386,70 +285,27 @@ def _get_seconds_to_next_class() -> int:
         int: 距离下一节课的剩余秒数，如果没有下一节课则返回0
     """
     try:
-        current_day_of_week = _get_current_day_of_week()
-        class_times = _get_class_times_by_day(current_day_of_week)
-
-        if not class_times or not isinstance(class_times, dict):
-            return 0
-
         current_total_seconds = _get_current_time_in_seconds()
-
-        # 将上课时间段按开始时间排序
-        time_ranges = []
-        for range_name, time_range in class_times.items():
-            try:
-                start_end = time_range.split("-")
-                if len(start_end) != 2:
-                    continue
-
-                start_time_str, end_time_str = start_end
-                start_total_seconds = _parse_time_string_to_seconds(start_time_str)
-                time_ranges.append((start_total_seconds, range_name))
-            except Exception as e:
-                logger.exception(
-                    f"解析时间段失败: {range_name} = {time_range}, 错误: {e}"
-                )
-                continue
-
-        # 按开始时间排序
-        time_ranges.sort(key=lambda x: x[0])
-
-        # 找到下一个上课时间段
-        for start_seconds, range_name in time_ranges:
-            if start_seconds > current_total_seconds:
-                return start_seconds - current_total_seconds
-
-        # 如果当天没有下一节课，返回0
-        return 0
+        next_period = _get_day_timetable(_get_current_day_of_week()).next_period(
+            current_total_seconds
+        )
+        if next_period is None:
+            # 如果当天没有下一节课，返回0
+            return 0
+        return next_period.start - current_total_seconds
     except Exception as e:
         logger.exception(f"计算距离下一节课时间失败: {e}")
         return 0
 
 
-def _get_seconds_since_last_class_end(day_of_week: int) -> int:
-    class_times = _get_class_times_by_day(day_of_week)
-    if not class_times or not isinstance(class_times, dict):
-        return 0
-
-    current_total_seconds = _get_current_time_in_seconds()
-    best_end_seconds = None
-    for _, time_range in class_times.items():
-        try:
-            start_end = time_range.split("-")
-            if len(start_end) != 2:
-                continue
-            _, end_time_str = start_end
-            end_seconds = _parse_time_string_to_seconds(end_time_str)
-            if end_seconds <= current_total_seconds and (
-                best_end_seconds is None or end_seconds > best_end_seconds
-            ):
-                best_end_seconds = end_seconds
-        except Exception:
-            continue
-
-    if best_end_seconds is None:
+def _get_seconds_since_last_class_end(
+    day_timetable: DayTimetable, current_total_seconds: int
+) -> int:
+    """获取距离上一节课结束的时间（秒），当天还没有下课时返回0"""
+    previous_period = day_timetable.previous_period(current_total_seconds)
+    if previous_period is None:
         return 0
-    return max(0, current_total_seconds - best_end_seconds)
+    return max(0, current_total_seconds - previous_period.end)
 
 
 def _get_non_class_times_config() -> Dict[str, str]:
@@ -526,6 +382,7 @@ def import_cses_schedule(file_path: str) -> Tuple[bool, str]:
         import shutil
 
         shutil.copy2(get_path(file_path), cses_data_path)
+        invalidate_compiled_timetable()
         logger.info(f"已将CSES文件保存到: {cses_data_path}")
 
         summary = parser.get_summary()
@@ -2,10 +2,11 @@
 # 导入库
 # ==================================================
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from loguru import logger
 from app.common.history import *
-from app.tools.settings_access import readme_settings_async
+from app.common.history.stats_index import get_roll_call_weight_view
+from app.tools.settings_access import read_section
 
 
 # ==================================================
@@ -82,6 +83,7 @@ def apply_avg_gap_protection(
     class_name: str,
     history_type: str = "roll_call",
     subject_filter: str = "",
+    stats_index: Optional[Dict[str, Any]] = None,
 ) -> List[Dict[str, Any]]:
     """
     应用平均值过滤 + 最大差距保护的公平抽取逻辑
@@ -91,16 +93,19 @@ def apply_avg_gap_protection(
         class_name: 班级名称
         history_type: 历史记录类型，默认为"roll_call"
         subject_filter: 科目过滤，如果指定则只计算该科目的历史记录
+        stats_index: 本次抽取已加载的点名统计索引，为空时自动加载
     Returns:
         处理后的候选池
     """
+    # 集中获取所有配置
+    fair_draw_settings = read_section("fair_draw_settings")
+
     # 检查功能是否启用
-    if not readme_settings_async("fair_draw_settings", "enable_avg_gap_protection"):
+    if not fair_draw_settings.get("enable_avg_gap_protection"):
         return candidates
 
-    # 集中获取所有配置
-    gap_threshold = readme_settings_async("fair_draw_settings", "gap_threshold")
-    min_pool_size = readme_settings_async("fair_draw_settings", "min_pool_size")
+    gap_threshold = fair_draw_settings.get("gap_threshold")
+    min_pool_size = fair_draw_settings.get("min_pool_size")
 
     logger.debug(
         f"应用平均值差值保护，抽取人数: {draw_count}, 差距阈值: {gap_threshold}, 最小池大小: {min_pool_size}"
@@ -113,34 +118,33 @@ def apply_avg_gap_protection(
 
     try:
         # Step 1: 获取当前抽取单位的次数
-        # 加载历史记录
-        history_data = load_history_data(history_type, class_name)
-        # 初始化学生抽取次数字典
         student_counts = {}
-        for student in candidates:
-            student_name = _get_student_name(student)
-            if student_name:
-                # 从历史记录中获取该学生的抽取次数
-                student_history = history_data.get("students", {}).get(student_name, {})
-
-                # 如果有科目过滤，使用科目统计
-                if subject_filter and history_type == "roll_call":
-                    subject_stats = student_history.get("subject_stats", {})
-                    if subject_filter in subject_stats:
-                        student_counts[student_name] = subject_stats[
-                            subject_filter
-                        ].get("total_count", 0)
-                    else:
-                        # 如果科目统计中没有该科目，从历史记录中计算
-                        history = student_history.get("history", [])
-                        filtered_count = 0
-                        for record in history:
-                            if record.get("class_name", "") == subject_filter:
-                                filtered_count += 1
-                        student_counts[student_name] = filtered_count
-                else:
-                    # 没有科目过滤，使用总次数
-                    student_counts[student_name] = student_history.get("total_count", 0)
+        if history_type == "roll_call":
+            # 点名统计索引按历史记录版本缓存并随每次抽取增量更新，
+            # 指定科目时视图中只包含该科目的次数，无需加载和遍历历史记录
+            if stats_index is None:
+                stats_index = load_roll_call_stats_index(class_name)
+            students_stats = get_roll_call_weight_view(stats_index, subject_filter)[
+                "students"
+            ]
+            for student in candidates:
+                student_name = _get_student_name(student)
+                if student_name:
+                    student_counts[student_name] = students_stats.get(
+                        student_name, {}
+                    ).get("total_count", 0)
+        else:
+            # 加载历史记录
+            history_data = load_history_data(history_type, class_name)
+            for student in candidates:
+                student_name = _get_student_name(student)
+                if student_name:
+                    # 没有科目统计，使用总次数
+                    student_counts[student_name] = (
+                        history_data.get("students", {})
+                        .get(student_name, {})
+                        .get("total_count", 0)
+                    )
 
         # 获取所有学生的抽取次数列表
         counts = list(student_counts.values())
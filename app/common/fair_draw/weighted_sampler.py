@@ -0,0 +1,188 @@
+# ==================================================
+# 导入库
+# ==================================================
+from bisect import bisect_right, insort
+from itertools import accumulate
+from random import SystemRandom
+from typing import List, Optional, Sequence
+
+system_random = SystemRandom()
+
+
+# ==================================================
+# 加权抽样器
+# ==================================================
+class WeightedSampler:
+    """加权不放回抽样器
+
+    每次抽取的概率与剩余条目的权重成正比，与逐次累加权重扫描的实现等价；
+    当剩余条目的权重之和不大于 0 时，在剩余条目中等概率抽取。
+
+    前缀和只在建立时计算一次，已抽出的条目以有序区间表记录，抽取时把随机值
+    映射回原始坐标后二分查找，单次抽取 O(log n + m)（m 为区间表长度）；
+    区间表超过阈值时重建前缀和，保证大量抽取时的均摊开销。
+    """
+
+    _COMPACT_THRESHOLD = 64
+
+    def __init__(self, weights: Sequence[float], rng: Optional[SystemRandom] = None):
+        """初始化抽样器
+
+        Args:
+            weights: 权重列表，不大于 0 的权重按 0 处理
+            rng: 随机数生成器，默认为 SystemRandom
+        """
+        self._rng = rng or system_random
+        self._weights = [w if w > 0 else 0.0 for w in weights]
+        self._size = len(self._weights)
+        self._alive = [True] * self._size
+        self._remaining = self._size
+        self._positive_remaining = self._size - self._weights.count(0.0)
+        self._uniform_pool = None
+        self._rebuild()
+
+    def __len__(self) -> int:
+        return self._remaining
+
+    def _rebuild(self):
+        """重建前缀和并清空已移除区间表"""
+        self._prefix = list(accumulate(self._weights))
+        self._total = self._prefix[-1] if self._prefix else 0.0
+        # 已移除条目在当前前缀和坐标中的区间 (起点, 宽度)，按起点升序
+        self._removed = []
+
+    def _remove(self, index: int):
+        """从抽样器中移除指定条目"""
+        self._alive[index] = False
+        self._remaining -= 1
+        if self._uniform_pool is not None:
+            self._uniform_pool.remove(index)
+
+        weight = self._weights[index]
+        if weight <= 0:
+            return
+        self._positive_remaining -= 1
+        self._weights[index] = 0.0
+        insort(self._removed, (self._prefix[index] - weight, weight))
+        self._total -= weight
+        if len(self._removed) >= self._COMPACT_THRESHOLD:
+            self._rebuild()
+
+    def _locate(self, value: float) -> int:
+        """把剩余权重坐标中的 value 映射为条目下标"""
+        for start, width in self._removed:
+            if value < start:
+                break
+            value += width
+        return bisect_right(self._prefix, value)
+
+    def _pick_positive(self) -> int:
+        """按权重抽取一个权重为正的剩余条目"""
+        for _ in range(4):
+            index = self._locate(self._rng.uniform(0, self._total))
+            if index < self._size and self._weights[index] > 0:
+                return index
+        # 浮点误差导致定位到边界外时，退化为线性扫描
+        value = self._rng.uniform(0, self._total)
+        last = -1
+        for index, weight in enumerate(self._weights):
+            if weight > 0:
+                last = index
+                value -= weight
+                if value < 0:
+                    return index
+        return last
+
+    def _pick_uniform(self) -> int:
+        """在剩余条目中等概率抽取一个"""
+        if self._uniform_pool is None:
+            self._uniform_pool = [i for i, alive in enumerate(self._alive) if alive]
+        return self._uniform_pool[self._rng.randint(0, len(self._uniform_pool) - 1)]
+
+    def pop(self) -> int:
+        """抽取一个条目并将其移出抽样器
+
+        Returns:
+            int: 被抽中条目在原权重列表中的下标
+
+        Raises:
+            IndexError: 抽样器已空
+        """
+        if self._remaining <= 0:
+            raise IndexError("pop from empty WeightedSampler")
+        if self._positive_remaining > 0 and self._total > 0:
+            index = self._pick_positive()
+        else:
+            index = self._pick_uniform()
+        self._remove(index)
+        return index
+
+    def draw(self, count: int) -> List[int]:
+        """不放回地抽取多个条目
+
+        Args:
+            count: 抽取数量，超过剩余数量时只返回剩余数量
+
+        Returns:
+            List[int]: 按抽中顺序排列的下标列表
+        """
+        count = min(int(count or 0), self._remaining)
+        return [self.pop() for _ in range(count)]
+
+
+# ==================================================
+# 便捷函数
+# ==================================================
+def weighted_sample(
+    weights: Sequence[float], count: int, rng: Optional[SystemRandom] = None
+) -> List[int]:
+    """加权不放回抽样
+
+    Args:
+        weights: 权重列表
+        count: 抽取数量
+        rng: 随机数生成器，默认为 SystemRandom
+
+    Returns:
+        List[int]: 按抽中顺序排列的下标列表
+    """
+    if count <= 0 or not weights:
+        return []
+    return WeightedSampler(weights, rng).draw(count)
+
+
+def weighted_choices(
+    weights: Sequence[float], count: int, rng: Optional[SystemRandom] = None
+) -> List[int]:
+    """加权有放回抽样
+
+    权重之和不大于 0 时在全部条目中等概率抽取
+
+    Args:
+        weights: 权重列表
+        count: 抽取数量
+        rng: 随机数生成器，默认为 SystemRandom
+
+    Returns:
+        List[int]: 按抽中顺序排列的下标列表
+    """
+    rng = rng or system_random
+    size = len(weights)
+    if count <= 0 or size == 0:
+        return []
+
+    cumulative = list(accumulate(w if w > 0 else 0.0 for w in weights))
+    total = cumulative[-1]
+    if total <= 0:
+        return [rng.randint(0, size - 1) for _ in range(count)]
+
+    result = []
+    for _ in range(count):
+        index = bisect_right(cumulative, rng.uniform(0, total))
+        # uniform 可能取到 total，此时回退到最后一个权重为正的条目
+        while index >= size or (
+            cumulative[index] == (cumulative[index - 1] if index else 0.0)
+        ):
+            index -= 1
+        result.append(index)
+    return result
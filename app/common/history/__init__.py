@@ -9,6 +9,11 @@ from app.common.history.file_utils import (
     load_history_data,
     save_history_data,
     get_all_history_names,
+    append_history_event,
+    compact_history,
+    history_data_exists,
+    delete_history_data,
+    migrate_history_storage,
 )
 
 # 统计函数
@@ -27,9 +32,21 @@ from app.common.history.roll_call_history import save_roll_call_history
 # 权重工具
 from app.common.history.weight_utils import (
     format_weight_for_display,
+    create_weight_formatter,
     calculate_weight,
 )
 
+# 历史记录查询库
+from app.common.history.history_store import get_history_store
+
+# 统计索引
+from app.common.history.stats_index import (
+    get_stats_index_path,
+    load_roll_call_stats_index,
+    load_lottery_stats_index,
+    remove_stats_index,
+)
+
 # 辅助函数
 from app.common.history.utils import (
     get_all_names,
@@ -43,17 +60,29 @@ from app.common.history.history_reader import (
     get_roll_call_student_list,
     get_roll_call_history_data,
     filter_roll_call_history_by_subject,
+    get_roll_call_subject_view,
+    get_roll_call_subject_history,
     get_roll_call_student_total_count,
     get_roll_call_students_data,
     get_roll_call_session_data,
     get_roll_call_student_stats_data,
     check_class_has_gender_or_group,
+    get_roll_call_session_summary,
+    get_roll_call_session_page,
+    get_roll_call_student_stats_summary,
+    get_roll_call_student_stats_page,
+    get_roll_call_subject_list,
     # 抽奖历史读取
     get_lottery_pool_list,
     get_lottery_history_data,
     get_lottery_prizes_data,
     get_lottery_session_data,
     get_lottery_prize_stats_data,
+    get_lottery_session_summary,
+    get_lottery_session_page,
+    get_lottery_prize_stats_summary,
+    get_lottery_prize_stats_page,
+    get_lottery_subject_list,
 )
 
 __all__ = [
@@ -62,6 +91,11 @@ __all__ = [
     "load_history_data",
     "save_history_data",
     "get_all_history_names",
+    "append_history_event",
+    "compact_history",
+    "history_data_exists",
+    "delete_history_data",
+    "migrate_history_storage",
     # 统计函数
     "get_name_history",
     "get_draw_sessions_history",
@@ -72,7 +106,15 @@ __all__ = [
     "save_roll_call_history",
     # 权重工具
     "format_weight_for_display",
+    "create_weight_formatter",
     "calculate_weight",
+    # 历史记录查询库
+    "get_history_store",
+    # 统计索引
+    "get_stats_index_path",
+    "load_roll_call_stats_index",
+    "load_lottery_stats_index",
+    "remove_stats_index",
     # 辅助函数
     "get_all_names",
     "format_table_item",
@@ -81,14 +123,26 @@ __all__ = [
     "get_roll_call_student_list",
     "get_roll_call_history_data",
     "filter_roll_call_history_by_subject",
+    "get_roll_call_subject_view",
+    "get_roll_call_subject_history",
     "get_roll_call_student_total_count",
     "get_roll_call_students_data",
     "get_roll_call_session_data",
     "get_roll_call_student_stats_data",
     "check_class_has_gender_or_group",
+    "get_roll_call_session_summary",
+    "get_roll_call_session_page",
+    "get_roll_call_student_stats_summary",
+    "get_roll_call_student_stats_page",
+    "get_roll_call_subject_list",
     "get_lottery_pool_list",
     "get_lottery_history_data",
     "get_lottery_prizes_data",
     "get_lottery_session_data",
     "get_lottery_prize_stats_data",
+    "get_lottery_session_summary",
+    "get_lottery_session_page",
+    "get_lottery_prize_stats_summary",
+    "get_lottery_prize_stats_page",
+    "get_lottery_subject_list",
 ]
@@ -1,13 +1,42 @@
 # ==================================================
 # 导入库
 # ==================================================
+import os
 import json
-from typing import Dict, List, Any
+import threading
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
 from loguru import logger
 
-from app.tools.path_utils import get_path
+from app.tools.path_utils import get_path, get_file_signature
+from app.tools.variable import HISTORY_STORAGE_VERSION, HISTORY_COMPACT_EVENT_THRESHOLD
+
+# 历史记录由两部分组成：
+# - {name}.json：聚合快照，结构与原历史记录文件一致
+# - {name}.log：追加式事件日志（JSON Lines），每次抽取只追加一行
+# 读取时在快照上重放事件日志；事件累计到阈值后在后台合并回快照
+HISTORY_EVENT_LOG_SUFFIX = ".log"
+HISTORY_SNAPSHOT_TMP_SUFFIX = ".json.tmp"
+HISTORY_COMPACTING_SUFFIX = ".log.compacting"
+HISTORY_STORAGE_MARKER = "storage_version.json"
+
+HistoryEventHandler = Callable[[Dict[str, Any], Dict[str, Any]], Any]
+HistoryCompactionListener = Callable[
+    [str, str, Optional[List[int]], Optional[List[int]]], None
+]
+HistoryAppendListener = Callable[
+    [str, str, Dict[str, Any], Optional[List[int]], Optional[List[int]]], None
+]
+
+_event_handlers: Dict[str, HistoryEventHandler] = {}
+_compaction_listeners: List[HistoryCompactionListener] = []
+_append_listeners: List[HistoryAppendListener] = []
+_file_locks: Dict[Tuple[str, str], threading.RLock] = {}
+_file_locks_guard = threading.Lock()
+_recovered_files: set = set()
+_event_counts: Dict[Tuple[str, str], int] = {}
+_compacting_files: set = set()
 
 
 # ==================================================
@@ -28,6 +57,292 @@ def get_history_file_path(history_type: str, file_name: str) -> Path:
     return history_dir / f"{file_name}.json"
 
 
+def get_history_event_log_path(history_type: str, file_name: str) -> Path:
+    """获取历史记录事件日志路径（与快照文件位于同一目录）
+
+    Args:
+        history_type: 历史记录类型 (roll_call, lottery 等)
+        file_name: 文件名（不含扩展名）
+
+    Returns:
+        Path: 事件日志文件路径
+    """
+    history_file = get_history_file_path(history_type, file_name)
+    return history_file.with_name(f"{file_name}{HISTORY_EVENT_LOG_SUFFIX}")
+
+
+def _get_side_file_path(history_type: str, file_name: str, suffix: str) -> Path:
+    """获取快照临时文件或合并中日志文件的路径"""
+    history_file = get_history_file_path(history_type, file_name)
+    return history_file.with_name(f"{file_name}{suffix}")
+
+
+def get_history_signature(history_type: str, file_name: str) -> Optional[List[int]]:
+    """获取历史记录版本标识（快照和事件日志的修改时间与大小）
+
+    Args:
+        history_type: 历史记录类型 (roll_call, lottery 等)
+        file_name: 文件名（不含扩展名）
+
+    Returns:
+        Optional[List[int]]: 版本标识，历史记录不存在时返回 None
+    """
+    snapshot_signature = get_file_signature(
+        get_history_file_path(history_type, file_name)
+    )
+    log_signature = get_file_signature(
+        get_history_event_log_path(history_type, file_name)
+    )
+    if snapshot_signature is None and log_signature is None:
+        return None
+    return [*(snapshot_signature or (0, 0)), *(log_signature or (0, 0))]
+
+
+# ==================================================
+# 事件处理器注册
+# ==================================================
+def register_history_event_handler(history_type: str, handler: HistoryEventHandler):
+    """注册历史记录事件处理器
+
+    处理器接收 (历史记录数据, 事件)，把事件应用到历史记录数据上，
+    用于读取和合并时重放事件日志
+
+    Args:
+        history_type: 历史记录类型 (roll_call, lottery 等)
+        handler: 事件处理器
+    """
+    _event_handlers[history_type] = handler
+
+
+def register_history_compaction_listener(listener: HistoryCompactionListener):
+    """注册历史记录合并监听器
+
+    合并不改变历史记录内容，只改变文件版本标识；监听器接收
+    (历史记录类型, 文件名, 合并前版本标识, 合并后版本标识)
+
+    Args:
+        listener: 合并监听器
+    """
+    if listener not in _compaction_listeners:
+        _compaction_listeners.append(listener)
+
+
+def register_history_append_listener(listener: HistoryAppendListener):
+    """注册历史事件追加监听器
+
+    监听器接收 (历史记录类型, 文件名, 事件, 追加前版本标识, 追加后版本标识)，
+    用于增量维护基于历史记录派生的数据
+
+    Args:
+        listener: 追加监听器
+    """
+    if listener not in _append_listeners:
+        _append_listeners.append(listener)
+
+
+def apply_history_event(
+    history_type: str, history_data: Dict[str, Any], event: Dict[str, Any]
+) -> bool:
+    """使用已注册的事件处理器把单个事件应用到历史记录数据上
+
+    Args:
+        history_type: 历史记录类型 (roll_call, lottery 等)
+        history_data: 历史记录数据（原地修改）
+        event: 事件数据
+
+    Returns:
+        bool: 是否找到对应的事件处理器
+    """
+    handler = _event_handlers.get(history_type)
+    if handler is None:
+        return False
+    handler(history_data, event)
+    return True
+
+
+# ==================================================
+# 存储内部函数
+# ==================================================
+def _get_file_lock(history_type: str, file_name: str) -> threading.RLock:
+    """获取单个历史记录的读写锁"""
+    key = (history_type, file_name)
+    with _file_locks_guard:
+        lock = _file_locks.get(key)
+        if lock is None:
+            lock = threading.RLock()
+            _file_locks[key] = lock
+        return lock
+
+
+def _recover_interrupted_write(history_type: str, file_name: str):
+    """恢复被中断的快照写入（每个历史记录在进程内只检查一次）
+
+    快照写入顺序为：写临时快照 -> 事件日志改名为合并中 -> 替换快照 -> 删除合并中日志。
+    合并中日志存在时，临时快照存在说明替换尚未完成，否则说明快照已替换完成
+    """
+    key = (history_type, file_name)
+    if key in _recovered_files:
+        return
+    _recovered_files.add(key)
+
+    tmp_path = _get_side_file_path(history_type, file_name, HISTORY_SNAPSHOT_TMP_SUFFIX)
+    compacting_path = _get_side_file_path(
+        history_type, file_name, HISTORY_COMPACTING_SUFFIX
+    )
+    log_path = get_history_event_log_path(history_type, file_name)
+    try:
+        if compacting_path.exists():
+            if tmp_path.exists():
+                os.replace(tmp_path, get_history_file_path(history_type, file_name))
+            compacting_path.unlink()
+            logger.warning(f"已恢复被中断的历史记录合并: {history_type}/{file_name}")
+        elif tmp_path.exists():
+            tmp_path.unlink()
+
+        # 截掉异常退出时写了一半的最后一行
+        if log_path.exists() and log_path.stat().st_size > 0:
+            with open(log_path, "rb+") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.seek(0)
+                    content = f.read()
+                    f.seek(0)
+                    f.truncate(content.rfind(b"\n") + 1)
+                    logger.warning(
+                        f"已截断不完整的历史事件: {history_type}/{file_name}"
+                    )
+    except Exception as e:
+        logger.error(f"恢复历史记录文件失败: {e}")
+
+
+def _read_snapshot(history_type: str, file_name: str) -> Tuple[bool, Dict[str, Any]]:
+    """读取快照文件
+
+    Returns:
+        Tuple[bool, Dict[str, Any]]: (是否读取成功, 快照数据)，文件不存在视为成功
+    """
+    file_path = get_history_file_path(history_type, file_name)
+    if not file_path.exists():
+        return True, {}
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return True, data if isinstance(data, dict) else {}
+    except Exception as e:
+        logger.error(f"加载历史记录数据失败: {e}")
+        return False, {}
+
+
+def _read_events(
+    history_type: str, file_name: str, strict: bool = False
+) -> List[Dict[str, Any]]:
+    """读取事件日志中的全部事件
+
+    Args:
+        strict: 为 True 时读取失败直接抛出异常（合并前使用，避免只合并部分事件）
+    """
+    log_path = get_history_event_log_path(history_type, file_name)
+    if not log_path.exists():
+        return []
+
+    events = []
+    try:
+        with open(log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(
+                        f"跳过无法解析的历史事件: {history_type}/{file_name}"
+                    )
+                    continue
+                if isinstance(event, dict):
+                    events.append(event)
+    except Exception as e:
+        if strict:
+            raise
+        logger.error(f"读取历史事件日志失败: {e}")
+    return events
+
+
+def _apply_events(
+    history_type: str, history_data: Dict[str, Any], events: List[Dict[str, Any]]
+) -> bool:
+    """把事件依次应用到历史记录数据上
+
+    Returns:
+        bool: 是否全部事件都已应用（未注册事件处理器或有事件重放失败时为 False）
+    """
+    if not events:
+        return True
+    handler = _event_handlers.get(history_type)
+    if handler is None:
+        logger.warning(
+            f"未注册 {history_type} 历史事件处理器，已忽略 {len(events)} 条事件"
+        )
+        return False
+    applied = True
+    for event in events:
+        try:
+            handler(history_data, event)
+        except Exception as e:
+            logger.error(f"重放历史事件失败: {e}")
+            applied = False
+    return applied
+
+
+def _write_snapshot(history_type: str, file_name: str, data: Dict[str, Any]):
+    """写入快照并丢弃已合并的事件日志（调用方需持有文件锁）"""
+    file_path = get_history_file_path(history_type, file_name)
+    tmp_path = _get_side_file_path(history_type, file_name, HISTORY_SNAPSHOT_TMP_SUFFIX)
+    compacting_path = _get_side_file_path(
+        history_type, file_name, HISTORY_COMPACTING_SUFFIX
+    )
+    log_path = get_history_event_log_path(history_type, file_name)
+
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    if log_path.exists():
+        os.replace(log_path, compacting_path)
+    os.replace(tmp_path, file_path)
+    if compacting_path.exists():
+        compacting_path.unlink()
+    _event_counts[(history_type, file_name)] = 0
+
+
+def _count_events(history_type: str, file_name: str) -> int:
+    """获取事件日志中尚未合并的事件数量（首次调用时统计行数）"""
+    key = (history_type, file_name)
+    count = _event_counts.get(key)
+    if count is None:
+        count = 0
+        log_path = get_history_event_log_path(history_type, file_name)
+        if log_path.exists():
+            with open(log_path, "rb") as f:
+                count = sum(1 for line in f if line.strip())
+        _event_counts[key] = count
+    return count
+
+
+def _notify_compacted(
+    history_type: str,
+    file_name: str,
+    old_signature: Optional[List[int]],
+    new_signature: Optional[List[int]],
+):
+    """通知合并监听器（不持有文件锁调用，避免与监听器自身的锁交叉）"""
+    for listener in list(_compaction_listeners):
+        try:
+            listener(history_type, file_name, old_signature, new_signature)
+        except Exception as e:
+            logger.error(f"历史记录合并监听器执行失败: {e}")
+
+
 # ==================================================
 # 历史记录数据读写函数
 # ==================================================
@@ -36,6 +351,8 @@ def get_history_file_path(history_type: str, file_name: str) -> Path:
 def load_history_data(history_type: str, file_name: str) -> Dict[str, Any]:
     """加载历史记录数据
 
+    在快照上重放尚未合并的事件日志，返回完整的历史记录
+
     Args:
         history_type: 历史记录类型 (roll_call, lottery 等)
         file_name: 文件名（不含扩展名）
@@ -43,22 +360,37 @@ def load_history_data(history_type: str, file_name: str) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: 历史记录数据
     """
-    file_path = get_history_file_path(history_type, file_name)
+    with _get_file_lock(history_type, file_name):
+        _recover_interrupted_write(history_type, file_name)
+        _, history_data = _read_snapshot(history_type, file_name)
+        _apply_events(history_type, history_data, _read_events(history_type, file_name))
+        return history_data
 
-    if not file_path.exists():
-        return {}
 
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as e:
-        logger.error(f"加载历史记录数据失败: {e}")
-        return {}
+def load_history_data_with_signature(
+    history_type: str, file_name: str
+) -> Tuple[Dict[str, Any], Optional[List[int]]]:
+    """加载历史记录数据及与之对应的版本标识
+
+    两者在同一次加锁中读取，用于构建以版本标识校验的派生数据
+
+    Args:
+        history_type: 历史记录类型 (roll_call, lottery 等)
+        file_name: 文件名（不含扩展名）
+
+    Returns:
+        Tuple[Dict[str, Any], Optional[List[int]]]: (历史记录数据, 版本标识)
+    """
+    with _get_file_lock(history_type, file_name):
+        history_data = load_history_data(history_type, file_name)
+        return history_data, get_history_signature(history_type, file_name)
 
 
 def save_history_data(history_type: str, file_name: str, data: Dict[str, Any]) -> bool:
     """保存历史记录数据
 
+    以完整数据覆盖快照，并丢弃事件日志（data 应已包含全部事件）
+
     Args:
         history_type: 历史记录类型 (roll_call, lottery 等)
         file_name: 文件名（不含扩展名）
@@ -67,14 +399,166 @@ def save_history_data(history_type: str, file_name: str, data: Dict[str, Any]) -
     Returns:
         bool: 保存是否成功
     """
-    file_path = get_history_file_path(history_type, file_name)
-    try:
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
-        return True
-    except Exception as e:
-        logger.error(f"保存历史记录数据失败: {e}")
-    return False
+    with _get_file_lock(history_type, file_name):
+        try:
+            _recover_interrupted_write(history_type, file_name)
+            _write_snapshot(history_type, file_name, data)
+            return True
+        except Exception as e:
+            logger.error(f"保存历史记录数据失败: {e}")
+        return False
+
+
+def append_history_event(
+    history_type: str, file_name: str, event: Dict[str, Any]
+) -> bool:
+    """向事件日志追加一条事件
+
+    只追加一行，耗时与历史记录大小无关；事件数达到阈值时在后台合并到快照
+
+    Args:
+        history_type: 历史记录类型 (roll_call, lottery 等)
+        file_name: 文件名（不含扩展名）
+        event: 事件数据（需能被对应的事件处理器重放）
+
+    Returns:
+        bool: 追加是否成功
+    """
+    key = (history_type, file_name)
+    old_signature = new_signature = None
+    with _get_file_lock(history_type, file_name):
+        try:
+            _recover_interrupted_write(history_type, file_name)
+            if _append_listeners:
+                old_signature = get_history_signature(history_type, file_name)
+            count = _count_events(history_type, file_name)
+            line = json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+            log_path = get_history_event_log_path(history_type, file_name)
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            _event_counts[key] = count + 1
+            if _append_listeners:
+                new_signature = get_history_signature(history_type, file_name)
+        except Exception as e:
+            logger.error(f"追加历史事件失败: {e}")
+            return False
+
+        if _event_counts[key] >= HISTORY_COMPACT_EVENT_THRESHOLD:
+            _schedule_compaction(history_type, file_name)
+
+    for listener in list(_append_listeners):
+        try:
+            listener(history_type, file_name, event, old_signature, new_signature)
+        except Exception as e:
+            logger.error(f"历史事件追加监听器执行失败: {e}")
+    return True
+
+
+def compact_history(history_type: str, file_name: str) -> bool:
+    """把事件日志合并到快照
+
+    快照无法解析、事件日志读取失败或有事件未能重放（如未注册事件处理器）时不合并，
+    保留原文件和事件日志，避免丢失抽取记录
+
+    Args:
+        history_type: 历史记录类型 (roll_call, lottery 等)
+        file_name: 文件名（不含扩展名）
+
+    Returns:
+        bool: 合并是否成功
+    """
+    with _get_file_lock(history_type, file_name):
+        try:
+            _recover_interrupted_write(history_type, file_name)
+            old_signature = get_history_signature(history_type, file_name)
+            if old_signature is None:
+                return True
+            ok, history_data = _read_snapshot(history_type, file_name)
+            if not ok:
+                logger.warning(f"快照无法解析，跳过合并: {history_type}/{file_name}")
+                return False
+            events = _read_events(history_type, file_name, strict=True)
+            if not _apply_events(history_type, history_data, events):
+                logger.warning(
+                    f"历史事件未能全部重放，跳过合并并保留事件日志: "
+                    f"{history_type}/{file_name}"
+                )
+                return False
+            _write_snapshot(history_type, file_name, history_data)
+            new_signature = get_history_signature(history_type, file_name)
+        except Exception as e:
+            logger.error(f"合并历史记录失败: {e}")
+            return False
+
+    _notify_compacted(history_type, file_name, old_signature, new_signature)
+    logger.debug(f"已合并历史记录: {history_type}/{file_name}")
+    return True
+
+
+def _schedule_compaction(history_type: str, file_name: str):
+    """在后台线程中合并历史记录，同一历史记录同时只有一个合并任务"""
+    key = (history_type, file_name)
+    if key in _compacting_files:
+        return
+    _compacting_files.add(key)
+
+    def worker():
+        try:
+            compact_history(history_type, file_name)
+        finally:
+            _compacting_files.discard(key)
+
+    threading.Thread(target=worker, daemon=True, name="HistoryCompactThread").start()
+
+
+def history_data_exists(history_type: str, file_name: str) -> bool:
+    """检查历史记录是否存在（快照或事件日志）
+
+    Args:
+        history_type: 历史记录类型 (roll_call, lottery 等)
+        file_name: 文件名（不含扩展名）
+
+    Returns:
+        bool: 历史记录是否存在
+    """
+    return (
+        get_history_file_path(history_type, file_name).exists()
+        or get_history_event_log_path(history_type, file_name).exists()
+    )
+
+
+def delete_history_data(history_type: str, file_name: str) -> bool:
+    """删除历史记录（快照、事件日志及统计索引）
+
+    Args:
+        history_type: 历史记录类型 (roll_call, lottery 等)
+        file_name: 文件名（不含扩展名）
+
+    Returns:
+        bool: 是否删除了历史记录文件
+    """
+    removed = False
+    with _get_file_lock(history_type, file_name):
+        paths = [
+            get_history_file_path(history_type, file_name),
+            get_history_event_log_path(history_type, file_name),
+            _get_side_file_path(history_type, file_name, HISTORY_SNAPSHOT_TMP_SUFFIX),
+            _get_side_file_path(history_type, file_name, HISTORY_COMPACTING_SUFFIX),
+        ]
+        for path in paths:
+            if path.exists():
+                path.unlink()
+                removed = True
+        # 之后可能写入新的文件（如导入数据），重新统计事件数并检查中断的写入
+        _event_counts.pop((history_type, file_name), None)
+        _recovered_files.discard((history_type, file_name))
+
+    from app.common.history.stats_index import remove_stats_index
+    from app.common.history.history_store import remove_history_store_source
+
+    remove_stats_index(history_type, file_name)
+    remove_history_store_source(history_type, file_name)
+    return removed
 
 
 def get_all_history_names(history_type: str) -> List[str]:
@@ -91,9 +575,52 @@ def get_all_history_names(history_type: str) -> List[str]:
         if not history_dir.exists():
             return []
         history_files = list(history_dir.glob("*.json"))
-        names = [file.stem for file in history_files]
-        names.sort()
+        history_files.extend(history_dir.glob(f"*{HISTORY_EVENT_LOG_SUFFIX}"))
+        names = sorted({file.stem for file in history_files})
         return names
     except Exception as e:
         logger.error(f"获取历史记录名称列表失败: {e}")
         return []
+
+
+# ==================================================
+# 历史记录存储迁移
+# ==================================================
+def migrate_history_storage() -> bool:
+    """把旧版历史记录迁移为 快照 + 事件日志 存储格式
+
+    旧版历史记录文件（每次抽取整体重写的缩进 JSON）即为快照的初始内容，
+    迁移时逐个合并遗留的事件日志并以紧凑格式重写快照，完成后记录存储版本，
+    之后不再重复执行
+
+    Returns:
+        bool: 迁移是否全部成功
+    """
+    marker_path = get_path("data/history") / HISTORY_STORAGE_MARKER
+    try:
+        if marker_path.exists():
+            with open(marker_path, "r", encoding="utf-8") as f:
+                if json.load(f).get("version", 0) >= HISTORY_STORAGE_VERSION:
+                    return True
+    except Exception as e:
+        logger.warning(f"读取历史记录存储版本失败，将重新迁移: {e}")
+
+    success = True
+    migrated_count = 0
+    for history_type in ("roll_call", "lottery"):
+        for file_name in get_all_history_names(history_type):
+            if compact_history(history_type, file_name):
+                migrated_count += 1
+            else:
+                success = False
+
+    if success:
+        try:
+            marker_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(marker_path, "w", encoding="utf-8") as f:
+                json.dump({"version": HISTORY_STORAGE_VERSION}, f)
+        except Exception as e:
+            logger.error(f"写入历史记录存储版本失败: {e}")
+            success = False
+    logger.info(f"历史记录存储迁移完成，共处理 {migrated_count} 个历史记录")
+    return success
@@ -2,12 +2,25 @@
 # 导入库
 # ==================================================
 import json
+import threading
 from typing import Dict, List, Any, Optional, Tuple
 
 from loguru import logger
 
-from app.tools.path_utils import get_data_path, open_file, file_exists
+from app.tools.path_utils import get_data_path, open_file
 from app.common.data.list import get_gender_list, get_group_list
+from app.common.history.file_utils import (
+    get_history_signature,
+    load_history_data,
+    load_history_data_with_signature,
+    register_history_append_listener,
+    register_history_compaction_listener,
+)
+from app.common.history.history_store import get_history_store
+from app.common.history.stats_index import (
+    get_lottery_prize_row_count,
+    load_lottery_stats_index,
+)
 
 
 # ==================================================
@@ -58,12 +71,7 @@ def get_roll_call_history_data(
         Dict[str, Any]: 历史记录数据
     """
     try:
-        history_file = get_data_path("history/roll_call_history", f"{class_name}.json")
-        if not file_exists(history_file):
-            return {}
-
-        with open_file(history_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_history_data("roll_call", class_name)
     except Exception as e:
         logger.error(f"获取点名历史记录数据失败: {e}")
         return {}
@@ -84,18 +92,41 @@ def filter_roll_call_history_by_subject(
     if not subject_name:
         return history_data
 
-    filtered_history_data = {"students": {}}
+    student_records = {}
     for student_name, student_info in history_data.get("students", {}).items():
         filtered_history = []
         for record in student_info.get("history", []):
             if record.get("class_name", "") == subject_name:
                 filtered_history.append(record)
         if filtered_history:
-            filtered_history_data["students"][student_name] = {
-                **student_info,
-                "history": filtered_history,
-                "total_count": len(filtered_history),
-            }
+            student_records[student_name] = filtered_history
+
+    return _build_subject_history_data(history_data, subject_name, student_records)
+
+
+def _build_subject_history_data(
+    history_data: Dict[str, Any],
+    subject_name: str,
+    student_records: Dict[str, List[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """根据按学生分组的课程记录构建过滤后的历史记录数据
+
+    Args:
+        history_data: 原始历史记录数据
+        subject_name: 课程名称
+        student_records: 学生姓名到该课程记录列表的映射（记录不复制）
+
+    Returns:
+        Dict[str, Any]: 过滤后的历史记录数据
+    """
+    students = history_data.get("students", {})
+    filtered_history_data = {"students": {}}
+    for student_name, records in student_records.items():
+        filtered_history_data["students"][student_name] = {
+            **students.get(student_name, {}),
+            "history": records,
+            "total_count": len(records),
+        }
 
     # 添加科目统计信息
     subject_stats = history_data.get("subject_stats", {})
@@ -110,6 +141,126 @@ def filter_roll_call_history_by_subject(
     return filtered_history_data
 
 
+# ==================================================
+# 点名历史记录课程视图
+# ==================================================
+# 按班级缓存按课程分组的历史记录视图，以历史记录版本标识为键，
+# 追加事件后失效，下次访问时重新分组
+_subject_view_cache: Dict[str, Dict[str, Any]] = {}
+_subject_view_lock = threading.RLock()
+
+
+def _build_roll_call_subject_view(history_data: Dict[str, Any]) -> Dict[str, Any]:
+    """一次遍历把历史记录按课程和学生分组（只保存记录引用，不复制）"""
+    subject_records: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    students = history_data.get("students", {})
+    if isinstance(students, dict):
+        for student_name, student_info in students.items():
+            if not isinstance(student_info, dict):
+                continue
+            for record in student_info.get("history", []):
+                subject_name = record.get("class_name", "")
+                if subject_name:
+                    subject_records.setdefault(subject_name, {}).setdefault(
+                        student_name, []
+                    ).append(record)
+    return {
+        "history_data": history_data,
+        "subject_records": subject_records,
+        "filtered": {},
+    }
+
+
+def get_roll_call_subject_view(class_name: str) -> Dict[str, Any]:
+    """获取班级按课程分组的历史记录视图
+
+    Args:
+        class_name: 班级名称
+
+    Returns:
+        Dict[str, Any]: 视图数据（与其他调用方共享，不应修改），包含 signature、
+            history_data、subject_records（课程 -> 学生 -> 记录列表）等
+    """
+    with _subject_view_lock:
+        view = _subject_view_cache.get(class_name)
+        if view is not None and view["signature"] == get_history_signature(
+            "roll_call", class_name
+        ):
+            return view
+
+        try:
+            history_data, signature = load_history_data_with_signature(
+                "roll_call", class_name
+            )
+        except Exception as e:
+            logger.error(f"获取点名历史记录数据失败: {e}")
+            history_data, signature = {}, None
+        view = _build_roll_call_subject_view(history_data)
+        view["signature"] = signature
+        _subject_view_cache[class_name] = view
+        return view
+
+
+def get_roll_call_subject_history(
+    class_name: str, subject_name: Optional[str] = None
+) -> Dict[str, Any]:
+    """获取按课程过滤后的点名历史记录（结果与 filter_roll_call_history_by_subject 一致）
+
+    Args:
+        class_name: 班级名称
+        subject_name: 课程名称，如果为空则返回完整历史记录
+
+    Returns:
+        Dict[str, Any]: 历史记录数据（缓存对象，调用方不应修改）
+    """
+    with _subject_view_lock:
+        view = get_roll_call_subject_view(class_name)
+        if not subject_name:
+            return view["history_data"]
+        filtered = view["filtered"].get(subject_name)
+        if filtered is None:
+            filtered = _build_subject_history_data(
+                view["history_data"],
+                subject_name,
+                view["subject_records"].get(subject_name, {}),
+            )
+            view["filtered"][subject_name] = filtered
+        return filtered
+
+
+def _on_roll_call_history_appended(
+    history_type: str,
+    file_name: str,
+    event: Dict[str, Any],
+    old_signature: Optional[List[int]],
+    new_signature: Optional[List[int]],
+):
+    """保存点名记录后使课程视图失效"""
+    if history_type != "roll_call":
+        return
+    with _subject_view_lock:
+        _subject_view_cache.pop(file_name, None)
+
+
+def _on_roll_call_history_compacted(
+    history_type: str,
+    file_name: str,
+    old_signature: Optional[List[int]],
+    new_signature: Optional[List[int]],
+):
+    """历史记录合并后内容不变，只更新课程视图的版本标识"""
+    if history_type != "roll_call":
+        return
+    with _subject_view_lock:
+        view = _subject_view_cache.get(file_name)
+        if view is not None and view["signature"] == old_signature:
+            view["signature"] = new_signature
+
+
+register_history_append_listener(_on_roll_call_history_appended)
+register_history_compaction_listener(_on_roll_call_history_compacted)
+
+
 def get_roll_call_student_total_count(
     history_data: Dict[str, Any],
     student_name: str,
@@ -381,12 +532,7 @@ def get_lottery_history_data(
         Dict[str, Any]: 历史记录数据
     """
     try:
-        history_file = get_data_path("history/lottery_history", f"{pool_name}.json")
-        if not file_exists(history_file):
-            return {}
-
-        with open_file(history_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_history_data("lottery", pool_name)
     except Exception as e:
         logger.error(f"获取抽奖历史记录数据失败: {e}")
         return {}
@@ -400,7 +546,8 @@ def get_lottery_prizes_data(
 
     Args:
         cleaned_lotterys: 清理后的奖品列表
-        history_data: 历史记录数据
+        history_data: 历史记录数据，或 load_lottery_stats_index 获取的统计索引
+            （只读取奖品的 total_count）
 
     Returns:
         List[Dict[str, Any]]: 奖品数据列表
@@ -562,3 +709,559 @@ def get_lottery_prize_stats_data(
                         )
             break
     return lotterys_data
+
+
+# ==================================================
+# 历史记录分页查询
+# ==================================================
+# 查询库不可用时，在内存中计算完整的排序结果并缓存最近一次查询，按页切片
+_fallback_cache: Dict[str, Any] = {"key": None, "rows": []}
+
+
+def _get_id_length(items: List[Tuple]) -> int:
+    """获取名单中编号的最大长度"""
+    return max(len(str(item[0])) for item in items) if items else 0
+
+
+def _build_roll_call_roster(
+    cleaned_students: List[Tuple[str, str, str, str]],
+) -> List[Tuple[str, str, str, str, str]]:
+    """把学生列表转换为查询库名单 (名称, 编号, 性别, 小组, 权重)"""
+    max_id_length = _get_id_length(cleaned_students)
+    return [
+        (name, str(student_id).zfill(max_id_length), gender, group, "")
+        for student_id, name, gender, group in cleaned_students
+    ]
+
+
+def _build_lottery_roster(
+    cleaned_lotterys: List[Tuple[str, str, str]],
+) -> List[Tuple[str, str, str, str, str]]:
+    """把奖品列表转换为查询库名单 (名称, 编号, 性别, 小组, 权重)"""
+    max_id_length = _get_id_length(cleaned_lotterys)
+    return [
+        (name, str(lottery_id).zfill(max_id_length), "", "", weight)
+        for lottery_id, name, weight in cleaned_lotterys
+    ]
+
+
+def _fallback_sort_value(value: Any, numeric: bool) -> Any:
+    """内存排序键，数值字段无法转换时排在最前，与查询库的 NULL 排序一致"""
+    if numeric:
+        try:
+            return (1, float(value))
+        except (TypeError, ValueError):
+            return (0, 0.0)
+    return str(value)
+
+
+def _get_fallback_rows(
+    cache_key: Tuple,
+    build_rows,
+    sort_key: Optional[str],
+    descending: bool,
+) -> List[Dict[str, Any]]:
+    """获取内存计算的排序结果（缓存最近一次查询）"""
+    if _fallback_cache["key"] == cache_key:
+        return _fallback_cache["rows"]
+
+    rows = build_rows()
+    if sort_key:
+        numeric = sort_key in ("weight", "draw_people_numbers", "draw_lottery_numbers")
+        rows.sort(
+            key=lambda row: _fallback_sort_value(row.get(sort_key, ""), numeric),
+            reverse=descending,
+        )
+    else:
+        rows.sort(key=lambda row: row.get("draw_time", ""), reverse=True)
+
+    _fallback_cache["key"] = cache_key
+    _fallback_cache["rows"] = rows
+    return rows
+
+
+def _summarize_rows(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """统计内存计算结果"""
+    from app.common.history.weight_utils import format_weight_for_display
+
+    _, weight_int_length, _ = format_weight_for_display(rows, "weight")
+    return {
+        "total": len(rows),
+        "has_class_record": any(row.get("class_name", "") for row in rows),
+        "weight_int_length": weight_int_length,
+    }
+
+
+def _summarize_lottery_index(
+    index: Dict[str, Any],
+    cleaned_lotterys: List[Tuple[str, str, str]],
+    subject_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """从抽奖统计索引统计奖品列表中奖品的记录，与 _summarize_rows 的结果一致
+
+    只遍历奖品列表，耗时与历史记录长度无关
+    """
+    from app.common.history.weight_utils import format_weight_for_display
+
+    total = 0
+    has_class_record = False
+    drawn_weights = []
+    for _, name, weight in cleaned_lotterys:
+        count = get_lottery_prize_row_count(index, name, subject_name or "")
+        if not count:
+            continue
+        total += count
+        drawn_weights.append({"weight": weight})
+        if subject_name:
+            has_class_record = True
+        elif index.get("lotterys", {}).get(name, {}).get("class_record_count", 0):
+            has_class_record = True
+
+    _, weight_int_length, _ = format_weight_for_display(drawn_weights, "weight")
+    return {
+        "total": total,
+        "has_class_record": has_class_record,
+        "weight_int_length": weight_int_length,
+    }
+
+
+def _get_subjects_from_history(history_data: Dict[str, Any], key: str) -> List[str]:
+    """从历史记录数据中收集课程名称"""
+    subjects = set()
+    for info in history_data.get(key, {}).values():
+        for record in info.get("history", []):
+            class_name = record.get("class_name", "")
+            if class_name:
+                subjects.add(class_name)
+    return sorted(subjects)
+
+
+def _resolve_sort_field(sort_field: Optional[str], numbers_key: str) -> Optional[str]:
+    """把查询库排序字段转换为内存结果中的键名"""
+    return numbers_key if sort_field == "draw_numbers" else sort_field
+
+
+def get_roll_call_session_summary(
+    cleaned_students: List[Tuple[str, str, str, str]],
+    class_name: str,
+    subject_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """统计点名会话记录
+
+    Args:
+        cleaned_students: 清理后的学生列表
+        class_name: 班级名称
+        subject_name: 课程名称，如果为空则统计所有记录
+
+    Returns:
+        Dict[str, Any]: total（记录数）、has_class_record（是否有课程记录）、
+            weight_int_length（权重整数部分最大长度）
+    """
+    summary = get_history_store().summarize(
+        "roll_call",
+        class_name,
+        _build_roll_call_roster(cleaned_students),
+        subject=subject_name,
+    )
+    if summary is not None:
+        return summary
+    return _summarize_rows(
+        get_roll_call_session_data(
+            cleaned_students, get_roll_call_history_data(class_name), subject_name
+        )
+    )
+
+
+def get_roll_call_session_page(
+    cleaned_students: List[Tuple[str, str, str, str]],
+    class_name: str,
+    subject_name: Optional[str] = None,
+    sort_field: Optional[str] = None,
+    descending: bool = False,
+    offset: int = 0,
+    limit: int = -1,
+) -> List[Dict[str, Any]]:
+    """按页获取排序后的点名会话记录
+
+    Args:
+        cleaned_students: 清理后的学生列表
+        class_name: 班级名称
+        subject_name: 课程名称，如果为空则显示所有记录
+        sort_field: 排序字段 (draw_time, id, name, gender, group, class_name, weight)，
+            为空时按抽取时间倒序
+        descending: 是否降序
+        offset: 起始位置
+        limit: 最大数量，-1 表示不限制
+
+    Returns:
+        List[Dict[str, Any]]: 会话数据列表
+    """
+    rows = get_history_store().query(
+        "roll_call",
+        class_name,
+        _build_roll_call_roster(cleaned_students),
+        subject=subject_name,
+        sort_field=sort_field,
+        descending=descending,
+        offset=offset,
+        limit=limit,
+    )
+    if rows is not None:
+        return [
+            {
+                "draw_time": row["draw_time"],
+                "id": row["id"],
+                "name": row["name"],
+                "gender": row["gender"],
+                "group": row["group"],
+                "class_name": row["class_name"],
+                "weight": row["weight"],
+            }
+            for row in rows
+        ]
+
+    cache_key = (
+        "roll_call_session",
+        class_name,
+        get_history_signature("roll_call", class_name),
+        tuple(cleaned_students),
+        subject_name,
+        sort_field,
+        descending,
+    )
+    rows = _get_fallback_rows(
+        cache_key,
+        lambda: get_roll_call_session_data(
+            cleaned_students, get_roll_call_history_data(class_name), subject_name
+        ),
+        sort_field,
+        descending,
+    )
+    return rows[offset:] if limit < 0 else rows[offset : offset + limit]
+
+
+def get_roll_call_student_stats_summary(
+    cleaned_students: List[Tuple[str, str, str, str]],
+    class_name: str,
+    student_name: str,
+    subject_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """统计学生的点名记录
+
+    Args:
+        cleaned_students: 清理后的学生列表
+        class_name: 班级名称
+        student_name: 学生姓名
+        subject_name: 课程名称，如果为空则统计所有记录
+
+    Returns:
+        Dict[str, Any]: total、has_class_record、weight_int_length
+    """
+    if not any(name == student_name for _, name, _, _ in cleaned_students):
+        return {"total": 0, "has_class_record": False, "weight_int_length": 0}
+    summary = get_history_store().summarize(
+        "roll_call", class_name, None, name=student_name, subject=subject_name
+    )
+    if summary is not None:
+        return summary
+    return _summarize_rows(
+        get_roll_call_student_stats_data(
+            cleaned_students,
+            get_roll_call_history_data(class_name),
+            student_name,
+            subject_name,
+        )
+    )
+
+
+def get_roll_call_student_stats_page(
+    cleaned_students: List[Tuple[str, str, str, str]],
+    class_name: str,
+    student_name: str,
+    subject_name: Optional[str] = None,
+    sort_field: Optional[str] = None,
+    descending: bool = False,
+    offset: int = 0,
+    limit: int = -1,
+) -> List[Dict[str, Any]]:
+    """按页获取排序后的学生点名记录
+
+    Args:
+        cleaned_students: 清理后的学生列表
+        class_name: 班级名称
+        student_name: 学生姓名
+        subject_name: 课程名称，如果为空则显示所有记录
+        sort_field: 排序字段 (draw_time, draw_method, draw_numbers, draw_gender,
+            draw_group, class_name, weight)，为空时按抽取时间倒序
+        descending: 是否降序
+        offset: 起始位置
+        limit: 最大数量，-1 表示不限制
+
+    Returns:
+        List[Dict[str, Any]]: 统计数据列表
+    """
+    if not any(name == student_name for _, name, _, _ in cleaned_students):
+        return []
+    rows = get_history_store().query(
+        "roll_call",
+        class_name,
+        None,
+        name=student_name,
+        subject=subject_name,
+        sort_field=sort_field,
+        descending=descending,
+        offset=offset,
+        limit=limit,
+    )
+    if rows is not None:
+        return [
+            {
+                "draw_time": row["draw_time"],
+                "draw_method": row["draw_method"],
+                "draw_people_numbers": row["draw_numbers"],
+                "draw_gender": row["draw_gender"],
+                "draw_group": row["draw_group"],
+                "class_name": row["class_name"],
+                "weight": row["weight"],
+            }
+            for row in rows
+        ]
+
+    cache_key = (
+        "roll_call_stats",
+        class_name,
+        get_history_signature("roll_call", class_name),
+        student_name,
+        subject_name,
+        sort_field,
+        descending,
+    )
+    rows = _get_fallback_rows(
+        cache_key,
+        lambda: get_roll_call_student_stats_data(
+            cleaned_students,
+            get_roll_call_history_data(class_name),
+            student_name,
+            subject_name,
+        ),
+        _resolve_sort_field(sort_field, "draw_people_numbers"),
+        descending,
+    )
+    return rows[offset:] if limit < 0 else rows[offset : offset + limit]
+
+
+def get_roll_call_subject_list(class_name: str) -> List[str]:
+    """获取点名历史记录中出现过的课程名称
+
+    Args:
+        class_name: 班级名称
+
+    Returns:
+        List[str]: 排序后的课程名称列表
+    """
+    subjects = get_history_store().get_subjects("roll_call", class_name)
+    if subjects is not None:
+        return subjects
+    return _get_subjects_from_history(
+        get_roll_call_history_data(class_name), "students"
+    )
+
+
+def get_lottery_session_summary(
+    cleaned_lotterys: List[Tuple[str, str, str]],
+    pool_name: str,
+    subject_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """统计抽奖会话记录
+
+    Args:
+        cleaned_lotterys: 清理后的奖品列表
+        pool_name: 奖池名称
+        subject_name: 课程名称，如果为空则统计所有记录
+
+    Returns:
+        Dict[str, Any]: total、has_class_record、weight_int_length
+    """
+    return _summarize_lottery_index(
+        load_lottery_stats_index(pool_name), cleaned_lotterys, subject_name
+    )
+
+
+def get_lottery_session_page(
+    cleaned_lotterys: List[Tuple[str, str, str]],
+    pool_name: str,
+    subject_name: Optional[str] = None,
+    sort_field: Optional[str] = None,
+    descending: bool = False,
+    offset: int = 0,
+    limit: int = -1,
+) -> List[Dict[str, Any]]:
+    """按页获取排序后的抽奖会话记录
+
+    Args:
+        cleaned_lotterys: 清理后的奖品列表
+        pool_name: 奖池名称
+        subject_name: 课程名称，如果为空则显示所有记录
+        sort_field: 排序字段 (draw_time, id, name, class_name, weight)，
+            为空时按抽取时间倒序
+        descending: 是否降序
+        offset: 起始位置
+        limit: 最大数量，-1 表示不限制
+
+    Returns:
+        List[Dict[str, Any]]: 会话数据列表
+    """
+    rows = get_history_store().query(
+        "lottery",
+        pool_name,
+        _build_lottery_roster(cleaned_lotterys),
+        subject=subject_name,
+        sort_field=sort_field,
+        descending=descending,
+        offset=offset,
+        limit=limit,
+    )
+    if rows is not None:
+        return [
+            {
+                "draw_time": row["draw_time"],
+                "id": row["id"],
+                "name": row["name"],
+                "class_name": row["class_name"],
+                "weight": row["roster_weight"],
+            }
+            for row in rows
+        ]
+
+    cache_key = (
+        "lottery_session",
+        pool_name,
+        get_history_signature("lottery", pool_name),
+        tuple(cleaned_lotterys),
+        subject_name,
+        sort_field,
+        descending,
+    )
+    rows = _get_fallback_rows(
+        cache_key,
+        lambda: get_lottery_session_data(
+            cleaned_lotterys, get_lottery_history_data(pool_name), subject_name
+        ),
+        sort_field,
+        descending,
+    )
+    return rows[offset:] if limit < 0 else rows[offset : offset + limit]
+
+
+def get_lottery_prize_stats_summary(
+    cleaned_lotterys: List[Tuple[str, str, str]],
+    pool_name: str,
+    lottery_name: str,
+    subject_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """统计奖品的抽奖记录
+
+    Args:
+        cleaned_lotterys: 清理后的奖品列表
+        pool_name: 奖池名称
+        lottery_name: 奖品名称
+        subject_name: 课程名称，如果为空则统计所有记录
+
+    Returns:
+        Dict[str, Any]: total、has_class_record、weight_int_length
+    """
+    return _summarize_lottery_index(
+        load_lottery_stats_index(pool_name),
+        [lottery for lottery in cleaned_lotterys if lottery[1] == lottery_name],
+        subject_name,
+    )
+
+
+def get_lottery_prize_stats_page(
+    cleaned_lotterys: List[Tuple[str, str, str]],
+    pool_name: str,
+    lottery_name: str,
+    subject_name: Optional[str] = None,
+    sort_field: Optional[str] = None,
+    descending: bool = False,
+    offset: int = 0,
+    limit: int = -1,
+) -> List[Dict[str, Any]]:
+    """按页获取排序后的奖品抽奖记录
+
+    Args:
+        cleaned_lotterys: 清理后的奖品列表
+        pool_name: 奖池名称
+        lottery_name: 奖品名称
+        subject_name: 课程名称，如果为空则显示所有记录
+        sort_field: 排序字段 (draw_time, draw_numbers, class_name, weight)，
+            为空时按抽取时间倒序
+        descending: 是否降序
+        offset: 起始位置
+        limit: 最大数量，-1 表示不限制
+
+    Returns:
+        List[Dict[str, Any]]: 统计数据列表
+    """
+    lottery_weight_map = {name: weight for _, name, weight in cleaned_lotterys}
+    if lottery_name not in lottery_weight_map:
+        return []
+    # 同一奖品的权重都相同，按权重排序等同于保持抽取顺序
+    rows = get_history_store().query(
+        "lottery",
+        pool_name,
+        None,
+        name=lottery_name,
+        subject=subject_name,
+        sort_field="record_index" if sort_field == "weight" else sort_field,
+        descending=False if sort_field == "weight" else descending,
+        offset=offset,
+        limit=limit,
+    )
+    if rows is not None:
+        return [
+            {
+                "draw_time": row["draw_time"],
+                "draw_lottery_numbers": row["draw_numbers"],
+                "draw_gender": row["draw_gender"],
+                "draw_group": row["draw_group"],
+                "class_name": row["class_name"],
+                "weight": lottery_weight_map[lottery_name],
+            }
+            for row in rows
+        ]
+
+    cache_key = (
+        "lottery_stats",
+        pool_name,
+        get_history_signature("lottery", pool_name),
+        tuple(cleaned_lotterys),
+        lottery_name,
+        subject_name,
+        sort_field,
+        descending,
+    )
+    rows = _get_fallback_rows(
+        cache_key,
+        lambda: get_lottery_prize_stats_data(
+            cleaned_lotterys,
+            get_lottery_history_data(pool_name),
+            lottery_name,
+            subject_name,
+        ),
+        _resolve_sort_field(sort_field, "draw_lottery_numbers"),
+        descending,
+    )
+    return rows[offset:] if limit < 0 else rows[offset : offset + limit]
+
+
+def get_lottery_subject_list(pool_name: str) -> List[str]:
+    """获取抽奖历史记录中出现过的课程名称
+
+    Args:
+        pool_name: 奖池名称
+
+    Returns:
+        List[str]: 排序后的课程名称列表
+    """
+    return sorted(load_lottery_stats_index(pool_name).get("subject_counts", {}))
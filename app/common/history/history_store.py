@@ -0,0 +1,638 @@
+# ==================================================
+# 导入库
+# ==================================================
+import atexit
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from app.tools.path_utils import get_path
+from app.tools.settings_access import readme_settings_async
+from app.common.history.file_utils import (
+    apply_history_event,
+    get_history_signature,
+    load_history_data_with_signature,
+    register_history_append_listener,
+    register_history_compaction_listener,
+)
+
+try:
+    import sqlite3
+except ImportError:  # 精简的 Python 发行版可能不包含 sqlite3
+    sqlite3 = None
+
+# 历史记录查询库只是 JSON 历史记录的派生索引，可随时删除重建
+HISTORY_STORE_FILENAME = "history.sqlite3"
+HISTORY_STORE_SCHEMA_VERSION = 1
+HISTORY_STORE_SUMMARY_CACHE_SIZE = 64
+
+# 历史记录数据中保存各条目记录的键
+_RECORD_KEYS = {"roll_call": "students", "lottery": "lotterys"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    history_type TEXT NOT NULL,
+    source TEXT NOT NULL,
+    signature TEXT,
+    roster_hash TEXT,
+    PRIMARY KEY (history_type, source)
+);
+CREATE TABLE IF NOT EXISTS draws (
+    history_type TEXT NOT NULL,
+    source TEXT NOT NULL,
+    name TEXT NOT NULL,
+    record_index INTEGER NOT NULL,
+    draw_time TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    draw_method TEXT,
+    draw_numbers TEXT,
+    draw_gender TEXT,
+    draw_group TEXT,
+    weight_text TEXT,
+    weight REAL
+);
+CREATE INDEX IF NOT EXISTS idx_draws_time
+    ON draws (history_type, source, draw_time);
+CREATE INDEX IF NOT EXISTS idx_draws_name
+    ON draws (history_type, source, name, record_index);
+CREATE INDEX IF NOT EXISTS idx_draws_subject
+    ON draws (history_type, source, subject, draw_time);
+CREATE TABLE IF NOT EXISTS roster (
+    history_type TEXT NOT NULL,
+    source TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    item_id TEXT,
+    gender TEXT,
+    item_group TEXT,
+    weight_text TEXT,
+    weight REAL
+);
+CREATE INDEX IF NOT EXISTS idx_roster_name
+    ON roster (history_type, source, name);
+"""
+
+# 可排序字段到 SQL 表达式的映射（d 为抽取记录，r 为名单）
+_SORT_EXPRESSIONS = {
+    "draw_time": "d.draw_time",
+    "id": "r.item_id",
+    "name": "d.name",
+    "gender": "r.gender",
+    "group": "r.item_group",
+    "class_name": "d.subject",
+    "draw_method": "d.draw_method",
+    "draw_numbers": "CAST(d.draw_numbers AS INTEGER)",
+    "draw_gender": "d.draw_gender",
+    "draw_group": "d.draw_group",
+    "record_index": "d.record_index",
+}
+
+# 权重整数部分长度，与 format_weight_for_display 的计算方式一致
+_WEIGHT_INT_LENGTH_SQL = (
+    "CASE WHEN instr({0}, '.') > 0 THEN instr({0}, '.') - 1 ELSE length({0}) END"
+)
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """把权重转换为浮点数，无法转换时返回 None"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _record_to_row(
+    history_type: str, source: str, name: str, record_index: int, record: Any
+) -> Optional[Tuple]:
+    """把一条历史记录转换为 draws 表的行，没有抽取时间的记录不显示"""
+    if not isinstance(record, dict):
+        return None
+    draw_time = record.get("draw_time", "")
+    if not draw_time:
+        return None
+    if history_type == "lottery":
+        draw_numbers = record.get("draw_lottery_numbers", 0)
+    else:
+        draw_numbers = record.get("draw_people_numbers", 0)
+    weight = record.get("weight", "")
+    return (
+        history_type,
+        source,
+        name,
+        record_index,
+        str(draw_time),
+        str(record.get("class_name", "") or ""),
+        str(record.get("draw_method", "")),
+        str(draw_numbers),
+        str(record.get("draw_gender", "")),
+        str(record.get("draw_group", "")),
+        str(weight),
+        _to_float(weight),
+    )
+
+
+def _iter_history_rows(
+    history_type: str, source: str, history_data: Dict[str, Any]
+) -> Iterator[Tuple]:
+    """遍历历史记录数据中的全部抽取记录"""
+    items = history_data.get(_RECORD_KEYS.get(history_type, ""), {})
+    if not isinstance(items, dict):
+        return
+    for name, info in items.items():
+        if not isinstance(info, dict):
+            continue
+        history = info.get("history", [])
+        if not isinstance(history, list):
+            continue
+        for record_index, record in enumerate(history):
+            row = _record_to_row(history_type, source, name, record_index, record)
+            if row is not None:
+                yield row
+
+
+# ==================================================
+# 历史记录查询库
+# ==================================================
+class HistoryStore:
+    """基于 SQLite（WAL 模式）的历史记录查询库
+
+    JSON 快照和事件日志仍是历史记录的唯一数据来源，查询库按历史记录版本标识
+    同步：追加事件时增量写入，版本不一致时整体重建，历史记录表格只按页查询。
+    sqlite3 不可用或在设置中关闭时，调用方回退到内存计算。
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._conn = None
+        self._failed = False
+        # 统计结果缓存，键中包含历史记录版本标识和名单摘要，数据变化后自然失效
+        self._summary_cache: Dict[Tuple, Dict[str, Any]] = {}
+
+    def is_enabled(self) -> bool:
+        """查询库是否可用"""
+        if sqlite3 is None or self._failed:
+            return False
+        enabled = readme_settings_async(
+            "history_management", "history_database_enabled"
+        )
+        return enabled is not False
+
+    def _connect(self):
+        """打开数据库连接（首次调用时创建表结构）"""
+        if self._conn is not None:
+            return self._conn
+        db_path = get_path("data/history") / HISTORY_STORE_FILENAME
+        try:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != HISTORY_STORE_SCHEMA_VERSION:
+                with conn:
+                    for table in ("sources", "draws", "roster"):
+                        conn.execute(f"DROP TABLE IF EXISTS {table}")
+                    conn.executescript(_SCHEMA)
+                    conn.execute(f"PRAGMA user_version={HISTORY_STORE_SCHEMA_VERSION}")
+            self._conn = conn
+        except Exception as e:
+            logger.error(f"打开历史记录查询库失败，将使用内存查询: {e}")
+            self._failed = True
+        return self._conn
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except Exception as e:
+                    logger.error(f"关闭历史记录查询库失败: {e}")
+                self._conn = None
+
+    def _get_source_state(self, conn, history_type: str, source: str) -> Tuple:
+        """获取已同步的历史记录版本标识和名单摘要"""
+        row = conn.execute(
+            "SELECT signature, roster_hash FROM sources "
+            "WHERE history_type = ? AND source = ?",
+            (history_type, source),
+        ).fetchone()
+        return row if row else (None, None)
+
+    def _ensure_source(self, conn, history_type: str, source: str):
+        """确保查询库中的抽取记录与历史记录一致，不一致时整体重建"""
+        stored_signature, _ = self._get_source_state(conn, history_type, source)
+        if stored_signature == json.dumps(get_history_signature(history_type, source)):
+            return
+
+        history_data, signature = load_history_data_with_signature(history_type, source)
+        signature = json.dumps(signature)
+        with conn:
+            conn.execute(
+                "DELETE FROM draws WHERE history_type = ? AND source = ?",
+                (history_type, source),
+            )
+            conn.executemany(
+                "INSERT INTO draws VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                _iter_history_rows(history_type, source, history_data),
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO sources (history_type, source) VALUES (?, ?)",
+                (history_type, source),
+            )
+            conn.execute(
+                "UPDATE sources SET signature = ? WHERE history_type = ? AND source = ?",
+                (signature, history_type, source),
+            )
+        logger.debug(f"已重建历史记录查询库: {history_type}/{source}")
+
+    def _ensure_roster(
+        self, conn, history_type: str, source: str, roster: Sequence[Tuple]
+    ):
+        """同步名单，roster 的每个元素为 (名称, 编号, 性别, 小组, 权重)"""
+        roster_hash = hashlib.sha1(
+            json.dumps(list(roster), ensure_ascii=False, default=str).encode("utf-8")
+        ).hexdigest()
+        _, stored_hash = self._get_source_state(conn, history_type, source)
+        if stored_hash == roster_hash:
+            return
+
+        with conn:
+            conn.execute(
+                "DELETE FROM roster WHERE history_type = ? AND source = ?",
+                (history_type, source),
+            )
+            conn.executemany(
+                "INSERT INTO roster VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        history_type,
+                        source,
+                        position,
+                        str(name),
+                        str(item_id),
+                        str(gender),
+                        str(group),
+                        str(weight),
+                        _to_float(weight),
+                    )
+                    for position, (name, item_id, gender, group, weight) in enumerate(
+                        roster
+                    )
+                ),
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO sources (history_type, source) VALUES (?, ?)",
+                (history_type, source),
+            )
+            conn.execute(
+                "UPDATE sources SET roster_hash = ? WHERE history_type = ? AND source = ?",
+                (roster_hash, history_type, source),
+            )
+
+    def _build_query(
+        self,
+        history_type: str,
+        source: str,
+        name: Optional[str],
+        subject: Optional[str],
+    ) -> Tuple[str, List[Any]]:
+        """构建 FROM/WHERE 子句
+
+        不指定名称时按名单连接，只返回名单中条目的记录；指定名称时只查询该条目
+        """
+        if name is None:
+            clause = (
+                "FROM draws d JOIN roster r ON r.history_type = d.history_type "
+                "AND r.source = d.source AND r.name = d.name "
+                "WHERE d.history_type = ? AND d.source = ?"
+            )
+            params: List[Any] = [history_type, source]
+        else:
+            clause = (
+                "FROM draws d WHERE d.history_type = ? AND d.source = ? AND d.name = ?"
+            )
+            params = [history_type, source, name]
+        if subject:
+            clause += " AND d.subject = ?"
+            params.append(subject)
+        return clause, params
+
+    def _prepare(
+        self,
+        history_type: str,
+        source: str,
+        roster: Optional[Sequence[Tuple]],
+    ):
+        """打开连接并同步抽取记录和名单，失败时返回 None"""
+        conn = self._connect()
+        if conn is None:
+            return None
+        self._ensure_source(conn, history_type, source)
+        if roster is not None:
+            self._ensure_roster(conn, history_type, source, roster)
+        return conn
+
+    def summarize(
+        self,
+        history_type: str,
+        source: str,
+        roster: Optional[Sequence[Tuple]],
+        name: Optional[str] = None,
+        subject: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """统计符合条件的记录
+
+        Returns:
+            Optional[Dict[str, Any]]: total（记录数）、has_class_record（是否有课程）、
+                weight_int_length（权重整数部分最大长度），查询库不可用时返回 None
+        """
+        if not self.is_enabled():
+            return None
+        with self._lock:
+            try:
+                conn = self._prepare(history_type, source, roster)
+                if conn is None:
+                    return None
+                state = self._get_source_state(conn, history_type, source)
+                cache_key = (
+                    history_type,
+                    source,
+                    state[0],
+                    state[1] if name is None else None,
+                    name,
+                    subject,
+                )
+                summary = self._summary_cache.get(cache_key)
+                if summary is not None:
+                    return dict(summary)
+
+                clause, params = self._build_query(history_type, source, name, subject)
+                weight_column = (
+                    "r.weight_text"
+                    if history_type == "lottery" and name is None
+                    else "d.weight_text"
+                )
+                total, has_class_record, weight_int_length = conn.execute(
+                    "SELECT COUNT(*), MAX(d.subject != ''), MAX("
+                    + _WEIGHT_INT_LENGTH_SQL.format(weight_column)
+                    + ") "
+                    + clause,
+                    params,
+                ).fetchone()
+                summary = {
+                    "total": total or 0,
+                    "has_class_record": bool(has_class_record),
+                    "weight_int_length": weight_int_length or 0,
+                }
+                if len(self._summary_cache) >= HISTORY_STORE_SUMMARY_CACHE_SIZE:
+                    self._summary_cache.clear()
+                self._summary_cache[cache_key] = summary
+                return dict(summary)
+            except Exception as e:
+                logger.exception(f"统计历史记录失败: {e}")
+                return None
+
+    def query(
+        self,
+        history_type: str,
+        source: str,
+        roster: Optional[Sequence[Tuple]],
+        name: Optional[str] = None,
+        subject: Optional[str] = None,
+        sort_field: Optional[str] = None,
+        descending: bool = False,
+        offset: int = 0,
+        limit: int = -1,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """按页查询符合条件的记录
+
+        排序相同的记录保持名单顺序和抽取顺序；未指定排序字段时按抽取时间倒序
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: 记录列表，查询库不可用时返回 None
+        """
+        if not self.is_enabled():
+            return None
+        with self._lock:
+            try:
+                conn = self._prepare(history_type, source, roster)
+                if conn is None:
+                    return None
+                clause, params = self._build_query(history_type, source, name, subject)
+                joined = name is None
+
+                if sort_field == "weight":
+                    sort_expression = (
+                        "r.weight"
+                        if history_type == "lottery" and joined
+                        else "d.weight"
+                    )
+                else:
+                    sort_expression = _SORT_EXPRESSIONS.get(sort_field or "")
+                    if (
+                        sort_expression
+                        and sort_expression.startswith("r.")
+                        and not joined
+                    ):
+                        sort_expression = None
+                if sort_expression is None:
+                    sort_expression, descending = "d.draw_time", True
+                order = f"{sort_expression} {'DESC' if descending else 'ASC'}"
+                order += (
+                    ", r.position, d.record_index" if joined else ", d.record_index"
+                )
+
+                columns = (
+                    "d.draw_time, d.name, d.subject, d.draw_method, d.draw_numbers, "
+                    "d.draw_gender, d.draw_group, d.weight_text"
+                )
+                if joined:
+                    columns += ", r.item_id, r.gender, r.item_group, r.weight_text"
+                cursor = conn.execute(
+                    f"SELECT {columns} {clause} ORDER BY {order} LIMIT ? OFFSET ?",
+                    [*params, limit, offset],
+                )
+                rows = []
+                for row in cursor:
+                    item = {
+                        "draw_time": row[0],
+                        "name": row[1],
+                        "class_name": row[2],
+                        "draw_method": row[3],
+                        "draw_numbers": row[4],
+                        "draw_gender": row[5],
+                        "draw_group": row[6],
+                        "weight": row[7],
+                    }
+                    if joined:
+                        item.update(
+                            {
+                                "id": row[8],
+                                "gender": row[9],
+                                "group": row[10],
+                                "roster_weight": row[11],
+                            }
+                        )
+                    rows.append(item)
+                return rows
+            except Exception as e:
+                logger.exception(f"查询历史记录失败: {e}")
+                return None
+
+    def get_subjects(self, history_type: str, source: str) -> Optional[List[str]]:
+        """获取历史记录中出现过的课程名称（已排序），查询库不可用时返回 None"""
+        if not self.is_enabled():
+            return None
+        with self._lock:
+            try:
+                conn = self._prepare(history_type, source, None)
+                if conn is None:
+                    return None
+                cursor = conn.execute(
+                    "SELECT DISTINCT subject FROM draws "
+                    "WHERE history_type = ? AND source = ? AND subject != '' "
+                    "ORDER BY subject",
+                    (history_type, source),
+                )
+                return [row[0] for row in cursor]
+            except Exception as e:
+                logger.exception(f"查询课程列表失败: {e}")
+                return None
+
+    def warm_source(self, history_type: str, source: str) -> bool:
+        """提前同步查询库中的抽取记录（启动预热时在后台线程调用）
+
+        Returns:
+            bool: 查询库可用且同步成功时返回 True
+        """
+        if not self.is_enabled():
+            return False
+        with self._lock:
+            try:
+                return self._prepare(history_type, source, None) is not None
+            except Exception as e:
+                logger.exception(f"同步历史记录查询库失败: {e}")
+                return False
+
+    def remove_source(self, history_type: str, source: str):
+        """删除历史记录在查询库中的全部数据"""
+        if sqlite3 is None or self._failed:
+            return
+        with self._lock:
+            try:
+                conn = self._connect()
+                if conn is None:
+                    return
+                with conn:
+                    for table in ("draws", "roster", "sources"):
+                        conn.execute(
+                            f"DELETE FROM {table} WHERE history_type = ? AND source = ?",
+                            (history_type, source),
+                        )
+            except Exception as e:
+                logger.error(f"删除历史记录查询数据失败: {e}")
+
+    def on_event_appended(
+        self,
+        history_type: str,
+        source: str,
+        event: Dict[str, Any],
+        old_signature: Optional[List[int]],
+        new_signature: Optional[List[int]],
+    ):
+        """追加事件后增量写入，只在查询库与追加前的历史记录一致时生效"""
+        if not self.is_enabled() or self._conn is None:
+            return
+        with self._lock:
+            try:
+                conn = self._conn
+                stored_signature, _ = self._get_source_state(conn, history_type, source)
+                if stored_signature != json.dumps(old_signature):
+                    return
+
+                # 在空白历史记录上重放事件，得到本次新增的记录
+                scratch: Dict[str, Any] = {}
+                if not apply_history_event(history_type, scratch, event):
+                    return
+                items = scratch.get(_RECORD_KEYS.get(history_type, ""), {})
+
+                with conn:
+                    for name, info in items.items():
+                        next_index = conn.execute(
+                            "SELECT COALESCE(MAX(record_index) + 1, 0) FROM draws "
+                            "WHERE history_type = ? AND source = ? AND name = ?",
+                            (history_type, source, name),
+                        ).fetchone()[0]
+                        conn.executemany(
+                            "INSERT INTO draws VALUES "
+                            "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            filter(
+                                None,
+                                (
+                                    _record_to_row(
+                                        history_type,
+                                        source,
+                                        name,
+                                        next_index + i,
+                                        record,
+                                    )
+                                    for i, record in enumerate(info.get("history", []))
+                                ),
+                            ),
+                        )
+                    conn.execute(
+                        "UPDATE sources SET signature = ? "
+                        "WHERE history_type = ? AND source = ?",
+                        (json.dumps(new_signature), history_type, source),
+                    )
+            except Exception as e:
+                logger.error(f"增量更新历史记录查询库失败: {e}")
+
+    def on_compacted(
+        self,
+        history_type: str,
+        source: str,
+        old_signature: Optional[List[int]],
+        new_signature: Optional[List[int]],
+    ):
+        """历史记录合并后内容不变，只更新版本标识"""
+        if self._conn is None:
+            return
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        "UPDATE sources SET signature = ? "
+                        "WHERE history_type = ? AND source = ? AND signature = ?",
+                        (
+                            json.dumps(new_signature),
+                            history_type,
+                            source,
+                            json.dumps(old_signature),
+                        ),
+                    )
+            except Exception as e:
+                logger.error(f"更新历史记录查询库版本失败: {e}")
+
+
+# ==================================================
+# 全局实例与便捷函数
+# ==================================================
+_history_store = HistoryStore()
+register_history_append_listener(_history_store.on_event_appended)
+register_history_compaction_listener(_history_store.on_compacted)
+atexit.register(_history_store.close)
+
+
+def get_history_store() -> HistoryStore:
+    """获取历史记录查询库实例"""
+    return _history_store
+
+
+def remove_history_store_source(history_type: str, source: str):
+    """删除历史记录在查询库中的数据（随历史记录一同删除时调用）"""
+    _history_store.remove_source(history_type, source)
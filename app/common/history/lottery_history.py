@@ -6,8 +6,78 @@ from typing import Dict, List, Any
 
 from loguru import logger
 
-from app.common.extraction.extract import _get_current_class_info
-from app.common.history.file_utils import load_history_data, save_history_data
+from app.common.extraction.class_schedule import get_current_class_info
+from app.common.history.file_utils import (
+    append_history_event,
+    register_history_event_handler,
+)
+from app.common.history.stats_index import (
+    load_lottery_stats_index,
+    update_lottery_stats_index,
+)
+
+
+# ==================================================
+# 抽奖历史事件
+# ==================================================
+def _apply_lottery_event(history_data: Dict[str, Any], event: Dict[str, Any]):
+    """把抽奖事件应用到历史记录数据上（用于重放事件日志）"""
+    current_time = event.get("time", "")
+    names = event.get("names", [])
+    group_filter = event.get("group_filter")
+    gender_filter = event.get("gender_filter")
+
+    lotterys = history_data.get("lotterys", {})
+    group_stats = history_data.get("group_stats", {})
+    gender_stats = history_data.get("gender_stats", {})
+    total_stats = history_data.get("total_stats", 0)
+
+    for name in names:
+        if not name:
+            continue
+        entry = lotterys.get(name)
+        if not isinstance(entry, dict):
+            entry = {
+                "total_count": 0,
+                "rounds_missed": 0,
+                "last_drawn_time": "",
+                "history": [],
+            }
+        entry["total_count"] = int(entry.get("total_count", 0)) + 1
+        entry["last_drawn_time"] = current_time
+        hist = entry.get("history", [])
+        if not isinstance(hist, list):
+            hist = []
+        hist.append(
+            {
+                "draw_time": current_time,
+                "draw_lottery_numbers": len(names),
+                "draw_group": group_filter,
+                "draw_gender": gender_filter,
+            }
+        )
+        # 如果能获取到课程信息，则添加到历史记录中
+        if event.get("subject") is not None:
+            hist[-1]["class_name"] = event["subject"]
+        entry["history"] = hist
+        lotterys[name] = entry
+
+    # 更新统计
+    if group_filter:
+        group_stats[group_filter] = int(group_stats.get(group_filter, 0)) + len(names)
+    if gender_filter:
+        gender_stats[gender_filter] = int(gender_stats.get(gender_filter, 0)) + len(
+            names
+        )
+    total_stats = int(total_stats) + len(names)
+
+    history_data["lotterys"] = lotterys
+    history_data["group_stats"] = group_stats
+    history_data["gender_stats"] = gender_stats
+    history_data["total_stats"] = total_stats
+
+
+register_history_event_handler("lottery", _apply_lottery_event)
 
 
 # ==================================================
@@ -21,6 +91,9 @@ def save_lottery_history(
 ) -> bool:
     """保存抽奖历史（基于奖池名称）
 
+    只向事件日志追加一条事件，不重写完整的历史记录文件，
+    并增量更新奖池的抽奖统计索引
+
     Args:
         pool_name: 奖池名称
         selected_students: 学生字典列表（包含 name、id、exist 等）
@@ -35,62 +108,23 @@ def save_lottery_history(
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         # 获取当前课程信息
-        current_class_info = _get_current_class_info()
-
-        history_data = load_history_data("lottery", pool_name)
-        lotterys = history_data.get("lotterys", {})
-        group_stats = history_data.get("group_stats", {})
-        gender_stats = history_data.get("gender_stats", {})
-        total_stats = history_data.get("total_stats", 0)
-
-        for student in selected_students or []:
-            name = student.get("name", "")
-            if not name:
-                continue
-            entry = lotterys.get(name)
-            if not isinstance(entry, dict):
-                entry = {
-                    "total_count": 0,
-                    "rounds_missed": 0,
-                    "last_drawn_time": "",
-                    "history": [],
-                }
-            entry["total_count"] = int(entry.get("total_count", 0)) + 1
-            entry["last_drawn_time"] = current_time
-            hist = entry.get("history", [])
-            if not isinstance(hist, list):
-                hist = []
-            hist.append(
-                {
-                    "draw_time": current_time,
-                    "draw_lottery_numbers": len(selected_students),
-                    "draw_group": group_filter,
-                    "draw_gender": gender_filter,
-                }
-            )
-            # 如果能获取到课程信息，则添加到历史记录中
-            if current_class_info:
-                hist[-1]["class_name"] = current_class_info.get("name", "")
-            entry["history"] = hist
-            lotterys[name] = entry
-
-        # 更新统计
-        if group_filter:
-            group_stats[group_filter] = int(group_stats.get(group_filter, 0)) + len(
-                selected_students or []
-            )
-        if gender_filter:
-            gender_stats[gender_filter] = int(gender_stats.get(gender_filter, 0)) + len(
-                selected_students or []
-            )
-        total_stats = int(total_stats) + len(selected_students or [])
-
-        history_data["lotterys"] = lotterys
-        history_data["group_stats"] = group_stats
-        history_data["gender_stats"] = gender_stats
-        history_data["total_stats"] = total_stats
-
-        return save_history_data("lottery", pool_name, history_data)
+        current_class_info = get_current_class_info()
+
+        event = {
+            "time": current_time,
+            "subject": (
+                current_class_info.get("name", "") if current_class_info else None
+            ),
+            "group_filter": group_filter,
+            "gender_filter": gender_filter,
+            "names": [student.get("name", "") for student in selected_students or []],
+        }
+        # 追加事件前加载统计索引，确保索引与追加前的历史记录一致
+        stats_index = load_lottery_stats_index(pool_name)
+        if not append_history_event("lottery", pool_name, event):
+            return False
+        update_lottery_stats_index(pool_name, stats_index, event)
+        return True
     except Exception as e:
         logger.exception(f"保存抽奖历史失败: {e}")
         return False
@@ -9,9 +9,17 @@ from loguru import logger
 from app.tools.settings_access import readme_settings_async
 from app.common.data.list import get_student_list
 from app.Language.obtain_language import get_content_combo_name_async
-from app.common.extraction.extract import _get_current_class_info
-from app.common.history.file_utils import load_history_data, save_history_data
+from app.common.extraction.class_schedule import get_subject_class_info
+from app.common.history.file_utils import (
+    append_history_event,
+    get_history_signature,
+    register_history_event_handler,
+)
 from app.common.history.weight_utils import calculate_weight
+from app.common.history.stats_index import (
+    load_roll_call_stats_index,
+    update_roll_call_stats_index,
+)
 
 
 def _initialize_history_data(history_data: Dict[str, Any]):
@@ -37,41 +45,81 @@ def _get_subject_filter() -> Tuple[Optional[Dict], str]:
     if not subject_history_filter_enabled:
         return None, ""
 
-    data_source = readme_settings_async("linkage_settings", "data_source")
-    current_class_info = None
-
-    if data_source == 2:
-        from app.common.IPC_URL.csharp_ipc_handler import CSharpIPCHandler
-
-        current_class_info = CSharpIPCHandler.instance().get_current_class_info()
-    elif data_source == 1:
-        current_class_info = _get_current_class_info()
-
-    # 如果当前没有课程信息（课间时段），则使用课间归属的课程信息
-    if not current_class_info:
-        from app.common.extraction.extract import (
-            _is_non_class_time,
-            _get_break_assignment_class_info,
-        )
-
-        if _is_non_class_time():
-            current_class_info = _get_break_assignment_class_info()
+    # 课间时段使用课间归属的课程信息，课程状态在上下课边界之间由调度服务缓存
+    current_class_info = get_subject_class_info()
 
     subject_filter = current_class_info.get("name", "") if current_class_info else ""
     return current_class_info, subject_filter
 
 
-def _update_student_history(
-    history_data: Dict[str, Any],
+def _build_roll_call_event(
     selected_students: List[Dict[str, Any]],
     students_with_weight: List[Dict[str, Any]],
     current_time: str,
     current_class_info: Optional[Dict],
     group_filter: Optional[str],
     gender_filter: Optional[str],
-):
-    """更新学生维度的历史记录"""
+) -> Dict[str, Any]:
+    """构建一次点名抽取的历史事件
+
+    事件包含重放所需的全部信息，重放结果与抽取时直接更新历史记录一致
+    """
+    weights = {}
+    for sw in students_with_weight:
+        weights.setdefault(sw.get("name"), sw.get("next_weight", 0))
+
+    students = []
+    for student in selected_students:
+        student_name = student.get("name", "")
+        students.append(
+            {
+                "name": student_name,
+                "group": student.get("group", ""),
+                "gender": student.get("gender", ""),
+                "weight": weights.get(student_name) if student_name else None,
+            }
+        )
+
+    return {
+        "time": current_time,
+        "subject": current_class_info.get("name", "") if current_class_info else None,
+        "group_filter": group_filter,
+        "gender_filter": gender_filter,
+        "students": students,
+    }
+
+
+def _create_history_entry(
+    event: Dict[str, Any], student: Dict[str, Any]
+) -> Dict[str, Any]:
+    """根据点名事件创建学生的历史记录条目"""
+    history_entry = {
+        "draw_method": 1,
+        "draw_time": event.get("time", ""),
+        "draw_people_numbers": len(event.get("students", [])),
+        "draw_group": event.get("group_filter"),
+        "draw_gender": event.get("gender_filter"),
+        "weight": student.get("weight"),
+    }
+    if event.get("subject") is not None:
+        history_entry["class_name"] = event["subject"]
+    return history_entry
+
+
+def _update_student_history(
+    history_data: Dict[str, Any], event: Dict[str, Any]
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """更新学生维度的历史记录
+
+    Returns:
+        List[Tuple[str, Dict[str, Any]]]: 本次新增的 (学生姓名, 历史记录条目)
+    """
+    selected_students = event.get("students", [])
     selected_names = [s.get("name", "") for s in selected_students]
+    current_time = event.get("time", "")
+    group_filter = event.get("group_filter")
+    gender_filter = event.get("gender_filter")
+    new_records = []
 
     # 更新被选中学生的历史记录
     for student in selected_students:
@@ -94,25 +142,10 @@ def _update_student_history(
         student_data["last_drawn_time"] = current_time
         student_data["rounds_missed"] = 0
 
-        # 获取权重
-        current_student_weight = None
-        for sw in students_with_weight:
-            if sw.get("name") == student_name:
-                current_student_weight = sw.get("next_weight", 0)
-                break
-
-        history_entry = {
-            "draw_method": 1,
-            "draw_time": current_time,
-            "draw_people_numbers": len(selected_students),
-            "draw_group": group_filter,
-            "draw_gender": gender_filter,
-            "weight": current_student_weight,
-        }
-
-        if current_class_info:
-            subject_name = current_class_info.get("name", "")
-            history_entry["class_name"] = subject_name
+        history_entry = _create_history_entry(event, student)
+
+        if "class_name" in history_entry:
+            subject_name = history_entry["class_name"]
 
             if "subject_stats" not in student_data:
                 student_data["subject_stats"] = {}
@@ -136,19 +169,20 @@ def _update_student_history(
                     ] += 1
 
         student_data["history"].append(history_entry)
+        new_records.append((student_name, history_entry))
 
     # 更新未被选中学生的未选中次数
     for student_name, student_data in history_data["students"].items():
         if student_name not in selected_names:
             student_data["rounds_missed"] += 1
 
+    return new_records
 
-def _update_global_stats(
-    history_data: Dict[str, Any],
-    selected_students: List[Dict[str, Any]],
-    current_class_info: Optional[Dict],
-):
+
+def _update_global_stats(history_data: Dict[str, Any], event: Dict[str, Any]):
     """更新全局统计信息（小组、性别、学科）"""
+    selected_students = event.get("students", [])
+
     # 更新小组和性别统计
     for student in selected_students:
         group = student.get("group", "")
@@ -164,39 +198,48 @@ def _update_global_stats(
             )
 
     # 更新学科统计
-    if current_class_info:
-        subject_name = current_class_info.get("name", "")
-        if subject_name:
-            if subject_name not in history_data["subject_stats"]:
-                history_data["subject_stats"][subject_name] = {
-                    "group_stats": {},
-                    "gender_stats": {},
-                    "total_rounds": 0,
-                    "total_stats": 0,
-                }
+    subject_name = event.get("subject")
+    if subject_name:
+        if subject_name not in history_data["subject_stats"]:
+            history_data["subject_stats"][subject_name] = {
+                "group_stats": {},
+                "gender_stats": {},
+                "total_rounds": 0,
+                "total_stats": 0,
+            }
 
-            subject_stat = history_data["subject_stats"][subject_name]
-            subject_stat["total_rounds"] += 1
-            subject_stat["total_stats"] += len(selected_students)
+        subject_stat = history_data["subject_stats"][subject_name]
+        subject_stat["total_rounds"] += 1
+        subject_stat["total_stats"] += len(selected_students)
 
-            for student in selected_students:
-                group = student.get("group", "")
-                gender = student.get("gender", "")
+        for student in selected_students:
+            group = student.get("group", "")
+            gender = student.get("gender", "")
 
-                if group:
-                    subject_stat["group_stats"][group] = (
-                        subject_stat["group_stats"].get(group, 0) + 1
-                    )
-                if gender:
-                    subject_stat["gender_stats"][gender] = (
-                        subject_stat["gender_stats"].get(gender, 0) + 1
-                    )
+            if group:
+                subject_stat["group_stats"][group] = (
+                    subject_stat["group_stats"].get(group, 0) + 1
+                )
+            if gender:
+                subject_stat["gender_stats"][gender] = (
+                    subject_stat["gender_stats"].get(gender, 0) + 1
+                )
 
     # 更新总轮数和总统计数
     history_data["total_rounds"] += 1
     history_data["total_stats"] += len(selected_students)
 
 
+def _apply_roll_call_event(history_data: Dict[str, Any], event: Dict[str, Any]):
+    """把点名事件应用到历史记录数据上（用于重放事件日志）"""
+    _initialize_history_data(history_data)
+    _update_student_history(history_data, event)
+    _update_global_stats(history_data, event)
+
+
+register_history_event_handler("roll_call", _apply_roll_call_event)
+
+
 # ==================================================
 # 保存点名历史函数
 # ==================================================
@@ -205,36 +248,51 @@ def save_roll_call_history(
     selected_students: List[Dict[str, Any]],
     group_filter: Optional[str] = None,
     gender_filter: Optional[str] = None,
+    *,
+    roster: Optional[List[Dict[str, Any]]] = None,
+    subject_info: Optional[Tuple[Optional[Dict], str]] = None,
+    stats_index: Optional[Dict[str, Any]] = None,
 ) -> bool:
     """保存点名历史记录
 
+    只向事件日志追加一条事件并增量更新统计索引，不重写完整的历史记录文件
+
     Args:
         class_name: 班级名称
         selected_students: 被选中的学生列表
         group_filter: 小组过滤器，指定本次抽取的小组范围，None表示不限制
         gender_filter: 性别过滤器，指定本次抽取的性别范围，None表示不限制
+        roster: 本次抽取已读取的班级名单，为空时重新读取
+        subject_info: 本次抽取已获取的 (课程信息, 科目过滤器)，为空时重新获取
+        stats_index: 本次抽取已加载的统计索引，与当前历史记录不一致时重新加载
 
     Returns:
         bool: 保存是否成功
     """
     try:
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        history_data = load_history_data("roll_call", class_name)
-
-        _initialize_history_data(history_data)
 
         # 获取课程信息
-        current_class_info, subject_filter = _get_subject_filter()
+        if subject_info is None:
+            subject_info = _get_subject_filter()
+        current_class_info, subject_filter = subject_info
+
+        # 保存前获取与当前历史记录一致的统计索引，保存后只做增量更新
+        if stats_index is None or stats_index.get(
+            "history_signature"
+        ) != get_history_signature("roll_call", class_name):
+            stats_index = load_roll_call_stats_index(class_name)
 
         # 计算权重
-        students_dict_list = get_student_list(class_name)
+        if roster is None:
+            students_dict_list = get_student_list(class_name)
+        else:
+            students_dict_list = [dict(student) for student in roster]
         students_with_weight = calculate_weight(
-            students_dict_list, class_name, subject_filter
+            students_dict_list, class_name, subject_filter, stats_index
         )
 
-        # 更新学生历史
-        _update_student_history(
-            history_data,
+        event = _build_roll_call_event(
             selected_students,
             students_with_weight,
             current_time,
@@ -242,11 +300,21 @@ def save_roll_call_history(
             group_filter,
             gender_filter,
         )
-
-        # 更新全局统计
-        _update_global_stats(history_data, selected_students, current_class_info)
-
-        return save_history_data("roll_call", class_name, history_data)
+        if not append_history_event("roll_call", class_name, event):
+            return False
+
+        new_records = [
+            (student["name"], _create_history_entry(event, student))
+            for student in event["students"]
+            if student["name"]
+        ]
+        update_roll_call_stats_index(
+            class_name,
+            stats_index,
+            new_records,
+            lambda index: _update_global_stats(index, event),
+        )
+        return True
 
     except Exception as e:
         logger.exception(f"保存点名历史记录失败: {e}")
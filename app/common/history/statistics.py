@@ -3,6 +3,10 @@
 # ==================================================
 from app.common.data.list import get_student_list, get_pool_list
 from app.common.history.file_utils import load_history_data
+from app.common.history.stats_index import (
+    get_lottery_prize_record_count,
+    load_lottery_stats_index,
+)
 
 
 # ==================================================
@@ -38,14 +42,15 @@ def get_draw_sessions_history(history_type: str, class_name: str) -> int:
     Returns:
         int: 抽取会话历史记录数量
     """
-    history_data = load_history_data(history_type, class_name)
-    session_count = 0
+    if history_type == "lottery":
+        # 抽奖记录数直接读取统计索引
+        return load_lottery_stats_index(class_name).get("record_count", 0)
     if history_type == "roll_call":
         key = "students"
-    elif history_type == "lottery":
-        key = "lotterys"
     else:
         return 0
+    history_data = load_history_data(history_type, class_name)
+    session_count = 0
     students_dict = history_data.get(key, {})
     if isinstance(students_dict, dict):
         for student_name, student_info in students_dict.items():
@@ -68,13 +73,15 @@ def get_individual_statistics(
     Returns:
         int: 个人统计记录数量
     """
-    history_data = load_history_data(history_type, class_name)
+    if history_type == "lottery":
+        return get_lottery_prize_record_count(
+            load_lottery_stats_index(class_name), students_name
+        )
     if history_type == "roll_call":
         key = "students"
-    elif history_type == "lottery":
-        key = "lotterys"
     else:
         return 0
+    history_data = load_history_data(history_type, class_name)
     students_dict = history_data.get(key, {})
     if not isinstance(students_dict, dict):
         return 0
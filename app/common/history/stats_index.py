@@ -0,0 +1,633 @@
+# ==================================================
+# 导入库
+# ==================================================
+import atexit
+import copy
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from loguru import logger
+
+from app.Language.obtain_language import get_content_combo_name_async
+from app.common.history.file_utils import (
+    get_history_file_path,
+    get_history_signature,
+    load_history_data_with_signature,
+    register_history_compaction_listener,
+)
+
+# 索引格式版本，结构变化时递增以触发重建
+STATS_INDEX_VERSION = 2
+STATS_INDEX_SUFFIX = ".idx"
+
+_index_cache: Dict[str, Dict[str, Any]] = {}
+_lottery_index_cache: Dict[str, Dict[str, Any]] = {}
+_index_lock = threading.RLock()
+# 已增量更新但尚未写入磁盘的索引 (history_type, file_name)
+_dirty_indexes: set = set()
+
+
+# ==================================================
+# 索引文件路径与版本
+# ==================================================
+def get_stats_index_path(history_type: str, file_name: str) -> Path:
+    """获取统计索引文件路径（与历史记录文件位于同一目录）
+
+    Args:
+        history_type: 历史记录类型 (roll_call, lottery 等)
+        file_name: 文件名（不含扩展名）
+
+    Returns:
+        Path: 统计索引文件路径
+    """
+    history_file = get_history_file_path(history_type, file_name)
+    return history_file.with_name(f"{file_name}{STATS_INDEX_SUFFIX}")
+
+
+def _get_index_cache(history_type: str) -> Dict[str, Dict[str, Any]]:
+    """获取历史记录类型对应的索引内存缓存（班级和奖池可能同名，分开缓存）"""
+    return _lottery_index_cache if history_type == "lottery" else _index_cache
+
+
+def _get_all_options() -> Dict[str, str]:
+    """获取"全部小组/全部性别"选项文本
+
+    历史记录中保存的是抽取时的显示文本，语言切换后需要重建索引
+    """
+    return {
+        "group": get_content_combo_name_async("roll_call", "range_combobox")[0],
+        "gender": get_content_combo_name_async("roll_call", "gender_combobox")[0],
+    }
+
+
+# ==================================================
+# 点名统计索引构建
+# ==================================================
+def _new_student_stats() -> Dict[str, Any]:
+    """创建学生统计条目"""
+    return {
+        "total_count": 0,
+        "group_count": 0,
+        "gender_count": 0,
+        "last_drawn_time": "",
+        "rounds_missed": 0,
+        "subjects": {},
+    }
+
+
+def _add_record_to_student_stats(
+    student_stats: Dict[str, Any], record: Dict[str, Any], all_options: Dict[str, str]
+):
+    """把一条抽取记录计入学生统计中的小组、性别和科目计数"""
+    draw_group = record.get("draw_group", "")
+    is_group_draw = bool(draw_group) and draw_group != all_options["group"]
+    draw_gender = record.get("draw_gender", "")
+    is_gender_draw = bool(draw_gender) and draw_gender != all_options["gender"]
+
+    if is_group_draw:
+        student_stats["group_count"] += 1
+    if is_gender_draw:
+        student_stats["gender_count"] += 1
+
+    subject_name = record.get("class_name", "")
+    if subject_name:
+        subject_stats = student_stats["subjects"].setdefault(
+            subject_name, {"total_count": 0, "group_count": 0, "gender_count": 0}
+        )
+        subject_stats["total_count"] += 1
+        if is_group_draw:
+            subject_stats["group_count"] += 1
+        if is_gender_draw:
+            subject_stats["gender_count"] += 1
+
+
+def _sync_class_stats(index: Dict[str, Any], history_data: Dict[str, Any]):
+    """同步班级维度的统计（小组、性别、学科、总轮数）"""
+    index["group_stats"] = dict(history_data.get("group_stats", {}))
+    index["gender_stats"] = dict(history_data.get("gender_stats", {}))
+    index["subject_stats"] = copy.deepcopy(history_data.get("subject_stats", {}))
+    index["total_rounds"] = history_data.get("total_rounds", 0)
+    index["total_stats"] = history_data.get("total_stats", 0)
+
+
+def _sync_student_scalars(student_stats: Dict[str, Any], student_info: Dict[str, Any]):
+    """同步学生的总次数、未选中轮数和最后抽取时间"""
+    student_stats["total_count"] = student_info.get("total_count", 0)
+    student_stats["rounds_missed"] = student_info.get("rounds_missed", 0)
+    student_stats["last_drawn_time"] = student_info.get("last_drawn_time", "")
+
+
+def build_roll_call_stats_index(history_data: Dict[str, Any]) -> Dict[str, Any]:
+    """根据完整的点名历史记录构建统计索引
+
+    Args:
+        history_data: 点名历史记录数据
+
+    Returns:
+        Dict[str, Any]: 统计索引
+    """
+    all_options = _get_all_options()
+    index = {
+        "version": STATS_INDEX_VERSION,
+        "all_options": all_options,
+        "history_signature": None,
+        "students": {},
+    }
+    _sync_class_stats(index, history_data)
+
+    students_history = history_data.get("students", {})
+    if isinstance(students_history, dict):
+        for student_name, student_info in students_history.items():
+            if not isinstance(student_info, dict):
+                continue
+            student_stats = _new_student_stats()
+            _sync_student_scalars(student_stats, student_info)
+            history = student_info.get("history", [])
+            if isinstance(history, list):
+                for record in history:
+                    if isinstance(record, dict):
+                        _add_record_to_student_stats(student_stats, record, all_options)
+            index["students"][student_name] = student_stats
+
+    return index
+
+
+def _is_index_valid(
+    index: Any,
+    history_signature: Optional[List[int]],
+    all_options: Optional[Dict[str, str]] = None,
+) -> bool:
+    """检查索引是否与当前历史记录文件和语言一致（抽奖索引不记录语言选项）"""
+    return (
+        isinstance(index, dict)
+        and index.get("version") == STATS_INDEX_VERSION
+        and index.get("history_signature") == history_signature
+        and index.get("all_options") == all_options
+    )
+
+
+def _save_stats_index(history_type: str, file_name: str, index: Dict[str, Any]):
+    """保存统计索引文件（紧凑格式，先写临时文件再替换，写入中断不会留下不完整的索引）"""
+    _dirty_indexes.discard((history_type, file_name))
+    index_path = get_stats_index_path(history_type, file_name)
+    tmp_path = index_path.with_name(f"{index_path.name}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, index_path)
+    except Exception as e:
+        logger.error(f"保存统计索引失败: {e}")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def _mark_stats_index_dirty(history_type: str, file_name: str):
+    """标记索引需要写入磁盘（合并历史记录或退出程序时写入）
+
+    未写入的索引在下次启动时因版本标识不一致而重新构建，不会读到过期的统计
+    """
+    _dirty_indexes.add((history_type, file_name))
+
+
+def flush_stats_indexes():
+    """写入所有尚未保存的统计索引"""
+    with _index_lock:
+        for history_type, file_name in list(_dirty_indexes):
+            index = _get_index_cache(history_type).get(file_name)
+            if index is None:
+                _dirty_indexes.discard((history_type, file_name))
+                continue
+            _save_stats_index(history_type, file_name, index)
+
+
+# 正常退出解释器时写入（os._exit 不会触发，需显式调用 flush_stats_indexes）
+atexit.register(flush_stats_indexes)
+
+
+# ==================================================
+# 点名统计索引读写接口
+# ==================================================
+def load_roll_call_stats_index(class_name: str) -> Dict[str, Any]:
+    """加载班级的点名统计索引
+
+    索引与历史记录文件版本不一致（如历史记录被清除、恢复或外部修改）时，
+    会从历史记录重新构建一次并保存
+
+    Args:
+        class_name: 班级名称
+
+    Returns:
+        Dict[str, Any]: 统计索引（调用方不应修改）
+    """
+    with _index_lock:
+        history_signature = get_history_signature("roll_call", class_name)
+        all_options = _get_all_options()
+
+        index = _index_cache.get(class_name)
+        if _is_index_valid(index, history_signature, all_options):
+            return index
+
+        index = None
+        index_path = get_stats_index_path("roll_call", class_name)
+        if index_path.exists():
+            try:
+                with open(index_path, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+            except Exception as e:
+                logger.warning(f"读取统计索引失败，将重新构建: {e}")
+                index = None
+
+        if not _is_index_valid(index, history_signature, all_options):
+            history_data, history_signature = load_history_data_with_signature(
+                "roll_call", class_name
+            )
+            index = build_roll_call_stats_index(history_data)
+            index["history_signature"] = history_signature
+            if history_signature is not None:
+                _save_stats_index("roll_call", class_name, index)
+            logger.debug(f"已重建班级 '{class_name}' 的点名统计索引")
+
+        _index_cache[class_name] = index
+        return index
+
+
+def update_roll_call_stats_index(
+    class_name: str,
+    index: Dict[str, Any],
+    new_records: List[Tuple[str, Dict[str, Any]]],
+    update_class_stats: Callable[[Dict[str, Any]], Any],
+):
+    """在追加点名事件后增量更新统计索引
+
+    只统计本次新增的记录，耗时 O(学生数)，与历史记录长度无关。
+    传入的索引可能正被预计算线程读取，因此在副本上更新后替换缓存，不修改原索引
+
+    Args:
+        class_name: 班级名称
+        index: 追加事件之前通过 load_roll_call_stats_index 获取的索引
+        new_records: 本次新增的记录列表，每个元素为 (学生姓名, 历史记录条目)
+        update_class_stats: 更新班级维度统计的函数，索引中的小组、性别、学科
+            统计与历史记录结构一致，直接复用历史记录的更新逻辑
+    """
+    with _index_lock:
+        try:
+            index = copy.deepcopy(index)
+            all_options = index["all_options"]
+            update_class_stats(index)
+
+            students_stats = index["students"]
+            selected_names = set()
+            for student_name, record in new_records:
+                student_stats = students_stats.get(student_name)
+                if student_stats is None:
+                    student_stats = _new_student_stats()
+                    students_stats[student_name] = student_stats
+                student_stats["total_count"] += 1
+                student_stats["last_drawn_time"] = record.get("draw_time", "")
+                student_stats["rounds_missed"] = 0
+                _add_record_to_student_stats(student_stats, record, all_options)
+                selected_names.add(student_name)
+
+            for student_name, student_stats in students_stats.items():
+                if student_name not in selected_names:
+                    student_stats["rounds_missed"] += 1
+
+            index["history_signature"] = get_history_signature("roll_call", class_name)
+            _index_cache[class_name] = index
+            _mark_stats_index_dirty("roll_call", class_name)
+        except Exception as e:
+            logger.exception(f"更新统计索引失败: {e}")
+            invalidate_stats_index(class_name)
+
+
+def _on_history_compacted(
+    history_type: str,
+    file_name: str,
+    old_signature: Optional[List[int]],
+    new_signature: Optional[List[int]],
+):
+    """历史记录合并后内容不变，更新索引记录的版本标识并写入磁盘以避免重建
+
+    缓存中的索引替换为浅拷贝，不修改其他线程可能正在读取的索引
+    """
+    if history_type not in ("roll_call", "lottery"):
+        return
+    with _index_lock:
+        cache = _get_index_cache(history_type)
+        index = cache.get(file_name)
+        if index is None or index.get("history_signature") != old_signature:
+            return
+        index = dict(index, history_signature=new_signature)
+        cache[file_name] = index
+        _save_stats_index(history_type, file_name, index)
+
+
+register_history_compaction_listener(_on_history_compacted)
+
+
+def invalidate_stats_index(class_name: str, history_type: str = "roll_call"):
+    """使班级（或奖池）统计索引的内存缓存失效"""
+    with _index_lock:
+        _get_index_cache(history_type).pop(class_name, None)
+        _dirty_indexes.discard((history_type, class_name))
+
+
+def remove_stats_index(history_type: str, file_name: str):
+    """删除统计索引文件（随历史记录一同删除时调用）"""
+    with _index_lock:
+        _get_index_cache(history_type).pop(file_name, None)
+        _dirty_indexes.discard((history_type, file_name))
+        index_path = get_stats_index_path(history_type, file_name)
+        try:
+            if index_path.exists():
+                index_path.unlink()
+        except Exception as e:
+            logger.error(f"删除统计索引失败: {e}")
+
+
+# ==================================================
+# 抽奖统计索引构建
+# ==================================================
+def _new_prize_stats() -> Dict[str, Any]:
+    """创建奖品统计条目"""
+    return {
+        "total_count": 0,
+        "last_drawn_time": "",
+        "record_count": 0,
+        "row_count": 0,
+        "class_record_count": 0,
+        "subjects": {},
+    }
+
+
+def _add_record_to_prize_stats(
+    index: Dict[str, Any], prize_stats: Dict[str, Any], record: Dict[str, Any]
+):
+    """把一条抽奖记录计入奖品和奖池的记录数、课程计数
+
+    构建索引和增量更新共用此函数：
+    - record_count、奖池课程计数：统计全部记录（与统计页面、课程列表一致）
+    - row_count、class_record_count、subjects：只统计有抽取时间的记录
+      （与历史记录表格显示的行一致）
+    """
+    prize_stats["record_count"] += 1
+    index["record_count"] += 1
+
+    subject_name = record.get("class_name", "")
+    if subject_name:
+        subject_counts = index["subject_counts"]
+        subject_counts[subject_name] = subject_counts.get(subject_name, 0) + 1
+
+    if not record.get("draw_time", ""):
+        return
+    prize_stats["row_count"] += 1
+    if subject_name:
+        prize_stats["class_record_count"] += 1
+        prize_subjects = prize_stats["subjects"]
+        prize_subjects[subject_name] = prize_subjects.get(subject_name, 0) + 1
+
+
+def build_lottery_stats_index(history_data: Dict[str, Any]) -> Dict[str, Any]:
+    """根据完整的抽奖历史记录构建统计索引
+
+    索引保存每个奖品的抽中次数、记录数和各课程记录数，以及奖池的抽取次数、
+    小组、性别和课程统计，统计和表格合计只读取索引，查看明细时才读取历史记录
+
+    Args:
+        history_data: 抽奖历史记录数据
+
+    Returns:
+        Dict[str, Any]: 统计索引
+    """
+    index = {
+        "version": STATS_INDEX_VERSION,
+        "history_signature": None,
+        "lotterys": {},
+        "record_count": 0,
+        "session_count": 0,
+        "last_session_time": "",
+        "subject_counts": {},
+        "group_stats": dict(history_data.get("group_stats", {})),
+        "gender_stats": dict(history_data.get("gender_stats", {})),
+        "total_stats": history_data.get("total_stats", 0),
+    }
+
+    # 同一次抽取的所有奖品记录抽取时间相同，按不同的抽取时间统计抽取次数
+    session_times = set()
+    lotterys_history = history_data.get("lotterys", {})
+    if isinstance(lotterys_history, dict):
+        for prize_name, prize_info in lotterys_history.items():
+            if not isinstance(prize_info, dict):
+                continue
+            prize_stats = _new_prize_stats()
+            prize_stats["total_count"] = prize_info.get("total_count", 0)
+            prize_stats["last_drawn_time"] = prize_info.get("last_drawn_time", "")
+            history = prize_info.get("history", [])
+            if isinstance(history, list):
+                for record in history:
+                    if isinstance(record, dict):
+                        _add_record_to_prize_stats(index, prize_stats, record)
+                        if record.get("draw_time", ""):
+                            session_times.add(record["draw_time"])
+            index["lotterys"][prize_name] = prize_stats
+
+    index["session_count"] = len(session_times)
+    index["last_session_time"] = max(session_times) if session_times else ""
+    return index
+
+
+# ==================================================
+# 抽奖统计索引读写接口
+# ==================================================
+def load_lottery_stats_index(pool_name: str) -> Dict[str, Any]:
+    """加载奖池的抽奖统计索引
+
+    索引与历史记录文件版本不一致时，会从历史记录重新构建一次并保存
+
+    Args:
+        pool_name: 奖池名称
+
+    Returns:
+        Dict[str, Any]: 统计索引（调用方不应修改）
+    """
+    with _index_lock:
+        history_signature = get_history_signature("lottery", pool_name)
+
+        index = _lottery_index_cache.get(pool_name)
+        if _is_index_valid(index, history_signature):
+            return index
+
+        index = None
+        index_path = get_stats_index_path("lottery", pool_name)
+        if index_path.exists():
+            try:
+                with open(index_path, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+            except Exception as e:
+                logger.warning(f"读取统计索引失败，将重新构建: {e}")
+                index = None
+
+        if not _is_index_valid(index, history_signature):
+            history_data, history_signature = load_history_data_with_signature(
+                "lottery", pool_name
+            )
+            index = build_lottery_stats_index(history_data)
+            index["history_signature"] = history_signature
+            if history_signature is not None:
+                _save_stats_index("lottery", pool_name, index)
+            logger.debug(f"已重建奖池 '{pool_name}' 的抽奖统计索引")
+
+        _lottery_index_cache[pool_name] = index
+        return index
+
+
+def update_lottery_stats_index(
+    pool_name: str, index: Dict[str, Any], event: Dict[str, Any]
+):
+    """在追加抽奖事件后增量更新统计索引
+
+    与重放抽奖事件的逻辑一致，只统计本次抽中的奖品，耗时与历史记录长度无关
+
+    Args:
+        pool_name: 奖池名称
+        index: 追加事件之前通过 load_lottery_stats_index 获取的索引
+        event: 本次追加的抽奖事件
+    """
+    with _index_lock:
+        try:
+            current_time = event.get("time", "")
+            names = event.get("names", [])
+            group_filter = event.get("group_filter")
+            gender_filter = event.get("gender_filter")
+            subject = event.get("subject")
+
+            record = {"draw_time": current_time}
+            if subject is not None:
+                record["class_name"] = subject
+
+            lotterys_stats = index["lotterys"]
+            for name in names:
+                if not name:
+                    continue
+                prize_stats = lotterys_stats.get(name)
+                if prize_stats is None:
+                    prize_stats = _new_prize_stats()
+                    lotterys_stats[name] = prize_stats
+                prize_stats["total_count"] = int(prize_stats["total_count"]) + 1
+                prize_stats["last_drawn_time"] = current_time
+                _add_record_to_prize_stats(index, prize_stats, record)
+
+            if current_time and current_time != index["last_session_time"]:
+                index["session_count"] += 1
+                index["last_session_time"] = current_time
+
+            if group_filter:
+                group_stats = index["group_stats"]
+                group_stats[group_filter] = int(group_stats.get(group_filter, 0)) + len(
+                    names
+                )
+            if gender_filter:
+                gender_stats = index["gender_stats"]
+                gender_stats[gender_filter] = int(
+                    gender_stats.get(gender_filter, 0)
+                ) + len(names)
+            index["total_stats"] = int(index["total_stats"]) + len(names)
+
+            index["history_signature"] = get_history_signature("lottery", pool_name)
+            _lottery_index_cache[pool_name] = index
+            _mark_stats_index_dirty("lottery", pool_name)
+        except Exception as e:
+            logger.exception(f"更新统计索引失败: {e}")
+            invalidate_stats_index(pool_name, "lottery")
+
+
+def get_lottery_prize_record_count(index: Dict[str, Any], prize_name: str) -> int:
+    """从统计索引读取奖品的全部记录数（与历史记录列表长度一致）
+
+    Args:
+        index: 抽奖统计索引
+        prize_name: 奖品名称
+
+    Returns:
+        int: 记录数
+    """
+    prize_stats = index.get("lotterys", {}).get(prize_name)
+    if not prize_stats:
+        return 0
+    return prize_stats.get("record_count", 0)
+
+
+def get_lottery_prize_row_count(
+    index: Dict[str, Any], prize_name: str, subject: str = ""
+) -> int:
+    """从统计索引读取奖品在历史记录表格中显示的行数（没有抽取时间的记录不显示）
+
+    Args:
+        index: 抽奖统计索引
+        prize_name: 奖品名称
+        subject: 课程名称，为空时统计全部课程
+
+    Returns:
+        int: 行数
+    """
+    prize_stats = index.get("lotterys", {}).get(prize_name)
+    if not prize_stats:
+        return 0
+    if subject:
+        return prize_stats.get("subjects", {}).get(subject, 0)
+    return prize_stats.get("row_count", 0)
+
+
+# ==================================================
+# 权重计算视图
+# ==================================================
+def get_roll_call_weight_view(
+    index: Dict[str, Any], subject: str = ""
+) -> Dict[str, Any]:
+    """从统计索引生成权重计算所需的数据视图
+
+    与按科目过滤历史记录后再统计的结果一致：指定科目时，学生的总次数、
+    小组和性别计数只统计该科目，未在该科目被抽到的学生不出现在视图中
+
+    Args:
+        index: 统计索引
+        subject: 科目名称，为空时统计全部记录
+
+    Returns:
+        Dict[str, Any]: 包含 students、group_stats、gender_stats、total_stats
+    """
+    if not subject:
+        return {
+            "students": index.get("students", {}),
+            "group_stats": index.get("group_stats", {}),
+            "gender_stats": index.get("gender_stats", {}),
+            "total_stats": index.get("total_stats", 0),
+        }
+
+    students = {}
+    for student_name, student_stats in index.get("students", {}).items():
+        subject_stats = student_stats.get("subjects", {}).get(subject)
+        if not subject_stats:
+            continue
+        students[student_name] = {
+            "total_count": subject_stats["total_count"],
+            "group_count": subject_stats["group_count"],
+            "gender_count": subject_stats["gender_count"],
+            "last_drawn_time": student_stats.get("last_drawn_time", ""),
+            "rounds_missed": student_stats.get("rounds_missed", 0),
+        }
+
+    subject_data = index.get("subject_stats", {}).get(subject)
+    if not isinstance(subject_data, dict):
+        subject_data = {}
+    return {
+        "students": students,
+        "group_stats": subject_data.get("group_stats", {}),
+        "gender_stats": subject_data.get("gender_stats", {}),
+        "total_stats": subject_data.get("total_stats", 0),
+    }
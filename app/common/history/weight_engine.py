@@ -0,0 +1,215 @@
+# ==================================================
+# 导入库
+# ==================================================
+import math
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from app.tools.lazy_import import lazy_import
+
+np = lazy_import("numpy", optional=True)
+
+# 时间换算（微秒）
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_DAY_US = 86_400_000_000
+
+
+def is_available() -> bool:
+    """向量化权重计算是否可用（需要 numpy）"""
+    return np.is_available()
+
+
+# ==================================================
+# 时间列
+# ==================================================
+def _to_microseconds(moment: datetime) -> int:
+    """把不带时区的时间转换为整数微秒（与 datetime 相减的结果完全一致）"""
+    return (moment - _EPOCH) // _MICROSECOND
+
+
+@lru_cache(maxsize=4096)
+def _parse_draw_time(value: str) -> Optional[int]:
+    """解析抽取时间为整数微秒，无法解析或带时区时返回None
+
+    同一次抽取的学生时间相同，缓存解析结果避免重复解析
+    """
+    try:
+        moment = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is not None:
+        # 与当前时间（不带时区）无法相减，按没有抽取时间处理
+        return None
+    return _to_microseconds(moment)
+
+
+def _duration_microseconds(unit: int, value: float) -> int:
+    """屏蔽时长（与逐个学生计算时构造的 timedelta 完全一致）"""
+    if unit == 0:
+        duration = timedelta(seconds=value)
+    elif unit == 1:
+        duration = timedelta(minutes=value)
+    else:
+        duration = timedelta(hours=value)
+    return duration // _MICROSECOND
+
+
+# ==================================================
+# 向量化权重计算
+# ==================================================
+def _balance_column(enabled, weight, counts, stats, values) -> Any:
+    """计算小组或性别平衡因子列"""
+    size = len(counts)
+    if not enabled:
+        return np.zeros(size)
+
+    if sum(1 for v in stats.values() if v > 0) > 3:
+        history = np.maximum(
+            np.array([stats.get(value, 0) for value in values], dtype=np.int64), 0
+        )
+        return (1.0 / (history * 0.2 + 1)) * weight
+
+    max_count = int(counts.max()) if size else 0
+    if max_count == 0:
+        return np.full(size, 0.2 * weight)
+    return np.where(counts == 0, 0.5 * weight, weight * (1.0 - (counts / max_count)))
+
+
+def _frequency_column(settings, total_counts, max_total_count, is_cold_start) -> Any:
+    """计算频率因子列"""
+    if not settings["fair_draw_enabled"]:
+        return np.zeros(len(total_counts))
+
+    func_type = settings["frequency_function"]
+    if func_type == 0:  # 线性
+        factor = (max_total_count - total_counts + 1) / (max_total_count + 1)
+    elif func_type == 2:  # 指数
+        if max_total_count == 0:
+            factor = np.ones(len(total_counts))
+        else:
+            # 抽取次数的取值很少，对不同取值调用 math.exp，保证与逐个计算的结果一致
+            exponents = (max_total_count - total_counts) / max_total_count
+            unique, inverse = np.unique(exponents, return_inverse=True)
+            factor = np.array([math.exp(value) for value in unique.tolist()])[inverse]
+    else:  # 平方根
+        factor = np.sqrt(float(max_total_count + 1)) / np.sqrt(total_counts + 1.0)
+
+    if is_cold_start:
+        factor = np.minimum(0.8 + (factor * 0.2), factor)
+    return factor * settings["frequency_weight"]
+
+
+def compute_weight_columns(
+    settings: Dict[str, Any],
+    total_counts: List[int],
+    group_counts: List[int],
+    gender_counts: List[int],
+    last_drawn_times: List[Optional[str]],
+    groups: List[str],
+    genders: List[str],
+    group_stats: Dict[str, int],
+    gender_stats: Dict[str, int],
+    is_cold_start: bool,
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """按列计算所有学生的权重因子
+
+    每个因子对整列只做几次数组运算，结果与逐个学生计算完全一致
+    （总权重未保留小数，由调用方按 round 规则处理）
+
+    Args:
+        settings: 权重设置
+        total_counts: 每个学生的抽取次数
+        group_counts: 每个学生的小组抽取次数
+        gender_counts: 每个学生的性别抽取次数
+        last_drawn_times: 每个学生的最后抽取时间
+        groups: 每个学生的小组
+        genders: 每个学生的性别
+        group_stats: 小组统计
+        gender_stats: 性别统计
+        is_cold_start: 是否处于冷启动阶段
+        now: 当前时间，为空时使用 datetime.now()
+
+    Returns:
+        Dict[str, Any]: 各因子的列（Python 数值列表），包含
+            frequency_penalty、group_balance、gender_balance、time_factor、
+            total_weight、is_shielded、shield_remaining，以及 max_total_count
+    """
+    size = len(total_counts)
+    totals = np.array(total_counts, dtype=np.int64)
+    max_total_count = int(totals.max()) if size else 0
+
+    frequency = _frequency_column(settings, totals, max_total_count, is_cold_start)
+    group_balance = _balance_column(
+        settings["fair_draw_group_enabled"],
+        settings["group_weight"],
+        np.array(group_counts, dtype=np.int64),
+        group_stats,
+        groups,
+    )
+    gender_balance = _balance_column(
+        settings["fair_draw_gender_enabled"],
+        settings["gender_weight"],
+        np.array(gender_counts, dtype=np.int64),
+        gender_stats,
+        genders,
+    )
+
+    # 时间因子与屏蔽检查共用同一列抽取时间差
+    time_factor = np.zeros(size)
+    is_shielded = np.zeros(size, dtype=bool)
+    shield_remaining = np.zeros(size)
+    time_enabled = settings["fair_draw_time_enabled"]
+    shield_enabled = settings["shield_enabled"]
+    if time_enabled or shield_enabled:
+        parsed = [
+            _parse_draw_time(value) if value else None for value in last_drawn_times
+        ]
+        has_time = np.array([value is not None for value in parsed], dtype=bool)
+        drawn_us = np.array(
+            [value if value is not None else 0 for value in parsed], dtype=np.int64
+        )
+        now_us = _to_microseconds(now or datetime.now())
+        diff_us = now_us - drawn_us
+
+        if time_enabled:
+            days = np.floor_divide(diff_us, _DAY_US)
+            time_factor = np.where(
+                has_time,
+                np.minimum(1.0, days / 30.0) * settings["time_weight"],
+                0.0,
+            )
+        if shield_enabled:
+            duration_us = _duration_microseconds(
+                settings["shield_time_unit"], settings["shield_time"]
+            )
+            is_shielded = has_time & (diff_us < duration_us)
+            shield_remaining = np.where(
+                is_shielded, (duration_us - diff_us) / 1_000_000, 0.0
+            )
+
+    total_weight = (
+        settings["base_weight"]
+        + frequency
+        + group_balance
+        + gender_balance
+        + time_factor
+    )
+    min_weight = settings["min_weight"] / 10
+    total_weight = np.where(is_shielded, min_weight, total_weight)
+    total_weight = np.maximum(
+        min_weight, np.minimum(settings["max_weight"], total_weight)
+    )
+
+    return {
+        "frequency_penalty": frequency.tolist(),
+        "group_balance": group_balance.tolist(),
+        "gender_balance": gender_balance.tolist(),
+        "time_factor": time_factor.tolist(),
+        "total_weight": total_weight.tolist(),
+        "is_shielded": is_shielded.tolist(),
+        "shield_remaining": shield_remaining.tolist(),
+        "max_total_count": max_total_count,
+    }
@@ -2,13 +2,17 @@
 # 导入库
 # ==================================================
 import math
+from datetime import datetime
 from random import SystemRandom
+from typing import Any, Dict, Optional
 from loguru import logger
 
-from app.tools.settings_access import readme_settings_async
-from app.Language.obtain_language import get_content_combo_name_async
-from app.common.history.file_utils import load_history_data
-from app.common.history.history_reader import filter_roll_call_history_by_subject
+from app.tools.settings_access import read_section
+from app.common.history import weight_engine
+from app.common.history.stats_index import (
+    load_roll_call_stats_index,
+    get_roll_call_weight_view,
+)
 
 system_random = SystemRandom()
 
@@ -16,28 +20,16 @@ system_random = SystemRandom()
 # ==================================================
 # 权重格式化函数
 # ==================================================
-def format_weight_for_display(weights_data: list, weight_key: str = "weight") -> tuple:
-    """格式化权重显示，确保小数点对齐
+def create_weight_formatter(max_int_length: int, max_dec_length: int = 2):
+    """创建权重格式化函数，确保小数点对齐
 
     Args:
-        weights_data: 包含权重数据的列表
-        weight_key: 权重在数据项中的键名，默认为'weight'
+        max_int_length: 整数部分最大长度
+        max_dec_length: 小数部分长度，默认为两位
 
     Returns:
-        tuple: (格式化函数, 整数部分最大长度, 小数部分最大长度)
+        Callable: 格式化函数
     """
-    # 计算权重显示的最大长度，考虑小数点前后的对齐
-    max_int_length = 0  # 整数部分最大长度
-    max_dec_length = 2  # 固定为两位小数
-
-    for item in weights_data:
-        weight = item.get(weight_key, 0)
-        weight_str = str(weight)
-        if "." in weight_str:
-            int_part, _ = weight_str.split(".", 1)
-            max_int_length = max(max_int_length, len(int_part))
-        else:
-            max_int_length = max(max_int_length, len(weight_str))
 
     # 格式化权重显示，确保小数点对齐并保留两位小数
     def format_weight(weight):
@@ -60,112 +52,85 @@ def format_weight_for_display(weights_data: list, weight_key: str = "weight") ->
             formatted_dec = "00".ljust(max_dec_length)
             return f"{formatted_int}.{formatted_dec}"
 
+    return format_weight
+
+
+def format_weight_for_display(weights_data: list, weight_key: str = "weight") -> tuple:
+    """格式化权重显示，确保小数点对齐
+
+    Args:
+        weights_data: 包含权重数据的列表
+        weight_key: 权重在数据项中的键名，默认为'weight'
+
+    Returns:
+        tuple: (格式化函数, 整数部分最大长度, 小数部分最大长度)
+    """
+    # 计算权重显示的最大长度，考虑小数点前后的对齐
+    max_int_length = 0  # 整数部分最大长度
+    max_dec_length = 2  # 固定为两位小数
+
+    for item in weights_data:
+        weight = item.get(weight_key, 0)
+        weight_str = str(weight)
+        if "." in weight_str:
+            int_part, _ = weight_str.split(".", 1)
+            max_int_length = max(max_int_length, len(int_part))
+        else:
+            max_int_length = max(max_int_length, len(weight_str))
+
+    format_weight = create_weight_formatter(max_int_length, max_dec_length)
     return format_weight, max_int_length, max_dec_length
 
 
 def _load_weight_settings() -> dict:
     """加载权重设置"""
+    fair_draw = read_section("fair_draw_settings")
+    advanced = read_section("advanced_settings")
     return {
-        "fair_draw_enabled": readme_settings_async("fair_draw_settings", "fair_draw")
-        or False,
-        "fair_draw_group_enabled": readme_settings_async(
-            "fair_draw_settings", "fair_draw_group"
-        )
-        or False,
-        "fair_draw_gender_enabled": readme_settings_async(
-            "fair_draw_settings", "fair_draw_gender"
-        )
-        or False,
-        "fair_draw_time_enabled": readme_settings_async(
-            "fair_draw_settings", "fair_draw_time"
-        )
-        or False,
-        "base_weight": readme_settings_async("fair_draw_settings", "base_weight")
-        or 1.0,
-        "min_weight": readme_settings_async("fair_draw_settings", "min_weight") or 0.1,
-        "max_weight": readme_settings_async("fair_draw_settings", "max_weight") or 5.0,
-        "frequency_function": readme_settings_async(
-            "fair_draw_settings", "frequency_function"
-        )
-        or 1,
-        "frequency_weight": readme_settings_async(
-            "fair_draw_settings", "frequency_weight"
-        )
-        or 1.0,
-        "group_weight": readme_settings_async("fair_draw_settings", "group_weight")
-        or 1.0,
-        "gender_weight": readme_settings_async("fair_draw_settings", "gender_weight")
-        or 1.0,
-        "time_weight": readme_settings_async("fair_draw_settings", "time_weight")
-        or 1.0,
-        "cold_start_enabled": readme_settings_async(
-            "fair_draw_settings", "cold_start_enabled"
-        )
-        or False,
-        "cold_start_rounds": readme_settings_async(
-            "fair_draw_settings", "cold_start_rounds"
-        )
-        or 10,
-        "shield_enabled": readme_settings_async("advanced_settings", "shield_enabled")
-        or False,
-        "shield_time": readme_settings_async("advanced_settings", "shield_time") or 0,
-        "shield_time_unit": readme_settings_async(
-            "advanced_settings", "shield_time_unit"
-        )
-        or 0,
+        "fair_draw_enabled": fair_draw.get("fair_draw") or False,
+        "fair_draw_group_enabled": fair_draw.get("fair_draw_group") or False,
+        "fair_draw_gender_enabled": fair_draw.get("fair_draw_gender") or False,
+        "fair_draw_time_enabled": fair_draw.get("fair_draw_time") or False,
+        "base_weight": fair_draw.get("base_weight") or 1.0,
+        "min_weight": fair_draw.get("min_weight") or 0.1,
+        "max_weight": fair_draw.get("max_weight") or 5.0,
+        "frequency_function": fair_draw.get("frequency_function") or 1,
+        "frequency_weight": fair_draw.get("frequency_weight") or 1.0,
+        "group_weight": fair_draw.get("group_weight") or 1.0,
+        "gender_weight": fair_draw.get("gender_weight") or 1.0,
+        "time_weight": fair_draw.get("time_weight") or 1.0,
+        "cold_start_enabled": fair_draw.get("cold_start_enabled") or False,
+        "cold_start_rounds": fair_draw.get("cold_start_rounds") or 10,
+        "shield_enabled": advanced.get("shield_enabled") or False,
+        "shield_time": advanced.get("shield_time") or 0,
+        "shield_time_unit": advanced.get("shield_time_unit") or 0,
     }
 
 
-def _process_history_for_weights(students_data: list, history_data: dict) -> dict:
-    """处理历史记录以获取权重计算所需数据"""
+def _process_history_for_weights(students_data: list, weight_view: dict) -> dict:
+    """从统计索引视图中提取权重计算所需数据，耗时 O(学生数)"""
     weight_data = {}
+    students_stats = weight_view.get("students", {})
 
-    # 初始化
     for student in students_data:
         student_id = student.get("id", student.get("name", ""))
-        weight_data[student_id] = {
-            "total_count": 0,
-            "group_count": 0,
-            "gender_count": 0,
-            "last_drawn_time": None,
-            "rounds_missed": 0,
-        }
-
-    # 从历史记录填充数据
-    if isinstance(history_data, dict) and "students" in history_data:
-        students_history = history_data.get("students", {})
-        if isinstance(students_history, dict):
-            for student_name, student_info in students_history.items():
-                if student_name in weight_data and isinstance(student_info, dict):
-                    weight_data[student_name]["total_count"] = student_info.get(
-                        "total_count", 0
-                    )
-                    weight_data[student_name]["rounds_missed"] = student_info.get(
-                        "rounds_missed", 0
-                    )
-                    weight_data[student_name]["last_drawn_time"] = student_info.get(
-                        "last_drawn_time", ""
-                    )
-
-                    # 统计小组和性别计数
-                    history = student_info.get("history", [])
-                    if isinstance(history, list):
-                        all_group_opt = get_content_combo_name_async(
-                            "roll_call", "range_combobox"
-                        )[0]
-                        all_gender_opt = get_content_combo_name_async(
-                            "roll_call", "gender_combobox"
-                        )[0]
-
-                        for record in history:
-                            if isinstance(record, dict):
-                                draw_group = record.get("draw_group", "")
-                                if draw_group and draw_group != all_group_opt:
-                                    weight_data[student_name]["group_count"] += 1
-
-                                draw_gender = record.get("draw_gender", "")
-                                if draw_gender and draw_gender != all_gender_opt:
-                                    weight_data[student_name]["gender_count"] += 1
+        student_stats = students_stats.get(student_id)
+        if isinstance(student_stats, dict):
+            weight_data[student_id] = {
+                "total_count": student_stats.get("total_count", 0),
+                "group_count": student_stats.get("group_count", 0),
+                "gender_count": student_stats.get("gender_count", 0),
+                "last_drawn_time": student_stats.get("last_drawn_time", ""),
+                "rounds_missed": student_stats.get("rounds_missed", 0),
+            }
+        else:
+            weight_data[student_id] = {
+                "total_count": 0,
+                "group_count": 0,
+                "gender_count": 0,
+                "last_drawn_time": None,
+                "rounds_missed": 0,
+            }
 
     return weight_data
 
@@ -219,7 +184,7 @@ def _calculate_balance_factor(
         return 0.0  # Placeholder, logic handled inside main loop for now
 
 
-def _calculate_time_factor(settings, last_drawn_time):
+def _calculate_time_factor(settings, last_drawn_time, now=None):
     """计算时间因子"""
     if not settings["fair_draw_time_enabled"] or not last_drawn_time:
         return 0.0
@@ -228,14 +193,14 @@ def _calculate_time_factor(settings, last_drawn_time):
         from datetime import datetime
 
         last_time = datetime.fromisoformat(last_drawn_time)
-        days_diff = (datetime.now() - last_time).days
+        days_diff = ((now or datetime.now()) - last_time).days
         return min(1.0, days_diff / 30.0) * settings["time_weight"]
     except Exception as e:
         logger.exception(f"Error calculating time factor: {e}")
         return 0.0
 
 
-def _check_shield_status(settings, last_drawn_time):
+def _check_shield_status(settings, last_drawn_time, now=None):
     """检查屏蔽状态"""
     if not settings["shield_enabled"] or not last_drawn_time:
         return False, 0
@@ -255,7 +220,7 @@ def _check_shield_status(settings, last_drawn_time):
         else:
             duration = timedelta(hours=value)
 
-        diff = datetime.now() - last_time
+        diff = (now or datetime.now()) - last_time
         if diff < duration:
             remaining = (duration - diff).total_seconds()
             return True, remaining
@@ -269,32 +234,136 @@ def _check_shield_status(settings, last_drawn_time):
 # ==================================================
 # 公平抽取权重计算函数
 # ==================================================
-def calculate_weight(students_data: list, class_name: str, subject: str = "") -> list:
+def calculate_weight(
+    students_data: list,
+    class_name: str,
+    subject: str = "",
+    stats_index: Optional[Dict[str, Any]] = None,
+    now: Optional[datetime] = None,
+    vectorized: bool = True,
+) -> list:
     """计算学生权重
 
+    默认使用按列计算的权重引擎（weight_engine），numpy 不可用或 vectorized
+    为 False 时逐个学生计算，两种方式的结果完全一致
+
     Args:
         students_data: 学生数据列表
         class_name: 班级名称
         subject: 科目名称
+        stats_index: 本次抽取已加载的点名统计索引，为空时自动加载
+        now: 计算时间因子和屏蔽状态使用的当前时间，为空时使用 datetime.now()
+        vectorized: 是否使用按列计算的权重引擎
 
     Returns:
         list: 更新后的学生数据列表
     """
     settings = _load_weight_settings()
-    history_data = load_history_data("roll_call", class_name)
-
-    if subject:
-        history_data = filter_roll_call_history_by_subject(history_data, subject)
-
-    group_stats = history_data.get("group_stats", {})
-    gender_stats = history_data.get("gender_stats", {})
+    if stats_index is None:
+        stats_index = load_roll_call_stats_index(class_name)
+    weight_view = get_roll_call_weight_view(stats_index, subject)
 
-    current_stats = history_data.get("total_stats", 0)
+    current_stats = weight_view.get("total_stats", 0)
     is_cold_start = (
         settings["cold_start_enabled"] and current_stats < settings["cold_start_rounds"]
     )
 
-    weight_data = _process_history_for_weights(students_data, history_data)
+    weight_data = _process_history_for_weights(students_data, weight_view)
+
+    if vectorized and weight_engine.is_available():
+        _calculate_weight_columns(
+            students_data, settings, weight_view, weight_data, is_cold_start, now
+        )
+    else:
+        _calculate_weight_per_student(
+            students_data, settings, weight_view, weight_data, is_cold_start, now
+        )
+    return students_data
+
+
+def _build_weight_details(
+    settings, is_cold_start, total_count, max_total_count, factors, total_weight
+):
+    """生成学生的权重详情"""
+    (
+        frequency_penalty,
+        group_balance,
+        gender_balance,
+        time_factor,
+        is_shielded,
+        shield_remaining,
+    ) = factors
+    return {
+        "base_weight": settings["base_weight"],
+        "frequency_penalty": frequency_penalty,
+        "group_balance": group_balance,
+        "gender_balance": gender_balance,
+        "time_factor": time_factor,
+        "total_weight": total_weight,
+        "is_cold_start": is_cold_start,
+        "total_count": total_count,
+        "max_total_count": max_total_count,
+        "frequency_function": settings["frequency_function"],
+        "is_shielded": is_shielded,
+        "shield_remaining": round(shield_remaining, 2),
+        "shield_enabled": settings["shield_enabled"],
+    }
+
+
+def _calculate_weight_columns(
+    students_data, settings, weight_view, weight_data, is_cold_start, now
+):
+    """使用权重引擎按列计算所有学生的权重"""
+    rows = []
+    for student in students_data:
+        student_id = student.get("id", student.get("name", ""))
+        if student_id in weight_data:
+            rows.append((student, weight_data[student_id]))
+    if not rows:
+        return
+
+    columns = weight_engine.compute_weight_columns(
+        settings,
+        [s_data["total_count"] for _, s_data in rows],
+        [s_data["group_count"] for _, s_data in rows],
+        [s_data["gender_count"] for _, s_data in rows],
+        [s_data["last_drawn_time"] for _, s_data in rows],
+        [student.get("group", "") for student, _ in rows],
+        [student.get("gender", "") for student, _ in rows],
+        weight_view.get("group_stats", {}),
+        weight_view.get("gender_stats", {}),
+        is_cold_start,
+        now,
+    )
+    max_total_count = columns["max_total_count"]
+
+    for position, (student, s_data) in enumerate(rows):
+        is_shielded = columns["is_shielded"][position]
+        total_weight = round(columns["total_weight"][position], 2)
+        student["next_weight"] = total_weight
+        student["weight_details"] = _build_weight_details(
+            settings,
+            is_cold_start,
+            s_data["total_count"],
+            max_total_count,
+            (
+                columns["frequency_penalty"][position],
+                columns["group_balance"][position],
+                columns["gender_balance"][position],
+                columns["time_factor"][position],
+                is_shielded,
+                columns["shield_remaining"][position] if is_shielded else 0,
+            ),
+            total_weight,
+        )
+
+
+def _calculate_weight_per_student(
+    students_data, settings, weight_view, weight_data, is_cold_start, now
+):
+    """逐个学生计算权重（numpy 不可用时使用，也用于校验权重引擎的结果）"""
+    group_stats = weight_view.get("group_stats", {})
+    gender_stats = weight_view.get("gender_stats", {})
 
     all_total_counts = [data["total_count"] for data in weight_data.values()]
     max_total_count = max(all_total_counts) if all_total_counts else 0
@@ -361,11 +430,11 @@ def calculate_weight(students_data: list, class_name: str, subject: str = "") ->
                     )
 
         # 4. 时间因子
-        time_factor = _calculate_time_factor(settings, s_data["last_drawn_time"])
+        time_factor = _calculate_time_factor(settings, s_data["last_drawn_time"], now)
 
         # 5. 屏蔽检查
         is_shielded, shield_remaining = _check_shield_status(
-            settings, s_data["last_drawn_time"]
+            settings, s_data["last_drawn_time"], now
         )
 
         # 计算总权重
@@ -388,20 +457,18 @@ def calculate_weight(students_data: list, class_name: str, subject: str = "") ->
         total_weight = round(total_weight, 2)
 
         student["next_weight"] = total_weight
-        student["weight_details"] = {
-            "base_weight": settings["base_weight"],
-            "frequency_penalty": frequency_penalty,
-            "group_balance": group_balance,
-            "gender_balance": gender_balance,
-            "time_factor": time_factor,
-            "total_weight": total_weight,
-            "is_cold_start": is_cold_start,
-            "total_count": s_data["total_count"],
-            "max_total_count": max_total_count,
-            "frequency_function": settings["frequency_function"],
-            "is_shielded": is_shielded,
-            "shield_remaining": round(shield_remaining, 2),
-            "shield_enabled": settings["shield_enabled"],
-        }
-
-    return students_data
+        student["weight_details"] = _build_weight_details(
+            settings,
+            is_cold_start,
+            s_data["total_count"],
+            max_total_count,
+            (
+                frequency_penalty,
+                group_balance,
+                gender_balance,
+                time_factor,
+                is_shielded,
+                shield_remaining,
+            ),
+            total_weight,
+        )
@@ -1,6 +1,7 @@
 from PySide6.QtCore import QObject, Signal, QTimer, QEasingCurve, QFileSystemWatcher
 from PySide6.QtGui import QFont
 from dataclasses import dataclass
+from pathlib import Path
 from loguru import logger
 from random import SystemRandom
 
@@ -10,14 +11,19 @@ from app.common.data.list import (
     get_class_name_list,
     get_group_list,
     get_gender_list,
+    invalidate_pool_cache,
 )
 from app.common.history import save_lottery_history
-from app.common.display.result_display import ResultDisplayUtils
+from app.common.display.result_display import (
+    AnimationFrameRenderer,
+    DisplaySnapshot,
+    ResultDisplayUtils,
+)
 from app.common.lottery.lottery_utils import LotteryUtils
 from app.common.roll_call.roll_call_utils import RollCallUtils
 from app.common.music.music_player import music_player
 from app.common.voice.voice import TTSHandler
-from app.common.extraction.extract import _is_non_class_time
+from app.common.extraction.class_schedule import is_non_class_time
 from app.common.safety.verify_ops import require_and_run
 from app.page_building.another_window import create_remaining_list_window
 from app.tools.path_utils import get_data_path
@@ -54,6 +60,7 @@ class LotteryDrawPlan:
     animation_interval: int
     animation_music: str | None
     result_music: str | None
+    display: DisplaySnapshot | None = None
 
 
 class LotteryManager(QObject):
@@ -274,7 +281,7 @@ class LotteryManager(QObject):
             context.gender_index,
             invalid_class_options=invalid_class_options,
         )
-        self.get_render_settings(refresh=refresh_settings)
+        render_settings = self.get_render_settings(refresh=refresh_settings)
         self.get_notification_settings(refresh=refresh_settings)
         self.get_pool_total_count(context.pool_name, refresh=refresh_total_count)
 
@@ -307,6 +314,7 @@ class LotteryManager(QObject):
             animation_interval=animation_interval,
             animation_music=animation_music or None,
             result_music=result_music or None,
+            display=DisplaySnapshot.from_settings("lottery_settings", render_settings),
         )
 
     def finalize_draw(
@@ -767,6 +775,15 @@ def init_tts(widget):
 def init_animation_state(widget):
     widget.is_animating = False
     widget._draw_plan = None
+    widget._frame_renderer = None
+
+
+def get_frame_renderer(widget) -> AnimationFrameRenderer:
+    renderer = getattr(widget, "_frame_renderer", None)
+    if renderer is None:
+        renderer = AnimationFrameRenderer(widget.result_grid)
+        widget._frame_renderer = renderer
+    return renderer
 
 
 def handle_long_press(widget):
@@ -853,7 +870,7 @@ def _update_remaining_list_delayed(widget):
 
 
 def start_draw(widget):
-    if _is_non_class_time():
+    if is_non_class_time():
         if readme_settings_async("linkage_settings", "verification_required"):
             logger.info("当前时间在非上课时间段内，需要密码验证")
             require_and_run("lottery_start", widget, lambda: start_lottery_draw(widget))
@@ -869,7 +886,7 @@ def animate_result(widget):
 
 
 def reset_count(widget):
-    if _is_non_class_time():
+    if is_non_class_time():
         if readme_settings_async("linkage_settings", "verification_required"):
             logger.info("当前时间在非上课时间段内，需要密码验证")
             require_and_run("lottery_reset", widget, widget._do_reset_count)
@@ -1138,37 +1155,18 @@ def display_result(widget, selected_students, pool_name, draw_count=None):
 def display_result_animated(
     widget, selected_students, pool_name, draw_count=None, ipc_selected_students=None
 ):
-    render_settings = widget.manager.get_render_settings(refresh=False)
+    plan = widget._draw_plan
+    snapshot = plan.display if plan else None
+    if snapshot is None:
+        snapshot = DisplaySnapshot.from_settings(
+            "lottery_settings", widget.manager.get_render_settings(refresh=False)
+        )
     if draw_count is None:
         draw_count = widget.current_count
 
-    student_labels = ResultDisplayUtils.create_student_label(
-        class_name=pool_name,
-        selected_students=selected_students,
-        draw_count=draw_count,
-        font_size=render_settings["font_size"],
-        animation_color=render_settings["animation_color"],
-        display_format=render_settings["display_format"],
-        display_style=render_settings.get("display_style", 0),
-        show_student_image=render_settings["show_student_image"],
-        image_position=render_settings.get("image_position"),
-        group_index=0,
-        show_random=render_settings["show_random"],
-        settings_group="lottery_settings",
+    get_frame_renderer(widget).render(
+        snapshot, pool_name, selected_students, draw_count
     )
-    cached_widgets = ResultDisplayUtils.collect_grid_widgets(widget.result_grid)
-    if cached_widgets and len(cached_widgets) == len(student_labels):
-        updated = ResultDisplayUtils.update_grid_labels(
-            widget.result_grid, student_labels, cached_widgets
-        )
-        if updated:
-            ResultDisplayUtils.dispose_widgets(student_labels)
-        else:
-            ResultDisplayUtils.display_results_in_grid(
-                widget.result_grid, student_labels
-            )
-    else:
-        ResultDisplayUtils.display_results_in_grid(widget.result_grid, student_labels)
 
     settings = widget.manager.get_notification_settings(refresh=False)
     if settings is not None:
@@ -1361,6 +1359,8 @@ def setup_file_watcher(widget):
 
 def on_directory_changed(widget, path):
     try:
+        # 名单文件增删改后使奖池缓存失效
+        invalidate_pool_cache()
         widget._sync_watcher_files()
         QTimer.singleShot(500, widget.refresh_pool_list)
     except Exception as e:
@@ -1369,6 +1369,7 @@ def on_directory_changed(widget, path):
 
 def on_file_changed(widget, path):
     try:
+        invalidate_pool_cache(Path(path).stem)
         QTimer.singleShot(500, widget.refresh_pool_list)
     except Exception as e:
         logger.exception(f"处理文件变化事件失败: {e}")
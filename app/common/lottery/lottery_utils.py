@@ -12,6 +12,7 @@ from app.common.data.list import (
 from app.common.roll_call.roll_call_utils import RollCallUtils
 from app.common.history import calculate_weight
 from app.common.behind_scenes.behind_scenes_utils import BehindScenesUtils
+from app.common.fair_draw.weighted_sampler import weighted_sample, weighted_choices
 from app.tools.config import (
     calculate_remaining_count,
     read_drawn_record,
@@ -301,59 +302,29 @@ class LotteryUtils:
                     pick_candidates = selected_students_dict
                     pick_weights = [1.0] * len(selected_students_dict)
 
-                for _ in range(remaining_to_draw):
-                    if not pick_candidates:
-                        break
-                    total_weight = sum(pick_weights)
-                    if total_weight <= 0:
-                        random_index = system_random.randint(
-                            0, len(pick_candidates) - 1
+                if pick_candidates:
+                    pick_weights = list(pick_weights)
+                    if len(pick_weights) < len(pick_candidates):
+                        pick_weights.extend(
+                            [1.0] * (len(pick_candidates) - len(pick_weights))
                         )
-                    else:
-                        rand_value = system_random.uniform(0, total_weight)
-                        cumulative_weight = 0
-                        random_index = 0
-                        for i, weight in enumerate(pick_weights):
-                            cumulative_weight += weight
-                            if rand_value <= cumulative_weight:
-                                random_index = i
-                                break
-
-                    selected_student = pick_candidates[random_index]
-                    student_id = selected_student.get("id", "")
-                    random_name = selected_student.get("name", "")
-                    exist = selected_student.get("exist", True)
-                    selected_students.append((student_id, random_name, exist))
-                    selected_students_dict.append(selected_student)
+                    for random_index in weighted_choices(
+                        pick_weights[: len(pick_candidates)], remaining_to_draw
+                    ):
+                        selected_student = pick_candidates[random_index]
+                        student_id = selected_student.get("id", "")
+                        random_name = selected_student.get("name", "")
+                        exist = selected_student.get("exist", True)
+                        selected_students.append((student_id, random_name, exist))
+                        selected_students_dict.append(selected_student)
             else:
-                remaining_to_draw = min(remaining_to_draw, len(students_with_weight))
-                for _ in range(remaining_to_draw):
-                    if not students_with_weight:
-                        break
-                    total_weight = sum(weights)
-                    if total_weight <= 0:
-                        random_index = system_random.randint(
-                            0, len(students_with_weight) - 1
-                        )
-                    else:
-                        rand_value = system_random.uniform(0, total_weight)
-                        cumulative_weight = 0
-                        random_index = 0
-                        for i, weight in enumerate(weights):
-                            cumulative_weight += weight
-                            if rand_value <= cumulative_weight:
-                                random_index = i
-                                break
-
-                    selected_student = students_with_weight[random_index]
-                    student_id = selected_student.get("id", "")
-                    random_name = selected_student.get("name", "")
-                    exist = selected_student.get("exist", True)
-                    selected_students.append((student_id, random_name, exist))
-                    selected_students_dict.append(selected_student)
-
-                    students_with_weight.pop(random_index)
-                    weights.pop(random_index)
+                selected_candidates, selected_candidates_dict = (
+                    RollCallUtils._perform_weighted_draw(
+                        students_with_weight, remaining_to_draw, weights
+                    )
+                )
+                selected_students.extend(selected_candidates)
+                selected_students_dict.extend(selected_candidates_dict)
 
         return {
             "selected_students": selected_students,
@@ -478,31 +449,14 @@ class LotteryUtils:
                 behind_scenes_weight = behind_scenes_weights[i]
                 weights.append(base_weight * behind_scenes_weight)
 
-            draw = min(current_count, len(items))
             selected = []
             selected_dict = []
-            for _ in range(draw):
-                if not items:
-                    break
-                total_weight = sum(weights)
-                if total_weight <= 0:
-                    idx = system_random.randint(0, len(items) - 1)
-                else:
-                    rv = system_random.uniform(0, total_weight)
-                    cum = 0
-                    idx = 0
-                    for i, w in enumerate(weights):
-                        cum += w
-                        if rv <= cum:
-                            idx = i
-                            break
+            for idx in weighted_sample(weights, current_count):
                 chosen = items[idx]
                 selected.append(
                     (chosen.get("id"), chosen.get("name"), chosen.get("exist", True))
                 )
                 selected_dict.append(chosen)
-                items.pop(idx)
-                weights.pop(idx)
             return {
                 "selected_prizes": selected,
                 "pool_name": pool_name,
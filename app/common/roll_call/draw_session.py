@@ -0,0 +1,83 @@
+# ==================================================
+# 导入库
+# ==================================================
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from app.common.data.list import get_student_list
+from app.common.history.roll_call_history import _get_subject_filter
+from app.common.history.stats_index import load_roll_call_stats_index
+from app.common.behind_scenes.behind_scenes_utils import BehindScenesUtils
+from app.tools.config import read_drawn_record
+
+
+# ==================================================
+# 点名抽取会话
+# ==================================================
+@dataclass(slots=True)
+class DrawSession:
+    """一次点名抽取的数据快照
+
+    由 RollCallManager.prepare_draw 创建，在候选过滤、平均值差值保护、权重计算、
+    抽取和保存历史记录之间传递。每个数据源在第一次使用时读取并保存在会话中，
+    同一次抽取中不会重复读取，read_counts 记录本会话调用各数据源读取函数的次数
+    """
+
+    class_name: str
+    group_index: int = 0
+    group_filter: str = ""
+    gender_index: int = 0
+    gender_filter: str = ""
+    half_repeat: int = 0
+    read_counts: Dict[str, int] = field(default_factory=dict)
+    _values: Dict[str, Any] = field(default_factory=dict)
+    _lock: threading.RLock = field(default_factory=threading.RLock)
+
+    def _load(self, source: str, loader: Callable[[], Any]) -> Any:
+        """读取数据源（每个会话只读取一次）"""
+        with self._lock:
+            if source not in self._values:
+                self._values[source] = loader()
+                self.read_counts[source] = self.read_counts.get(source, 0) + 1
+            return self._values[source]
+
+    def get_roster(self) -> List[Dict[str, Any]]:
+        """班级名单（共享列表，调用方不应修改其中的学生字典）"""
+        return self._load("roster", lambda: get_student_list(self.class_name))
+
+    def get_drawn_records(self) -> List[Tuple[str, int]]:
+        """半重复模式下的已抽取记录，每个元素为 (名称, 次数)"""
+        return self._load(
+            "drawn_records",
+            lambda: read_drawn_record(
+                self.class_name, self.gender_filter, self.group_filter
+            ),
+        )
+
+    def get_subject_info(self) -> Tuple[Optional[Dict], str]:
+        """当前课程信息和科目过滤器"""
+        return self._load("subject", _get_subject_filter)
+
+    def get_subject_filter(self) -> str:
+        """科目过滤器，未启用课程联动或当前没有课程时为空"""
+        return self.get_subject_info()[1]
+
+    def get_stats_index(self) -> Dict[str, Any]:
+        """点名统计索引（平均值差值保护、权重计算和保存历史记录共用）
+
+        缓存中的索引只会被整体替换，不会被原地修改，可以在预计算线程中读取
+        """
+        return self._load(
+            "stats_index", lambda: load_roll_call_stats_index(self.class_name)
+        )
+
+    def get_behind_scenes_settings(self) -> Dict[str, Any]:
+        """内幕设置"""
+        return self._load("behind_scenes", BehindScenesUtils.get_behind_scenes_settings)
+
+    def log_read_counts(self):
+        """输出本次抽取各数据源的读取次数"""
+        logger.debug(f"点名抽取数据读取次数: {self.read_counts}")
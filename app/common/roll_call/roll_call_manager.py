@@ -9,23 +9,27 @@ from PySide6.QtCore import (
 )
 from PySide6.QtGui import QFont
 from dataclasses import dataclass
+from pathlib import Path
 from loguru import logger
 from random import SystemRandom
 
 from app.common.data.list import (
-    get_student_list,
     filter_students_data,
     get_group_list,
     get_gender_list,
     get_class_name_list,
+    invalidate_roster_cache,
+)
+from app.common.display.result_display import (
+    AnimationFrameRenderer,
+    DisplaySnapshot,
 )
-from app.common.display.result_display import ResultDisplayUtils
 from app.common.history import calculate_weight
 from app.common.roll_call.roll_call_utils import RollCallUtils
+from app.common.roll_call.draw_session import DrawSession
 from app.common.music.music_player import music_player
-from app.common.behind_scenes.behind_scenes_utils import BehindScenesUtils
 from app.common.voice.voice import TTSHandler
-from app.common.extraction.extract import _is_non_class_time
+from app.common.extraction.class_schedule import is_non_class_time
 from app.common.safety.verify_ops import require_and_run
 from app.page_building.another_window import create_remaining_list_window
 from app.tools.config import remove_record
@@ -58,6 +62,7 @@ class RollCallDrawPlan:
     animation_interval: int
     animation_music: str | None
     result_music: str | None
+    display: DisplaySnapshot | None = None
 
 
 class RollCallManager(QObject):
@@ -83,6 +88,7 @@ class RollCallManager(QObject):
         self._precomputed_result = None
         self._precompute_key = None
         self._precompute_running = False
+        self._draw_session = None
 
     def build_draw_context(
         self,
@@ -146,6 +152,15 @@ class RollCallManager(QObject):
             animation_interval=animation_interval,
             animation_music=animation_music or None,
             result_music=result_music or None,
+            display=self.create_display_snapshot(),
+        )
+
+    @staticmethod
+    def create_display_snapshot() -> DisplaySnapshot:
+        """读取一次显示设置，供整个抽取动画使用"""
+        return DisplaySnapshot.from_settings(
+            "roll_call_settings",
+            RollCallUtils.create_display_settings("roll_call_settings"),
         )
 
     def finalize_draw(self, count: int, *, parent=None):
@@ -200,12 +215,23 @@ class RollCallManager(QObject):
             self.current_gender_index = gender_index
             self.half_repeat = half_repeat
 
-            # 获取原始学生列表
-            raw_students = get_student_list(class_name)
+            # 创建本次抽取的数据快照，名单、统计索引等数据在整次抽取中只读取一次
+            self._draw_session = DrawSession(
+                class_name=class_name,
+                group_index=group_index,
+                group_filter=group_filter,
+                gender_index=gender_index,
+                gender_filter=gender_filter,
+                half_repeat=half_repeat,
+            )
 
             # 过滤数据
             self.students = filter_students_data(
-                raw_students, group_index, group_filter, gender_index, gender_filter
+                self._draw_session.get_roster(),
+                group_index,
+                group_filter,
+                gender_index,
+                gender_filter,
             )
 
             # 计算权重
@@ -231,7 +257,12 @@ class RollCallManager(QObject):
             )
 
         # 批量计算权重
-        weighted_students = calculate_weight(students_dicts, self.current_class_name)
+        weighted_students = calculate_weight(
+            students_dicts,
+            self.current_class_name,
+            "",
+            self._draw_session.get_stats_index(),
+        )
 
         # 提取权重值，保持顺序一致
         weights = []
@@ -278,6 +309,7 @@ class RollCallManager(QObject):
             self.current_gender_filter,
             count,
             self.half_repeat,
+            self._draw_session,
         )
         return result
 
@@ -285,6 +317,9 @@ class RollCallManager(QObject):
         """
         保存抽取结果
         """
+        session = self._draw_session
+        # 保存后历史记录和已抽取记录发生变化，下一次抽取需要重新读取
+        self._draw_session = None
         return RollCallUtils.record_drawn_students(
             self.current_class_name,
             selected_students,
@@ -292,6 +327,7 @@ class RollCallManager(QObject):
             self.current_gender_filter,
             self.current_group_filter,
             self.half_repeat,
+            session,
         )
 
     def _build_precompute_key(self, count):
@@ -329,6 +365,7 @@ class RollCallManager(QObject):
         gender_index = self.current_gender_index
         gender_filter = self.current_gender_filter
         half_repeat = self.half_repeat
+        session = self._draw_session
         draw_count = count
 
         class _Signals(QObject):
@@ -357,6 +394,7 @@ class RollCallManager(QObject):
                 gender_filter,
                 draw_count,
                 half_repeat,
+                session,
             )
 
         signals = _Signals()
@@ -490,6 +528,15 @@ def init_tts(widget):
 def init_animation_state(widget):
     widget.is_animating = False
     widget._draw_plan = None
+    widget._frame_renderer = None
+
+
+def get_frame_renderer(widget) -> AnimationFrameRenderer:
+    renderer = getattr(widget, "_frame_renderer", None)
+    if renderer is None:
+        renderer = AnimationFrameRenderer(widget.result_grid)
+        widget._frame_renderer = renderer
+    return renderer
 
 
 def handle_long_press(widget):
@@ -511,7 +558,7 @@ def stop_long_press(widget):
 
 
 def start_draw(widget):
-    if _is_non_class_time():
+    if is_non_class_time():
         if readme_settings_async("linkage_settings", "verification_required"):
             logger.info("当前时间在非上课时间段内，需要密码验证")
             require_and_run(
@@ -529,7 +576,7 @@ def animate_result(widget):
 
 
 def reset_count(widget):
-    if _is_non_class_time():
+    if is_non_class_time():
         if readme_settings_async("linkage_settings", "verification_required"):
             logger.info("当前时间在非上课时间段内，需要密码验证")
             require_and_run("roll_call_reset", widget, widget._do_reset_count)
@@ -548,7 +595,6 @@ def stop_animation(widget):
         get_content_pushbutton_name_async("roll_call", "start_button")
     )
     widget.is_animating = False
-    BehindScenesUtils.clear_cache()
     try:
         widget.start_button.clicked.disconnect()
     except Exception as e:
@@ -717,43 +763,22 @@ def display_result(
 
 def display_result_animated(widget, selected_students, class_name, draw_count=None):
     group_index = widget.range_combobox.currentIndex()
-    display_dict = RollCallUtils.create_display_settings("roll_call_settings")
+    plan = widget._draw_plan
+    snapshot = plan.display if plan else None
+    if snapshot is None:
+        snapshot = widget.manager.create_display_snapshot()
     if draw_count is None:
         draw_count = widget.current_count
 
     if group_index == 1:
         selected_students = RollCallUtils.render_group_display_students(
-            class_name, selected_students, display_dict.get("show_random", 0)
+            class_name, selected_students, snapshot.show_random
         )
 
-    student_labels = ResultDisplayUtils.create_student_label(
-        class_name=class_name,
-        selected_students=selected_students,
-        draw_count=draw_count,
-        font_size=display_dict["font_size"],
-        animation_color=display_dict["animation_color"],
-        display_format=display_dict["display_format"],
-        display_style=display_dict["display_style"],
-        show_student_image=display_dict["show_student_image"],
-        group_index=group_index,
-        show_random=display_dict["show_random"],
-        settings_group="roll_call_settings",
+    get_frame_renderer(widget).render(
+        snapshot, class_name, selected_students, draw_count, group_index
     )
 
-    cached_widgets = ResultDisplayUtils.collect_grid_widgets(widget.result_grid)
-    if cached_widgets and len(cached_widgets) == len(student_labels):
-        updated = ResultDisplayUtils.update_grid_labels(
-            widget.result_grid, student_labels, cached_widgets
-        )
-        if updated:
-            ResultDisplayUtils.dispose_widgets(student_labels)
-        else:
-            ResultDisplayUtils.display_results_in_grid(
-                widget.result_grid, student_labels
-            )
-    else:
-        ResultDisplayUtils.display_results_in_grid(widget.result_grid, student_labels)
-
     RollCallUtils.show_notification_if_enabled(
         class_name=class_name,
         selected_students=selected_students,
@@ -935,6 +960,8 @@ def setup_file_watcher(widget):
 
 def on_directory_changed(widget, path):
     try:
+        # 名单文件增删改后使名单缓存失效
+        invalidate_roster_cache()
         QTimer.singleShot(500, lambda: refresh_class_list(widget))
     except Exception as e:
         logger.exception(f"处理文件夹变化事件失败: {e}")
@@ -942,6 +969,7 @@ def on_directory_changed(widget, path):
 
 def on_file_changed(widget, path):
     try:
+        invalidate_roster_cache(Path(path).stem)
         QTimer.singleShot(500, lambda: refresh_class_list(widget))
     except Exception as e:
         logger.exception(f"处理文件变化事件失败: {e}")
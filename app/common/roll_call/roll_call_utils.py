@@ -4,23 +4,19 @@
 from random import SystemRandom
 
 from app.common.data.list import get_group_list, get_student_list, filter_students_data
+from app.common.roll_call.draw_session import DrawSession
 from app.common.history import calculate_weight
 from app.common.fair_draw.avg_gap_protection import apply_avg_gap_protection
+from app.common.fair_draw.weighted_sampler import weighted_sample
 from app.common.behind_scenes.behind_scenes_utils import BehindScenesUtils
 from app.tools.config import (
     calculate_remaining_count,
-    read_drawn_record,
     reset_drawn_record,
     record_drawn_student,
 )
 from app.tools.settings_access import readme_settings_async, get_safe_font_size
 from app.common.display.result_display import ResultDisplayUtils
 from app.common.history import save_roll_call_history
-from app.common.extraction.extract import (
-    _get_current_class_info,
-    _is_non_class_time,
-    _get_break_assignment_class_info,
-)
 
 from app.Language.obtain_language import get_any_position_value
 
@@ -30,10 +26,6 @@ system_random = SystemRandom()
 class RollCallUtils:
     """点名工具类，提供通用的点名相关功能"""
 
-    _student_data_cache = {}
-    _drawn_record_cache = {}
-    _behind_scenes_cache = {}
-
     @staticmethod
     def get_total_count(list_combobox_text, range_combobox_index, range_combobox_text):
         """
@@ -151,26 +143,17 @@ class RollCallUtils:
         return total_count, remaining_count, formatted_text
 
     @staticmethod
-    def _get_filtered_candidates(
-        class_name, group_index, group_filter, gender_index, gender_filter
-    ):
+    def _get_filtered_candidates(session):
         """获取并过滤候选人列表"""
-        cache_key = (
-            f"{class_name}_{group_index}_{group_filter}_{gender_index}_{gender_filter}"
+        group_index = session.group_index
+        students_data = filter_students_data(
+            session.get_roster(),
+            group_index,
+            session.group_filter,
+            session.gender_index,
+            session.gender_filter,
         )
 
-        if cache_key not in RollCallUtils._student_data_cache:
-            # 使用 get_student_list 获取处理好的学生列表（List[Dict]），而不是直接加载原始JSON
-            raw_students = get_student_list(class_name)
-
-            students_data = filter_students_data(
-                raw_students, group_index, group_filter, gender_index, gender_filter
-            )
-
-            RollCallUtils._student_data_cache[cache_key] = students_data
-        else:
-            students_data = RollCallUtils._student_data_cache[cache_key]
-
         students_dict_list = []
         if group_index == 1:
             students_data = sorted(students_data, key=lambda x: x[3])
@@ -188,21 +171,13 @@ class RollCallUtils:
         return students_dict_list
 
     @staticmethod
-    def _apply_history_filter(
-        students_dict_list, half_repeat, class_name, gender_filter, group_filter
-    ):
+    def _apply_history_filter(students_dict_list, session):
         """应用历史记录过滤（半重复模式）"""
+        half_repeat = session.half_repeat
         if half_repeat <= 0:
             return students_dict_list
 
-        record_key = f"{class_name}_{gender_filter}_{group_filter}"
-        if record_key not in RollCallUtils._drawn_record_cache:
-            drawn_records = read_drawn_record(class_name, gender_filter, group_filter)
-            RollCallUtils._drawn_record_cache[record_key] = drawn_records
-        else:
-            drawn_records = RollCallUtils._drawn_record_cache[record_key]
-
-        drawn_counts = {name: count for name, count in drawn_records}
+        drawn_counts = {name: count for name, count in session.get_drawn_records()}
 
         filtered_list = []
         for item in students_dict_list:
@@ -215,34 +190,16 @@ class RollCallUtils:
     @staticmethod
     def _perform_weighted_draw(candidates, count, weights=None):
         """执行加权或随机抽取"""
-        draw_count = min(count, len(candidates))
-        selected_candidates = []
-        selected_candidates_dict = []
-
-        # Create a copy to avoid modifying the original list if it's used elsewhere
         candidates = list(candidates)
-
-        # If weights are provided, ensure they match the candidates length
         current_weights = list(weights) if weights else [1.0] * len(candidates)
+        # 权重列表长度与候选人不一致时，缺失部分按 1.0 补齐
+        if len(current_weights) < len(candidates):
+            current_weights.extend([1.0] * (len(candidates) - len(current_weights)))
 
-        for _ in range(draw_count):
-            if not candidates:
-                break
-
-            total_weight = sum(current_weights)
-            if total_weight <= 0:
-                random_index = system_random.randint(0, len(candidates) - 1)
-            else:
-                rand_value = system_random.uniform(0, total_weight)
-                cumulative_weight = 0
-                random_index = 0
-                for i, weight in enumerate(current_weights):
-                    cumulative_weight += weight
-                    if rand_value <= cumulative_weight:
-                        random_index = i
-                        break
-
-            selected_candidate = candidates[random_index]
+        selected_candidates = []
+        selected_candidates_dict = []
+        for index in weighted_sample(current_weights[: len(candidates)], count):
+            selected_candidate = candidates[index]
 
             # Extract basic info tuple
             info_tuple = (
@@ -254,9 +211,6 @@ class RollCallUtils:
             selected_candidates.append(info_tuple)
             selected_candidates_dict.append(selected_candidate)
 
-            candidates.pop(random_index)
-            current_weights.pop(random_index)
-
         return selected_candidates, selected_candidates_dict
 
     @staticmethod
@@ -268,18 +222,30 @@ class RollCallUtils:
         gender_filter,
         current_count,
         half_repeat,
+        session=None,
     ):
         """
         抽取随机学生
+
+        Args:
+            session: 本次抽取的数据快照（DrawSession），为空时创建新的会话
         """
+        if session is None:
+            session = DrawSession(
+                class_name=class_name,
+                group_index=group_index,
+                group_filter=group_filter,
+                gender_index=gender_index,
+                gender_filter=gender_filter,
+                half_repeat=half_repeat,
+            )
+
         # 1. 获取候选人
-        students_dict_list = RollCallUtils._get_filtered_candidates(
-            class_name, group_index, group_filter, gender_index, gender_filter
-        )
+        students_dict_list = RollCallUtils._get_filtered_candidates(session)
 
         # 2. 应用历史记录过滤
         students_dict_list = RollCallUtils._apply_history_filter(
-            students_dict_list, half_repeat, class_name, gender_filter, group_filter
+            students_dict_list, session
         )
 
         if not students_dict_list:
@@ -307,39 +273,25 @@ class RollCallUtils:
             }
 
         # 4. 获取当前课程信息（用于科目过滤）
-        current_class_info = None
-        subject_history_filter_enabled = (
-            readme_settings_async("linkage_settings", "subject_history_filter_enabled")
-            or False
-        )
-
-        if subject_history_filter_enabled:
-            data_source = readme_settings_async("linkage_settings", "data_source")
-            if data_source == 2:
-                from app.common.IPC_URL.csharp_ipc_handler import CSharpIPCHandler
-
-                current_class_info = (
-                    CSharpIPCHandler.instance().get_current_class_info()
-                )
-            elif data_source == 1:
-                current_class_info = _get_current_class_info()
-
-            if not current_class_info and _is_non_class_time():
-                current_class_info = _get_break_assignment_class_info()
-
-        subject_filter = (
-            current_class_info.get("name", "") if current_class_info else ""
-        )
+        subject_filter = session.get_subject_filter()
 
         # 5. 应用平均间隔保护
         students_dict_list = apply_avg_gap_protection(
-            students_dict_list, current_count, class_name, "roll_call", subject_filter
+            students_dict_list,
+            current_count,
+            class_name,
+            "roll_call",
+            subject_filter,
+            stats_index=session.get_stats_index(),
         )
 
         # 6. 应用内幕权重
         students_dict_list, behind_scenes_weights = (
             BehindScenesUtils.apply_probability_weights(
-                students_dict_list, 0, class_name
+                students_dict_list,
+                0,
+                class_name,
+                settings=session.get_behind_scenes_settings(),
             )
         )
 
@@ -365,7 +317,10 @@ class RollCallUtils:
         weights = []
         if draw_type == 1:
             students_with_weight = calculate_weight(
-                students_dict_list, class_name, subject_filter
+                students_dict_list,
+                class_name,
+                subject_filter,
+                session.get_stats_index(),
             )
             # 重新对齐权重列表（students_with_weight 和 behind_scenes_weights 应该是一一对应的）
             for i, student in enumerate(students_with_weight):
@@ -570,9 +525,6 @@ class RollCallUtils:
             group_filter: 小组过滤器
         """
         reset_drawn_record(window, class_name, gender_filter, group_filter)
-        record_key = f"{class_name}_{gender_filter}_{group_filter}"
-        if record_key in RollCallUtils._drawn_record_cache:
-            del RollCallUtils._drawn_record_cache[record_key]
 
     @staticmethod
     def update_start_button_state(button, total_count):
@@ -713,6 +665,7 @@ class RollCallUtils:
         gender_filter,
         group_filter,
         half_repeat,
+        session=None,
     ):
         """
         记录已抽取的学生
@@ -724,6 +677,7 @@ class RollCallUtils:
             gender_filter: 性别过滤器
             group_filter: 小组过滤器
             half_repeat: 半重复设置
+            session: 本次抽取的数据快照（DrawSession），保存历史记录时复用其中的数据
         """
         if half_repeat > 0:
             record_drawn_student(
@@ -732,17 +686,26 @@ class RollCallUtils:
                 group=group_filter,
                 student_name=selected_students,
             )
-            record_key = f"{class_name}_{gender_filter}_{group_filter}"
-            if record_key in RollCallUtils._drawn_record_cache:
-                del RollCallUtils._drawn_record_cache[record_key]
 
         if selected_students_dict:
-            save_roll_call_history(
-                class_name=class_name,
-                selected_students=selected_students_dict,
-                group_filter=group_filter,
-                gender_filter=gender_filter,
-            )
+            if session is not None and session.class_name == class_name:
+                save_roll_call_history(
+                    class_name=class_name,
+                    selected_students=selected_students_dict,
+                    group_filter=group_filter,
+                    gender_filter=gender_filter,
+                    roster=session.get_roster(),
+                    subject_info=session.get_subject_info(),
+                    stats_index=session.get_stats_index(),
+                )
+                session.log_read_counts()
+            else:
+                save_roll_call_history(
+                    class_name=class_name,
+                    selected_students=selected_students_dict,
+                    group_filter=group_filter,
+                    gender_filter=gender_filter,
+                )
 
     @staticmethod
     def prepare_notification_settings_by_group(
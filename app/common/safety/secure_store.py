@@ -16,6 +16,9 @@ except Exception:
     except Exception:
         AES = None
 
+# 内幕设置写入后调用的监听器（用于使解密结果和编译的权重表失效）
+_behind_scenes_write_listeners = []
+
 
 def _set_hidden(path: str) -> None:
     try:
@@ -217,6 +220,24 @@ def read_behind_scenes_settings() -> dict:
     return {}
 
 
+def register_behind_scenes_write_listener(listener) -> None:
+    """注册内幕设置写入监听器
+
+    Args:
+        listener: 无参数的回调函数，每次写入内幕设置后调用
+    """
+    if listener not in _behind_scenes_write_listeners:
+        _behind_scenes_write_listeners.append(listener)
+
+
+def _notify_behind_scenes_written() -> None:
+    for listener in list(_behind_scenes_write_listeners):
+        try:
+            listener()
+        except Exception as e:
+            logger.warning(f"内幕设置写入监听器执行失败：{e}")
+
+
 def write_behind_scenes_settings(d: dict) -> None:
     """写入内幕设置数据
 
@@ -266,3 +287,5 @@ def write_behind_scenes_settings(d: dict) -> None:
             logger.warning(f"写入内幕设置降级为明文JSON：{p}")
         except Exception as e2:
             logger.exception(f"降级写入明文JSON也失败：{e2}")
+    finally:
+        _notify_behind_scenes_written()
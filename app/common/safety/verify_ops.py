@@ -1,6 +1,5 @@
 from app.tools.settings_access import readme_settings_async
 from app.common.safety.password import is_configured as password_is_configured
-from app.page_building.security_window import create_verify_password_window
 from loguru import logger
 
 
@@ -53,6 +52,9 @@ def require_and_run(op: str, parent, func, on_preview=None):
         func()
         return
     logger.debug(f"触发验证窗口：{op}")
+    # 验证窗口（包括U盘验证及其加密库）只在需要验证时才导入
+    from app.page_building.security_window import create_verify_password_window
+
     create_verify_password_window(
         on_verified=func, on_preview=on_preview, operation_type=op
     )
@@ -1,10 +1,18 @@
 from .edge_tts_worker import EdgeTTSWorker
+from .presynthesis import VoicePresynthesisJob
+from .synthesis_worker import EdgeTTSBackend, StaticAudioBackend, VoiceSynthesisWorker
+from .voice_cache import VoiceCache
 from .voice import TTSHandler, VoiceCacheManager, VoicePlaybackSystem, LoadBalancer
 
 __all__ = [
+    "EdgeTTSBackend",
     "EdgeTTSWorker",
     "TTSHandler",
+    "VoiceCache",
     "VoiceCacheManager",
     "VoicePlaybackSystem",
+    "VoicePresynthesisJob",
+    "VoiceSynthesisWorker",
     "LoadBalancer",
+    "StaticAudioBackend",
 ]
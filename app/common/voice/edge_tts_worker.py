@@ -1,8 +1,12 @@
 import asyncio
-import edge_tts
 from loguru import logger
 from PySide6.QtCore import QThread, Signal
 
+from app.tools.lazy_import import lazy_import
+
+# edge-tts 在获取语音列表时才导入
+edge_tts = lazy_import("edge_tts")
+
 
 class EdgeTTSWorker(QThread):
     """Edge TTS语音列表获取线程"""
@@ -0,0 +1,228 @@
+"""
+语音预生成
+在后台按名单逐条合成播报语音并写入语音缓存，首次抽到某个学生时
+不需要再等待在线语音合成
+"""
+
+import concurrent.futures
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+from PySide6.QtCore import QThread, Signal
+
+from app.common.data.list import get_pool_list, get_student_list
+from app.common.voice.voice import (
+    VoiceCacheManager,
+    build_announcement_text,
+    load_announcement_settings,
+)
+from app.tools.settings_access import readme_settings_async
+from app.tools.variable import VOICE_PRESYNTHESIS_INTERVAL, VOICE_SYNTHESIS_TIMEOUT
+
+# 名单类型
+ROLL_CALL_MODE = 0
+LOTTERY_MODE = 1
+
+
+def collect_announcement_phrases(
+    class_name: str, mode: int = ROLL_CALL_MODE
+) -> List[str]:
+    """
+    生成班级/奖池中所有名称的播报文本（已应用别名、前缀和后缀，去重后保持名单顺序）
+
+    Args:
+        class_name: 班级或奖池名称
+        mode: 0 为点名名单，1 为抽奖奖池
+
+    Returns:
+        List[str]: 播报文本列表
+    """
+    if not class_name:
+        return []
+    if mode == LOTTERY_MODE:
+        items = get_pool_list(class_name)
+    else:
+        items = get_student_list(class_name)
+
+    try:
+        audio_settings = load_announcement_settings(class_name)
+    except Exception as e:
+        logger.warning(f"读取播报设置失败 {class_name}: {e}")
+        audio_settings = {}
+
+    phrases: Dict[str, None] = {}
+    for item in items:
+        name = str(item.get("name", "") or "")
+        if name and item.get("exist", True):
+            phrases[build_announcement_text(name, audio_settings)] = None
+    return list(phrases)
+
+
+def get_edge_tts_voice() -> Optional[str]:
+    """当前使用 Edge TTS 播报时返回语音名称，否则返回None（系统TTS不需要预生成）"""
+    if not readme_settings_async("basic_voice_settings", "voice_enable"):
+        return None
+    if readme_settings_async("basic_voice_settings", "voice_engine") != "Edge TTS":
+        return None
+    return readme_settings_async("basic_voice_settings", "edge_tts_voice_name") or None
+
+
+# ==================================================
+# 预生成任务
+# ==================================================
+class VoicePresynthesisJob(QThread):
+    """语音预生成任务
+
+    在低优先级线程中逐条检查缓存，未缓存的文本提交给语音合成工作线程，
+    每次只等待一条请求并在两次请求之间间隔 interval 秒，
+    不占用抽取时播报所需的并发合成额度
+    """
+
+    progress_changed = Signal(int, int)  # 已处理数量，总数
+    job_finished = Signal(dict)  # 结果统计
+
+    def __init__(
+        self,
+        class_name: str,
+        voice_name: str,
+        mode: int = ROLL_CALL_MODE,
+        cache_manager: Optional[VoiceCacheManager] = None,
+        interval: float = VOICE_PRESYNTHESIS_INTERVAL,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.class_name = class_name
+        self.voice_name = voice_name
+        self.mode = mode
+        self.cache_manager = cache_manager or VoiceCacheManager()
+        self.interval = max(0.0, float(interval))
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """取消任务（正在合成的一条会继续完成并写入缓存）"""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def _wait_result(self, future: concurrent.futures.Future) -> Optional[str]:
+        """等待合成完成，期间响应取消，超时或取消时返回None"""
+        waited = 0.0
+        while waited < VOICE_SYNTHESIS_TIMEOUT:
+            if self._cancel_event.is_set():
+                return None
+            try:
+                return future.result(timeout=0.2)
+            except concurrent.futures.TimeoutError:
+                waited += 0.2
+        raise TimeoutError("语音合成超时")
+
+    def run(self):
+        summary = {
+            "class_name": self.class_name,
+            "total": 0,
+            "cached": 0,
+            "generated": 0,
+            "failed": 0,
+            "cancelled": False,
+        }
+        try:
+            phrases = collect_announcement_phrases(self.class_name, self.mode)
+        except Exception as e:
+            logger.exception(f"读取名单失败 {self.class_name}: {e}")
+            phrases = []
+        summary["total"] = len(phrases)
+        self.progress_changed.emit(0, len(phrases))
+        logger.info(f"开始预生成语音: {self.class_name}，共{len(phrases)}条")
+
+        for index, text in enumerate(phrases, start=1):
+            if self._cancel_event.is_set():
+                break
+            try:
+                if self.cache_manager.get_cached_voice(text, self.voice_name):
+                    summary["cached"] += 1
+                else:
+                    future = self.cache_manager.request_voice(text, self.voice_name)
+                    if self._wait_result(future) is not None:
+                        summary["generated"] += 1
+                    # 限制请求频率
+                    self._cancel_event.wait(self.interval)
+            except Exception as e:
+                summary["failed"] += 1
+                logger.warning(f"预生成语音失败 {text}: {e}")
+            self.progress_changed.emit(index, len(phrases))
+
+        summary["cancelled"] = self._cancel_event.is_set()
+        logger.info(
+            f"预生成语音结束: {self.class_name}，新生成{summary['generated']}条，"
+            f"已缓存{summary['cached']}条，失败{summary['failed']}条"
+            + ("（已取消）" if summary["cancelled"] else "")
+        )
+        self.job_finished.emit(summary)
+
+
+# ==================================================
+# 全局任务管理
+# ==================================================
+_presynthesis_jobs: Dict[Tuple[int, str], VoicePresynthesisJob] = {}
+
+
+def get_presynthesis_job(
+    class_name: str, mode: int = ROLL_CALL_MODE
+) -> Optional[VoicePresynthesisJob]:
+    """获取正在运行的预生成任务"""
+    job = _presynthesis_jobs.get((mode, class_name))
+    if job is not None and not job.isRunning():
+        return None
+    return job
+
+
+def start_presynthesis(
+    class_name: str, mode: int = ROLL_CALL_MODE
+) -> Optional[VoicePresynthesisJob]:
+    """
+    启动班级/奖池的语音预生成任务（需要在主线程调用）
+
+    同一名单已有任务在运行时返回该任务；未使用 Edge TTS 播报时返回None
+
+    Args:
+        class_name: 班级或奖池名称
+        mode: 0 为点名名单，1 为抽奖奖池
+
+    Returns:
+        Optional[VoicePresynthesisJob]: 预生成任务
+    """
+    if not class_name:
+        return None
+    voice_name = get_edge_tts_voice()
+    if voice_name is None:
+        logger.debug("未使用 Edge TTS 播报，跳过语音预生成")
+        return None
+
+    job = get_presynthesis_job(class_name, mode)
+    if job is not None:
+        return job
+
+    key = (mode, class_name)
+    job = VoicePresynthesisJob(class_name, voice_name, mode)
+    job.finished.connect(lambda: _forget_job(key, job))
+    _presynthesis_jobs[key] = job
+    job.start(QThread.Priority.LowestPriority)
+    return job
+
+
+def _forget_job(key: Tuple[int, str], job: VoicePresynthesisJob):
+    if _presynthesis_jobs.get(key) is job:
+        del _presynthesis_jobs[key]
+    job.deleteLater()
+
+
+def cancel_presynthesis(class_name: Optional[str] = None, mode: Optional[int] = None):
+    """取消预生成任务（不指定名称时取消全部）"""
+    for (job_mode, job_class), job in list(_presynthesis_jobs.items()):
+        if class_name is not None and job_class != class_name:
+            continue
+        if mode is not None and job_mode != mode:
+            continue
+        job.cancel()
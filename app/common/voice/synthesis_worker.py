@@ -0,0 +1,298 @@
+"""
+语音合成工作线程
+在常驻的 asyncio 事件循环中并发合成语音，通过信号量限制同时进行的请求数，
+避免每条语音都新建事件循环并按顺序等待网络请求
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import struct
+import threading
+from typing import Callable, Dict, List, Optional, Protocol, Union
+
+from loguru import logger
+
+from app.tools.lazy_import import lazy_import
+from app.tools.variable import (
+    VOICE_SYNTHESIS_DEFAULT_RATE,
+    VOICE_SYNTHESIS_MAX_CONCURRENCY,
+    VOICE_SYNTHESIS_MAX_RETRIES,
+    VOICE_SYNTHESIS_MAX_TEXT_LENGTH,
+)
+
+edge_tts = lazy_import("edge_tts")
+edge_tts_exceptions = lazy_import("edge_tts.exceptions")
+
+
+# ==================================================
+# 语音合成后端
+# ==================================================
+class SynthesisBackend(Protocol):
+    """语音合成后端接口，把文本合成为音频文件
+
+    测试时可以传入不访问网络的本地后端代替 Edge TTS；
+    engine 参与语音缓存键的计算，不同后端的缓存互不混用
+    """
+
+    engine: str
+
+    async def synthesize(
+        self, text: str, voice: str, file_path: str, rate: str
+    ) -> None: ...
+
+
+class EdgeTTSBackend:
+    """Edge TTS 在线语音合成后端（失败时重试）"""
+
+    engine = "Edge TTS"
+
+    def __init__(self, max_retries: int = VOICE_SYNTHESIS_MAX_RETRIES):
+        self.max_retries = max_retries
+
+    async def synthesize(
+        self,
+        text: str,
+        voice: str,
+        file_path: str,
+        rate: str = VOICE_SYNTHESIS_DEFAULT_RATE,
+    ) -> None:
+        # 限制文本长度，防止生成过大的音频
+        if len(text) > VOICE_SYNTHESIS_MAX_TEXT_LENGTH:
+            text = text[:VOICE_SYNTHESIS_MAX_TEXT_LENGTH]
+            logger.warning(f"文本长度超过限制{VOICE_SYNTHESIS_MAX_TEXT_LENGTH}，已截断")
+
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                communicate = edge_tts.Communicate(text, voice, rate=rate)
+                await communicate.save(file_path)
+                logger.debug(f"成功生成语音并保存至: {file_path}")
+                return
+            except Exception as e:
+                if isinstance(e, edge_tts_exceptions.NoAudioReceived):
+                    reason = "未接收到音频数据"
+                elif isinstance(e, edge_tts_exceptions.WebSocketError):
+                    reason = "WebSocket通信错误"
+                else:
+                    reason = "合成出错"
+                logger.warning(
+                    f"生成语音失败，{reason}，重试{attempt}/{self.max_retries}: "
+                    f"{type(e).__name__} {e}"
+                )
+                if attempt < self.max_retries:
+                    await asyncio.sleep(1)
+
+        logger.warning("生成语音失败，已达到最大重试次数")
+        raise RuntimeError("生成语音失败")
+
+
+def make_silent_wav(samples: int = 800, samplerate: int = 8000) -> bytes:
+    """生成一段静音的 16 位单声道 WAV 数据"""
+    data_size = samples * 2
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,
+        1,
+        samplerate,
+        samplerate * 2,
+        2,
+        16,
+        b"data",
+        data_size,
+    )
+    return header + bytes(data_size)
+
+
+class StaticAudioBackend:
+    """不访问网络的本地后端，等待指定时间后写入固定的音频数据
+
+    用于测试和基准测试；delay 可以是秒数，也可以是根据文本返回秒数的函数，
+    用来模拟先提交的请求后完成的情况。会记录调用顺序和同时进行的请求数
+    """
+
+    engine = "Static"
+
+    def __init__(
+        self,
+        delay: Union[float, Callable[[str], float]] = 0.0,
+        data: Optional[bytes] = None,
+    ):
+        self.delay = delay
+        self.data = data if data is not None else make_silent_wav()
+        self.started: List[str] = []
+        self.finished: List[str] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def synthesize(
+        self,
+        text: str,
+        voice: str,
+        file_path: str,
+        rate: str = VOICE_SYNTHESIS_DEFAULT_RATE,
+    ) -> None:
+        self.started.append(text)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            delay = self.delay(text) if callable(self.delay) else self.delay
+            await asyncio.sleep(delay)
+            with open(file_path, "wb") as f:
+                f.write(self.data)
+        finally:
+            self.active -= 1
+        self.finished.append(text)
+
+
+# ==================================================
+# 语音合成工作线程
+# ==================================================
+class VoiceSynthesisWorker:
+    """常驻事件循环的语音合成工作线程
+
+    submit() 可以在任意线程调用，返回 concurrent.futures.Future；
+    同一文件的合成请求在完成前只执行一次。合成结果先写入临时文件，
+    完成后再替换为目标文件，未完成的文件不会被当作缓存命中。
+    finalize 在线程池中执行（如转码、写入缓存索引），不阻塞事件循环
+    """
+
+    def __init__(
+        self,
+        backend: Optional[SynthesisBackend] = None,
+        max_concurrency: int = VOICE_SYNTHESIS_MAX_CONCURRENCY,
+    ):
+        self.backend: SynthesisBackend = backend or EdgeTTSBackend()
+        self.max_concurrency = max(1, int(max_concurrency))
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending: Dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """启动事件循环线程（调用方需持有 self._lock）"""
+        if self._loop is not None and self._thread is not None:
+            if self._thread.is_alive():
+                return self._loop
+
+        loop = asyncio.new_event_loop()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._thread = threading.Thread(
+            target=self._run_loop, args=(loop,), daemon=True, name="VoiceSynthesis"
+        )
+        self._loop = loop
+        self._thread.start()
+        return loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop):
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.close()
+
+    def submit(
+        self,
+        text: str,
+        voice: str,
+        file_path: str,
+        rate: str = VOICE_SYNTHESIS_DEFAULT_RATE,
+        finalize: Optional[Callable[[str], str]] = None,
+    ) -> concurrent.futures.Future:
+        """
+        提交一条语音合成请求
+
+        Args:
+            text: 要合成的文本
+            voice: 语音名称
+            file_path: 合成结果的保存路径
+            rate: 语速（Edge TTS 格式，如 "+0%"）
+            finalize: 合成完成后对 file_path 的处理，返回最终的文件路径
+
+        Returns:
+            concurrent.futures.Future: 结果为 finalize 的返回值（未指定时为 file_path），
+                合成失败时为异常
+        """
+        with self._lock:
+            future = self._pending.get(file_path)
+            if future is not None and not future.done():
+                return future
+            loop = self._ensure_loop()
+            future = asyncio.run_coroutine_threadsafe(
+                self._synthesize(text, voice, file_path, rate, finalize), loop
+            )
+            self._pending[file_path] = future
+
+        future.add_done_callback(lambda done: self._forget(file_path, done))
+        return future
+
+    def _forget(self, file_path: str, future: concurrent.futures.Future):
+        with self._lock:
+            if self._pending.get(file_path) is future:
+                del self._pending[file_path]
+
+    async def _synthesize(
+        self,
+        text: str,
+        voice: str,
+        file_path: str,
+        rate: str,
+        finalize: Optional[Callable[[str], str]],
+    ) -> str:
+        async with self._semaphore:
+            # 排队期间可能已由其他请求生成
+            if not os.path.exists(file_path):
+                temp_path = f"{file_path}.{os.getpid()}.part"
+                try:
+                    await self.backend.synthesize(text, voice, temp_path, rate)
+                    os.replace(temp_path, file_path)
+                finally:
+                    if os.path.exists(temp_path):
+                        try:
+                            os.remove(temp_path)
+                        except OSError:
+                            pass
+
+        if finalize is None:
+            return file_path
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, finalize, file_path)
+
+    def stop(self, timeout: float = 5.0):
+        """停止事件循环，未完成的请求会被取消"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+            self._pending.clear()
+        if loop is not None and thread is not None and thread.is_alive():
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=timeout)
+
+
+# ==================================================
+# 全局实例
+# ==================================================
+_synthesis_worker: Optional[VoiceSynthesisWorker] = None
+_synthesis_worker_lock = threading.Lock()
+
+
+def get_synthesis_worker() -> VoiceSynthesisWorker:
+    """获取全局语音合成工作线程（首次提交请求时才启动事件循环）"""
+    global _synthesis_worker
+    if _synthesis_worker is None:
+        with _synthesis_worker_lock:
+            if _synthesis_worker is None:
+                _synthesis_worker = VoiceSynthesisWorker()
+    return _synthesis_worker
@@ -4,8 +4,9 @@
 并内置缓存、队列、负载均衡与权限控制。
 """
 
+from __future__ import annotations
+
 # --------- 标准库 ---------
-import asyncio
 import concurrent.futures
 import json
 import os
@@ -18,32 +19,33 @@ from queue import Queue, Empty
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 # --------- 第三方库 ---------
-import edge_tts
-import numpy as np
-import psutil
-import pyttsx3
 from loguru import logger
-
-try:
-    import sounddevice as sd
-except Exception as e:
-    sd = None
-    logger.warning(f"sounddevice 不可用: {e}")
-
-try:
-    import soundfile as sf
-except Exception as e:
-    sf = None
-    logger.warning(f"soundfile 不可用: {e}")
 from PySide6.QtCore import *
 from PySide6.QtWidgets import *
 
-from edge_tts.exceptions import NoAudioReceived, WebSocketError
+# 语音合成与音频依赖在首次使用时才导入，未启用语音播报时不影响启动速度
+from app.tools.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+psutil = lazy_import("psutil")
+pyttsx3 = lazy_import("pyttsx3")
+sd = lazy_import("sounddevice", optional=True)
+sf = lazy_import("soundfile", optional=True)
 
 # --------- 项目内部 ---------
 from app.tools.path_utils import ensure_dir, get_audio_path
 from app.tools.settings_access import readme_settings_async
 from app.tools.config import restore_volume
+from app.tools.variable import VOICE_SYNTHESIS_DEFAULT_RATE, VOICE_SYNTHESIS_TIMEOUT
+from app.common.voice.synthesis_worker import (
+    VoiceSynthesisWorker,
+    get_synthesis_worker,
+)
+from app.common.voice.voice_cache import (
+    VoiceCache,
+    get_voice_cache,
+    make_voice_cache_key,
+)
 
 
 # 权限检查装饰器
@@ -147,7 +149,7 @@ class VoicePlaybackSystem:
         """流式播放音频文件（低内存占用）"""
         stream = None
         sf_file = None
-        if sd is None or sf is None:
+        if not sd.is_available() or not sf.is_available():
             logger.warning("音频播放依赖不可用，无法播放音频")
             return
         try:
@@ -219,7 +221,7 @@ class VoicePlaybackSystem:
     def _safe_play_memory(self, data: np.ndarray, fs: int) -> None:
         """安全播放内存数据实现"""
         stream = None
-        if sd is None:
+        if not sd.is_available():
             logger.warning("sounddevice 不可用，无法播放音频")
             return
         try:
@@ -360,13 +362,29 @@ class VoicePlaybackSystem:
 class VoiceCacheManager:
     """语音磁盘缓存系统"""
 
-    def __init__(self, audio_dir: Optional[str] = None):
+    def __init__(
+        self,
+        audio_dir: Optional[str] = None,
+        worker: Optional[VoiceSynthesisWorker] = None,
+    ):
         self.audio_dir: str = audio_dir if audio_dir else get_audio_path("voices")
         ensure_dir(self.audio_dir)
-        self._disk_cache_lock: threading.Lock = threading.Lock()
-
-    def get_voice(self, text: str, voice: str) -> str:
-        """获取语音文件路径（自动缓存到磁盘）"""
+        self.cache: VoiceCache = get_voice_cache(self.audio_dir)
+        self._worker: Optional[VoiceSynthesisWorker] = worker
+
+    @property
+    def worker(self) -> VoiceSynthesisWorker:
+        """语音合成工作线程（未指定时使用全局实例）"""
+        return self._worker or get_synthesis_worker()
+
+    @property
+    def engine(self) -> str:
+        """合成后端名称（参与缓存键计算）"""
+        backend = self.worker.backend
+        return getattr(backend, "engine", type(backend).__name__)
+
+    @staticmethod
+    def _validate(text: str, voice: str) -> None:
         if not isinstance(text, str) or not text:
             logger.warning(f"无效的文本: {text}")
             raise ValueError("文本不能为空")
@@ -374,99 +392,54 @@ class VoiceCacheManager:
             logger.warning(f"无效的语音名称: {voice}")
             raise ValueError("语音名称不能为空")
 
-        logger.debug(f"获取语音: text='{text}', voice='{voice}'")
-
-        file_path: str = self._get_cache_file_path(text, voice)
-        if os.path.exists(file_path):
-            logger.debug(f"命中磁盘缓存: {file_path}")
-            return file_path
-
-        logger.debug(f"未命中缓存，生成新语音: {file_path}")
-        asyncio.run(self._generate_voice(text, voice, file_path))
-        return file_path
-
-    async def _generate_voice(self, text: str, voice: str, file_path: str) -> None:
-        """生成语音核心方法"""
-        # 限制文本长度，防止生成过大的音频
-        max_text_length = 500
-        if len(text) > max_text_length:
-            text = text[:max_text_length]
-            logger.warning(f"文本长度超过限制{max_text_length}，已截断")
+    def cache_key(
+        self, text: str, voice: str, rate: str = VOICE_SYNTHESIS_DEFAULT_RATE
+    ) -> str:
+        """生成缓存键"""
+        return make_voice_cache_key(self.engine, voice, text, rate)
+
+    def get_cached_voice(
+        self, text: str, voice: str, rate: str = VOICE_SYNTHESIS_DEFAULT_RATE
+    ) -> Optional[str]:
+        """获取已缓存的语音文件路径，未缓存时返回None"""
+        return self.cache.lookup(self.cache_key(text, voice, rate))
+
+    def request_voice(
+        self, text: str, voice: str, rate: str = VOICE_SYNTHESIS_DEFAULT_RATE
+    ) -> concurrent.futures.Future:
+        """
+        请求语音文件（不阻塞），未命中缓存时提交给合成工作线程
 
-        retry_count = 0
-        max_retries = 3
+        Returns:
+            concurrent.futures.Future: 结果为语音文件路径
+        """
+        self._validate(text, voice)
 
-        while retry_count < max_retries:
-            try:
-                communicate = edge_tts.Communicate(text, voice)
-                await communicate.save(file_path)
-                logger.debug(f"成功生成语音并保存至: {file_path}")
-                return
-            except NoAudioReceived as e:
-                retry_count += 1
-                logger.warning(
-                    f"生成语音失败，未接收到音频数据，重试{retry_count}/{max_retries}: {type(e).__name__} {e}"
-                )
-                if retry_count < max_retries:
-                    await asyncio.sleep(1)
-            except WebSocketError as e:
-                retry_count += 1
-                logger.warning(
-                    f"生成语音失败，WebSocket通信错误，重试{retry_count}/{max_retries}: {type(e).__name__} {e}"
-                )
-                if retry_count < max_retries:
-                    await asyncio.sleep(1)
-            except Exception as e:
-                retry_count += 1
-                logger.warning(
-                    f"生成语音失败，重试{retry_count}/{max_retries}: {type(e).__name__} {e}"
-                )
-                if retry_count < max_retries:
-                    await asyncio.sleep(1)
-
-        # 最终失败时的降级处理
-        logger.warning("生成语音失败，已达到最大重试次数")
-        raise RuntimeError("生成语音失败")
-
-    def _generate_cache_key(self, text: str, voice: str) -> str:
-        """生成安全的文件名"""
-        safe_text = (
-            text.replace("/", "_")
-            .replace("\\", "_")
-            .replace(":", "_")
-            .replace("*", "_")
-            .replace("?", "_")
-            .replace('"', "_")
-            .replace("<", "_")
-            .replace(">", "_")
-            .replace("|", "_")
-        )
-        return f"{voice}_{safe_text}"
-
-    def _get_cache_file_path(self, text: str, voice: str) -> str:
-        """获取缓存文件路径"""
-        safe_text = (
-            text.replace("/", "_")
-            .replace("\\", "_")
-            .replace(":", "_")
-            .replace("*", "_")
-            .replace("?", "_")
-            .replace('"', "_")
-            .replace("<", "_")
-            .replace(">", "_")
-            .replace("|", "_")
+        key = self.cache_key(text, voice, rate)
+        file_path = self.cache.lookup(key)
+        if file_path is not None:
+            logger.debug(f"命中磁盘缓存: {file_path}")
+            future: concurrent.futures.Future = concurrent.futures.Future()
+            future.set_result(file_path)
+            return future
+
+        logger.debug(f"未命中缓存，生成新语音: {text}")
+        return self.worker.submit(
+            text,
+            voice,
+            self.cache.staging_path(key),
+            rate,
+            finalize=lambda staged_path: self.cache.commit(key, staged_path),
         )
-        filename = f"{voice}_{safe_text}.wav"
-        return os.path.join(self.audio_dir, filename)
 
-    def _save_to_disk(self, file_path: str, data: np.ndarray, fs: int) -> None:
-        """保存到磁盘"""
-        try:
-            with self._disk_cache_lock:
-                sf.write(file_path, data, fs)
-                logger.debug(f"语音已保存到磁盘: {file_path}")
-        except Exception as e:
-            logger.exception(f"保存缓存失败: {e}")
+    def get_voice(
+        self, text: str, voice: str, rate: str = VOICE_SYNTHESIS_DEFAULT_RATE
+    ) -> str:
+        """获取语音文件路径（自动缓存到磁盘，未命中时等待合成完成）"""
+        logger.debug(f"获取语音: text='{text}', voice='{voice}'")
+        return self.request_voice(text, voice, rate).result(
+            timeout=VOICE_SYNTHESIS_TIMEOUT
+        )
 
 
 class LoadBalancer:
@@ -568,6 +541,43 @@ class LoadBalancer:
             return self.BASE_QUEUE_SIZE
 
 
+def load_announcement_settings(class_name: str) -> Dict[str, Any]:
+    """读取班级/奖池的播报设置（audio/<名称>.json，包含别名、前缀和后缀）"""
+    if not class_name:
+        return {}
+    audio_file = get_audio_path(f"{class_name}.json")
+    if not audio_file.exists():
+        return {}
+    with open(str(audio_file), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_announcement_text(name: str, audio_settings: Dict[str, Any]) -> str:
+    """
+    生成播报文本：前缀 + 别名（为空时使用名称）+ 后缀
+
+    Args:
+        name: 学生姓名或奖品名称
+        audio_settings: load_announcement_settings 读取的播报设置
+
+    Returns:
+        str: 播报文本
+    """
+    # 获取对应的音频设置，如果不存在则使用默认值
+    settings = audio_settings.get(name, {})
+    tts_alias = settings.get("tts_alias", "")
+    prefix = settings.get("prefix", "")
+    suffix = settings.get("suffix", "")
+
+    announcement_text = []
+    if prefix:
+        announcement_text.append(prefix)
+    announcement_text.append(tts_alias or name)
+    if suffix:
+        announcement_text.append(suffix)
+    return " ".join(announcement_text)
+
+
 class TTSHandler:
     """语音处理主控制器"""
 
@@ -577,6 +587,8 @@ class TTSHandler:
         self.playback_system.start()
         self.voice_engine: Optional[Any] = None
         self.system_tts_lock: threading.Lock = threading.Lock()
+        # 每次播报递增，旧的播报任务发现编号变化后不再提交播放
+        self._play_generation: int = 0
 
         self._thread_pool: concurrent.futures.ThreadPoolExecutor = (
             concurrent.futures.ThreadPoolExecutor(
@@ -730,39 +742,16 @@ class TTSHandler:
                 return
 
             # 停止之前的播放，清空队列
+            self._play_generation += 1
             self.stop()
             # 重新启动播放线程
             self.playback_system.start()
 
-            # 读取音频设置文件
-            audio_settings = {}
-            if class_name:
-                audio_file = get_audio_path(f"{class_name}.json")
-                if audio_file.exists():
-                    with open(str(audio_file), "r", encoding="utf-8") as f:
-                        audio_settings = json.load(f)
-
-            # 应用TTS别名、前缀和后缀
-            processed_names = []
-            for name in student_names:
-                # 获取对应的音频设置，如果不存在则使用默认值
-                settings = audio_settings.get(name, {})
-                tts_alias = settings.get("tts_alias", "")
-                prefix = settings.get("prefix", "")
-                suffix = settings.get("suffix", "")
-
-                # 构建最终的播报文本
-                announcement_text = []
-                if prefix:
-                    announcement_text.append(prefix)
-                if tts_alias:
-                    announcement_text.append(tts_alias)
-                else:
-                    announcement_text.append(name)
-                if suffix:
-                    announcement_text.append(suffix)
-
-                processed_names.append(" ".join(announcement_text))
+            # 读取音频设置文件，应用TTS别名、前缀和后缀
+            audio_settings = load_announcement_settings(class_name)
+            processed_names = [
+                build_announcement_text(name, audio_settings) for name in student_names
+            ]
 
             # 添加日志，记录要播放的学生名单
             logger.debug(f"准备播放语音，原始学生名单: {student_names}")
@@ -807,25 +796,51 @@ class TTSHandler:
         """Edge TTS处理模块启动"""
         # 使用线程池执行任务
         self._thread_pool.submit(
-            self._prepare_and_play, student_names, config, voice_name
+            self._prepare_and_play,
+            student_names,
+            config,
+            voice_name,
+            self._play_generation,
         )
 
     def _prepare_and_play(
-        self, student_names: List[str], config: Dict[str, Any], voice_name: str
+        self,
+        student_names: List[str],
+        config: Dict[str, Any],
+        voice_name: str,
+        generation: Optional[int] = None,
     ) -> None:
-        """准备并播放语音"""
+        """准备并播放语音
+
+        先把所有未缓存的名字一起提交给合成工作线程并发合成，
+        再按顺序等待结果，每条合成完成后立即加入播放队列，
+        第一条合成完成即开始播放
+        """
         self._apply_system_volume()
 
         self.playback_system.set_volume(config["voice_volume"] / 100.0)
         self.playback_system.set_speed(config["voice_speed"])
 
+        requests = []
         for name in student_names:
             try:
-                file_path = self.cache_manager.get_voice(name, voice_name)
-                if not self.playback_system.add_task(file_path):
-                    logger.exception(f"提交播放任务失败: {name}")
+                requests.append(
+                    (name, self.cache_manager.request_voice(name, voice_name))
+                )
+            except Exception as e:
+                logger.exception(f"处理{name}失败: {e}")
+
+        for name, future in requests:
+            try:
+                file_path = future.result(timeout=VOICE_SYNTHESIS_TIMEOUT)
             except Exception as e:
                 logger.exception(f"处理{name}失败: {e}")
+                continue
+            if generation is not None and generation != self._play_generation:
+                logger.debug("已开始新的语音播报，停止提交旧的播放任务")
+                return
+            if not self.playback_system.add_task(file_path):
+                logger.exception(f"提交播放任务失败: {name}")
 
         logger.debug("所有语音播放任务已提交，将异步播放")
 
@@ -0,0 +1,476 @@
+"""
+语音缓存
+按 (引擎, 语音, 语速, 文本) 的哈希保存合成结果，用索引文件记录文件大小、
+校验值和最近访问时间，超过空间上限时按最近最少使用的顺序清理
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+
+from app.common.voice.synthesis_worker import EdgeTTSBackend
+from app.tools.lazy_import import lazy_import
+from app.tools.variable import (
+    VOICE_CACHE_COMPRESS_FORMAT,
+    VOICE_CACHE_INDEX_SAVE_INTERVAL,
+    VOICE_CACHE_MAX_BYTES,
+    VOICE_SYNTHESIS_DEFAULT_RATE,
+    VOICE_SYNTHESIS_TIMEOUT,
+)
+
+sf = lazy_import("soundfile", optional=True)
+
+INDEX_FILE_NAME = "index.json"
+INDEX_VERSION = 1
+STAGING_SUFFIX = ".synth"
+
+# 缓存目录中的音频文件扩展名
+_AUDIO_SUFFIXES = (".wav", ".mp3", ".ogg", ".flac")
+_CACHE_KEY_LENGTH = 32
+
+
+def make_voice_cache_key(engine: str, voice: str, text: str, rate: str) -> str:
+    """生成语音缓存键（固定长度的十六进制字符串，可直接作为文件名）"""
+    payload = json.dumps([engine, voice, rate, text], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:_CACHE_KEY_LENGTH]
+
+
+def _is_cache_key(name: str) -> bool:
+    return len(name) == _CACHE_KEY_LENGTH and all(c in "0123456789abcdef" for c in name)
+
+
+def _is_staging_file(name: str) -> bool:
+    """合成或转码过程中的临时文件（xxx.synth、xxx.synth.<pid>.part、xxx.synth.ogg）"""
+    return STAGING_SUFFIX in name or name.endswith(".part")
+
+
+def _legacy_cache_key(name: str) -> Optional[str]:
+    """旧版本按 "{语音}_{文本}.wav" 命名的缓存文件对应的缓存键
+
+    旧版本只使用 Edge TTS 和默认语速，Edge TTS 的语音名称不含下划线。
+    文本中的 /\\:*?"<>| 在文件名中被替换为下划线，这类文本无法还原，
+    换算出的键不会再被命中，之后按最近最少使用的顺序清理
+    """
+    stem, ext = os.path.splitext(name)
+    if ext.lower() != ".wav" or "_" not in stem:
+        return None
+    voice, text = stem.split("_", 1)
+    if not voice or not text:
+        return None
+    return make_voice_cache_key(
+        EdgeTTSBackend.engine, voice, text, VOICE_SYNTHESIS_DEFAULT_RATE
+    )
+
+
+def _file_crc32(path: str) -> int:
+    crc = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def _detect_audio_format(path: str) -> Optional[str]:
+    """根据文件头判断音频格式，无法识别时返回None"""
+    with open(path, "rb") as f:
+        head = f.read(12)
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head[:4] == b"OggS":
+        return "ogg"
+    if head[:4] == b"fLaC":
+        return "flac"
+    if head[:3] == b"ID3" or (len(head) >= 2 and head[0] == 0xFF and head[1] >= 0xE0):
+        return "mp3"
+    return None
+
+
+@dataclass(slots=True)
+class VoiceCacheEntry:
+    """缓存索引中的一条记录"""
+
+    ext: str
+    size: int
+    crc: int
+    last_used: float
+
+
+# ==================================================
+# 语音缓存索引
+# ==================================================
+class VoiceCache:
+    """内容寻址的语音缓存
+
+    查找只访问内存中的索引；每个文件在本次运行中第一次命中时校验大小和 CRC32，
+    损坏或丢失的文件会从索引中移除并重新合成。首次使用时扫描一次目录：
+    索引中没有记录的缓存文件（写入索引前中断、旧版本按文本命名）换算缓存键后
+    加入索引，合成中的临时文件只在超过合成超时时间后清理
+    """
+
+    def __init__(self, directory: str, max_bytes: int = VOICE_CACHE_MAX_BYTES):
+        self.directory = str(directory)
+        self.index_path = os.path.join(self.directory, INDEX_FILE_NAME)
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: "OrderedDict[str, VoiceCacheEntry]" = OrderedDict()
+        self._verified: set = set()
+        self._total_bytes = 0
+        self._loaded = False
+        self._dirty = False
+        self._saved_at = 0.0
+        self._lock = threading.RLock()
+
+    # ---------- 路径 ----------
+    def path_for(self, key: str, ext: str) -> str:
+        return os.path.join(self.directory, f"{key}.{ext}")
+
+    def staging_path(self, key: str) -> str:
+        """合成结果写入缓存前的暂存路径"""
+        return os.path.join(self.directory, f"{key}{STAGING_SUFFIX}")
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    # ---------- 索引读写 ----------
+    def _read_index(self) -> Dict[str, VoiceCacheEntry]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return {}
+            return {
+                key: VoiceCacheEntry(str(ext), int(size), int(crc), float(last_used))
+                for key, (ext, size, crc, last_used) in data["entries"].items()
+            }
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"读取语音缓存索引失败，将重新建立: {e}")
+            return {}
+
+    def _ensure_loaded(self):
+        """读取索引并与目录中的文件核对（调用方需持有 self._lock）"""
+        if self._loaded:
+            return
+        self._loaded = True
+        recorded = self._read_index()
+        present: Dict[str, int] = {}
+        adopted: Dict[str, VoiceCacheEntry] = {}
+        try:
+            with os.scandir(self.directory) as it:
+                # 扫描过程中会重命名文件，先取出全部目录项
+                entries = [entry for entry in it if entry.is_file()]
+        except FileNotFoundError:
+            entries = []
+
+        now = time.time()
+        for entry in entries:
+            if entry.name == INDEX_FILE_NAME:
+                continue
+            if _is_staging_file(entry.name):
+                # 可能是其他请求正在合成的文件，超过合成超时时间仍未完成时才清理
+                try:
+                    if now - entry.stat().st_mtime > VOICE_SYNTHESIS_TIMEOUT:
+                        self._remove_file(entry.path)
+                except OSError:
+                    pass
+                continue
+            key, ext = os.path.splitext(entry.name)
+            record = recorded.get(key)
+            if record is not None:
+                if ext == f".{record.ext}":
+                    present[key] = entry.stat().st_size
+                elif ext.lower() in _AUDIO_SUFFIXES:
+                    self._remove_file(entry.path)
+                continue
+            if ext.lower() not in _AUDIO_SUFFIXES:
+                continue
+            result = self._adopt_file(entry.path, key if _is_cache_key(key) else None)
+            if result is not None:
+                adopted[result[0]] = result[1]
+
+        entries_by_age = [
+            (key, record)
+            for key, record in recorded.items()
+            if self._check_recorded(key, record, present)
+        ]
+        valid_keys = {key for key, _ in entries_by_age}
+        for key, record in list(adopted.items()):
+            if key in valid_keys:
+                # 索引中已有有效的缓存
+                self._remove_file(self.path_for(key, record.ext))
+                del adopted[key]
+        entries_by_age.extend(adopted.items())
+        entries_by_age.sort(key=lambda kv: kv[1].last_used)
+        for key, record in entries_by_age:
+            self._entries[key] = record
+            self._total_bytes += record.size
+        if len(self._entries) != len(recorded):
+            self._dirty = True
+        if adopted:
+            logger.info(f"已将{len(adopted)}个未记录的语音缓存文件加入索引")
+        if self._evict():
+            self._dirty = True
+        if self._dirty:
+            self._save()
+
+    def _check_recorded(
+        self, key: str, record: VoiceCacheEntry, present: Dict[str, int]
+    ) -> bool:
+        """检查索引记录的文件是否存在且大小一致，不一致时删除文件"""
+        if present.get(key) == record.size:
+            return True
+        if key in present:
+            self._remove_file(self.path_for(key, record.ext))
+        self._dirty = True
+        return False
+
+    def _adopt_file(
+        self, path: str, key: Optional[str]
+    ) -> Optional[Tuple[str, VoiceCacheEntry]]:
+        """
+        把索引中没有记录的缓存文件加入索引（调用方需持有 self._lock）
+
+        Args:
+            path: 文件路径
+            key: 以缓存键命名的文件（写入索引前中断）传入文件名中的键，
+                旧版本按文本命名的文件传入None，由文件名换算
+
+        Returns:
+            Optional[Tuple[str, VoiceCacheEntry]]: (缓存键, 索引记录)，
+                无法识别的文件返回None（不删除，可能不是缓存文件）
+        """
+        if key is None:
+            key = _legacy_cache_key(os.path.basename(path))
+            if key is None:
+                return None
+        try:
+            ext = _detect_audio_format(path)
+            if ext is None:
+                self._remove_file(path)
+                return None
+            target = self.path_for(key, ext)
+            if os.path.normcase(target) != os.path.normcase(path):
+                if os.path.exists(target):
+                    # 同一文本已有缓存（旧文件名替换特殊字符后重名）
+                    self._remove_file(path)
+                    return None
+                os.replace(path, target)
+            stat = os.stat(target)
+            return key, VoiceCacheEntry(
+                ext, stat.st_size, _file_crc32(target), stat.st_mtime
+            )
+        except OSError as e:
+            logger.debug(f"整理语音缓存文件失败 {path}: {e}")
+            return None
+
+    def _save(self):
+        """写入索引文件（调用方需持有 self._lock）"""
+        data = {
+            "version": INDEX_VERSION,
+            "entries": {
+                key: [e.ext, e.size, e.crc, round(e.last_used, 1)]
+                for key, e in self._entries.items()
+            },
+        }
+        tmp_path = f"{self.index_path}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        except OSError as e:
+            logger.warning(f"保存语音缓存索引失败: {e}")
+
+    def flush(self):
+        """写入尚未保存的访问时间"""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    # ---------- 查找与写入 ----------
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        查找缓存的语音文件
+
+        Args:
+            key: make_voice_cache_key 生成的缓存键
+
+        Returns:
+            Optional[str]: 语音文件路径，未缓存或文件已损坏时返回None
+        """
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            path = self.path_for(key, entry.ext)
+            if key not in self._verified:
+                try:
+                    valid = (
+                        os.path.getsize(path) == entry.size
+                        and _file_crc32(path) == entry.crc
+                    )
+                except OSError:
+                    valid = False
+                if not valid:
+                    logger.warning(f"语音缓存文件已损坏或丢失，将重新合成: {path}")
+                    self._discard(key)
+                    self._save()
+                    return None
+                self._verified.add(key)
+
+            self._entries.move_to_end(key)
+            entry.last_used = time.time()
+            self._dirty = True
+            if time.monotonic() - self._saved_at >= VOICE_CACHE_INDEX_SAVE_INTERVAL:
+                self._save()
+            return path
+
+    def commit(self, key: str, staged_path: str) -> str:
+        """
+        把合成完成的暂存文件加入缓存（可在任意线程调用）
+
+        未压缩的 WAV 会在 soundfile 可用时转码为 VOICE_CACHE_COMPRESS_FORMAT
+
+        Args:
+            key: 缓存键
+            staged_path: 暂存文件路径
+
+        Returns:
+            str: 缓存文件路径
+        """
+        ext = _detect_audio_format(staged_path)
+        if ext is None:
+            self._remove_file(staged_path)
+            raise ValueError(f"无法识别的语音文件格式: {staged_path}")
+        if ext == "wav" and VOICE_CACHE_COMPRESS_FORMAT:
+            ext = self._compress(staged_path, ext)
+
+        path = self.path_for(key, ext)
+        os.replace(staged_path, path)
+        entry = VoiceCacheEntry(
+            ext, os.path.getsize(path), _file_crc32(path), time.time()
+        )
+
+        with self._lock:
+            self._ensure_loaded()
+            previous = self._entries.get(key)
+            if previous is not None:
+                if previous.ext != ext:
+                    self._remove_file(self.path_for(key, previous.ext))
+                self._total_bytes -= previous.size
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._total_bytes += entry.size
+            self._verified.add(key)
+            self._evict(keep=key)
+            self._save()
+        logger.debug(f"语音已写入缓存: {path}")
+        return path
+
+    def _compress(self, staged_path: str, ext: str) -> str:
+        """把暂存的 WAV 转码为压缩格式（原地替换暂存文件），返回最终的扩展名"""
+        if not sf.is_available():
+            return ext
+        target = VOICE_CACHE_COMPRESS_FORMAT.lower()
+        temp_path = f"{staged_path}.{target}"
+        try:
+            data, samplerate = sf.read(staged_path, dtype="float32")
+            sf.write(temp_path, data, samplerate, format=VOICE_CACHE_COMPRESS_FORMAT)
+            os.replace(temp_path, staged_path)
+            return target
+        except Exception as e:
+            logger.warning(f"语音缓存转码失败，保存为原格式: {e}")
+            self._remove_file(temp_path)
+            return ext
+
+    def invalidate(self, key: str):
+        """移除一条缓存"""
+        with self._lock:
+            self._ensure_loaded()
+            if key in self._entries:
+                self._discard(key)
+                self._save()
+
+    # ---------- 清理 ----------
+    def _discard(self, key: str):
+        """移除索引记录和文件（调用方需持有 self._lock）"""
+        entry = self._entries.pop(key)
+        self._verified.discard(key)
+        self._total_bytes -= entry.size
+        self._remove_file(self.path_for(key, entry.ext))
+
+    def _evict(self, keep: Optional[str] = None) -> bool:
+        """按最近最少使用的顺序清理，直到不超过空间上限（调用方需持有 self._lock）"""
+        evicted = False
+        while self._total_bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            if key == keep:
+                if len(self._entries) == 1:
+                    break
+                self._entries.move_to_end(key)
+                continue
+            self._discard(key)
+            evicted = True
+        if evicted:
+            logger.debug(f"语音缓存已清理，当前占用 {self._total_bytes} 字节")
+        return evicted
+
+    @staticmethod
+    def _remove_file(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            # 正在播放的文件在 Windows 上无法删除，下次启动扫描目录时再清理
+            logger.debug(f"删除语音缓存文件失败 {path}: {e}")
+
+
+# ==================================================
+# 全局实例
+# ==================================================
+_voice_caches: Dict[str, VoiceCache] = {}
+_voice_caches_lock = threading.Lock()
+
+
+def get_voice_cache(directory: str) -> VoiceCache:
+    """
+    获取语音缓存（同一目录共用一个实例）
+
+    Args:
+        directory: 缓存目录
+
+    Returns:
+        VoiceCache: 语音缓存
+    """
+    directory = os.path.abspath(str(directory))
+    cache = _voice_caches.get(directory)
+    if cache is None:
+        with _voice_caches_lock:
+            cache = _voice_caches.get(directory)
+            if cache is None:
+                cache = VoiceCache(directory)
+                _voice_caches[directory] = cache
+    return cache
+
+
+def _flush_voice_caches():
+    for cache in list(_voice_caches.values()):
+        cache.flush()
+
+
+# 正常退出时写入尚未保存的访问时间
+atexit.register(_flush_voice_caches)
@@ -4,7 +4,7 @@ from loguru import logger
 from app.tools.settings_default import manage_settings_file
 from app.tools.config import remove_record
 from app.tools.settings_access import readme_settings_async
-from app.tools.update_utils import check_for_updates_on_startup
+from app.tools.startup_profiler import profile_phase
 from app.tools.variable import APP_INIT_DELAY
 from app.core.font_manager import (
     apply_font_settings,
@@ -31,6 +31,17 @@ class AppInitializer:
         self._schedule_initialization_tasks()
         logger.debug("应用初始化调度已启动，主窗口将在延迟后创建")
 
+    def _run_task(self, name: str, func, error_message: str) -> None:
+        """执行一个初始化任务（启用启动性能分析时记录耗时）
+
+        Args:
+            name: 任务名称（用于启动性能分析报告）
+            func: 任务函数
+            error_message: 任务失败时的日志信息
+        """
+        with profile_phase(name):
+            safe_execute(func, error_message=error_message)
+
     def _manage_settings_file(self) -> None:
         """管理设置文件，确保其存在且完整"""
         manage_settings_file()
@@ -41,14 +52,17 @@ class AppInitializer:
         self._load_theme()
         self._load_theme_color()
         self._clear_restart_record()
+        self._migrate_history_storage()
         self._check_updates()
+        self._start_class_schedule_service()
+        self._start_warmup()
         self._create_main_window()
 
     def _load_theme(self) -> None:
         """加载主题设置"""
         QTimer.singleShot(
             APP_INIT_DELAY,
-            lambda: safe_execute(self._apply_theme, error_message="加载主题失败"),
+            lambda: self._run_task("load_theme", self._apply_theme, "加载主题失败"),
         )
 
     def _apply_theme(self) -> None:
@@ -70,11 +84,12 @@ class AppInitializer:
 
         QTimer.singleShot(
             APP_INIT_DELAY,
-            lambda: safe_execute(
+            lambda: self._run_task(
+                "load_theme_color",
                 lambda: setThemeColor(
                     readme_settings_async("basic_settings", "theme_color")
                 ),
-                error_message="加载主题颜色失败",
+                "加载主题颜色失败",
             ),
         )
 
@@ -82,18 +97,66 @@ class AppInitializer:
         """清除重启记录"""
         QTimer.singleShot(
             APP_INIT_DELAY,
-            lambda: safe_execute(
+            lambda: self._run_task(
+                "clear_restart_record",
                 lambda: remove_record("", "", "", "restart"),
-                error_message="清除重启记录失败",
+                "清除重启记录失败",
+            ),
+        )
+
+    def _migrate_history_storage(self) -> None:
+        """在后台迁移历史记录存储格式（只在首次运行新版本时执行）"""
+        import threading
+
+        from app.common.history.file_utils import migrate_history_storage
+
+        QTimer.singleShot(
+            APP_INIT_DELAY,
+            lambda: self._run_task(
+                "migrate_history_storage",
+                lambda: threading.Thread(
+                    target=migrate_history_storage,
+                    daemon=True,
+                    name="HistoryMigrateThread",
+                ).start(),
+                "迁移历史记录存储失败",
             ),
         )
 
     def _check_updates(self) -> None:
-        """检查是否需要安装更新"""
+        """检查是否需要安装更新（更新模块及其网络库在此时才导入）"""
+
+        def check_updates():
+            from app.tools.update_utils import check_for_updates_on_startup
+
+            check_for_updates_on_startup(None)
+
         QTimer.singleShot(
             APP_INIT_DELAY,
-            lambda: safe_execute(
-                lambda: check_for_updates_on_startup(None), error_message="检查更新失败"
+            lambda: self._run_task("check_updates", check_updates, "检查更新失败"),
+        )
+
+    def _start_class_schedule_service(self) -> None:
+        """启动课程时间调度服务（在主线程中创建，按课程边界定时）"""
+        from app.common.extraction.class_schedule import get_class_schedule_service
+
+        QTimer.singleShot(
+            APP_INIT_DELAY,
+            lambda: self._run_task(
+                "start_class_schedule_service",
+                get_class_schedule_service,
+                "启动课程时间调度服务失败",
+            ),
+        )
+
+    def _start_warmup(self) -> None:
+        """在后台预热默认班级和奖池的名单、统计、内幕设置与课程表缓存"""
+        from app.core.startup_warmup import start_startup_warmup
+
+        QTimer.singleShot(
+            APP_INIT_DELAY,
+            lambda: self._run_task(
+                "start_warmup", start_startup_warmup, "启动预热失败"
             ),
         )
 
@@ -103,8 +166,10 @@ class AppInitializer:
         init_delay = 0 if not guide_completed else APP_INIT_DELAY
         QTimer.singleShot(
             init_delay,
-            lambda: safe_execute(
-                self.window_manager.create_main_window, error_message="创建主窗口失败"
+            lambda: self._run_task(
+                "create_main_window",
+                self.window_manager.create_main_window,
+                "创建主窗口失败",
             ),
         )
 
@@ -114,5 +179,7 @@ class AppInitializer:
         init_delay = 0 if not guide_completed else APP_INIT_DELAY
         QTimer.singleShot(
             init_delay,
-            lambda: safe_execute(apply_font_settings, error_message="应用字体设置失败"),
+            lambda: self._run_task(
+                "apply_font_settings", apply_font_settings, "应用字体设置失败"
+            ),
         )
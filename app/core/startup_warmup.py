@@ -0,0 +1,222 @@
+# ==================================================
+# 导入库
+# ==================================================
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from loguru import logger
+
+from app.tools.settings_access import readme_settings_async
+
+
+# ==================================================
+# 预热阶段
+# ==================================================
+@dataclass(slots=True)
+class WarmupStage:
+    """一个预热阶段的执行状态"""
+
+    name: str  # 阶段名称（用于日志）
+    status: str = "pending"  # pending / running / done / failed
+    elapsed_ms: float = 0.0  # 执行耗时（毫秒）
+
+
+_warmup_lock = threading.Lock()
+_warmup_stages: List[WarmupStage] = []
+_warmup_thread: Optional[threading.Thread] = None
+
+
+def _resolve_default_class() -> Optional[str]:
+    """获取启动后点名页面会选中的班级（默认班级不存在时为第一个班级）"""
+    from app.common.data.list import get_class_name_list
+
+    class_list = get_class_name_list()
+    if not class_list:
+        return None
+    default_class = readme_settings_async("roll_call_settings", "default_class")
+    return default_class if default_class in class_list else class_list[0]
+
+
+def _resolve_default_pool() -> Optional[str]:
+    """获取启动后抽奖页面会选中的奖池（默认奖池不存在时为第一个奖池）"""
+    from app.common.data.list import get_pool_name_list
+
+    pool_list = get_pool_name_list()
+    if not pool_list:
+        return None
+    default_pool = readme_settings_async("lottery_settings", "default_pool")
+    return default_pool if default_pool in pool_list else pool_list[0]
+
+
+def _warm_language():
+    """加载当前语言的文本表"""
+    from app.Language.obtain_language import get_content_combo_name_async
+
+    get_content_combo_name_async("roll_call", "range_combobox")
+    get_content_combo_name_async("lottery", "list_combobox")
+
+
+def _warm_roll_call(class_name: str):
+    """解析默认班级名单并加载其抽取统计索引"""
+    from app.common.data.list import get_class_roster
+    from app.common.history.stats_index import load_roll_call_stats_index
+
+    get_class_roster(class_name)
+    load_roll_call_stats_index(class_name)
+
+
+def _warm_lottery(pool_name: str):
+    """解析默认奖池名单并加载其抽奖统计索引"""
+    from app.common.data.list import get_pool_list
+    from app.common.history.stats_index import load_lottery_stats_index
+
+    get_pool_list(pool_name)
+    load_lottery_stats_index(pool_name)
+
+
+def _warm_history_store(sources: List[Tuple[str, str]]):
+    """同步默认班级和奖池在历史记录查询库中的抽取记录"""
+    from app.common.history.history_store import get_history_store
+
+    store = get_history_store()
+    for history_type, source in sources:
+        store.warm_source(history_type, source)
+
+
+def _warm_behind_scenes():
+    """解密内幕设置"""
+    from app.common.behind_scenes.behind_scenes_utils import BehindScenesUtils
+
+    BehindScenesUtils.get_behind_scenes_settings()
+
+
+def _warm_timetable():
+    """编译CSES课程表（课程时间来源为CSES文件时）"""
+    if readme_settings_async("linkage_settings", "data_source") != 1:
+        return
+    from app.common.extraction.cses_timetable import get_compiled_timetable
+
+    get_compiled_timetable()
+
+
+def _warm_image_indexes():
+    """扫描开启了头像显示的图片目录"""
+    from app.common.display.avatar_cache import get_image_index
+
+    for settings_group, folder in (
+        ("roll_call_settings", "student_images"),
+        ("lottery_settings", "prize_images"),
+    ):
+        if readme_settings_async(settings_group, "student_image"):
+            get_image_index(folder).refresh()
+
+
+def _build_stages() -> List[Tuple[str, Callable[[], None]]]:
+    """按默认班级和奖池生成预热阶段"""
+    stages: List[Tuple[str, Callable[[], None]]] = [("语言", _warm_language)]
+    sources: List[Tuple[str, str]] = []
+
+    class_name = _resolve_default_class()
+    if class_name:
+        stages.append((f"班级 {class_name}", lambda: _warm_roll_call(class_name)))
+        sources.append(("roll_call", class_name))
+
+    pool_name = _resolve_default_pool()
+    if pool_name:
+        stages.append((f"奖池 {pool_name}", lambda: _warm_lottery(pool_name)))
+        sources.append(("lottery", pool_name))
+
+    if sources:
+        stages.append(("历史记录", lambda: _warm_history_store(sources)))
+    stages.append(("内幕设置", _warm_behind_scenes))
+    stages.append(("课程表", _warm_timetable))
+    stages.append(("头像图片", _warm_image_indexes))
+    return stages
+
+
+def _get_elapsed_since_start() -> Optional[float]:
+    """获取距离程序启动的时间（秒），启动时间未记录时返回None"""
+    from app.core import window_manager
+
+    start_time = getattr(window_manager, "app_start_time", 0)
+    if not start_time:
+        return None
+    return time.perf_counter() - start_time
+
+
+def _run_warmup(stages: List[Tuple[str, Callable[[], None]]]):
+    """依次执行预热阶段（后台线程）"""
+    started = time.perf_counter()
+    for index, (_, func) in enumerate(stages):
+        stage = _warmup_stages[index]
+        stage.status = "running"
+        stage_started = time.perf_counter()
+        try:
+            func()
+            stage.status = "done"
+        except Exception as e:
+            stage.status = "failed"
+            logger.warning(f"启动预热阶段 {stage.name} 失败: {e}")
+        stage.elapsed_ms = (time.perf_counter() - stage_started) * 1000
+
+    elapsed = time.perf_counter() - started
+    since_start = _get_elapsed_since_start()
+    suffix = f"，距启动 {since_start:.3f}s" if since_start is not None else ""
+    logger.debug(f"启动预热完成，耗时 {elapsed:.3f}s{suffix}: {get_warmup_summary()}")
+
+
+# ==================================================
+# 启动与查询
+# ==================================================
+def start_startup_warmup() -> bool:
+    """在后台线程中预热首次抽取需要的数据
+
+    解析默认班级名单和默认奖池，加载抽取统计索引，同步历史记录查询库，
+    解密内幕设置并编译课程表，结果保存在各模块的共享缓存中，
+    首次抽取时直接命中缓存。每个进程只执行一次
+
+    Returns:
+        bool: 本次调用启动了预热线程时返回True
+    """
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is not None:
+            return False
+        stages = _build_stages()
+        _warmup_stages[:] = [WarmupStage(name) for name, _ in stages]
+        _warmup_thread = threading.Thread(
+            target=_run_warmup,
+            args=(stages,),
+            daemon=True,
+            name="StartupWarmupThread",
+        )
+    _warmup_thread.start()
+    return True
+
+
+def get_warmup_stages() -> List[WarmupStage]:
+    """获取预热阶段的状态（副本）"""
+    return [
+        WarmupStage(stage.name, stage.status, stage.elapsed_ms)
+        for stage in _warmup_stages
+    ]
+
+
+def get_warmup_summary() -> str:
+    """获取预热进度的描述文本，用于启动日志"""
+    stages = get_warmup_stages()
+    if not stages:
+        return "未开始"
+    finished = sum(1 for stage in stages if stage.status in ("done", "failed"))
+    details = []
+    for stage in stages:
+        if stage.status in ("done", "failed"):
+            mark = "" if stage.status == "done" else "失败 "
+            details.append(f"{stage.name} {mark}{stage.elapsed_ms:.0f}ms")
+        else:
+            details.append(
+                f"{stage.name} {'进行中' if stage.status == 'running' else '等待'}"
+            )
+    return f"{finished}/{len(stages)}（{', '.join(details)}）"
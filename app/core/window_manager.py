@@ -613,8 +613,14 @@ class WindowManager:
         try:
             import time
 
+            from app.core.startup_warmup import get_warmup_summary
+            from app.tools.startup_profiler import finish_startup_profile, mark
+
             elapsed = time.perf_counter() - app_start_time
             logger.debug(f"主窗口创建完成，启动耗时: {elapsed:.3f}s")
+            logger.debug(f"启动预热进度: {get_warmup_summary()}")
+            mark("main_window_created")
+            finish_startup_profile()
         except Exception as e:
             logger.exception("计算启动耗时出错（已忽略）: {}", e)
 
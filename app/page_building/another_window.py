@@ -4,12 +4,10 @@ from loguru import logger
 from app.page_building.page_template import PageTemplate
 from app.page_building.window_template import SimpleWindowTemplate
 from app.view.another_window.contributor import contributor_page
-from app.view.another_window.student.import_student_name import ImportStudentNameWindow
 from app.view.another_window.student.set_class_name import SetClassNameWindow
 from app.view.another_window.student.name_setting import NameSettingWindow
 from app.view.another_window.student.gender_setting import GenderSettingWindow
 from app.view.another_window.student.group_setting import GroupSettingWindow
-from app.view.another_window.prize.import_prize_name import ImportPrizeNameWindow
 from app.view.another_window.prize.set_pool_name import SetPoolNameWindow
 from app.view.another_window.prize.prize_name_setting import PrizeNameSettingWindow
 from app.view.another_window.prize.prize_weight_setting import PrizeWeightSettingWindow
@@ -136,6 +134,11 @@ class import_student_name_window_template(PageTemplate):
 
     def __init__(self, parent=None, class_name=None):
         def factory(parent):
+            # 名单导入窗口（及其依赖的 pandas 等表格库）在首次打开时才导入
+            from app.view.another_window.student.import_student_name import (
+                ImportStudentNameWindow,
+            )
+
             return ImportStudentNameWindow(parent=parent, class_name=class_name)
 
         factory.__name__ = "ImportStudentNameWindow"
@@ -342,6 +345,11 @@ class import_prize_name_window_template(PageTemplate):
 
     def __init__(self, parent=None, pool_name=None):
         def factory(parent):
+            # 奖品导入窗口（及其依赖的 pandas 等表格库）在首次打开时才导入
+            from app.view.another_window.prize.import_prize_name import (
+                ImportPrizeNameWindow,
+            )
+
             return ImportPrizeNameWindow(parent=parent, pool_name=pool_name)
 
         factory.__name__ = "ImportPrizeNameWindow"
@@ -30,7 +30,12 @@ from app.tools.path_utils import (
     get_path,
 )
 from app.tools.personalised import get_theme_icon
-from app.tools.settings_access import readme_settings_async
+from app.tools.settings_access import (
+    discard_pending_settings,
+    flush_settings,
+    readme_settings_async,
+    replace_settings,
+)
 from app.common.data.list import get_student_list, get_group_list
 from app.tools.variable import (
     SPECIAL_VERSION,
@@ -654,6 +659,8 @@ def export_settings(parent: Optional[QWidget] = None) -> None:
         )
 
         if file_path:
+            # 先写入尚未落盘的设置，导出的文件与当前设置一致
+            flush_settings()
             Path(file_path).write_text(
                 Path(settings_path).read_text(encoding="utf-8"), encoding="utf-8"
             )
@@ -762,9 +769,8 @@ def import_settings(parent: Optional[QWidget] = None) -> None:
             )
 
             if dialog.exec():
-                settings_path = get_settings_path()
-                with open(settings_path, "w", encoding="utf-8") as f:
-                    json.dump(imported_settings, f, ensure_ascii=False, indent=4)
+                # 丢弃尚未落盘的设置，避免稍后的延迟写入覆盖导入的值
+                replace_settings(imported_settings)
 
                 success_dialog = MessageBox(
                     get_any_position_value_async(
@@ -957,6 +963,7 @@ def _export_diagnostic_files(file_path: str, app_dir: Path) -> int:
     ]
 
     exported_count = 0
+    flush_settings()
 
     with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as zipf:
         for folder_path in export_folders:
@@ -1293,6 +1300,7 @@ def export_all_data(parent: Optional[QWidget] = None) -> None:
             ("images", get_data_path("images")),
             ("logs", get_path(LOG_DIR)),
         ]
+        flush_settings()
 
         with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as zipf:
             version_info = {
@@ -1661,6 +1669,12 @@ def _extract_data_files(file_path: str) -> list:
     logs_root = get_path(LOG_DIR).resolve()
 
     with zipfile.ZipFile(file_path, "r") as zipf:
+        _reset_imported_history(zipf.namelist())
+        settings_member = f"config/{get_settings_path().name}"
+        if settings_member in zipf.namelist():
+            # 设置文件将被覆盖，尚未落盘的设置不能再写回
+            discard_pending_settings()
+
         for member in zipf.namelist():
             if member == "version.json":
                 continue
@@ -1719,6 +1733,39 @@ def _extract_data_files(file_path: str) -> list:
     return skipped_files
 
 
+def _reset_imported_history(members: list) -> None:
+    """删除压缩包中包含的历史记录在本地的全部文件
+
+    历史记录由快照和事件日志组成，读取时会在快照上重放事件日志。
+    只覆盖快照会让本地旧的事件日志重放到导入的快照上，因此先整体删除
+    （同时清除统计索引和查询库中的数据），再由压缩包写入快照和日志
+    """
+    from app.common.history.file_utils import (
+        HISTORY_EVENT_LOG_SUFFIX,
+        delete_history_data,
+    )
+
+    history_names = set()
+    for member in members:
+        parts = Path(member).parts
+        if len(parts) != 3 or parts[0] != "history":
+            continue
+        if not parts[1].endswith("_history"):
+            continue
+        file_name = parts[2]
+        for suffix in (".json", HISTORY_EVENT_LOG_SUFFIX):
+            if file_name.endswith(suffix):
+                history_names.add(
+                    (parts[1][: -len("_history")], file_name[: -len(suffix)])
+                )
+
+    for history_type, file_name in sorted(history_names):
+        try:
+            delete_history_data(history_type, file_name)
+        except Exception as e:
+            logger.warning(f"清除本地历史记录失败 {history_type}/{file_name}: {e}")
+
+
 # ==================== 记录管理模块 ====================
 
 
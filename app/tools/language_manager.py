@@ -3,10 +3,12 @@
 # ==================================================
 import os
 import json
-from typing import Dict, Optional, Any, List
+import threading
+from collections.abc import Mapping
+from typing import Dict, Optional, Any, List, Iterator
 from loguru import logger
 
-from app.tools.path_utils import get_path, get_data_path
+from app.tools.path_utils import get_path, get_data_path, get_file_signature
 from app.tools.settings_access import readme_settings
 
 # from app.Language.ZH_CN import ZH_CN
@@ -15,46 +17,156 @@ import importlib
 import importlib.util
 import pkgutil
 
-from app.tools.variable import LANGUAGE_MODULE_DIR
+from app.tools.variable import LANGUAGE_CACHE_DIR, LANGUAGE_MODULE_DIR, VERSION
+
+# 语言缓存文件格式版本，合并规则变化时递增使旧缓存失效
+LANGUAGE_CACHE_VERSION = 1
+
+
+def _is_language_code(key: Any) -> bool:
+    """判断字典键是否为语言代码（如 "ZH_CN"、"EN_US"）"""
+    return isinstance(key, str) and key.isupper() and "_" in key
+
+
+def _read_cache_file(path: str) -> Optional[Dict[str, Any]]:
+    """读取语言缓存文件，文件不存在或已损坏时返回None"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and data.get("version") == LANGUAGE_CACHE_VERSION:
+            return data
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.debug(f"读取语言缓存 {path} 失败，将重新生成: {e}")
+    return None
+
+
+def _write_cache_file(path: str, data: Dict[str, Any]) -> None:
+    """写入语言缓存文件（先写临时文件再替换，避免留下不完整的缓存）"""
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": LANGUAGE_CACHE_VERSION, **data},
+                f,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.debug(f"写入语言缓存 {path} 失败: {e}")
+
+
+# ==================================================
+# 按需加载的语言数据
+# ==================================================
+class LanguageData(Mapping):
+    """某一语言的数据（只读映射）
+
+    第一层的键为分类（如 "roll_call"），首次访问某个分类时才加载定义它的
+    语言模块，同一模块中的其他分类随之一并加载
+    """
+
+    def __init__(self, manager: "SimpleLanguageManager", language_code: str):
+        self._manager = manager
+        self._language_code = language_code
+        self._sections: Dict[str, Any] = {}
+        self._loaded_modules: set[str] = set()
+
+    def _load_section(self, key: Any) -> bool:
+        """确保分类所在的模块已加载，返回分类是否存在"""
+        if key in self._sections:
+            return True
+        module_name = self._manager.get_section_module(key)
+        if module_name is None:
+            return False
+        with self._manager.lock:
+            if module_name not in self._loaded_modules:
+                self._sections.update(
+                    self._manager.load_module_sections(self._language_code, module_name)
+                )
+                self._loaded_modules.add(module_name)
+        return key in self._sections
+
+    def _load_all(self) -> None:
+        """加载全部模块（遍历所有分类时使用）"""
+        for key in self._manager.get_section_names():
+            self._load_section(key)
+
+    def __getitem__(self, key: str) -> Any:
+        if not self._load_section(key):
+            raise KeyError(key)
+        return self._sections[key]
+
+    def __contains__(self, key: object) -> bool:
+        return self._load_section(key)
+
+    def __iter__(self) -> Iterator[str]:
+        self._load_all()
+        return iter(list(self._sections))
+
+    def __len__(self) -> int:
+        self._load_all()
+        return len(self._sections)
 
 
 # ==================================================
 # 简化的语言管理器类
 # ==================================================
 class SimpleLanguageManager:
-    """负责获取当前语言和全部语言"""
+    """负责获取当前语言和全部语言
+
+    启动时只读取语言清单（可用的语言代码、每个分类所在的模块和语言信息），
+    语言数据在首次访问时按模块加载，合并结果按模块文件的修改时间和大小
+    缓存在磁盘上，模块未变化时无需导入语言模块
+    """
 
     def __init__(self):
         self._current_language: Optional[str] = None
+        self.lock = threading.RLock()
 
-        # 从模块文件动态扫描所有可用语言并合并
-        self._loaded_languages: Dict[str, Dict[str, Any]] = {}
-        self._load_languages_from_modules()
+        # 语言模块 {模块名: 文件路径（打包环境为None）}
+        self._module_entries: Dict[str, Optional[str]] = dict(
+            self._get_module_entries()
+        )
+        self._cache_dir = str(get_path(LANGUAGE_CACHE_DIR))
 
-        # 加载data/Language文件夹下的所有语言文件
-        self._load_all_languages()
+        # 语言清单：分类所在模块、模块中的语言及其信息
+        self._section_modules: Dict[str, str] = {}
+        self._module_languages: Dict[str, Dict[str, Any]] = {}
+        self._load_manifest()
 
-    def _get_available_languages_from_modules(self) -> set[str]:
-        """
-        扫描模块文件，获取所有可用的语言代码
+        # data/Language 文件夹下的语言文件 {语言代码: 文件路径}
+        self._json_language_files: Dict[str, str] = self._get_json_language_files()
+
+        # 已创建的语言数据 {语言代码: 语言数据}
+        self._language_data: Dict[str, Mapping] = {}
+
+    # ------------------------------------------------------------------
+    # 语言模块
+    # ------------------------------------------------------------------
+    def _get_module_entries(self) -> List[tuple[str, Optional[str]]]:
+        """枚举语言模块
 
         Returns:
-            语言代码集合
+            (模块名, 文件路径) 列表，打包环境中文件路径为None
         """
-        available_languages: set[str] = set()
-        language_dir = get_path(LANGUAGE_MODULE_DIR)
-
         module_entries: List[tuple[str, Optional[str]]] = []
+        language_dir = get_path(LANGUAGE_MODULE_DIR)
 
         if os.path.isdir(language_dir):
+            # 开发环境：直接从文件系统查找
             language_module_files = glob.glob(os.path.join(language_dir, "*.py"))
-            for file_path in language_module_files:
+            for file_path in sorted(language_module_files):
                 if file_path.endswith("__init__.py"):
                     continue
                 module_entries.append(
                     (os.path.splitext(os.path.basename(file_path))[0], file_path)
                 )
         else:
+            # 打包环境：利用包信息进行枚举
             try:
                 language_package = importlib.import_module("app.Language.modules")
                 discovered = {
@@ -69,58 +181,54 @@ class SimpleLanguageManager:
                     module_entries.extend(
                         (module_name, None) for module_name in sorted(discovered)
                     )
+                else:
+                    logger.warning("未能通过 pkgutil.walk_packages 发现语言模块")
             except Exception as e:
                 logger.exception(f"枚举语言模块失败: {e}")
 
-        # 扫描所有模块，收集语言代码
-        for module_name, file_path in module_entries:
-            try:
-                try:
-                    module = __import__(
-                        f"app.Language.modules.{module_name}",
-                        fromlist=[module_name],
-                    )
-                except ImportError:
-                    if not file_path:
-                        raise
-                    spec = importlib.util.spec_from_file_location(
-                        module_name, file_path
-                    )
-                    if spec is None or spec.loader is None:
-                        continue
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-
-                for attr_name in dir(module):
-                    attr_value = getattr(module, attr_name)
-                    if isinstance(attr_value, dict):
-                        # 收集字典中的所有语言代码键
-                        for key in attr_value.keys():
-                            if isinstance(key, str) and key.isupper() and "_" in key:
-                                available_languages.add(key)
-            except Exception as e:
-                logger.debug(f"扫描模块 {module_name} 时出错: {e}")
-                continue
-
-        # 确保至少有 ZH_CN
-        available_languages.add("ZH_CN")
-        return available_languages
-
-    def _load_languages_from_modules(self) -> None:
-        """从模块文件加载所有语言"""
-        available_languages = self._get_available_languages_from_modules()
-
-        # 首先加载 ZH_CN 作为基础
-        zh_cn_merged = self._merge_language_files("ZH_CN", None)
-        self._loaded_languages["ZH_CN"] = zh_cn_merged
-
-        # 然后加载其他语言，以 ZH_CN 为基础进行深度合并
-        for language_code in available_languages:
-            if language_code == "ZH_CN":
+        if not module_entries:
+            logger.warning("未找到任何语言模块")
+        return module_entries
+
+    def _get_module_signature(self, module_name: str) -> Any:
+        """获取语言模块的版本标识（打包环境中模块随软件版本变化）"""
+        file_path = self._module_entries.get(module_name)
+        if not file_path:
+            return VERSION
+        signature = get_file_signature(file_path)
+        return list(signature) if signature is not None else None
+
+    def _import_module(self, module_name: str):
+        """导入语言模块"""
+        file_path = self._module_entries.get(module_name)
+        try:
+            # 优先使用标准导入（适用于打包环境）
+            return __import__(
+                f"app.Language.modules.{module_name}",
+                fromlist=[module_name],
+            )
+        except ImportError:
+            if not file_path:
+                raise
+            # 如果直接导入失败且存在文件路径，使用动态加载（开发环境）
+            spec = importlib.util.spec_from_file_location(module_name, file_path)
+            if spec is None or spec.loader is None:
+                raise
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            return module
+
+    @staticmethod
+    def _iter_language_dicts(module) -> Iterator[tuple[str, Dict[str, Any]]]:
+        """遍历模块中以语言代码为键的字典"""
+        for attr_name in dir(module):
+            if attr_name.startswith("__"):
                 continue
-            merged = self._merge_language_files(language_code, zh_cn_merged)
-            if merged:
-                self._loaded_languages[language_code] = merged
+            attr_value = getattr(module, attr_name)
+            if isinstance(attr_value, dict) and any(
+                _is_language_code(key) for key in attr_value
+            ):
+                yield attr_name, attr_value
 
     def _deep_merge(
         self, base: Dict[str, Any], override: Dict[str, Any]
@@ -153,145 +261,186 @@ class SimpleLanguageManager:
 
         return result
 
-    def _merge_language_files(
-        self,
-        language_code: Optional[str],
-        base_language: Optional[Dict[str, Any]] = None,
-    ) -> Dict[str, Any]:
+    def _merge_section(
+        self, section: Dict[str, Any], language_code: str
+    ) -> Optional[Any]:
         """
-        从模块化语言文件中合并生成完整的语言字典
+        获取分类在指定语言下的数据：以 ZH_CN 为基础深度合并目标语言，
+        目标语言不存在时回退到 ZH_CN
 
         Args:
-            language_code: 语言代码，默认为"ZH_CN"
+            section: 以语言代码为键的分类字典
+            language_code: 语言代码
 
         Returns:
-            合并后的语言字典
+            合并后的分类数据，两种语言都不存在时返回None
         """
-        merged = {}
-        language_code = "ZH_CN" if not language_code else language_code
-        language_dir = get_path(LANGUAGE_MODULE_DIR)
-
-        module_entries: List[tuple[str, Optional[str]]] = []
-
-        if os.path.isdir(language_dir):
-            # 开发环境：直接从文件系统查找
-            language_module_files = glob.glob(os.path.join(language_dir, "*.py"))
-            for file_path in language_module_files:
-                if file_path.endswith("__init__.py"):
-                    continue
-                module_entries.append(
-                    (os.path.splitext(os.path.basename(file_path))[0], file_path)
-                )
-        else:
-            # 打包环境：利用包信息进行枚举
-            logger.warning(f"语言模块目录不存在: {language_dir}")
-            try:
-                language_package = importlib.import_module("app.Language.modules")
-                discovered = {
-                    name.rsplit(".", 1)[-1]
-                    for _, name, is_pkg in pkgutil.walk_packages(
-                        getattr(language_package, "__path__", []),
-                        language_package.__name__ + ".",
-                    )
-                    if not is_pkg and not name.endswith(".__init__")
-                }
-                if discovered:
-                    module_entries.extend(
-                        (module_name, None) for module_name in sorted(discovered)
-                    )
-                else:
-                    logger.warning("未能通过 pkgutil.walk_packages 发现语言模块")
-            except Exception as discovery_error:
-                logger.exception(f"枚举语言模块失败: {discovery_error}")
-
-        if not module_entries:
-            logger.warning("未找到任何语言模块，返回空语言数据")
-            return merged
-
-        # 遍历所有模块并导入
-        for module_name, file_path in module_entries:
+        target_data = section.get(language_code)
+        zh_cn_data = section.get("ZH_CN")
+        if target_data is not None:
+            if language_code != "ZH_CN" and isinstance(zh_cn_data, dict):
+                return self._deep_merge(zh_cn_data, target_data)
+            return target_data
+        return zh_cn_data
+
+    # ------------------------------------------------------------------
+    # 语言清单
+    # ------------------------------------------------------------------
+    def _load_manifest(self) -> None:
+        """加载语言清单，模块文件变化后重新扫描全部模块"""
+        signature = {
+            module_name: self._get_module_signature(module_name)
+            for module_name in self._module_entries
+        }
+        manifest_path = os.path.join(self._cache_dir, "manifest.json")
+        manifest = _read_cache_file(manifest_path)
+        if manifest is None or manifest.get("signature") != signature:
+            manifest = self._build_manifest()
+            _write_cache_file(manifest_path, {"signature": signature, **manifest})
+            logger.debug("已重新生成语言清单")
+
+        self._section_modules = dict(manifest.get("sections", {}))
+        self._module_languages = dict(manifest.get("languages", {}))
+        self._module_languages.setdefault("ZH_CN", {})
+
+    def _build_manifest(self) -> Dict[str, Any]:
+        """导入全部语言模块，收集分类所在模块、可用语言代码和语言信息"""
+        sections: Dict[str, str] = {}
+        language_codes: set[str] = {"ZH_CN"}
+        language_info_section: Optional[Dict[str, Any]] = None
+
+        for module_name in self._module_entries:
             try:
-                # 优先使用标准导入（适用于打包环境）
-                try:
-                    module = __import__(
-                        f"app.Language.modules.{module_name}",
-                        fromlist=[module_name],
-                    )
-                except ImportError:
-                    if not file_path:
-                        raise
-                    # 如果直接导入失败且存在文件路径，使用动态加载（开发环境）
-                    spec = importlib.util.spec_from_file_location(
-                        module_name, file_path
-                    )
-                    if spec is None:
-                        logger.warning(f"无法创建模块规范: {file_path}")
-                        continue
-
-                    module = importlib.util.module_from_spec(spec)
-                    if spec.loader is None:
-                        logger.warning(f"模块加载器为空: {file_path}")
-                        continue
-
-                    spec.loader.exec_module(module)
-
-                # 遍历模块中的所有属性
-                for attr_name in dir(module):
-                    attr_value = getattr(module, attr_name)
-                    # 如果属性是字典
-                    if isinstance(attr_value, dict):
-                        # 获取目标语言的数据
-                        target_data = attr_value.get(language_code)
-                        zh_cn_data = attr_value.get("ZH_CN")
-
-                        if target_data is not None:
-                            if base_language is not None and attr_name in base_language:
-                                # 以 ZH_CN 为基础，深度合并目标语言
-                                merged[attr_name] = self._deep_merge(
-                                    base_language[attr_name], target_data
-                                )
-                            else:
-                                merged[attr_name] = target_data
-                        elif language_code != "ZH_CN" and zh_cn_data is not None:
-                            # 目标语言不存在，回退到 ZH_CN
-                            merged[attr_name] = zh_cn_data
-
+                module = self._import_module(module_name)
             except Exception as e:
-                logger.exception(f"导入语言模块 {file_path} 时出错: {e}")
+                logger.exception(f"导入语言模块 {module_name} 时出错: {e}")
                 continue
+            for attr_name, attr_value in self._iter_language_dicts(module):
+                sections[attr_name] = module_name
+                language_codes.update(
+                    key for key in attr_value if _is_language_code(key)
+                )
+                if attr_name == "translate_JSON_file":
+                    language_info_section = attr_value
+
+        # ZH_CN 排在最前，其余语言按代码排序
+        languages: Dict[str, Any] = {}
+        for language_code in ["ZH_CN"] + sorted(language_codes - {"ZH_CN"}):
+            info = None
+            if language_info_section is not None:
+                info = self._merge_section(language_info_section, language_code)
+            languages[language_code] = info if isinstance(info, dict) else {}
+        return {"sections": sections, "languages": languages}
+
+    def get_section_module(self, section: Any) -> Optional[str]:
+        """获取定义某个分类的语言模块名称"""
+        return self._section_modules.get(section)
+
+    def get_section_names(self) -> List[str]:
+        """获取所有分类名称"""
+        return list(self._section_modules)
+
+    def load_module_sections(
+        self, language_code: str, module_name: str
+    ) -> Dict[str, Any]:
+        """加载一个语言模块在指定语言下的全部分类
+
+        优先读取磁盘缓存，缓存与模块文件版本不一致时导入模块重新合并
+
+        Args:
+            language_code: 语言代码
+            module_name: 语言模块名称
 
-        return merged
+        Returns:
+            {分类名称: 合并后的分类数据}
+        """
+        signature = self._get_module_signature(module_name)
+        cache_path = os.path.join(self._cache_dir, language_code, f"{module_name}.json")
+        cached = _read_cache_file(cache_path)
+        if cached is not None and cached.get("signature") == signature:
+            return cached.get("sections", {})
 
-    def _load_all_languages(self) -> None:
-        """加载data/Language文件夹下的所有语言文件"""
+        sections: Dict[str, Any] = {}
+        try:
+            module = self._import_module(module_name)
+        except Exception as e:
+            logger.exception(f"导入语言模块 {module_name} 时出错: {e}")
+            return sections
+
+        for attr_name, attr_value in self._iter_language_dicts(module):
+            data = self._merge_section(attr_value, language_code)
+            if data is not None:
+                sections[attr_name] = data
+
+        if signature is not None:
+            _write_cache_file(
+                cache_path, {"signature": signature, "sections": sections}
+            )
+        return sections
+
+    # ------------------------------------------------------------------
+    # data/Language 语言文件
+    # ------------------------------------------------------------------
+    def _get_json_language_files(self) -> Dict[str, str]:
+        """获取data/Language文件夹下的语言文件（与模块语言同名的文件被忽略）"""
+        language_files: Dict[str, str] = {}
         try:
             # 获取语言文件夹路径
             language_dir = get_data_path("Language")
 
             if not language_dir or not os.path.exists(language_dir):
-                return
+                return language_files
 
-            # 遍历文件夹中的所有.json文件
-            for filename in os.listdir(language_dir):
+            for filename in sorted(os.listdir(language_dir)):
                 if filename.endswith(".json"):
                     language_code = filename[:-5]  # 去掉.json后缀
 
-                    # 跳过已加载的语言
-                    if language_code in self._loaded_languages:
+                    # 跳过模块中已有的语言
+                    if language_code in self._module_languages:
                         continue
 
-                    file_path = os.path.join(language_dir, filename)
-
-                    try:
-                        # 加载语言文件
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            language_data = json.load(f)
-                            self._loaded_languages[language_code] = language_data
-                    except Exception as e:
-                        logger.exception(f"加载语言文件 {filename} 时出错: {e}")
+                    language_files[language_code] = os.path.join(language_dir, filename)
 
         except Exception as e:
             logger.exception(f"加载语言文件夹时出错: {e}")
+        return language_files
+
+    def _load_json_language(self, language_code: str) -> Optional[Dict[str, Any]]:
+        """加载data/Language文件夹下的语言文件"""
+        file_path = self._json_language_files[language_code]
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                language_data = json.load(f)
+            if isinstance(language_data, dict):
+                return language_data
+            logger.warning(f"语言文件 {file_path} 格式不正确")
+        except Exception as e:
+            logger.exception(f"加载语言文件 {file_path} 时出错: {e}")
+        return None
+
+    # ------------------------------------------------------------------
+    # 语言查询
+    # ------------------------------------------------------------------
+    def get_language_codes(self) -> List[str]:
+        """获取所有可用的语言代码（ZH_CN 在最前）"""
+        return list(self._module_languages) + list(self._json_language_files)
+
+    def get_language_data(self, language_code: str) -> Optional[Mapping]:
+        """获取指定语言的数据，语言不存在或无法加载时返回None"""
+        language_data = self._language_data.get(language_code)
+        if language_data is not None:
+            return language_data
+
+        with self.lock:
+            language_data = self._language_data.get(language_code)
+            if language_data is None:
+                if language_code in self._module_languages:
+                    language_data = LanguageData(self, language_code)
+                elif language_code in self._json_language_files:
+                    language_data = self._load_json_language(language_code)
+                if language_data is not None:
+                    self._language_data[language_code] = language_data
+            return language_data
 
     def get_current_language(self) -> str:
         """获取当前语言代码
@@ -309,7 +458,7 @@ class SimpleLanguageManager:
                 self._current_language = self._get_language_code_by_name(saved_language)
                 if self._current_language is None:
                     # 如果找不到匹配，检查是否直接是语言代码
-                    if saved_language in self._loaded_languages:
+                    if saved_language in self.get_language_codes():
                         self._current_language = saved_language
                     else:
                         self._current_language = "ZH_CN"
@@ -325,33 +474,39 @@ class SimpleLanguageManager:
         Returns:
             语言代码（如 "ZH_CN"、"EN_US"），如果找不到返回 None
         """
-        for code, data in self._loaded_languages.items():
-            language_info = data.get("translate_JSON_file", {})
+        for code in self.get_language_codes():
+            language_info = self.get_language_info(code) or {}
             if language_info.get("name") == name:
                 return code
         return None
 
-    def get_current_language_data(self) -> Dict[str, Any]:
+    def get_current_language_data(self) -> Mapping:
         """获取当前语言数据
 
         Returns:
-            当前语言数据字典
+            当前语言数据（按需加载的只读映射）
         """
         language_code = self.get_current_language()
+        language_data = self.get_language_data(language_code)
 
-        # 如果语言未加载，返回默认中文
-        if language_code not in self._loaded_languages:
-            return self._loaded_languages["ZH_CN"]
+        # 如果语言无法加载，返回默认中文
+        if language_data is None:
+            return self.get_language_data("ZH_CN")
 
-        return self._loaded_languages[language_code]
+        return language_data
 
-    def get_all_languages(self) -> Dict[str, Dict[str, Any]]:
-        """获取所有已加载的语言数据
+    def get_all_languages(self) -> Dict[str, Mapping]:
+        """获取所有语言的数据
 
         Returns:
-            包含所有语言数据的字典，键为语言代码，值为语言数据字典
+            包含所有语言数据的字典，键为语言代码，值为语言数据（按需加载）
         """
-        return dict(self._loaded_languages)
+        all_languages = {}
+        for code in self.get_language_codes():
+            language_data = self.get_language_data(code)
+            if language_data is not None:
+                all_languages[code] = language_data
+        return all_languages
 
     def get_language_info(self, language_code: str) -> Optional[Dict[str, Any]]:
         """获取指定语言的信息（translate_JSON_file字段）
@@ -362,10 +517,15 @@ class SimpleLanguageManager:
         Returns:
             语言信息字典，如果语言不存在则返回None
         """
-        if language_code not in self._loaded_languages:
+        if language_code in self._module_languages:
+            return self._module_languages[language_code]
+
+        if language_code not in self._json_language_files:
             return None
 
-        language_data = self._loaded_languages[language_code]
+        language_data = self.get_language_data(language_code)
+        if language_data is None:
+            return None
 
         # 返回translate_JSON_file字段，如果不存在则返回空字典
         return language_data.get("translate_JSON_file", {})
@@ -395,11 +555,11 @@ def get_current_language() -> str:
     return get_simple_language_manager().get_current_language()
 
 
-def get_all_languages() -> Dict[str, Dict[str, Any]]:
-    """获取所有已加载的语言数据
+def get_all_languages() -> Dict[str, Mapping]:
+    """获取所有语言的数据
 
     Returns:
-        包含所有语言数据的字典，键为语言代码，值为语言数据字典
+        包含所有语言数据的字典，键为语言代码，值为语言数据（按需加载）
     """
     return get_simple_language_manager().get_all_languages()
 
@@ -410,19 +570,22 @@ def get_all_languages_name() -> List[str]:
     Returns:
         包含所有语言名称的列表，每个元素为语言名称
     """
+    manager = get_simple_language_manager()
     language_names = []
-    for code, data in get_all_languages().items():
-        language_info = data.get("translate_JSON_file", {})
+    for code in manager.get_language_codes():
+        language_info = manager.get_language_info(code)
+        if language_info is None:
+            continue
         name = language_info.get("name", code)
         language_names.append(name)
     return language_names
 
 
-def get_current_language_data() -> Dict[str, Any]:
+def get_current_language_data() -> Mapping:
     """获取当前语言数据
 
     Returns:
-        当前语言数据字典
+        当前语言数据（按需加载的只读映射）
     """
     return get_simple_language_manager().get_current_language_data()
 
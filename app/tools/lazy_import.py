@@ -0,0 +1,78 @@
+# ==================================================
+# 导入库
+# ==================================================
+import importlib
+import threading
+from types import ModuleType
+from typing import Any, Optional
+
+from loguru import logger
+
+
+# ==================================================
+# 延迟导入
+# ==================================================
+class LazyModule:
+    """延迟导入的模块代理
+
+    创建时不导入模块，首次访问属性时才导入真实模块并转发属性访问，
+    用于语音、音乐等只在使用时才需要的重量级依赖（numpy、sounddevice 等），
+    避免拖慢程序启动。optional 为 True 时导入失败只记录一次警告，
+    之后 is_available() 返回 False，访问属性会抛出 ImportError
+    """
+
+    __slots__ = ("_module_name", "_optional", "_module", "_failed", "_lock")
+
+    def __init__(self, module_name: str, optional: bool = False):
+        self._module_name = module_name
+        self._optional = optional
+        self._module: Optional[ModuleType] = None
+        self._failed = False
+        self._lock = threading.Lock()
+
+    def load(self) -> Optional[ModuleType]:
+        """导入并返回真实模块，可选模块导入失败时返回None"""
+        module = self._module
+        if module is not None or self._failed:
+            return module
+        with self._lock:
+            if self._module is None and not self._failed:
+                try:
+                    self._module = importlib.import_module(self._module_name)
+                except Exception as e:
+                    if not self._optional:
+                        raise
+                    self._failed = True
+                    logger.warning(f"{self._module_name} 不可用: {e}")
+            return self._module
+
+    def is_available(self) -> bool:
+        """模块是否可以导入（会触发导入）"""
+        return self.load() is not None
+
+    def is_loaded(self) -> bool:
+        """模块是否已经导入（不会触发导入）"""
+        return self._module is not None
+
+    def __getattr__(self, name: str) -> Any:
+        module = self.load()
+        if module is None:
+            raise ImportError(f"模块 {self._module_name} 不可用")
+        return getattr(module, name)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "deferred"
+        return f"<LazyModule {self._module_name!r} ({state})>"
+
+
+def lazy_import(module_name: str, optional: bool = False) -> LazyModule:
+    """创建延迟导入的模块代理
+
+    Args:
+        module_name: 模块名称（如 "numpy"、"edge_tts.exceptions"）
+        optional: 是否为可选依赖，导入失败时不抛出异常
+
+    Returns:
+        LazyModule: 模块代理，首次访问属性时导入
+    """
+    return LazyModule(module_name, optional)
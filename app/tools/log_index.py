@@ -0,0 +1,241 @@
+# ==================================================
+# 导入库
+# ==================================================
+import os
+from array import array
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from app.tools.variable import (
+    LOG_VIEWER_CACHED_BLOCKS,
+    LOG_VIEWER_LINE_BLOCK_SIZE,
+    LOG_VIEWER_READ_CHUNK_SIZE,
+)
+
+# 日志等级（值越大，等级越高）
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+# 没有等级标记的行（如异常堆栈、其他等级），在任何等级过滤下都显示
+NO_LEVEL = 255
+
+# 日志格式：时间戳 | 等级(8字符左对齐) | 模块:函数:行号 - 消息
+_LEVEL_SEPARATOR = b" | "
+_LEVEL_TAGS = {f"{level:<8}".encode(): value for value, level in enumerate(LOG_LEVELS)}
+_LEVEL_TAG_LENGTH = 8
+
+# 包含以下关键字的行不在日志查看器中显示
+_HIDDEN_KEYWORD = "内幕".encode("utf-8")
+_HIDDEN_KEYWORD_LOWER = b"behind"
+
+
+def parse_log_level(line: bytes) -> int:
+    """解析一行日志的等级
+
+    Args:
+        line: 日志行（不含换行符）
+
+    Returns:
+        int: 等级值（LOG_LEVELS 中的下标），没有等级标记时返回 NO_LEVEL
+    """
+    index = line.find(_LEVEL_SEPARATOR)
+    if index < 0:
+        return NO_LEVEL
+    tag_start = index + len(_LEVEL_SEPARATOR)
+    tag_end = tag_start + _LEVEL_TAG_LENGTH
+    if line[tag_end : tag_end + len(_LEVEL_SEPARATOR)] != _LEVEL_SEPARATOR:
+        return NO_LEVEL
+    return _LEVEL_TAGS.get(line[tag_start:tag_end], NO_LEVEL)
+
+
+def is_hidden_log_line(line: bytes) -> bool:
+    """是否为不显示的日志行"""
+    return _HIDDEN_KEYWORD in line or _HIDDEN_KEYWORD_LOWER in line.lower()
+
+
+# ==================================================
+# 日志文件索引
+# ==================================================
+class LogFileIndex:
+    """日志文件的行索引
+
+    记录已读取到的字节位置，每次更新只解析文件末尾新增的完整行，
+    为每一行保存起止位置和日志等级，并按最低等级分别保存可见行号，
+    切换等级过滤不需要重新扫描文件。显示的行按块从文件中读取并缓存
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = str(file_path)
+        self.reset()
+
+    def reset(self):
+        """清空索引（文件被清空、替换或删除后从头读取）"""
+        self._offset = 0
+        self._has_pending = False
+        self._file_identity: Optional[Tuple[int, int]] = None
+        self._line_starts = array("Q")
+        self._line_ends = array("Q")
+        self._levels = bytearray()
+        self._rows: List[array] = [array("I") for _ in LOG_LEVELS]
+        self._blocks: "OrderedDict[int, List[str]]" = OrderedDict()
+
+    @property
+    def offset(self) -> int:
+        """已解析到的字节位置"""
+        return self._offset
+
+    @property
+    def has_pending(self) -> bool:
+        """上次更新是否因 max_bytes 限制而未读取到文件末尾"""
+        return self._has_pending
+
+    @property
+    def line_count(self) -> int:
+        """已索引的行数（不含隐藏的行）"""
+        return len(self._levels)
+
+    def rows(self, min_level: int = 0) -> array:
+        """获取等级不低于 min_level 的行号列表
+
+        返回的列表在索引更新时原地追加，调用方不应修改
+        """
+        min_level = max(0, min(min_level, len(LOG_LEVELS) - 1))
+        return self._rows[min_level]
+
+    def level(self, line_number: int) -> int:
+        """获取行的日志等级"""
+        return self._levels[line_number]
+
+    def update(self, max_bytes: Optional[int] = None) -> bool:
+        """读取文件新增的内容并更新索引
+
+        Args:
+            max_bytes: 本次最多读取的字节数，为None时读取到文件末尾；
+                文件很大时分多次读取，避免长时间阻塞界面
+
+        Returns:
+            bool: 文件被清空、替换或删除导致索引被重置时返回True
+        """
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            was_empty = self._offset == 0 and not self._levels
+            self.reset()
+            return not was_empty
+
+        identity = (stat.st_dev, stat.st_ino)
+        was_reset = False
+        if (
+            self._file_identity is not None and identity != self._file_identity
+        ) or stat.st_size < self._offset:
+            self.reset()
+            was_reset = True
+        self._file_identity = identity
+
+        self._has_pending = False
+        if stat.st_size == self._offset:
+            return was_reset
+
+        with open(self.file_path, "rb") as f:
+            f.seek(self._offset)
+            data_start = self._offset
+            pending = b""
+            remaining = stat.st_size - self._offset
+            if max_bytes is not None and max_bytes < remaining:
+                remaining = max_bytes
+                self._has_pending = True
+            while remaining > 0:
+                chunk = f.read(min(LOG_VIEWER_READ_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                data = pending + chunk if pending else chunk
+                consumed = self._index_lines(data, data_start)
+                pending = data[consumed:]
+                data_start += consumed
+
+        # 最后一行尚未写完时不计入，下次更新时从该行开头继续读取
+        self._offset = data_start
+        self._drop_last_block()
+        return was_reset
+
+    def _index_lines(self, data: bytes, data_start: int) -> int:
+        """为数据中的完整行建立索引，返回已处理的字节数"""
+        consumed = data.rfind(b"\n") + 1
+        if not consumed:
+            return 0
+
+        # 整块数据不包含隐藏关键字时，无需逐行检查
+        check_hidden = is_hidden_log_line(data[:consumed])
+        line_starts = self._line_starts
+        line_ends = self._line_ends
+        levels = self._levels
+        rows = self._rows
+        max_level = len(rows) - 1
+
+        position = data_start
+        for line in data[: consumed - 1].split(b"\n"):
+            line_start = position
+            position += len(line) + 1
+            if line.endswith(b"\r"):
+                line = line[:-1]
+            if check_hidden and is_hidden_log_line(line):
+                continue
+            level = parse_log_level(line)
+            line_number = len(levels)
+            line_starts.append(line_start)
+            line_ends.append(line_start + len(line))
+            levels.append(level)
+            for min_level in range(min(level, max_level) + 1):
+                rows[min_level].append(line_number)
+        return consumed
+
+    def _drop_last_block(self):
+        """移除最后一个行块的缓存（追加新行后该块可能不完整）"""
+        if self._levels:
+            self._blocks.pop(
+                (len(self._levels) - 1) // LOG_VIEWER_LINE_BLOCK_SIZE, None
+            )
+
+    def get_line(self, line_number: int) -> str:
+        """获取一行日志文本
+
+        Args:
+            line_number: 行号（索引中的行号，不含隐藏的行）
+
+        Returns:
+            str: 日志文本，读取失败时返回空字符串
+        """
+        block_number, block_offset = divmod(line_number, LOG_VIEWER_LINE_BLOCK_SIZE)
+        block = self._blocks.get(block_number)
+        if block is None or block_offset >= len(block):
+            block = self._read_block(block_number)
+            self._blocks[block_number] = block
+            while len(self._blocks) > LOG_VIEWER_CACHED_BLOCKS:
+                self._blocks.popitem(last=False)
+        else:
+            self._blocks.move_to_end(block_number)
+        return block[block_offset] if block_offset < len(block) else ""
+
+    def get_lines(self, line_numbers: List[int]) -> List[str]:
+        """获取多行日志文本"""
+        return [self.get_line(line_number) for line_number in line_numbers]
+
+    def _read_block(self, block_number: int) -> List[str]:
+        """从文件中一次读取一个行块"""
+        first = block_number * LOG_VIEWER_LINE_BLOCK_SIZE
+        last = min(first + LOG_VIEWER_LINE_BLOCK_SIZE, len(self._levels))
+        if first >= last:
+            return []
+        block_start = self._line_starts[first]
+        try:
+            with open(self.file_path, "rb") as f:
+                f.seek(block_start)
+                data = f.read(self._line_ends[last - 1] - block_start)
+        except OSError:
+            return []
+
+        lines = []
+        for line_number in range(first, last):
+            start = self._line_starts[line_number] - block_start
+            end = self._line_ends[line_number] - block_start
+            lines.append(data[start:end].decode("utf-8", errors="replace"))
+        return lines
@@ -7,6 +7,7 @@
 # - file_exists()    - 检查文件是否存在
 # - open_file()      - 打开文件
 # - remove_file()    - 删除文件
+# - get_file_signature() - 获取文件版本标识（修改时间和大小）
 
 # ====================== 3. 特定路径获取便捷函数 ======================
 # - get_settings_path() - 获取设置文件路径
@@ -22,7 +23,7 @@
 import os
 import sys
 from pathlib import Path
-from typing import Union
+from typing import Optional, Tuple, Union
 from loguru import logger
 
 from app.tools.variable import *
@@ -269,6 +270,21 @@ class FileOperations:
             return open(absolute_path, mode)
         return open(absolute_path, mode, encoding=encoding)
 
+    def file_signature(self, path: Union[str, Path]) -> Optional[Tuple[int, int]]:
+        """获取文件版本标识
+
+        Args:
+            path: 文件路径（相对或绝对）
+
+        Returns:
+            Optional[Tuple[int, int]]: (修改时间纳秒, 文件大小)，文件不存在时返回 None
+        """
+        try:
+            stat_result = os.stat(self._path_manager.get_absolute_path(path))
+        except OSError:
+            return None
+        return stat_result.st_mtime_ns, stat_result.st_size
+
     def remove_file(self, path: Union[str, Path]) -> bool:
         """删除文件
 
@@ -366,6 +382,18 @@ def open_file(
     return file_operations.open_file(path, mode, encoding)
 
 
+def get_file_signature(path: Union[str, Path]) -> Optional[Tuple[int, int]]:
+    """获取文件版本标识的便捷函数，常用于判断缓存是否失效
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        Optional[Tuple[int, int]]: (修改时间纳秒, 文件大小)，文件不存在时返回 None
+    """
+    return file_operations.file_signature(path)
+
+
 def remove_file(path: Union[str, Path]) -> bool:
     """删除文件的便捷函数
 
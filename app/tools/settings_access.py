@@ -7,8 +7,13 @@ from PySide6.QtWidgets import *
 from PySide6.QtCore import *
 from PySide6.QtNetwork import *
 
+import os
+import copy
+import atexit
 import json
 import asyncio
+import threading
+import time
 import uuid
 from loguru import logger
 from typing import Any
@@ -43,21 +48,12 @@ class SettingsReaderWorker(QObject):
             self.finished.emit(default_value)
 
     def _read_setting_value(self):
-        """从设置文件或默认设置中读取值"""
-        settings_path = get_settings_path()
-        if file_exists(settings_path):
-            try:
-                with open_file(settings_path, "r", encoding="utf-8") as f:
-                    settings_data = json.load(f)
-                    if (
-                        self.first_level_key in settings_data
-                        and self.second_level_key in settings_data[self.first_level_key]
-                    ):
-                        return settings_data[self.first_level_key][
-                            self.second_level_key
-                        ]
-            except (json.JSONDecodeError, KeyError):
-                pass
+        """从设置缓存或默认设置中读取值"""
+        found, value = get_settings_cache().get(
+            self.first_level_key, self.second_level_key
+        )
+        if found:
+            return value
         return self._get_default_value()
 
     def _get_default_value(self):
@@ -132,6 +128,245 @@ class AsyncSettingsReader(QObject):
             self.thread.wait(1000)
 
 
+# ==================================================
+# 设置缓存
+# ==================================================
+class SettingsCache:
+    """进程内共享的设置缓存
+
+    设置文件只在内容变化时解析一次，以文件修改时间和大小作为版本标识；
+    update_settings 直接更新缓存中的数据，写入磁盘由写回队列在合并窗口
+    结束后统一完成（临时文件 + 重命名），避免频繁改动造成磁盘抖动
+    """
+
+    def __init__(
+        self,
+        write_delay_ms: int = SETTINGS_WRITE_DELAY_MS,
+        max_write_delay_ms: int = SETTINGS_WRITE_MAX_DELAY_MS,
+    ):
+        self._lock = threading.RLock()
+        self._data = {}
+        self._path = None
+        self._signature = None
+        self._load_failed = False
+        # 尚未写入磁盘的设置项 {(first_level_key, second_level_key): value}
+        self._pending = {}
+        self._pending_since = None
+        self._write_timer = None
+        self.write_delay_ms = write_delay_ms
+        self.max_write_delay_ms = max_write_delay_ms
+
+    @staticmethod
+    def _get_file_signature(settings_path):
+        """获取设置文件版本标识 (mtime_ns, size)，文件不存在时返回 None"""
+        try:
+            stat_result = os.stat(settings_path)
+        except OSError:
+            return None
+        return stat_result.st_mtime_ns, stat_result.st_size
+
+    def _ensure_loaded(self) -> dict:
+        """确保缓存与设置文件一致，必要时重新解析文件
+
+        设置文件被外部修改时，尚未写入的设置项会重新叠加到新数据上
+        调用方需持有 self._lock
+        """
+        settings_path = get_settings_path()
+        signature = self._get_file_signature(settings_path)
+        if settings_path == self._path and signature == self._signature:
+            return self._data
+
+        settings_data = {}
+        load_failed = False
+        if signature is not None:
+            try:
+                with open_file(settings_path, "r", encoding="utf-8") as f:
+                    content = f.read()
+                if not content or not content.strip():
+                    logger.warning(f"设置文件为空: {settings_path}")
+                    load_failed = True
+                else:
+                    loaded = json.loads(content)
+                    if isinstance(loaded, dict):
+                        settings_data = loaded
+            except Exception as e:
+                logger.exception(f"读取设置失败: {e}")
+                load_failed = True
+
+        for (first_level_key, second_level_key), value in self._pending.items():
+            if not isinstance(settings_data.get(first_level_key), dict):
+                settings_data[first_level_key] = {}
+            settings_data[first_level_key][second_level_key] = value
+
+        self._data = settings_data
+        self._path = settings_path
+        self._signature = signature
+        self._load_failed = load_failed
+        return self._data
+
+    def get(self, first_level_key: str, second_level_key: str):
+        """读取单个设置项
+
+        Returns:
+            tuple: (是否存在于设置文件中, 设置值)
+        """
+        with self._lock:
+            section = self._ensure_loaded().get(first_level_key)
+            if isinstance(section, dict) and second_level_key in section:
+                return True, _copy_setting_value(section[second_level_key])
+        return False, None
+
+    def get_section(self, first_level_key: str) -> dict:
+        """读取整个设置分组在设置文件中的值（不含默认值）"""
+        with self._lock:
+            section = self._ensure_loaded().get(first_level_key)
+            if isinstance(section, dict):
+                return copy.deepcopy(section)
+        return {}
+
+    def set(self, first_level_key: str, second_level_key: str, value: Any):
+        """更新缓存中的设置项，并安排写回设置文件"""
+        with self._lock:
+            settings_data = self._ensure_loaded()
+            if self._load_failed:
+                # 设置文件损坏时不覆盖写入，避免丢失其他设置项
+                raise ValueError(f"设置文件无法解析: {self._path}")
+            if not isinstance(settings_data.get(first_level_key), dict):
+                settings_data[first_level_key] = {}
+            value = _copy_setting_value(value)
+            settings_data[first_level_key][second_level_key] = value
+            self._pending[(first_level_key, second_level_key)] = value
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            self._schedule_write()
+
+    def _schedule_write(self):
+        """在合并窗口结束后写回设置文件
+
+        连续变化时每次都会推迟写入，但不会超过 max_write_delay_ms
+        调用方需持有 self._lock
+        """
+        if self.write_delay_ms <= 0:
+            self.flush()
+            return
+
+        if self._write_timer is not None:
+            self._write_timer.cancel()
+
+        elapsed_ms = (time.monotonic() - self._pending_since) * 1000
+        delay_ms = min(
+            self.write_delay_ms, max(0, self.max_write_delay_ms - elapsed_ms)
+        )
+        self._write_timer = threading.Timer(delay_ms / 1000, self.flush)
+        self._write_timer.daemon = True
+        self._write_timer.start()
+
+    def flush(self) -> bool:
+        """立即把尚未写入的设置项写回设置文件
+
+        Returns:
+            bool: 写入是否成功（没有待写入内容时返回 True）
+        """
+        with self._lock:
+            if self._write_timer is not None:
+                self._write_timer.cancel()
+                self._write_timer = None
+
+            if not self._pending:
+                return True
+
+            try:
+                settings_data = self._ensure_loaded()
+                if self._load_failed:
+                    logger.warning(f"设置文件无法解析，跳过写入: {self._path}")
+                    return False
+
+                ensure_dir(self._path.parent)
+                _write_json_atomic(self._path, settings_data)
+                self._signature = self._get_file_signature(self._path)
+                self._pending.clear()
+                self._pending_since = None
+                return True
+            except Exception as e:
+                logger.exception(f"写入设置文件失败: {e}")
+                return False
+
+    def has_pending_writes(self) -> bool:
+        """是否存在尚未写入设置文件的设置项"""
+        with self._lock:
+            return bool(self._pending)
+
+    def invalidate(self):
+        """使缓存失效，下一次读取时重新解析设置文件（尚未写入的设置项会保留）"""
+        with self._lock:
+            self._path = None
+            self._signature = None
+            self._data = {}
+
+    def discard_pending(self):
+        """丢弃尚未写入的设置项并使缓存失效（设置文件将被整体替换时调用）"""
+        with self._lock:
+            if self._write_timer is not None:
+                self._write_timer.cancel()
+                self._write_timer = None
+            self._pending.clear()
+            self._pending_since = None
+            self.invalidate()
+
+    def replace(self, settings_data: dict):
+        """用导入的数据整体替换设置文件，尚未写入的设置项不会再覆盖导入的值"""
+        with self._lock:
+            self.discard_pending()
+            settings_path = get_settings_path()
+            ensure_dir(settings_path.parent)
+            _write_json_atomic(settings_path, settings_data)
+
+
+def _write_json_atomic(file_path, data):
+    """以临时文件 + 重命名的方式原子写入 JSON 文件"""
+    tmp_path = file_path.with_name(f"{file_path.name}.tmp")
+    with open_file(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+
+    # Windows 上目标文件被其他进程短暂占用时 os.replace 会失败，稍后重试
+    for attempt in range(3):
+        try:
+            os.replace(tmp_path, file_path)
+            return
+        except PermissionError:
+            if attempt == 2:
+                raise
+            time.sleep(0.05)
+
+
+def _copy_setting_value(value):
+    """复制可变的设置值，防止调用方修改缓存内容"""
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    return value
+
+
+# 创建全局设置缓存实例
+_settings_cache = SettingsCache()
+# 正常退出解释器时写入剩余设置（os._exit 不会触发，需显式调用 flush_settings）
+atexit.register(_settings_cache.flush)
+
+
+def get_settings_cache() -> SettingsCache:
+    """获取设置缓存实例"""
+    return _settings_cache
+
+
+def _resolve_default_value(first_level_key: str, second_level_key: str):
+    """获取设置项的默认值（兼容嵌套的 default_value 结构）"""
+    default_setting = _get_default_setting(first_level_key, second_level_key)
+    if isinstance(default_setting, dict) and "default_value" in default_setting:
+        return default_setting["default_value"]
+    return default_setting
+
+
 def readme_settings(first_level_key: str, second_level_key: str):
     """读取设置
 
@@ -143,35 +378,38 @@ def readme_settings(first_level_key: str, second_level_key: str):
         返回设置值
     """
     try:
-        settings_path = get_settings_path()
-        if file_exists(settings_path):
-            with open_file(settings_path, "r", encoding="utf-8") as f:
-                content = f.read()
-                if not content or not content.strip():
-                    logger.warning(f"设置文件为空: {settings_path}")
-                else:
-                    settings_data = json.loads(content)
-                    if (
-                        first_level_key in settings_data
-                        and second_level_key in settings_data[first_level_key]
-                    ):
-                        value = settings_data[first_level_key][second_level_key]
-                        # logger.debug(f"从设置文件读取: {first_level_key}.{second_level_key} = {value}")
-                        return value
-
-        default_setting = _get_default_setting(first_level_key, second_level_key)
-        if isinstance(default_setting, dict) and "default_value" in default_setting:
-            default_value = default_setting["default_value"]
-        else:
-            default_value = default_setting
-        # logger.debug(f"使用默认设置: {first_level_key}.{second_level_key} = {default_value}")
-        return default_value
+        found, value = _settings_cache.get(first_level_key, second_level_key)
+        if found:
+            return value
+        return _resolve_default_value(first_level_key, second_level_key)
     except Exception as e:
         logger.exception(f"读取设置失败: {e}")
-        default_setting = _get_default_setting(first_level_key, second_level_key)
-        if isinstance(default_setting, dict) and "default_value" in default_setting:
-            return default_setting["default_value"]
-        return default_setting
+        return _resolve_default_value(first_level_key, second_level_key)
+
+
+def read_section(first_level_key: str) -> dict:
+    """一次性读取整个设置分组
+
+    返回该分组全部设置项：设置文件中存在的值覆盖默认值，
+    适用于需要连续读取同一分组多个设置项的场景
+
+    Args:
+        first_level_key: 第一层的键，如 "fair_draw_settings"
+
+    Returns:
+        dict: {第二层的键: 设置值}
+    """
+    section = {}
+    try:
+        default_section = get_default_settings().get(first_level_key, {})
+        for second_level_key in default_section:
+            section[second_level_key] = _copy_setting_value(
+                _resolve_default_value(first_level_key, second_level_key)
+            )
+        section.update(_settings_cache.get_section(first_level_key))
+    except Exception as e:
+        logger.exception(f"读取设置分组失败: {e}")
+    return section
 
 
 def readme_settings_async(first_level_key: str, second_level_key: str, timeout=1000):
@@ -221,28 +459,8 @@ def update_settings(first_level_key: str, second_level_key: str, value: Any):
         bool: 更新是否成功
     """
     try:
-        # 获取设置文件路径
-        settings_path = get_settings_path()
-
-        # 确保设置目录存在
-        ensure_dir(settings_path.parent)
-
-        # 读取现有设置
-        settings_data = {}
-        if file_exists(settings_path):
-            with open_file(settings_path, "r", encoding="utf-8") as f:
-                settings_data = json.load(f)
-
-        # 更新设置
-        if first_level_key not in settings_data:
-            settings_data[first_level_key] = {}
-
-        # 直接保存值，不保存嵌套结构
-        settings_data[first_level_key][second_level_key] = value
-
-        # 写入设置文件
-        with open_file(settings_path, "w", encoding="utf-8") as f:
-            json.dump(settings_data, f, ensure_ascii=False, indent=4)
+        # 更新内存中的设置，写入设置文件由写回队列合并完成
+        _settings_cache.set(first_level_key, second_level_key, value)
 
         if (
             not first_level_key == "user_info"
@@ -252,7 +470,7 @@ def update_settings(first_level_key: str, second_level_key: str, value: Any):
                 f"设置更新成功: {first_level_key}.{second_level_key} = {value}"
             )
 
-        # 发送设置变化信号
+        # 发送设置变化信号（基于内存中的最新值，无需等待写入磁盘）
         get_settings_signals().settingChanged.emit(
             first_level_key, second_level_key, value
         )
@@ -260,6 +478,29 @@ def update_settings(first_level_key: str, second_level_key: str, value: Any):
         logger.exception(f"设置更新失败: {e}")
 
 
+def flush_settings() -> bool:
+    """立即写入所有尚未落盘的设置（程序退出前必须调用）
+
+    Returns:
+        bool: 写入是否成功
+    """
+    return _settings_cache.flush()
+
+
+def discard_pending_settings():
+    """丢弃尚未写入的设置并重新读取设置文件（导入数据覆盖设置文件前调用）"""
+    _settings_cache.discard_pending()
+
+
+def replace_settings(settings_data: dict):
+    """用导入的设置整体替换设置文件
+
+    Args:
+        settings_data: 导入的设置数据
+    """
+    _settings_cache.replace(settings_data)
+
+
 def get_or_create_user_id():
     try:
         user_id = readme_settings("basic_settings", "offline_user_id")
@@ -348,6 +348,7 @@ DEFAULT_SETTINGS = {
         "select_weight": {"default_value": False},
         "show_lottery_history": {"default_value": True},
         "select_pool_name": {"default_value": 0},
+        "history_database_enabled": {"default_value": True},
     },
     "roll_call_history_table": {
         "select_class_name": {"default_value": 0},
@@ -0,0 +1,279 @@
+"""
+启动性能分析
+
+设置环境变量 SECRANDOM_PROFILE_STARTUP=1 或使用命令行参数 --profile-startup 启动时，
+记录启动过程中每个模块的导入耗时和各初始化阶段的耗时，主窗口创建完成后
+写入日志目录下的 startup_profile.json。
+
+本模块只依赖标准库，需要在 main.py 中先于其他模块导入，导入时根据环境变量和
+命令行参数决定是否启用；未启用时 profile_phase / mark 等函数不做任何事
+"""
+
+import builtins
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.tools.variable import (
+    LOG_DIR,
+    STARTUP_PROFILE_ARG,
+    STARTUP_PROFILE_ENV,
+    STARTUP_PROFILE_FILENAME,
+)
+
+
+# ==================================================
+# 导入计时
+# ==================================================
+class _ImportTimer:
+    """替换 builtins.__import__，记录首次导入每个模块的耗时
+
+    嵌套导入按线程记录调用栈，cumulative_ms 包含被嵌套导入的模块，
+    self_ms 为扣除嵌套导入后模块自身的耗时（与 python -X importtime 一致）
+    """
+
+    def __init__(self):
+        self._original_import = builtins.__import__
+        self._hook = self._timed_import
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.records: Dict[str, Dict[str, Any]] = {}
+
+    def install(self):
+        builtins.__import__ = self._hook
+
+    def uninstall(self):
+        if builtins.__import__ is self._hook:
+            builtins.__import__ = self._original_import
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # 已导入的模块直接返回，不计时
+        if level == 0 and not fromlist and name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        module_name = self._resolve_name(name, globals, level)
+        was_loaded = module_name in sys.modules
+        module_count = len(sys.modules)
+        stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            loaded = len(sys.modules) - module_count
+            if loaded > 0:
+                if was_loaded:
+                    # 模块本身已导入，新导入的是 fromlist 中的子模块
+                    module_name = f"{module_name}.{{{','.join(fromlist)}}}"
+                self._record(
+                    module_name, elapsed, elapsed - children, loaded, len(stack)
+                )
+
+    @staticmethod
+    def _resolve_name(name, globals, level) -> str:
+        """把相对导入解析为完整模块名"""
+        if level == 0:
+            return name
+        package = (globals or {}).get("__package__") or ""
+        try:
+            return importlib.util.resolve_name("." * level + name, package)
+        except Exception:
+            return f"{package}:{'.' * level}{name}"
+
+    def _record(
+        self, name: str, cumulative: float, own: float, loaded: int, depth: int
+    ):
+        with self._lock:
+            # 同一模块只记录最先完成的导入，外层的同名导入（如包的 __init__
+            # 中先导入了该模块）耗时已计入其嵌套导入
+            if name in self.records:
+                return
+            self.records[name] = {
+                "module": name,
+                "cumulative_ms": cumulative * 1000,
+                "self_ms": own * 1000,
+                "modules_loaded": loaded,
+                "depth": depth,
+            }
+
+
+# ==================================================
+# 启动性能分析器
+# ==================================================
+class StartupProfiler:
+    """记录模块导入、初始化阶段和关键时间点，生成 JSON 报告"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self._import_timer = _ImportTimer()
+        self._phases: List[Dict[str, Any]] = []
+        self._marks: List[Dict[str, Any]] = []
+        self._finished = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        self._import_timer.install()
+
+    def _offset_ms(self, moment: float) -> float:
+        return round((moment - self.started_at) * 1000, 3)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            with self._lock:
+                self._phases.append(
+                    {
+                        "name": name,
+                        "start_ms": self._offset_ms(started),
+                        "elapsed_ms": round((ended - started) * 1000, 3),
+                        "thread": threading.current_thread().name,
+                    }
+                )
+
+    def mark(self, name: str):
+        with self._lock:
+            self._marks.append(
+                {"name": name, "at_ms": self._offset_ms(time.perf_counter())}
+            )
+
+    def build_report(self) -> Dict[str, Any]:
+        """生成报告数据"""
+        with self._lock:
+            phases = list(self._phases)
+            marks = list(self._marks)
+        imports = sorted(
+            (dict(record) for record in self._import_timer.records.values()),
+            key=lambda record: record["cumulative_ms"],
+            reverse=True,
+        )
+        for record in imports:
+            record["cumulative_ms"] = round(record["cumulative_ms"], 3)
+            record["self_ms"] = round(record["self_ms"], 3)
+
+        report: Dict[str, Any] = {
+            "total_ms": self._offset_ms(time.perf_counter()),
+            "python": sys.version.split()[0],
+            "module_count": len(sys.modules),
+            "phases": sorted(phases, key=lambda phase: phase["start_ms"]),
+            "marks": marks,
+            "imports": imports,
+        }
+
+        warmup = sys.modules.get("app.core.startup_warmup")
+        if warmup is not None:
+            report["warmup"] = [
+                {
+                    "name": stage.name,
+                    "status": stage.status,
+                    "elapsed_ms": round(stage.elapsed_ms, 3),
+                }
+                for stage in warmup.get_warmup_stages()
+            ]
+        return report
+
+    def finish(self) -> Optional[str]:
+        """停止导入计时并写入报告，返回报告路径（只执行一次）"""
+        with self._lock:
+            if self._finished:
+                return None
+            self._finished = True
+        self._import_timer.uninstall()
+
+        from loguru import logger
+
+        from app.tools.path_utils import get_path
+
+        report = self.build_report()
+        try:
+            log_dir = get_path(LOG_DIR)
+            log_dir.mkdir(parents=True, exist_ok=True)
+            report_path = log_dir / STARTUP_PROFILE_FILENAME
+            with open(report_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            logger.error(f"写入启动性能分析报告失败: {e}")
+            return None
+
+        slowest = ", ".join(
+            f"{record['module']} {record['cumulative_ms']:.0f}ms"
+            for record in report["imports"]
+            if record["depth"] == 0
+        )
+        logger.info(
+            f"启动性能分析报告已写入: {report_path}，总耗时 {report['total_ms']:.0f}ms"
+        )
+        if slowest:
+            logger.debug(f"启动时导入耗时（顶层）: {slowest}")
+        return str(report_path)
+
+
+# ==================================================
+# 全局实例与便捷函数
+# ==================================================
+def is_startup_profile_requested() -> bool:
+    """是否通过环境变量或命令行参数请求了启动性能分析"""
+    env_value = os.environ.get(STARTUP_PROFILE_ENV, "").strip().lower()
+    if env_value and env_value not in ("0", "false", "no", "off"):
+        return True
+    return STARTUP_PROFILE_ARG in sys.argv
+
+
+_startup_profiler: Optional[StartupProfiler] = None
+if is_startup_profile_requested():
+    _startup_profiler = StartupProfiler()
+    _startup_profiler.start()
+
+
+def get_startup_profiler() -> Optional[StartupProfiler]:
+    """获取启动性能分析器，未启用时返回None"""
+    return _startup_profiler
+
+
+@contextmanager
+def profile_phase(name: str) -> Iterator[None]:
+    """记录一个初始化阶段的耗时（未启用时不做任何事）
+
+    Args:
+        name: 阶段名称
+    """
+    if _startup_profiler is None:
+        yield
+        return
+    with _startup_profiler.phase(name):
+        yield
+
+
+def mark(name: str):
+    """记录一个启动过程中的时间点（未启用时不做任何事）
+
+    Args:
+        name: 时间点名称
+    """
+    if _startup_profiler is not None:
+        _startup_profiler.mark(name)
+
+
+def finish_startup_profile() -> Optional[str]:
+    """结束启动性能分析并写入报告
+
+    Returns:
+        Optional[str]: 报告文件路径，未启用或已写入过时返回None
+    """
+    if _startup_profiler is None:
+        return None
+    return _startup_profiler.finish()
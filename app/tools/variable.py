@@ -219,12 +219,21 @@ DEFAULT_NAME_FORMAT = (
 # -------------------- 日志模块配置 --------------------
 LOG_ROTATION_SIZE = "1 MB"  # 日志文件轮转大小
 LOG_RETENTION_DAYS = "30 days"  # 日志保留天数
+LOG_VIEWER_READ_CHUNK_SIZE = 1024 * 1024  # 日志查看器每次读取新增内容的块大小（字节）
+LOG_VIEWER_UPDATE_MAX_BYTES = 8 * 1024 * 1024  # 日志查看器每轮最多解析的字节数
+LOG_VIEWER_LINE_BLOCK_SIZE = 256  # 日志查看器按块读取显示行时每块的行数
+LOG_VIEWER_CACHED_BLOCKS = 64  # 日志查看器缓存的显示行块数
+LOG_VIEWER_TAIL_DELAY_MS = 100  # 日志文件变化后读取新增内容的合并延迟（毫秒）
+STARTUP_PROFILE_ENV = "SECRANDOM_PROFILE_STARTUP"  # 启用启动性能分析的环境变量
+STARTUP_PROFILE_ARG = "--profile-startup"  # 启用启动性能分析的命令行参数
+STARTUP_PROFILE_FILENAME = "startup_profile.json"  # 启动性能分析报告文件名
 
 # -------------------- 语言模块配置 --------------------
 LANGUAGE_ZH_CN = "ZH_CN"  # 中文
 LANGUAGE_EN_US = "EN_US"  # 英文
 DEFAULT_LANGUAGE = LANGUAGE_ZH_CN  # 默认语言为中文
 LANGUAGE_MODULE_DIR = "app/Language/modules"  # 模块化语言文件路径
+LANGUAGE_CACHE_DIR = "data/cache/language"  # 合并后语言数据的缓存路径
 
 # -------------------- 共享内存配置 --------------------
 SHARED_MEMORY_KEY = "SecRandomSharedMemory"  # 共享内存键名
@@ -276,6 +285,8 @@ SUPPORTED_IMAGE_EXTENSIONS = [
     ".webp",
     ".gif",
 ]  # 支持的图片扩展名
+AVATAR_PIXMAP_CACHE_SIZE = 256  # 缩放后头像图片缓存的最大数量
+IMAGE_INDEX_RECHECK_INTERVAL = 5.0  # 图片目录不存在时重新检查的间隔（秒）
 
 # 格式化相关
 STUDENT_ID_FORMAT = "{num:02}"  # 学号格式化字符串
@@ -325,6 +336,36 @@ SETTINGS_WINDOW_DEFAULT_HEIGHT = 600  # 设置窗口默认高度
 SETTINGS_WARMUP_DELAY_MS = 300  # 设置窗口后台预热延迟（毫秒）
 SETTINGS_DEFAULT_PAGE_DELAY_MS = 100  # 设置窗口默认页面加载延迟（毫秒）
 
+# -------------------- 设置文件写入配置 --------------------
+SETTINGS_WRITE_DELAY_MS = 500  # 设置写入合并窗口（毫秒），为0时立即写入
+SETTINGS_WRITE_MAX_DELAY_MS = 2000  # 设置连续变化时的最长写入延迟（毫秒）
+
+# -------------------- 课程时间调度配置 --------------------
+CLASS_SCHEDULE_BOUNDARY_SLACK_MS = 50  # 课程边界定时器的额外延迟（毫秒）
+CLASS_SCHEDULE_MAX_INTERVAL_MS = 3600 * 1000  # 课程状态最长重新计算间隔（毫秒）
+CLASS_SCHEDULE_IPC_INTERVAL_MS = 30 * 1000  # ClassIsland 数据源兜底刷新间隔（毫秒）
+CLASS_SCHEDULE_WATCHDOG_INTERVAL_MS = 60 * 1000  # 系统时间跳变检查间隔（毫秒）
+CLASS_SCHEDULE_CLOCK_JUMP_TOLERANCE = 2.0  # 判定系统时间跳变的偏差（秒）
+
+# -------------------- 历史记录存储配置 --------------------
+HISTORY_STORAGE_VERSION = 1  # 历史记录存储格式版本（快照 + 追加式事件日志）
+HISTORY_COMPACT_EVENT_THRESHOLD = 100  # 事件日志累计多少条后合并到快照
+
+# -------------------- 语音合成配置 --------------------
+VOICE_SYNTHESIS_MAX_CONCURRENCY = 4  # 同时进行的在线语音合成请求数
+VOICE_SYNTHESIS_TIMEOUT = 30  # 等待单条语音合成完成的最长时间（秒）
+VOICE_SYNTHESIS_MAX_TEXT_LENGTH = 500  # 单条语音合成文本的最大长度
+VOICE_SYNTHESIS_MAX_RETRIES = 3  # 语音合成失败后的最大尝试次数
+VOICE_PRESYNTHESIS_INTERVAL = 0.5  # 后台预生成语音时两次合成请求的最小间隔（秒）
+VOICE_SYNTHESIS_DEFAULT_RATE = (
+    "+0%"  # 语音合成的语速（Edge TTS 格式，播放语速由播放器调整）
+)
+VOICE_CACHE_MAX_BYTES = 128 * 1024 * 1024  # 语音缓存目录的最大占用空间（字节）
+VOICE_CACHE_INDEX_SAVE_INTERVAL = 30  # 只有访问时间变化时写入缓存索引的最小间隔（秒）
+VOICE_CACHE_COMPRESS_FORMAT = (
+    "OGG"  # 合成结果为未压缩的 WAV 时转码保存的格式（需要 soundfile）
+)
+
 
 # ==================================================
 # 监控与调试配置
@@ -9,11 +9,72 @@ from PySide6.QtCore import *
 from qfluentwidgets import *
 
 from app.tools.variable import *
+from app.tools.log_index import LOG_LEVELS, NO_LEVEL, LogFileIndex
 from app.tools.path_utils import get_path
 from app.tools.personalised import *
 from app.Language.obtain_language import *
 
 
+class LogLineModel(QAbstractListModel):
+    """日志行列表模型，只为可见的行读取文本"""
+
+    def __init__(self, level_colors, parent=None):
+        super().__init__(parent)
+        self._log_index = None
+        self._rows = []
+        self._row_count = 0
+        self._min_level = 0
+        self._level_colors = {
+            LOG_LEVELS.index(level): QColor(color)
+            for level, color in level_colors.items()
+            if level in LOG_LEVELS
+        }
+        self._default_color = QColor("#d4d4d4")
+
+    def set_log_index(self, log_index, min_level=None):
+        """设置日志索引（切换文件或文件被重置时调用）"""
+        self.beginResetModel()
+        self._log_index = log_index
+        if min_level is not None:
+            self._min_level = min_level
+        self._rows = log_index.rows(self._min_level) if log_index else []
+        self._row_count = len(self._rows)
+        self.endResetModel()
+
+    def set_min_level(self, min_level):
+        """设置最低显示等级"""
+        self.set_log_index(self._log_index, min_level)
+
+    def sync_rows(self):
+        """同步索引中新增的行"""
+        row_count = len(self._rows)
+        if row_count > self._row_count:
+            self.beginInsertRows(QModelIndex(), self._row_count, row_count - 1)
+            self._row_count = row_count
+            self.endInsertRows()
+
+    def line_text(self, row):
+        """获取指定行的日志文本"""
+        return self._log_index.get_line(self._rows[row])
+
+    def rowCount(self, parent=None):
+        if parent is not None and parent.isValid():
+            return 0
+        return self._row_count
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._row_count:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.line_text(index.row())
+        if role == Qt.ItemDataRole.ForegroundRole:
+            level = self._log_index.level(self._rows[index.row()])
+            if level == NO_LEVEL:
+                return self._default_color
+            return self._level_colors.get(level, self._default_color)
+        return None
+
+
 class LogViewerWindow(QWidget):
     """日志查看窗口"""
 
@@ -30,8 +91,15 @@ class LogViewerWindow(QWidget):
             "ERROR": "#FF0000",
             "CRITICAL": "#8B0000",
         }
+        self.log_files = []
+        self.log_index = None
         self.file_watcher = QFileSystemWatcher(self)
+        self.file_watcher.directoryChanged.connect(self.on_directory_changed)
+        self.file_watcher.fileChanged.connect(self.on_file_changed)
         self.init_ui()
+        self._tail_timer = QTimer(self)
+        self._tail_timer.setSingleShot(True)
+        self._tail_timer.timeout.connect(self.update_log_content)
         self._load_timer = QTimer(self)
         self._load_timer.setSingleShot(True)
         self._load_timer.timeout.connect(self.load_log_files)
@@ -93,21 +161,31 @@ class LogViewerWindow(QWidget):
         # 添加控制区域到主布局
         self.main_layout.addLayout(control_layout)
 
-        # 创建日志显示文本框
-        self.log_text = TextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setPlaceholderText(
-            get_content_name_async("log_viewer", "placeholder")
+        # 创建日志显示列表（只绘制可见的行）
+        self.log_model = LogLineModel(self.log_level_colors, self)
+        self.log_view = QListView()
+        self.log_view.setModel(self.log_model)
+        self.log_view.setUniformItemSizes(True)
+        self.log_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.log_view.setSelectionMode(
+            QAbstractItemView.SelectionMode.ExtendedSelection
         )
-        self.log_text.setLineWrapMode(QTextBrowser.LineWrapMode.NoWrap)
-
-        # 创建平滑滚动区域
-        scroll_area = SmoothScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setWidget(self.log_text)
+        self.log_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        custom_font = load_custom_font()
+        font = QFont(custom_font if custom_font else "Consolas")
+        font.setStyleHint(QFont.StyleHint.Monospace)
+        font.setPixelSize(12)
+        self.log_view.setFont(font)
+        self.log_view.setStyleSheet(
+            "QListView { background-color: #1e1e1e; color: #d4d4d4; padding: 10px; }"
+        )
+        self.copy_shortcut = QShortcut(
+            QKeySequence(QKeySequence.StandardKey.Copy), self.log_view
+        )
+        self.copy_shortcut.activated.connect(self.copy_selected_lines)
 
         # 添加到主布局
-        self.main_layout.addWidget(scroll_area)
+        self.main_layout.addWidget(self.log_view)
 
         # 创建状态栏
         self.status_label = BodyLabel("")
@@ -129,7 +207,6 @@ class LogViewerWindow(QWidget):
             # 添加文件夹监听
             if str(log_dir) not in self.file_watcher.directories():
                 self.file_watcher.addPath(str(log_dir))
-                self.file_watcher.directoryChanged.connect(self.on_directory_changed)
 
             # 获取所有日志文件
             log_files = []
@@ -156,7 +233,9 @@ class LogViewerWindow(QWidget):
                 self.log_file_combo.setCurrentIndex(0)
                 self.load_log_content(log_files[0][1])
             else:
-                self.log_text.clear()
+                self.current_log_file = None
+                self.log_index = None
+                self.log_model.set_log_index(None)
                 self.status_label.setText(
                     get_content_name_async("log_viewer", "no_log_files")
                 )
@@ -179,26 +258,51 @@ class LogViewerWindow(QWidget):
             self.load_log_content(self.log_files[index][1])
 
     def load_log_content(self, file_path):
-        """加载日志内容"""
+        """加载日志内容（切换到其他文件时重新建立索引）"""
         try:
             if self._closing:
                 return
-            self.current_log_file = file_path
+            if self.log_index is None or self.current_log_file != file_path:
+                self.current_log_file = file_path
+                self.log_index = LogFileIndex(file_path)
+                self.log_model.set_log_index(self.log_index, self._get_min_level())
 
             # 添加文件监听
             if str(file_path) not in self.file_watcher.files():
                 self.file_watcher.addPath(str(file_path))
-                self.file_watcher.fileChanged.connect(self.on_file_changed)
 
-            # 读取日志文件
-            with open(file_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+            self.update_log_content()
+            self.log_view.scrollToBottom()
+
+        except Exception as e:
+            logger.exception(f"加载日志内容失败: {e}")
+            self.status_label.setText(
+                get_content_name_async("log_viewer", "load_failed").format(str(e))
+            )
+
+    def update_log_content(self):
+        """读取日志文件新增的行，滚动条位于底部时跟随到最新一行"""
+        try:
+            if self._closing or self.log_index is None:
+                return
+            scroll_bar = self.log_view.verticalScrollBar()
+            follow_tail = scroll_bar.value() >= scroll_bar.maximum()
+
+            if self.log_index.update(LOG_VIEWER_UPDATE_MAX_BYTES):
+                self.log_model.set_log_index(self.log_index)
+            else:
+                self.log_model.sync_rows()
+
+            if follow_tail:
+                self.log_view.scrollToBottom()
 
-            # 应用过滤并显示
-            self.filter_logs(lines)
+            # 文件较大时分多轮解析，每轮之间让出事件循环
+            if self.log_index.has_pending:
+                self._tail_timer.start(0)
 
             # 更新状态栏
-            file_size = os.path.getsize(file_path)
+            file_path = self.log_index.file_path
+            file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
             self.status_label.setText(
                 get_content_name_async("log_viewer", "status").format(
                     os.path.basename(file_path), file_size
@@ -212,113 +316,37 @@ class LogViewerWindow(QWidget):
             )
 
     def on_file_changed(self, file_path):
-        """文件变化时的处理"""
+        """文件变化时的处理（合并短时间内的多次变化）"""
         if self._closing:
             return
-        if file_path == self.current_log_file:
-            QTimer.singleShot(100, lambda: self.load_log_content(file_path))
-
-    def filter_logs(self, lines=None):
-        """过滤日志"""
+        if file_path == str(self.current_log_file):
+            # 文件被替换后监听会失效，重新添加
+            if os.path.exists(file_path) and file_path not in self.file_watcher.files():
+                self.file_watcher.addPath(file_path)
+            if not self._tail_timer.isActive():
+                self._tail_timer.start(LOG_VIEWER_TAIL_DELAY_MS)
+
+    def _get_min_level(self):
+        """获取选择的最低日志等级（"全部"与 DEBUG 相同）"""
+        return max(0, self.log_level_combo.currentIndex() - 1)
+
+    def filter_logs(self):
+        """按日志等级过滤（直接切换索引中对应等级的行列表）"""
         try:
             if self._closing:
                 return
-            # 如果没有提供 lines，则从文件读取
-            if lines is None:
-                if not self.current_log_file or not os.path.exists(
-                    self.current_log_file
-                ):
-                    return
-                with open(self.current_log_file, "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-
-            lines = [
-                line
-                for line in lines
-                if "内幕" not in line and "behind" not in line.lower()
-            ]
-
-            # 获取选择的日志等级
-            level_index = self.log_level_combo.currentIndex()
-            log_levels_dict = get_any_position_value_async("log_viewer", "log_levels")
-            log_levels = log_levels_dict.get("combo_items", [])
-            selected_level = (
-                log_levels[level_index] if level_index < len(log_levels) else "DEBUG"
-            )
-
-            # 如果选择"全部"，显示所有日志
-            if level_index == 0:
-                self.display_colored_logs(lines)
-                return
-
-            # 等级映射（值越大，等级越高）
-            level_map = {
-                "DEBUG": 0,
-                "INFO": 1,
-                "WARNING": 2,
-                "ERROR": 3,
-                "CRITICAL": 4,
-            }
-            min_level = level_map.get(selected_level, 0)
-
-            # 过滤日志行
-            filtered_lines = []
-            for line in lines:
-                # 检查日志等级
-                found_level = False
-                for level, level_value in level_map.items():
-                    # 日志格式：时间戳 | 等级(8字符左对齐) | 模块:函数:行号 - 消息
-                    # 匹配模式： | DEBUG    | （等级左对齐）
-                    if f" | {level:<8} | " in line:
-                        # 只显示等级 >= min_level 的日志
-                        if level_value >= min_level:
-                            filtered_lines.append(line)
-                        found_level = True
-                        break
-
-                # 如果没有找到等级标记，保留该行
-                if not found_level:
-                    filtered_lines.append(line)
-
-            # 显示过滤后的日志
-            self.display_colored_logs(filtered_lines)
-
+            self.log_model.set_min_level(self._get_min_level())
+            self.log_view.scrollToBottom()
         except Exception as e:
             logger.exception(f"过滤日志失败: {e}")
 
-    def display_colored_logs(self, lines):
-        """显示带颜色的日志"""
-        try:
-            # 获取当前设置的字体
-            custom_font = load_custom_font()
-            font_family = custom_font if custom_font else "Consolas, monospace"
-
-            html_content = f"<html><body style='font-family: {font_family}, monospace; font-size: 12px; background-color: #1e1e1e; color: #d4d4d4; margin: 0; padding: 10px;'>"
-
-            for line in lines:
-                # 转义 HTML 特殊字符
-                escaped_line = (
-                    line.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-                )
-
-                # 检查日志等级并应用颜色
-                colored_line = escaped_line
-                for level, color in self.log_level_colors.items():
-                    # 匹配日志等级（8字符左对齐）
-                    if f" | {level:<8} | " in escaped_line:
-                        # 为整行应用颜色
-                        colored_line = (
-                            f"<span style='color: {color};'>{escaped_line}</span>"
-                        )
-                        break
-
-                html_content += colored_line + "<br>"
-
-            html_content += "</body></html>"
-            self.log_text.setHtml(html_content)
-
-        except Exception as e:
-            logger.exception(f"显示带颜色日志失败: {e}")
+    def copy_selected_lines(self):
+        """复制选中的日志行"""
+        rows = sorted(index.row() for index in self.log_view.selectedIndexes())
+        if rows:
+            QApplication.clipboard().setText(
+                "\n".join(self.log_model.line_text(row) for row in rows)
+            )
 
     def clear_current_log(self):
         """清空当前日志文件"""
@@ -436,6 +464,8 @@ class LogViewerWindow(QWidget):
         try:
             if hasattr(self, "_load_timer") and self._load_timer.isActive():
                 self._load_timer.stop()
+            if hasattr(self, "_tail_timer") and self._tail_timer.isActive():
+                self._tail_timer.stop()
         except Exception:
             pass
         try:
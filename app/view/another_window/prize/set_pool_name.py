@@ -277,11 +277,9 @@ class SetPoolNameWindow(QWidget):
                             deleted_count += 1
 
                         # 删除对应的抽奖历史记录
-                        from app.common.history import get_history_file_path
+                        from app.common.history import delete_history_data
 
-                        history_file_path = get_history_file_path("lottery", pool_name)
-                        if history_file_path.exists():
-                            history_file_path.unlink()
+                        if delete_history_data("lottery", pool_name):
                             logger.info(f"已删除奖池 '{pool_name}' 的抽奖历史记录")
 
                     # 显示删除成功消息
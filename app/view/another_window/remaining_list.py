@@ -11,21 +11,27 @@ from typing import Any, Dict, List, Optional
 
 from loguru import logger
 from PySide6.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QRect,
+    QSize,
     Qt,
     QThread,
     QTimer,
     Signal,
 )
-from PySide6.QtGui import QFont
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter
 from PySide6.QtWidgets import (
+    QStyle,
+    QStyledItemDelegate,
     QVBoxLayout,
     QWidget,
 )
 from qfluentwidgets import (
     BodyLabel,
-    ElevatedCardWidget,
+    SmoothScrollDelegate,
     SubtitleLabel,
-    ScrollArea,
+    isDarkTheme,
 )
 
 from app.Language.obtain_language import (
@@ -42,7 +48,13 @@ from app.tools.variable import (
     STUDENT_CARD_MARGIN,
     STUDENT_CARD_SPACING,
 )
-from app.view.components.center_flow_layout import CenterFlowLayout
+from app.view.components.card_flow_view import CardFlowView
+
+# 卡片外观（与 ElevatedCardWidget 一致）
+CARD_BORDER_RADIUS = 5
+GROUP_CARD_MAX_HEIGHT = 500
+GROUP_CARD_SPACING = 8
+STUDENT_CARD_CONTENT_SPACING = 5
 
 
 class StudentLoader(QThread):
@@ -253,6 +265,201 @@ class StudentLoader(QThread):
             )
 
 
+class RemainingListModel(QAbstractListModel):
+    """剩余名单数据模型（每个条目为 StudentLoader 预处理后的学生或小组）"""
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._students: List[Dict[str, Any]] = []
+
+    def set_students(self, students: List[Dict[str, Any]]) -> None:
+        self.beginResetModel()
+        self._students = students
+        self.endResetModel()
+
+    def rowCount(self, parent=None) -> int:
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self._students)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._students):
+            return None
+        student = self._students[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return student.get("name", "")
+        if role == Qt.ItemDataRole.UserRole:
+            return student
+        return None
+
+
+class RemainingCardDelegate(QStyledItemDelegate):
+    """绘制剩余名单卡片（学生卡片和小组卡片）
+
+    字体和字体度量只创建一次，小组卡片的高度按文本换行计算
+    """
+
+    def __init__(self, font_family: Optional[str], parent=None) -> None:
+        super().__init__(parent)
+        family = font_family or ""
+        self.name_font = QFont(family, 14)
+        self.info_font = QFont(family, 9)
+        self.group_name_font = QFont(family, 16, QFont.Weight.Bold)
+        self.group_count_font = QFont(family, 10)
+        self.group_members_font = QFont(family, 9)
+        self.info_template: Optional[str] = None
+        self._content_width = STUDENT_CARD_FIXED_WIDTH - 2 * STUDENT_CARD_MARGIN
+
+    # ------------------------------------------------------------------
+    # 文本
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _group_count_text(student: Dict[str, Any]) -> str:
+        return f"成员数量: {len(student.get('members', []))}"
+
+    @staticmethod
+    def _group_members_text(student: Dict[str, Any]) -> str:
+        members = student.get("members", [])
+        members_text = student.get("members_text_pre", "")
+        if not members_text and members:
+            members_names = [member.get("name", "") for member in members[:5]]
+            members_text = "、".join(members_names)
+            if len(members) > 5:
+                members_text += f" 等{len(members) - 5}名成员"
+        return members_text
+
+    @staticmethod
+    def _info_text(student: Dict[str, Any], template: Optional[str]) -> str:
+        info_text = student.get("info_text_pre", "")
+        if info_text:
+            return info_text
+        try:
+            return (template or "{id} {gender} {group}").format(
+                id=student.get("id", ""),
+                gender=student.get("gender", ""),
+                group=student.get("group", ""),
+            )
+        except Exception:
+            return f"{student.get('id', '')} {student.get('gender', '')} {student.get('group', '')}"
+
+    def _wrapped_height(self, font: QFont, text: str, flags) -> int:
+        return (
+            QFontMetrics(font)
+            .boundingRect(
+                QRect(0, 0, self._content_width, GROUP_CARD_MAX_HEIGHT), flags, text
+            )
+            .height()
+        )
+
+    def _group_text_heights(self, student: Dict[str, Any]) -> List[int]:
+        wrap = Qt.TextFlag.TextWordWrap
+        return [
+            self._wrapped_height(
+                self.group_name_font,
+                student.get("name", ""),
+                Qt.AlignmentFlag.AlignCenter | wrap,
+            ),
+            QFontMetrics(self.group_count_font).height(),
+            self._wrapped_height(
+                self.group_members_font,
+                self._group_members_text(student),
+                Qt.AlignmentFlag.AlignLeft | wrap,
+            ),
+        ]
+
+    # ------------------------------------------------------------------
+    # 尺寸与绘制
+    # ------------------------------------------------------------------
+    def sizeHint(self, option, index: QModelIndex) -> QSize:
+        student = index.data(Qt.ItemDataRole.UserRole) or {}
+        if not student.get("is_group"):
+            return QSize(STUDENT_CARD_FIXED_WIDTH, STUDENT_CARD_FIXED_HEIGHT)
+        height = (
+            sum(self._group_text_heights(student))
+            + 2 * GROUP_CARD_SPACING
+            + 2 * STUDENT_CARD_MARGIN
+        )
+        return QSize(STUDENT_CARD_FIXED_WIDTH, min(height, GROUP_CARD_MAX_HEIGHT))
+
+    def paint(self, painter: QPainter, option, index: QModelIndex) -> None:
+        student = index.data(Qt.ItemDataRole.UserRole) or {}
+        dark = isDarkTheme()
+        hover = bool(option.state & QStyle.StateFlag.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        # 卡片背景和边框
+        if hover:
+            background = QColor(255, 255, 255, 16 if dark else 255)
+        else:
+            background = QColor(255, 255, 255, 13 if dark else 170)
+        painter.setPen(QColor(0, 0, 0, 48 if dark else 12))
+        painter.setBrush(background)
+        painter.drawRoundedRect(
+            option.rect.adjusted(1, 1, -1, -1), CARD_BORDER_RADIUS, CARD_BORDER_RADIUS
+        )
+
+        painter.setPen(QColor(255, 255, 255) if dark else QColor(0, 0, 0))
+        content = option.rect.adjusted(
+            STUDENT_CARD_MARGIN,
+            STUDENT_CARD_MARGIN,
+            -STUDENT_CARD_MARGIN,
+            -STUDENT_CARD_MARGIN,
+        )
+        if student.get("is_group"):
+            self._paint_group(painter, content, student)
+        else:
+            self._paint_student(painter, content, student)
+        painter.restore()
+
+    def _paint_student(self, painter: QPainter, content: QRect, student):
+        # 姓名和信息各占内容区域的一半并居中（与原先两个标签的布局一致）
+        half_height = (content.height() - STUDENT_CARD_CONTENT_SPACING) // 2
+        name_rect = QRect(content.left(), content.top(), content.width(), half_height)
+        info_rect = QRect(
+            content.left(),
+            content.bottom() - half_height + 1,
+            content.width(),
+            half_height,
+        )
+        painter.setFont(self.name_font)
+        painter.drawText(
+            name_rect, Qt.AlignmentFlag.AlignCenter, student.get("name", "")
+        )
+        painter.setFont(self.info_font)
+        painter.drawText(
+            info_rect,
+            Qt.AlignmentFlag.AlignCenter,
+            self._info_text(student, self.info_template),
+        )
+
+    def _paint_group(self, painter: QPainter, content: QRect, student):
+        wrap = Qt.TextFlag.TextWordWrap
+        name_height, count_height, members_height = self._group_text_heights(student)
+        y = content.top()
+        painter.setFont(self.group_name_font)
+        painter.drawText(
+            QRect(content.left(), y, content.width(), name_height),
+            Qt.AlignmentFlag.AlignCenter | wrap,
+            student.get("name", ""),
+        )
+        y += name_height + GROUP_CARD_SPACING
+        painter.setFont(self.group_count_font)
+        painter.drawText(
+            QRect(content.left(), y, content.width(), count_height),
+            Qt.AlignmentFlag.AlignCenter,
+            self._group_count_text(student),
+        )
+        y += count_height + GROUP_CARD_SPACING
+        painter.setFont(self.group_members_font)
+        painter.drawText(
+            QRect(content.left(), y, content.width(), max(0, content.bottom() - y + 1)),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop | wrap,
+            self._group_members_text(student),
+        )
+
+
 class RemainingListPage(QWidget):
     """剩余名单页面类"""
 
@@ -271,7 +478,6 @@ class RemainingListPage(QWidget):
         self.gender_index = 0
         self.source = source
         self.students: List[Dict[str, Any]] = []
-        self.cards: List[ElevatedCardWidget] = []
         self._loading_thread: Optional[StudentLoader] = None
 
         self._load_timer = QTimer(self)
@@ -279,14 +485,6 @@ class RemainingListPage(QWidget):
         self._load_timer.timeout.connect(self.load_data)
         self._load_timer.start(APP_INIT_DELAY)
 
-        # 布局状态
-        self._last_layout_width = 0
-        self._last_card_count = 0
-        self._layout_update_in_progress = False
-        self._resize_timer = QTimer(self)
-        self._resize_timer.setSingleShot(True)
-        self._resize_timer.timeout.connect(self._delayed_update_layout)
-
         # 缓存资源
         try:
             self._font_family = load_custom_font()
@@ -327,11 +525,6 @@ class RemainingListPage(QWidget):
                 self._load_timer.stop()
         except Exception:
             pass
-        try:
-            if self._resize_timer.isActive():
-                self._resize_timer.stop()
-        except Exception:
-            pass
         self.stop_loader()
         super().closeEvent(event)
 
@@ -368,25 +561,18 @@ class RemainingListPage(QWidget):
         self.count_label.setFont(QFont(self._font_family or "", 12))
         self.main_layout.addWidget(self.count_label)
 
-        # 滚动区域
-        self.scroll_area = ScrollArea(self)
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(
-            Qt.ScrollBarPolicy.ScrollBarAlwaysOff
-        )
-        self.main_layout.addWidget(self.scroll_area)
-
-        # 滚动区域内部容器
-        self.scroll_content = QWidget()
-        self.scroll_area.setWidget(self.scroll_content)
-
-        # 流式布局
-        self.flow_layout = CenterFlowLayout(self.scroll_content)
-        self.flow_layout.setHorizontalSpacing(STUDENT_CARD_SPACING)
-        self.flow_layout.setVerticalSpacing(STUDENT_CARD_SPACING)
-        self.flow_layout.setAlignment(Qt.AlignmentFlag.AlignHCenter)
-        self.flow_layout.setContentsMargins(10, 10, 10, 10)
-        self.scroll_content.setLayout(self.flow_layout)
+        # 卡片视图（只绘制可见区域内的卡片）
+        self.list_model = RemainingListModel(self)
+        self.card_delegate = RemainingCardDelegate(self._font_family, self)
+        self.card_view = CardFlowView(self)
+        self.card_view.setItemDelegate(self.card_delegate)
+        self.card_view.setModel(self.list_model)
+        self.card_view.setHorizontalSpacing(STUDENT_CARD_SPACING)
+        self.card_view.setVerticalSpacing(STUDENT_CARD_SPACING)
+        self.card_view.setLayoutMargins(10, 10, 10, 10)
+        self.card_view.setStyleSheet("background: transparent; border: none;")
+        self._scroll_delegate = SmoothScrollDelegate(self.card_view)
+        self.main_layout.addWidget(self.card_view)
 
         try:
             self._student_info_text = get_any_position_value_async(
@@ -394,6 +580,7 @@ class RemainingListPage(QWidget):
             )
         except Exception:
             self._student_info_text = "{id} {gender} {group}"
+        self.card_delegate.info_template = self._student_info_text
 
     # ------------------------------------------------------------------
     # 数据加载
@@ -511,165 +698,10 @@ class RemainingListPage(QWidget):
             self._count_label_template.format(count=remaining_count)
         )
 
-        # 清空现有卡片
-        self._clear_cards()
-
-        # 创建卡片
-        for student in self.students:
-            card = self._create_student_card(student)
-            if card:
-                self.cards.append(card)
-
-        # 更新布局
-        self._update_grid_layout()
+        self.list_model.set_students(self.students)
 
     def _clear_cards(self) -> None:
-        for card in self.cards:
-            try:
-                card.hide()
-                card.deleteLater()
-            except Exception:
-                pass
-        self.cards.clear()
-
-        if hasattr(self, "flow_layout") and self.flow_layout is not None:
-            self.flow_layout.removeAllWidgets()
-
-    def _update_grid_layout(self) -> None:
-        if not self.cards:
-            return
-
-        if not hasattr(self, "flow_layout") or self.flow_layout is None:
-            return
-
-        self.flow_layout.removeAllWidgets()
-        for card in self.cards:
-            self.flow_layout.addWidget(card)
-            card.show()
-
-        self._last_layout_width = self.scroll_area.width()
-        self._last_card_count = len(self.cards)
-
-    def _create_student_card(
-        self, student: Dict[str, Any]
-    ) -> Optional[ElevatedCardWidget]:
-        """创建学生卡片"""
-        is_group = student.get("is_group", False)
-
-        card = ElevatedCardWidget()
-        card.setProperty("is_group", is_group)
-
-        if is_group:
-            card.setMinimumSize(STUDENT_CARD_FIXED_WIDTH, 0)
-            card.setMaximumSize(STUDENT_CARD_FIXED_WIDTH, 500)
-            layout = QVBoxLayout(card)
-            layout.setContentsMargins(
-                STUDENT_CARD_MARGIN,
-                STUDENT_CARD_MARGIN,
-                STUDENT_CARD_MARGIN,
-                STUDENT_CARD_MARGIN,
-            )
-            layout.setSpacing(8)
-
-            # 小组名称
-            name_label = BodyLabel(student["name"])
-            if self._font_family:
-                name_label.setFont(QFont(self._font_family, 16, QFont.Weight.Bold))
-            name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            name_label.setWordWrap(True)
-            layout.addWidget(name_label)
-
-            # 成员数量
-            members = student.get("members", [])
-            count_label = BodyLabel(f"成员数量: {len(members)}")
-            if self._font_family:
-                count_label.setFont(QFont(self._font_family, 10))
-            count_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            layout.addWidget(count_label)
-
-            # 成员列表
-            members_text = student.get("members_text_pre", "")
-            if not members_text and members:
-                members_names = [member.get("name", "") for member in members[:5]]
-                members_text = "、".join(members_names)
-                if len(members) > 5:
-                    members_text += f" 等{len(members) - 5}名成员"
-
-            members_label = BodyLabel(members_text)
-            if self._font_family:
-                members_label.setFont(QFont(self._font_family, 9))
-            members_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
-            members_label.setWordWrap(True)
-            layout.addWidget(members_label)
-        else:
-            card.setFixedSize(STUDENT_CARD_FIXED_WIDTH, STUDENT_CARD_FIXED_HEIGHT)
-
-            layout = QVBoxLayout(card)
-            layout.setContentsMargins(
-                STUDENT_CARD_MARGIN,
-                STUDENT_CARD_MARGIN,
-                STUDENT_CARD_MARGIN,
-                STUDENT_CARD_MARGIN,
-            )
-            layout.setSpacing(5)
-
-            # 学生姓名
-            name_label = BodyLabel(student.get("name", ""))
-            if self._font_family:
-                name_label.setFont(QFont(self._font_family, 14))
-            else:
-                name_label.setFont(QFont("", 14))
-            name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            layout.addWidget(name_label)
-
-            # 学生信息
-            info_text = student.get("info_text_pre", "")
-            if not info_text:
-                template = self._student_info_text or "{id} {gender} {group}"
-                try:
-                    info_text = template.format(
-                        id=student.get("id", ""),
-                        gender=student.get("gender", ""),
-                        group=student.get("group", ""),
-                    )
-                except Exception:
-                    info_text = f"{student.get('id', '')} {student.get('gender', '')} {student.get('group', '')}"
-
-            info_label = BodyLabel(info_text)
-            if self._font_family:
-                info_label.setFont(QFont(self._font_family, 9))
-            else:
-                info_label.setFont(QFont("", 9))
-            info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            layout.addWidget(info_label)
-
-        return card
-
-    # ------------------------------------------------------------------
-    # 窗口大小处理
-    # ------------------------------------------------------------------
-    def resizeEvent(self, event) -> None:  # type: ignore[override]
-        new_size = event.size()
-        old_size = event.oldSize()
-
-        if new_size == old_size:
-            return
-
-        width_change = abs(new_size.width() - self._last_layout_width)
-        if width_change < 5:
-            return
-
-        if self._resize_timer is not None:
-            self._resize_timer.stop()
-        self._resize_timer.start(200)
-        super().resizeEvent(event)
-
-    def _delayed_update_layout(self) -> None:
-        try:
-            if self.isVisible() and self.cards:
-                self._update_grid_layout()
-        except RuntimeError as e:
-            logger.exception(f"延迟布局更新错误: {e}")
+        self.list_model.set_students([])
 
     # ------------------------------------------------------------------
     # 外部接口
@@ -692,14 +724,10 @@ class RemainingListPage(QWidget):
         self.group_index = group_index
         self.gender_index = gender_index
         self.source = source
-        self._last_layout_width = 0
-        self._last_card_count = 0
         self.load_data()
 
     def refresh(self) -> None:
         if self.class_name:
-            self._last_layout_width = 0
-            self._last_card_count = 0
             self.load_data()
 
     def on_count_changed(self, count: int) -> None:  # noqa: ARG002
@@ -19,6 +19,7 @@ from app.tools.settings_default import *
 from app.tools.settings_access import *
 from app.Language.obtain_language import *
 from app.tools.config import *
+from app.common.voice.presynthesis import start_presynthesis
 
 
 class ImportStudentNameWindow(QWidget):
@@ -752,3 +753,6 @@ class ImportStudentNameWindow(QWidget):
             )
         else:
             logger.info(f"已保存 {len(all_students)} 名学生到新班级 '{class_name}'")
+
+        # 在后台预生成新名单的播报语音
+        start_presynthesis(class_name)
@@ -277,13 +277,9 @@ class SetClassNameWindow(QWidget):
                             deleted_count += 1
 
                         # 删除对应的点名历史记录
-                        from app.common.history import get_history_file_path
+                        from app.common.history import delete_history_data
 
-                        history_file_path = get_history_file_path(
-                            "roll_call", class_name
-                        )
-                        if history_file_path.exists():
-                            history_file_path.unlink()
+                        if delete_history_data("roll_call", class_name):
                             logger.info(f"已删除班级 '{class_name}' 的点名历史记录")
 
                     # 显示删除成功消息
@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, QPoint, QRect, QSize, Qt
+from PySide6.QtGui import QPainter, QRegion
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QFrame,
+    QStyle,
+    QStyleOptionViewItem,
+    QWidget,
+)
+
+
+class CardFlowView(QAbstractItemView):
+    """按行居中排列卡片的列表视图
+
+    排列方式与 CenterFlowLayout（水平居中）一致，但不为每个条目创建控件：
+    卡片尺寸在数据变化时通过委托的 sizeHint 读取一次，排列位置只在视图宽度
+    变化时按算术重新计算，绘制和命中测试只处理可见区域内的卡片
+    """
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._h_spacing = 0
+        self._v_spacing = 0
+        self._margins = (0, 0, 0, 0)
+
+        # 排列结果
+        self._sizes: list[QSize] | None = None
+        self._item_x: list[int] = []
+        self._line_starts: list[int] = []  # 每行第一个卡片的行号
+        self._line_tops: list[int] = []
+        self._line_heights: list[int] = []
+        self._content_height = 0
+        self._layout_width = -1
+        self._hover_row = -1
+
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover, True)
+
+    # ------------------------------------------------------------------
+    # 排列参数
+    # ------------------------------------------------------------------
+    def setHorizontalSpacing(self, spacing: int) -> None:
+        self._h_spacing = spacing
+        self._invalidate_layout()
+
+    def setVerticalSpacing(self, spacing: int) -> None:
+        self._v_spacing = spacing
+        self._invalidate_layout()
+
+    def setLayoutMargins(self, left: int, top: int, right: int, bottom: int) -> None:
+        self._margins = (left, top, right, bottom)
+        self._invalidate_layout()
+
+    def setModel(self, model: QAbstractItemModel | None) -> None:
+        old_model = self.model()
+        if old_model is not None:
+            for signal in (
+                old_model.modelReset,
+                old_model.rowsInserted,
+                old_model.rowsRemoved,
+                old_model.layoutChanged,
+            ):
+                try:
+                    signal.disconnect(self._invalidate_sizes)
+                except Exception:
+                    pass
+        super().setModel(model)
+        if model is not None:
+            model.modelReset.connect(self._invalidate_sizes)
+            model.rowsInserted.connect(self._invalidate_sizes)
+            model.rowsRemoved.connect(self._invalidate_sizes)
+            model.layoutChanged.connect(self._invalidate_sizes)
+        self._invalidate_sizes()
+
+    def dataChanged(self, top_left, bottom_right, roles=()) -> None:
+        super().dataChanged(top_left, bottom_right, roles)
+        self._invalidate_sizes()
+
+    # ------------------------------------------------------------------
+    # 排列计算
+    # ------------------------------------------------------------------
+    def _invalidate_sizes(self, *args) -> None:
+        """数据变化后重新读取卡片尺寸"""
+        self._sizes = None
+        self._hover_row = -1
+        self._invalidate_layout()
+
+    def _invalidate_layout(self) -> None:
+        self._layout_width = -1
+        self.updateGeometries()
+        self.viewport().update()
+
+    def _view_option(self) -> QStyleOptionViewItem:
+        option = QStyleOptionViewItem()
+        self.initViewItemOption(option)
+        return option
+
+    def _ensure_layout(self) -> None:
+        """确保排列结果与当前数据和宽度一致"""
+        model = self.model()
+        if self._sizes is None:
+            self._sizes = []
+            if model is not None:
+                option = self._view_option()
+                delegate = self.itemDelegate()
+                root = self.rootIndex()
+                for row in range(model.rowCount(root)):
+                    index = model.index(row, 0, root)
+                    self._sizes.append(delegate.sizeHint(option, index))
+            self._layout_width = -1
+
+        width = self.viewport().width()
+        if width != self._layout_width:
+            self._layout_width = width
+            self._build_lines(width)
+
+    def _build_lines(self, width: int) -> None:
+        """按可用宽度把卡片分行并水平居中"""
+        left, top, right, bottom = self._margins
+        available_width = max(0, width - left - right)
+        h_space = self._h_spacing
+
+        self._item_x = [0] * len(self._sizes)
+        self._line_starts = []
+        self._line_tops = []
+        self._line_heights = []
+
+        y = top
+        line_start = 0
+        line_width = 0
+        line_height = 0
+
+        def finish_line(end: int) -> None:
+            x = left + max(0, available_width - line_width) // 2
+            for row in range(line_start, end):
+                self._item_x[row] = x
+                x += self._sizes[row].width() + h_space
+            self._line_starts.append(line_start)
+            self._line_tops.append(y)
+            self._line_heights.append(line_height)
+
+        for row, size in enumerate(self._sizes):
+            next_width = size.width() if row == line_start else h_space + size.width()
+            if row > line_start and line_width + next_width > available_width:
+                finish_line(row)
+                y += line_height + self._v_spacing
+                line_start = row
+                line_width = 0
+                line_height = 0
+                next_width = size.width()
+            line_width += next_width
+            line_height = max(line_height, size.height())
+
+        if line_start < len(self._sizes):
+            finish_line(len(self._sizes))
+            y += line_height
+
+        self._content_height = (y + bottom) if self._sizes else 0
+
+    def _line_of_row(self, row: int) -> int:
+        return bisect_right(self._line_starts, row) - 1
+
+    def _row_rect(self, row: int) -> QRect:
+        """卡片在内容中的位置（不含滚动偏移）"""
+        line = self._line_of_row(row)
+        return QRect(QPoint(self._item_x[row], self._line_tops[line]), self._sizes[row])
+
+    def _visible_lines(self, top: int, bottom: int) -> range:
+        """与内容区域 [top, bottom) 相交的行"""
+        first = max(0, bisect_right(self._line_tops, top) - 1)
+        while (
+            first < len(self._line_tops)
+            and self._line_tops[first] + self._line_heights[first] <= top
+        ):
+            first += 1
+        last = bisect_left(self._line_tops, bottom)
+        return range(first, last)
+
+    def _line_rows(self, line: int) -> range:
+        end = (
+            self._line_starts[line + 1]
+            if line + 1 < len(self._line_starts)
+            else len(self._sizes)
+        )
+        return range(self._line_starts[line], end)
+
+    # ------------------------------------------------------------------
+    # QAbstractItemView 接口
+    # ------------------------------------------------------------------
+    def visualRect(self, index: QModelIndex) -> QRect:
+        self._ensure_layout()
+        if not index.isValid() or not 0 <= index.row() < len(self._sizes):
+            return QRect()
+        return self._row_rect(index.row()).translated(0, -self.verticalOffset())
+
+    def indexAt(self, point: QPoint) -> QModelIndex:
+        self._ensure_layout()
+        model = self.model()
+        if model is None:
+            return QModelIndex()
+        content_point = point + QPoint(0, self.verticalOffset())
+        for line in self._visible_lines(content_point.y(), content_point.y() + 1):
+            for row in self._line_rows(line):
+                if self._row_rect(row).contains(content_point):
+                    return model.index(row, 0, self.rootIndex())
+        return QModelIndex()
+
+    def scrollTo(self, index: QModelIndex, hint=None) -> None:
+        rect = self.visualRect(index)
+        if rect.isEmpty():
+            return
+        scroll_bar = self.verticalScrollBar()
+        if rect.top() < 0:
+            scroll_bar.setValue(scroll_bar.value() + rect.top())
+        elif rect.bottom() > self.viewport().height():
+            scroll_bar.setValue(
+                scroll_bar.value() + rect.bottom() - self.viewport().height()
+            )
+
+    def moveCursor(self, cursor_action, modifiers) -> QModelIndex:
+        return self.currentIndex()
+
+    def horizontalOffset(self) -> int:
+        return 0
+
+    def verticalOffset(self) -> int:
+        return self.verticalScrollBar().value()
+
+    def isIndexHidden(self, index: QModelIndex) -> bool:
+        return False
+
+    def setSelection(self, rect: QRect, command) -> None:
+        pass
+
+    def visualRegionForSelection(self, selection) -> QRegion:
+        return QRegion()
+
+    def updateGeometries(self) -> None:
+        self._ensure_layout()
+        viewport_height = self.viewport().height()
+        scroll_bar = self.verticalScrollBar()
+        scroll_bar.setRange(0, max(0, self._content_height - viewport_height))
+        scroll_bar.setPageStep(viewport_height)
+        scroll_bar.setSingleStep(max(1, self._v_spacing * 2))
+        super().updateGeometries()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        if event.size().width() != event.oldSize().width():
+            self.updateGeometries()
+
+    # ------------------------------------------------------------------
+    # 绘制与悬停
+    # ------------------------------------------------------------------
+    def paintEvent(self, event) -> None:
+        self._ensure_layout()
+        model = self.model()
+        if model is None or not self._sizes:
+            return
+
+        offset = self.verticalOffset()
+        region = event.rect()
+        option = self._view_option()
+        base_state = option.state
+        delegate = self.itemDelegate()
+        root = self.rootIndex()
+
+        painter = QPainter(self.viewport())
+        for line in self._visible_lines(
+            region.top() + offset, region.bottom() + offset + 1
+        ):
+            for row in self._line_rows(line):
+                rect = self._row_rect(row).translated(0, -offset)
+                if not rect.intersects(region):
+                    continue
+                option.rect = rect
+                option.state = base_state
+                if row == self._hover_row:
+                    option.state |= QStyle.StateFlag.State_MouseOver
+                delegate.paint(painter, option, model.index(row, 0, root))
+        painter.end()
+
+    def _set_hover_row(self, row: int) -> None:
+        if row == self._hover_row:
+            return
+        model = self.model()
+        for old_or_new in (self._hover_row, row):
+            if model is not None and 0 <= old_or_new < len(self._sizes or []):
+                self.viewport().update(
+                    self.visualRect(model.index(old_or_new, 0, self.rootIndex()))
+                )
+        self._hover_row = row
+
+    def mouseMoveEvent(self, event) -> None:
+        index = self.indexAt(event.position().toPoint())
+        self._set_hover_row(index.row() if index.isValid() else -1)
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event) -> None:
+        self._set_hover_row(-1)
+        super().leaveEvent(event)
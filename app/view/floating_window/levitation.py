@@ -19,6 +19,7 @@ from app.tools.settings_access import (
     readme_settings_async,
     update_settings,
     get_settings_signals,
+    flush_settings,
 )
 from app.tools.path_utils import *
 from app.tools.variable import EXIT_CODE_RESTART, DEFAULT_ICON_CODEPOINT
@@ -26,7 +27,10 @@ from app.Language.obtain_language import (
     get_content_name_async,
     get_content_combo_name_async,
 )
-from app.common.extraction.extract import _is_non_class_time
+from app.common.extraction.class_schedule import (
+    get_class_schedule_service,
+    is_non_class_time,
+)
 from app.common.safety.verify_ops import require_and_run
 from app.common.data.list import get_class_name_list, get_group_list, get_gender_list
 
@@ -222,6 +226,7 @@ class LevitationWindow(QWidget):
         if app is not None:
             app.exit(EXIT_CODE_RESTART)
             return
+        flush_settings()
         os._exit(EXIT_CODE_RESTART)
 
     def _start_periodic_topmost(self):
@@ -721,22 +726,17 @@ class LevitationWindow(QWidget):
         self._pre_class_hide_main_visible = False
         self._pre_class_hide_storage_visible = False
 
-        # 定时检查器（默认 30 秒）
-        self._class_hide_timer = QTimer(self)
-        self._class_hide_timer.setInterval(30 * 1000)
-        self._class_hide_timer.timeout.connect(self._check_class_end_hide)
-        self._apply_class_hide_timer_state()
+        # 订阅课程时间调度服务，在上下课边界时刻更新隐藏状态
+        service = get_class_schedule_service()
+        if service is not None:
+            service.nonClassTimeChanged.connect(self._on_non_class_time_changed)
+        self._apply_class_hide_state()
 
-    def _apply_class_hide_timer_state(self):
+    def _apply_class_hide_state(self):
         try:
             if bool(getattr(self, "_hide_on_class_end_enabled", False)):
-                if not self._class_hide_timer.isActive():
-                    self._class_hide_timer.start()
                 QTimer.singleShot(0, self._check_class_end_hide)
             else:
-                if hasattr(self, "_class_hide_timer") and self._class_hide_timer:
-                    if self._class_hide_timer.isActive():
-                        self._class_hide_timer.stop()
                 # 如果设置被关闭，确保恢复先前的可见性
                 self._apply_class_hidden(False)
         except Exception:
@@ -749,13 +749,18 @@ class LevitationWindow(QWidget):
                 return
             is_non_class = False
             try:
-                is_non_class = bool(_is_non_class_time())
+                is_non_class = bool(is_non_class_time())
             except Exception:
                 is_non_class = False
             self._apply_class_hidden(bool(is_non_class))
         except Exception:
             pass
 
+    def _on_non_class_time_changed(self, is_non_class: bool):
+        """课程时间调度服务通知非上课时间状态变化"""
+        if bool(getattr(self, "_hide_on_class_end_enabled", False)):
+            self._apply_class_hidden(bool(is_non_class))
+
     def _apply_class_hidden(self, hidden: bool):
         """根据下课检测结果隐藏或恢复浮窗（记录并恢复之前可见性）"""
         hidden = bool(hidden)
@@ -1283,9 +1288,9 @@ class LevitationWindow(QWidget):
                 return
 
             # 检查当前时间是否在非上课时间段内
-            is_non_class_time = _is_non_class_time()
-            logger.debug(f"当前时间是否在非上课时间段内: {is_non_class_time}")
-            if is_non_class_time:
+            non_class_time = is_non_class_time()
+            logger.debug(f"当前时间是否在非上课时间段内: {non_class_time}")
+            if non_class_time:
                 # 检查是否需要验证流程
                 verification_required = readme_settings_async(
                     "linkage_settings", "verification_required"
@@ -3026,7 +3031,7 @@ class LevitationWindow(QWidget):
                     self._hide_on_class_end_enabled = bool(value)
                 except Exception:
                     self._hide_on_class_end_enabled = False
-                self._apply_class_hide_timer_state()
+                self._apply_class_hide_state()
             # 其他 linkage 设置目前不在此处处理
             return
         elif first == "float_position":
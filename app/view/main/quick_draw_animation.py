@@ -256,10 +256,6 @@ class QuickDrawAnimation(QObject):
             self._set_final_result(result)
             self._sync_final_result_to_widget()
 
-        from app.common.behind_scenes.behind_scenes_utils import BehindScenesUtils
-
-        BehindScenesUtils.clear_cache()
-
         music_player.stop_music(fade_out=True)
 
         result_music = readme_settings_async("quick_draw_settings", "result_music")
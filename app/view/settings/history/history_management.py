@@ -2,7 +2,6 @@
 # 导入库
 # ==================================================
 
-import os
 from loguru import logger
 from PySide6.QtWidgets import *
 from PySide6.QtGui import *
@@ -176,11 +175,8 @@ class roll_call_history(GroupHeaderCardWidget):
 
         if dialog.exec():
             try:
-                # 获取历史记录文件路径
-                history_file_path = get_history_file_path("roll_call", class_name)
-
-                if history_file_path.exists():
-                    os.remove(history_file_path)
+                # 删除历史记录文件（快照、事件日志及统计索引）
+                if delete_history_data("roll_call", class_name):
                     logger.info(f"已删除班级 '{class_name}' 的点名历史记录文件")
                 else:
                     logger.info(f"班级 '{class_name}' 的历史记录文件不存在")
@@ -279,8 +275,9 @@ class roll_call_history(GroupHeaderCardWidget):
             return
 
         # 检查历史记录文件是否存在
-        history_file_path = get_history_file_path("roll_call", class_name)
-        self.clear_roll_call_history_button.setEnabled(history_file_path.exists())
+        self.clear_roll_call_history_button.setEnabled(
+            history_data_exists("roll_call", class_name)
+        )
 
 
 class lottery_history(GroupHeaderCardWidget):
@@ -408,11 +405,8 @@ class lottery_history(GroupHeaderCardWidget):
 
         if dialog.exec():
             try:
-                # 获取历史记录文件路径
-                history_file_path = get_history_file_path("lottery", pool_name)
-
-                if history_file_path.exists():
-                    os.remove(history_file_path)
+                # 删除历史记录文件（快照、事件日志及统计索引）
+                if delete_history_data("lottery", pool_name):
                     logger.info(f"已删除奖池 '{pool_name}' 的抽奖历史记录文件")
                 else:
                     logger.info(f"奖池 '{pool_name}' 的历史记录文件不存在")
@@ -509,5 +503,6 @@ class lottery_history(GroupHeaderCardWidget):
             return
 
         # 检查历史记录文件是否存在
-        history_file_path = get_history_file_path("lottery", pool_name)
-        self.clear_lottery_history_button.setEnabled(history_file_path.exists())
+        self.clear_lottery_history_button.setEnabled(
+            history_data_exists("lottery", pool_name)
+        )
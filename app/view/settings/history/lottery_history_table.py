@@ -1,8 +1,6 @@
 # ==================================================
 # 导入库
 # ==================================================
-import json
-
 from loguru import logger
 from PySide6.QtWidgets import *
 from PySide6.QtGui import *
@@ -19,12 +17,29 @@ from app.Language.obtain_language import *
 from app.common.history import *
 from app.common.history.history_reader import (
     get_lottery_pool_list,
-    get_lottery_history_data,
     get_lottery_prizes_data,
-    get_lottery_session_data,
-    get_lottery_prize_stats_data,
+    get_lottery_session_summary,
+    get_lottery_session_page,
+    get_lottery_prize_stats_summary,
+    get_lottery_prize_stats_page,
+    get_lottery_subject_list,
 )
 
+# 会话模式和个人统计模式下列索引对应的查询排序字段
+SESSIONS_SORT_FIELDS = {
+    0: "draw_time",
+    1: "id",
+    2: "name",
+    3: "class_name",
+    4: "weight",
+}
+STATS_SORT_FIELDS = {
+    0: "draw_time",
+    1: "draw_numbers",
+    2: "class_name",
+    3: "weight",
+}
+
 
 # ==================================================
 # 点名历史记录表格
@@ -55,6 +70,7 @@ class lottery_history_table(GroupHeaderCardWidget):
         self.cached_lotterys_data = []  # 缓存的奖品数据列表
         self.cached_sessions_data = []  # 缓存的会话数据列表
         self.cached_stats_data = []  # 缓存的统计数据列表
+        self.cached_cleaned_lotterys = []  # 缓存的奖池奖品列表（分页查询使用）
         self.force_load_all = False
 
         # 创建奖池选择区域
@@ -341,6 +357,22 @@ class lottery_history_table(GroupHeaderCardWidget):
                 item = create_table_item(cell_data)
                 self.table.setItem(row_idx, col_idx, item)
 
+    def _get_sort_args(self, sort_fields):
+        """把当前排序列转换为查询的排序字段和方向
+
+        Args:
+            sort_fields: 列索引到排序字段的映射
+
+        Returns:
+            tuple: (排序字段, 是否降序)，未排序时排序字段为 None
+        """
+        if self.sort_column < 0:
+            return None, False
+        return (
+            sort_fields.get(self.sort_column),
+            self.sort_order == Qt.SortOrder.DescendingOrder,
+        )
+
     def _load_more_data(self):
         """加载更多数据"""
         if self.is_loading or self.current_row >= self.total_rows:
@@ -394,9 +426,10 @@ class lottery_history_table(GroupHeaderCardWidget):
             # 如果是第一次加载（current_row == 0），获取并排序数据
             if self.current_row == 0:
                 cleaned_lotterys = get_lottery_pool_list(self.current_pool_name)
-                history_data = get_lottery_history_data(self.current_pool_name)
+                # 奖品抽中次数直接读取统计索引，不加载完整的历史记录
+                stats_index = load_lottery_stats_index(self.current_pool_name)
 
-                lotterys_data = get_lottery_prizes_data(cleaned_lotterys, history_data)
+                lotterys_data = get_lottery_prizes_data(cleaned_lotterys, stats_index)
 
                 format_weight, _, _ = format_weight_for_display(lotterys_data, "weight")
 
@@ -459,63 +492,41 @@ class lottery_history_table(GroupHeaderCardWidget):
         if not self.current_pool_name:
             return
         try:
-            # 如果是第一次加载（current_row == 0），获取并排序数据
+            # 如果是第一次加载（current_row == 0），统计记录并确定表头和权重格式
             if self.current_row == 0:
-                cleaned_lotterys = get_lottery_pool_list(self.current_pool_name)
-                history_data = get_lottery_history_data(self.current_pool_name)
-
-                lotterys_data = get_lottery_session_data(
-                    cleaned_lotterys, history_data, self.current_subject
+                self.cached_cleaned_lotterys = get_lottery_pool_list(
+                    self.current_pool_name
                 )
-
-                self.has_class_record = any(
-                    lottery.get("class_name", "") for lottery in lotterys_data
+                summary = get_lottery_session_summary(
+                    self.cached_cleaned_lotterys,
+                    self.current_pool_name,
+                    self.current_subject,
                 )
+                self.has_class_record = summary["has_class_record"]
 
                 self.update_table_headers()
 
-                format_weight, _, _ = format_weight_for_display(lotterys_data, "weight")
-
-                if self.sort_column >= 0:
-
-                    def sort_key(lottery):
-                        if self.sort_column == 0:
-                            return lottery.get("draw_time", "")
-                        elif self.sort_column == 1:
-                            return lottery.get("id", "")
-                        elif self.sort_column == 2:
-                            return lottery.get("name", "")
-                        elif self.sort_column == 3:
-                            return lottery.get("class_name", "")
-                        elif self.sort_column == 4:
-                            return lottery.get("weight", "")
-                        return ""
-
-                    reverse_order = self.sort_order == Qt.SortOrder.DescendingOrder
-                    lotterys_data.sort(key=sort_key, reverse=reverse_order)
-                else:
-                    lotterys_data.sort(
-                        key=lambda x: x.get("draw_time", ""), reverse=True
-                    )
-
-                # 缓存排序后的数据
-                self.cached_sessions_data = lotterys_data
-                self.cached_sessions_format_weight = format_weight
-            else:
-                # 使用缓存的数据
-                lotterys_data = self.cached_sessions_data
-                format_weight = self.cached_sessions_format_weight
+                self.cached_sessions_format_weight = create_weight_formatter(
+                    summary["weight_int_length"]
+                )
+            format_weight = self.cached_sessions_format_weight
 
             start_row = self.current_row
             end_row = min(start_row + self.batch_size, self.total_rows)
 
-            for i in range(start_row, end_row):
-                if i >= len(lotterys_data):
-                    break
-
-                lottery = lotterys_data[i]
-                row = i
+            # 只查询当前页的数据，排序在查询中完成
+            sort_field, descending = self._get_sort_args(SESSIONS_SORT_FIELDS)
+            lotterys_data = get_lottery_session_page(
+                self.cached_cleaned_lotterys,
+                self.current_pool_name,
+                self.current_subject,
+                sort_field,
+                descending,
+                offset=start_row,
+                limit=end_row - start_row,
+            )
 
+            for row, lottery in enumerate(lotterys_data, start_row):
                 draw_time_item = create_table_item(lottery.get("draw_time", ""))
                 self.table.setItem(row, 0, draw_time_item)
 
@@ -549,61 +560,43 @@ class lottery_history_table(GroupHeaderCardWidget):
         if not self.current_pool_name:
             return
         try:
-            # 如果是第一次加载（current_row == 0），获取并排序数据
+            # 如果是第一次加载（current_row == 0），统计记录并确定表头和权重格式
             if self.current_row == 0:
-                cleaned_lotterys = get_lottery_pool_list(self.current_pool_name)
-                history_data = get_lottery_history_data(self.current_pool_name)
-
-                lotterys_data = get_lottery_prize_stats_data(
-                    cleaned_lotterys, history_data, lottery_name, self.current_subject
+                self.cached_cleaned_lotterys = get_lottery_pool_list(
+                    self.current_pool_name
                 )
-
-                self.has_class_record = any(
-                    lottery.get("class_name", "") for lottery in lotterys_data
+                summary = get_lottery_prize_stats_summary(
+                    self.cached_cleaned_lotterys,
+                    self.current_pool_name,
+                    lottery_name,
+                    self.current_subject,
                 )
+                self.has_class_record = summary["has_class_record"]
 
                 self.update_table_headers()
 
-                format_weight, _, _ = format_weight_for_display(lotterys_data, "weight")
-
-                if self.sort_column >= 0:
-
-                    def sort_key(lottery):
-                        if self.sort_column == 0:
-                            return lottery.get("draw_time", "")
-                        elif self.sort_column == 1:
-                            return int(lottery.get("draw_lottery_numbers", 0))
-                        elif self.sort_column == 2:
-                            return lottery.get("class_name", "")
-                        elif self.sort_column == 3:
-                            return float(lottery.get("weight", ""))
-                        return ""
-
-                    reverse_order = self.sort_order == Qt.SortOrder.DescendingOrder
-                    lotterys_data.sort(key=sort_key, reverse=reverse_order)
-                else:
-                    lotterys_data.sort(
-                        key=lambda x: x.get("draw_time", ""), reverse=True
-                    )
-
-                # 缓存排序后的数据
-                self.cached_stats_data = lotterys_data
-                self.cached_stats_format_weight = format_weight
-            else:
-                # 使用缓存的数据
-                lotterys_data = self.cached_stats_data
-                format_weight = self.cached_stats_format_weight
+                self.cached_stats_format_weight = create_weight_formatter(
+                    summary["weight_int_length"]
+                )
+            format_weight = self.cached_stats_format_weight
 
             start_row = self.current_row
             end_row = min(start_row + self.batch_size, self.total_rows)
 
-            for i in range(start_row, end_row):
-                if i >= len(lotterys_data):
-                    break
-
-                lottery = lotterys_data[i]
-                row = i
+            # 只查询当前页的数据，排序在查询中完成
+            sort_field, descending = self._get_sort_args(STATS_SORT_FIELDS)
+            lotterys_data = get_lottery_prize_stats_page(
+                self.cached_cleaned_lotterys,
+                self.current_pool_name,
+                lottery_name,
+                self.current_subject,
+                sort_field,
+                descending,
+                offset=start_row,
+                limit=end_row - start_row,
+            )
 
+            for row, lottery in enumerate(lotterys_data, start_row):
                 time_item = create_table_item(lottery.get("draw_time", ""))
                 self.table.setItem(row, 0, time_item)
 
@@ -712,6 +705,21 @@ class lottery_history_table(GroupHeaderCardWidget):
         # 刷新表格数据
         self.refresh_data()
 
+    def _get_sessions_count(self, pool_name):
+        """获取当前课程筛选下的会话记录数量"""
+        return get_lottery_session_summary(
+            get_lottery_pool_list(pool_name), pool_name, self.current_subject
+        )["total"]
+
+    def _get_stats_count(self, pool_name, lottery_name):
+        """获取当前课程筛选下奖品的个人统计记录数量"""
+        return get_lottery_prize_stats_summary(
+            get_lottery_pool_list(pool_name),
+            pool_name,
+            lottery_name,
+            self.current_subject,
+        )["total"]
+
     def refresh_data(self):
         """刷新表格数据"""
         if not hasattr(self, "table"):
@@ -758,7 +766,7 @@ class lottery_history_table(GroupHeaderCardWidget):
                         self._load_more_lotterys_data()
                 elif self.current_mode == 1:
                     # 获取会话记录数量
-                    sessions_count = get_draw_sessions_history("lottery", pool_name)
+                    sessions_count = self._get_sessions_count(pool_name)
                     if sessions_count:
                         self.total_rows = sessions_count
                         # 设置初始行数为批次大小或总行数，取较小值
@@ -777,8 +785,8 @@ class lottery_history_table(GroupHeaderCardWidget):
                         "lottery_history_table", "select_lottery_name"
                     )
                     # 获取个人统计记录数量
-                    stats_count = get_individual_statistics(
-                        "lottery", pool_name, self.current_lottery_name
+                    stats_count = self._get_stats_count(
+                        pool_name, self.current_lottery_name
                     )
                     if stats_count:
                         self.total_rows = stats_count
@@ -812,9 +820,8 @@ class lottery_history_table(GroupHeaderCardWidget):
                     self._ensure_scrollable_rows()
             elif self.current_mode == 1:
                 # 获取会话记录数量
-                sessions_count = get_draw_sessions_history("lottery", pool_name)
+                sessions_count = self._get_sessions_count(pool_name)
                 if sessions_count:
-                    self.total_rows = sessions_count
                     self.total_rows = sessions_count
                     # 设置初始行数为批次大小或总行数，取较小值
                     initial_rows = (
@@ -828,8 +835,8 @@ class lottery_history_table(GroupHeaderCardWidget):
                     self._ensure_scrollable_rows()
             else:
                 # 获取个人统计记录数量
-                stats_count = get_individual_statistics(
-                    "lottery", pool_name, self.mode_comboBox.currentText()
+                stats_count = self._get_stats_count(
+                    pool_name, self.mode_comboBox.currentText()
                 )
                 if stats_count:
                     self.total_rows = stats_count
@@ -917,28 +924,8 @@ class lottery_history_table(GroupHeaderCardWidget):
             return
 
         try:
-            history_file = get_data_path(
-                "history/lottery_history", f"{self.current_pool_name}.json"
-            )
-
-            if not file_exists(history_file):
-                self.available_subjects = []
-                return
-
-            with open_file(history_file, "r", encoding="utf-8") as f:
-                history_data = json.load(f)
-
             # 收集所有课程名称
-            subjects = set()
-            lotterys = history_data.get("lotterys", {})
-            for lottery_info in lotterys.values():
-                history = lottery_info.get("history", [])
-                for record in history:
-                    class_name = record.get("class_name", "")
-                    if class_name:
-                        subjects.add(class_name)
-
-            self.available_subjects = sorted(list(subjects))
+            self.available_subjects = get_lottery_subject_list(self.current_pool_name)
 
             # 更新课程下拉框
             if hasattr(self, "subject_comboBox"):
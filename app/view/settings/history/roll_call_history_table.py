@@ -1,8 +1,6 @@
 # ==================================================
 # 导入库
 # ==================================================
-import json
-
 from loguru import logger
 from PySide6.QtWidgets import *
 from PySide6.QtGui import *
@@ -19,14 +17,36 @@ from app.Language.obtain_language import *
 from app.common.history import *
 from app.common.history.history_reader import (
     get_roll_call_student_list,
-    get_roll_call_history_data,
-    filter_roll_call_history_by_subject,
+    get_roll_call_subject_history,
     get_roll_call_students_data,
-    get_roll_call_session_data,
-    get_roll_call_student_stats_data,
+    get_roll_call_session_summary,
+    get_roll_call_session_page,
+    get_roll_call_student_stats_summary,
+    get_roll_call_student_stats_page,
+    get_roll_call_subject_list,
     check_class_has_gender_or_group,
 )
 
+# 会话模式和个人统计模式下列索引对应的查询排序字段
+SESSIONS_SORT_FIELDS = {
+    0: "draw_time",
+    1: "id",
+    2: "name",
+    3: "gender",
+    4: "group",
+    5: "class_name",
+    6: "weight",
+}
+STATS_SORT_FIELDS = {
+    0: "draw_time",
+    1: "draw_method",
+    2: "draw_numbers",
+    3: "draw_gender",
+    4: "draw_group",
+    5: "class_name",
+    6: "weight",
+}
+
 
 # ==================================================
 # 点名历史记录表格
@@ -57,6 +77,7 @@ class roll_call_history_table(GroupHeaderCardWidget):
         self.cached_students_data = []  # 缓存的学生数据列表
         self.cached_sessions_data = []  # 缓存的会话数据列表
         self.cached_stats_data = []  # 缓存的统计数据列表
+        self.cached_cleaned_students = []  # 缓存的班级学生列表（分页查询使用）
         self.force_load_all = False
 
         # 创建班级选择区域
@@ -352,6 +373,22 @@ class roll_call_history_table(GroupHeaderCardWidget):
                 item = create_table_item(cell_data)
                 self.table.setItem(row_idx, col_idx, item)
 
+    def _get_sort_args(self, sort_fields):
+        """把当前排序列转换为查询的排序字段和方向
+
+        Args:
+            sort_fields: 列索引到排序字段的映射
+
+        Returns:
+            tuple: (排序字段, 是否降序)，未排序时排序字段为 None
+        """
+        if self.sort_column < 0:
+            return None, False
+        return (
+            sort_fields.get(self.sort_column),
+            self.sort_order == Qt.SortOrder.DescendingOrder,
+        )
+
     def _load_more_data(self):
         """加载更多数据"""
         if self.is_loading or self.current_row >= self.total_rows:
@@ -405,12 +442,9 @@ class roll_call_history_table(GroupHeaderCardWidget):
             # 如果是第一次加载（current_row == 0），获取并排序数据
             if self.current_row == 0:
                 cleaned_students = get_roll_call_student_list(self.current_class_name)
-                history_data = get_roll_call_history_data(self.current_class_name)
-
-                if self.current_subject:
-                    history_data = filter_roll_call_history_by_subject(
-                        history_data, self.current_subject
-                    )
+                history_data = get_roll_call_subject_history(
+                    self.current_class_name, self.current_subject
+                )
 
                 students_data = get_roll_call_students_data(
                     cleaned_students, history_data, self.current_subject
@@ -528,70 +562,45 @@ class roll_call_history_table(GroupHeaderCardWidget):
         if not self.current_class_name:
             return
         try:
-            # 如果是第一次加载（current_row == 0），获取并排序数据
+            # 如果是第一次加载（current_row == 0），统计记录并确定表头和权重格式
             if self.current_row == 0:
-                cleaned_students = get_roll_call_student_list(self.current_class_name)
-                history_data = get_roll_call_history_data(self.current_class_name)
-
-                students_data = get_roll_call_session_data(
-                    cleaned_students, history_data, self.current_subject
+                self.cached_cleaned_students = get_roll_call_student_list(
+                    self.current_class_name
                 )
-
-                self.has_class_record = any(
-                    student.get("class_name", "") for student in students_data
+                summary = get_roll_call_session_summary(
+                    self.cached_cleaned_students,
+                    self.current_class_name,
+                    self.current_subject,
                 )
+                self.has_class_record = summary["has_class_record"]
 
                 self.update_table_headers()
 
-                format_weight, _, _ = format_weight_for_display(students_data, "weight")
-
-                if self.sort_column >= 0:
-
-                    def sort_key(student):
-                        if self.sort_column == 0:
-                            return student.get("draw_time", "")
-                        elif self.sort_column == 1:
-                            return student.get("id", "")
-                        elif self.sort_column == 2:
-                            return student.get("name", "")
-                        elif self.sort_column == 3:
-                            return student.get("gender", "")
-                        elif self.sort_column == 4:
-                            return student.get("group", "")
-                        elif self.sort_column == 5:
-                            return student.get("class_name", "")
-                        elif self.sort_column == 6:
-                            return student.get("weight", "")
-                        return ""
-
-                    reverse_order = self.sort_order == Qt.SortOrder.DescendingOrder
-                    students_data.sort(key=sort_key, reverse=reverse_order)
-                else:
-                    students_data.sort(
-                        key=lambda x: x.get("draw_time", ""), reverse=True
-                    )
-
-                # 缓存排序后的数据
-                self.cached_sessions_data = students_data
-                self.cached_sessions_format_weight = format_weight
-            else:
-                # 使用缓存的数据
-                students_data = self.cached_sessions_data
-                format_weight = self.cached_sessions_format_weight
+                self.cached_sessions_format_weight = create_weight_formatter(
+                    summary["weight_int_length"]
+                )
+            format_weight = self.cached_sessions_format_weight
 
             start_row = self.current_row
             end_row = min(start_row + self.batch_size, self.total_rows)
 
+            # 只查询当前页的数据，排序在查询中完成
+            sort_field, descending = self._get_sort_args(SESSIONS_SORT_FIELDS)
+            students_data = get_roll_call_session_page(
+                self.cached_cleaned_students,
+                self.current_class_name,
+                self.current_subject,
+                sort_field,
+                descending,
+                offset=start_row,
+                limit=end_row - start_row,
+            )
+
             has_gender, has_group = check_class_has_gender_or_group(
                 self.current_class_name
             )
 
-            for i in range(start_row, end_row):
-                if i >= len(students_data):
-                    break
-
-                student = students_data[i]
-                row = i
+            for row, student in enumerate(students_data, start_row):
                 col = 0
 
                 draw_time_item = create_table_item(student.get("draw_time", ""))
@@ -642,70 +651,47 @@ class roll_call_history_table(GroupHeaderCardWidget):
         if not self.current_class_name:
             return
         try:
-            # 如果是第一次加载（current_row == 0），获取并排序数据
+            # 如果是第一次加载（current_row == 0），统计记录并确定表头和权重格式
             if self.current_row == 0:
-                cleaned_students = get_roll_call_student_list(self.current_class_name)
-                history_data = get_roll_call_history_data(self.current_class_name)
-
-                students_data = get_roll_call_student_stats_data(
-                    cleaned_students, history_data, student_name, self.current_subject
+                self.cached_cleaned_students = get_roll_call_student_list(
+                    self.current_class_name
                 )
-
-                self.has_class_record = any(
-                    student.get("class_name", "") for student in students_data
+                summary = get_roll_call_student_stats_summary(
+                    self.cached_cleaned_students,
+                    self.current_class_name,
+                    student_name,
+                    self.current_subject,
                 )
+                self.has_class_record = summary["has_class_record"]
 
                 self.update_table_headers()
 
-                format_weight, _, _ = format_weight_for_display(students_data, "weight")
-
-                if self.sort_column >= 0:
-
-                    def sort_key(student):
-                        if self.sort_column == 0:
-                            return student.get("draw_time", "")
-                        elif self.sort_column == 1:
-                            return str(student.get("draw_method", ""))
-                        elif self.sort_column == 2:
-                            return int(student.get("draw_people_numbers", 0))
-                        elif self.sort_column == 3:
-                            return str(student.get("draw_gender", ""))
-                        elif self.sort_column == 4:
-                            return str(student.get("draw_group", ""))
-                        elif self.sort_column == 5:
-                            return str(student.get("class_name", ""))
-                        elif self.sort_column == 6:
-                            return float(student.get("weight", ""))
-                        return ""
-
-                    reverse_order = self.sort_order == Qt.SortOrder.DescendingOrder
-                    students_data.sort(key=sort_key, reverse=reverse_order)
-                else:
-                    students_data.sort(
-                        key=lambda x: x.get("draw_time", ""), reverse=True
-                    )
-
-                # 缓存排序后的数据
-                self.cached_stats_data = students_data
-                self.cached_stats_format_weight = format_weight
-            else:
-                # 使用缓存的数据
-                students_data = self.cached_stats_data
-                format_weight = self.cached_stats_format_weight
+                self.cached_stats_format_weight = create_weight_formatter(
+                    summary["weight_int_length"]
+                )
+            format_weight = self.cached_stats_format_weight
 
             start_row = self.current_row
             end_row = min(start_row + self.batch_size, self.total_rows)
 
+            # 只查询当前页的数据，排序在查询中完成
+            sort_field, descending = self._get_sort_args(STATS_SORT_FIELDS)
+            students_data = get_roll_call_student_stats_page(
+                self.cached_cleaned_students,
+                self.current_class_name,
+                student_name,
+                self.current_subject,
+                sort_field,
+                descending,
+                offset=start_row,
+                limit=end_row - start_row,
+            )
+
             has_gender, has_group = check_class_has_gender_or_group(
                 self.current_class_name
             )
 
-            for i in range(start_row, end_row):
-                if i >= len(students_data):
-                    break
-
-                student = students_data[i]
-                row = i
+            for row, student in enumerate(students_data, start_row):
                 col = 0
 
                 time_item = create_table_item(student.get("draw_time", ""))
@@ -868,28 +854,10 @@ class roll_call_history_table(GroupHeaderCardWidget):
             return
 
         try:
-            history_file = get_data_path(
-                "history/roll_call_history", f"{self.current_class_name}.json"
-            )
-
-            if not file_exists(history_file):
-                self.available_subjects = []
-                return
-
-            with open_file(history_file, "r", encoding="utf-8") as f:
-                history_data = json.load(f)
-
             # 收集所有课程名称
-            subjects = set()
-            students = history_data.get("students", {})
-            for student_info in students.values():
-                history = student_info.get("history", [])
-                for record in history:
-                    class_name = record.get("class_name", "")
-                    if class_name:
-                        subjects.add(class_name)
-
-            self.available_subjects = sorted(list(subjects))
+            self.available_subjects = get_roll_call_subject_list(
+                self.current_class_name
+            )
 
             # 更新课程下拉框
             if hasattr(self, "subject_comboBox"):
@@ -929,6 +897,21 @@ class roll_call_history_table(GroupHeaderCardWidget):
             logger.exception(f"更新课程列表失败: {e}")
             self.available_subjects = []
 
+    def _get_sessions_count(self, class_name):
+        """获取当前课程筛选下的会话记录数量"""
+        return get_roll_call_session_summary(
+            get_roll_call_student_list(class_name), class_name, self.current_subject
+        )["total"]
+
+    def _get_stats_count(self, class_name, student_name):
+        """获取当前课程筛选下学生的个人统计记录数量"""
+        return get_roll_call_student_stats_summary(
+            get_roll_call_student_list(class_name),
+            class_name,
+            student_name,
+            self.current_subject,
+        )["total"]
+
     def refresh_data(self):
         """刷新表格数据"""
         if not hasattr(self, "table"):
@@ -975,7 +958,7 @@ class roll_call_history_table(GroupHeaderCardWidget):
                         self._load_more_students_data()
                 elif self.current_mode == 1:
                     # 获取会话记录数量
-                    sessions_count = get_draw_sessions_history("roll_call", class_name)
+                    sessions_count = self._get_sessions_count(class_name)
                     if sessions_count:
                         self.total_rows = sessions_count
                         # 设置初始行数为批次大小或总行数，取较小值
@@ -994,8 +977,8 @@ class roll_call_history_table(GroupHeaderCardWidget):
                         "roll_call_history_table", "select_student_name"
                     )
                     # 获取个人统计记录数量
-                    stats_count = get_individual_statistics(
-                        "roll_call", class_name, self.current_student_name
+                    stats_count = self._get_stats_count(
+                        class_name, self.current_student_name
                     )
                     if stats_count:
                         self.total_rows = stats_count
@@ -1029,9 +1012,8 @@ class roll_call_history_table(GroupHeaderCardWidget):
                     self._ensure_scrollable_rows()
             elif self.current_mode == 1:
                 # 获取会话记录数量
-                sessions_count = get_draw_sessions_history("roll_call", class_name)
+                sessions_count = self._get_sessions_count(class_name)
                 if sessions_count:
-                    self.total_rows = sessions_count
                     self.total_rows = sessions_count
                     # 设置初始行数为批次大小或总行数，取较小值
                     initial_rows = (
@@ -1044,8 +1026,8 @@ class roll_call_history_table(GroupHeaderCardWidget):
                     self._load_more_sessions_data()
                     self._ensure_scrollable_rows()
             else:
-                stats = get_individual_statistics(
-                    "roll_call", class_name, self.mode_comboBox.currentText()
+                stats = self._get_stats_count(
+                    class_name, self.mode_comboBox.currentText()
                 )
                 if stats:
                     self.total_rows = stats
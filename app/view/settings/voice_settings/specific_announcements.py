@@ -21,6 +21,8 @@ from app.common.data.list import (
     get_student_list,
     get_pool_list,
 )
+from app.common.voice.presynthesis import get_presynthesis_job, start_presynthesis
+from app.tools.config import show_notification, NotificationType, NotificationConfig
 
 
 # ==================================================
@@ -131,6 +133,7 @@ class voice_announcement_main(GroupHeaderCardWidget):
         """
         self.current_mode = mode
         self.refresh_class_history()
+        self.update_presynthesis_button()
         self.refresh_data()
 
     def create_class_selection(self):
@@ -168,6 +171,104 @@ class voice_announcement_main(GroupHeaderCardWidget):
             self.class_comboBox,
         )
 
+        # 预生成语音按钮
+        self.presynthesis_button = PushButton(
+            get_content_pushbutton_name_async("specific_announcements", "presynthesis")
+        )
+        self.presynthesis_button.clicked.connect(self.on_presynthesis_clicked)
+        self.addGroup(
+            get_theme_icon("ic_fluent_arrow_download_20_filled"),
+            get_content_name_async("specific_announcements", "presynthesis"),
+            get_content_description_async("specific_announcements", "presynthesis"),
+            self.presynthesis_button,
+        )
+        self._presynthesis_job = None
+        self.update_presynthesis_button()
+
+    def on_presynthesis_clicked(self):
+        """开始或取消当前班级/奖池的语音预生成"""
+        job = get_presynthesis_job(self.current_class_name, self.current_mode)
+        if job is not None:
+            job.cancel()
+            return
+
+        job = start_presynthesis(self.current_class_name, self.current_mode)
+        if job is None:
+            show_notification(
+                NotificationType.INFO,
+                NotificationConfig(
+                    title=get_content_name_async(
+                        "specific_announcements", "presynthesis"
+                    ),
+                    content=get_any_position_value_async(
+                        "specific_announcements",
+                        "presynthesis_notification",
+                        "unavailable",
+                    ),
+                ),
+                parent=self.window(),
+            )
+            return
+        self.update_presynthesis_button()
+
+    def update_presynthesis_button(self, done=None, total=None):
+        """根据当前班级/奖池的预生成任务状态更新按钮"""
+        if not hasattr(self, "presynthesis_button"):
+            return
+        job = get_presynthesis_job(self.current_class_name, self.current_mode)
+        if job is not self._presynthesis_job:
+            if self._presynthesis_job is not None:
+                self._presynthesis_job.progress_changed.disconnect(
+                    self.update_presynthesis_button
+                )
+                self._presynthesis_job.job_finished.disconnect(
+                    self.on_presynthesis_finished
+                )
+            if job is not None:
+                job.progress_changed.connect(self.update_presynthesis_button)
+                job.job_finished.connect(self.on_presynthesis_finished)
+            self._presynthesis_job = job
+
+        self.presynthesis_button.setEnabled(bool(self.current_class_name))
+        if job is None:
+            self.presynthesis_button.setText(
+                get_content_pushbutton_name_async(
+                    "specific_announcements", "presynthesis"
+                )
+            )
+        else:
+            self.presynthesis_button.setText(
+                get_any_position_value_async(
+                    "specific_announcements", "presynthesis_button", "cancel"
+                ).format(done=done or 0, total=total or 0)
+            )
+
+    def on_presynthesis_finished(self, summary):
+        """预生成结束后恢复按钮并显示结果"""
+        if self._presynthesis_job is not None:
+            self._presynthesis_job.progress_changed.disconnect(
+                self.update_presynthesis_button
+            )
+            self._presynthesis_job.job_finished.disconnect(
+                self.on_presynthesis_finished
+            )
+            self._presynthesis_job = None
+        self.presynthesis_button.setText(
+            get_content_pushbutton_name_async("specific_announcements", "presynthesis")
+        )
+        key = "cancelled" if summary["cancelled"] else "finished"
+        show_notification(
+            NotificationType.INFO if summary["cancelled"] else NotificationType.SUCCESS,
+            NotificationConfig(
+                title=f"{get_content_name_async('specific_announcements', 'presynthesis')}"
+                f" - {summary['class_name']}",
+                content=get_any_position_value_async(
+                    "specific_announcements", "presynthesis_notification", key
+                ).format(**summary),
+            ),
+            parent=self.window(),
+        )
+
     def create_table(self):
         """创建表格区域"""
         self.table = TableWidget()
@@ -360,6 +461,7 @@ class voice_announcement_main(GroupHeaderCardWidget):
 
         # 更新当前班级名称
         self.current_class_name = self.class_comboBox.currentText()
+        self.update_presynthesis_button()
 
         # 刷新表格数据
         self.refresh_data()
@@ -5,6 +5,9 @@ import gc
 import subprocess
 import platform
 
+# 启动性能分析需要先于其他模块导入，才能记录它们的导入耗时
+from app.tools.startup_profiler import mark, profile_phase
+
 import sentry_sdk
 from sentry_sdk.integrations.loguru import LoguruIntegration, LoggingLevels
 from PySide6.QtCore import Qt, QTimer, qInstallMessageHandler
@@ -14,7 +17,11 @@ from loguru import logger
 from app.tools.path_utils import get_app_root
 from app.tools.config import configure_logging
 from app.tools.settings_default import manage_settings_file
-from app.tools.settings_access import readme_settings_async, get_or_create_user_id
+from app.tools.settings_access import (
+    readme_settings_async,
+    get_or_create_user_id,
+    flush_settings,
+)
 from app.tools.variable import (
     APP_QUIT_ON_LAST_WINDOW_CLOSED,
     VERSION,
@@ -39,7 +46,6 @@ from app.core.window_manager import WindowManager
 from app.core.url_handler_setup import create_url_handler
 from app.core.cs_ipc_handler_setup import create_cs_ipc_handler
 from app.core.app_init import AppInitializer
-from app.tools.update_utils import update_check_thread
 import app.core.window_manager as wm
 
 
@@ -329,6 +335,15 @@ def cleanup_resources(
         cs_ipc_handler: CS IPC 处理器对象
         update_check_thread: 更新检查线程对象
     """
+    if flush_settings():
+        logger.debug("设置已写入磁盘")
+    else:
+        logger.warning("退出前写入设置失败")
+
+    from app.common.history.stats_index import flush_stats_indexes
+
+    flush_stats_indexes()
+
     if cs_ipc_handler:
         cs_ipc_handler.stop_ipc_client()
 
@@ -354,6 +369,18 @@ def cleanup_resources(
     logger.debug("垃圾回收已完成")
 
 
+def get_update_check_thread():
+    """获取更新检查线程
+
+    更新模块按需导入，未被导入时说明本次运行没有启动更新检查
+
+    Returns:
+        更新检查线程对象，没有时返回 None
+    """
+    update_utils = sys.modules.get("app.tools.update_utils")
+    return getattr(update_utils, "update_check_thread", None)
+
+
 def restart_application(program_dir):
     """重启应用程序
 
@@ -514,23 +541,28 @@ def main():
     except Exception:
         pass
 
-    program_dir, shared_memory, is_first_instance = initialize_application()
+    mark("modules_imported")
+    with profile_phase("initialize_application"):
+        program_dir, shared_memory, is_first_instance = initialize_application()
 
     if not is_first_instance:
         handle_existing_instance(shared_memory)
 
-    manage_settings_file()
+    with profile_phase("manage_settings_file"):
+        manage_settings_file()
 
-    app, window_manager, url_handler, cs_ipc_handler, local_server = (
-        setup_qt_application()
-    )
+    with profile_phase("setup_qt_application"):
+        app, window_manager, url_handler, cs_ipc_handler, local_server = (
+            setup_qt_application()
+        )
 
     if not local_server:
         logger.exception("无法启动本地服务器，程序将退出")
         shared_memory.detach()
         sys.exit(1)
 
-    initialize_app_components(window_manager)
+    with profile_phase("initialize_app_components"):
+        initialize_app_components(window_manager)
 
     if VERSION == DEV_VERSION:
         setup_dev_hints(app)
@@ -544,10 +576,14 @@ def main():
             local_server,
             url_handler,
             cs_ipc_handler,
-            update_check_thread,
+            get_update_check_thread(),
         )
     except Exception as e:
         logger.exception(f"程序退出过程中发生异常: {e}")
+        flush_settings()
+        from app.common.history.stats_index import flush_stats_indexes
+
+        flush_stats_indexes()
         if shared_memory:
             shared_memory.detach()
         if local_server:
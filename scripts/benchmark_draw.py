@@ -0,0 +1,729 @@
+"""
+点名与抽奖抽取流程的性能基准测试（无需 Qt 事件循环）。
+
+使用方法：
+    python scripts/benchmark_draw.py
+    python scripts/benchmark_draw.py --class-sizes 30 1000 --history-sizes 0 10000
+    python scripts/benchmark_draw.py --output result.json --save-baseline baseline.json
+    python scripts/benchmark_draw.py --baseline baseline.json --threshold 0.2
+
+脚本将执行以下操作：
+1. 在临时目录中生成合成班级名单、奖池和点名/抽奖历史记录（应用数据目录指向该临时目录）
+2. 对每种班级人数 × 历史记录条数的组合，分别计时各抽取阶段，
+   输出 p50/p99 延迟以及每次调用的平均文件读写字节数
+3. 可选：与保存的基线结果比较，p50 或 p99 超出阈值时以非零状态码退出
+4. 可选（--check-weights）：在每个场景中比较按列计算的权重引擎与逐个学生计算的
+   权重结果（覆盖频率函数、冷启动、时间因子和屏蔽等设置组合），结果不一致时
+   以非零状态码退出
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from loguru import logger
+
+BENCHMARK_CLASS_NAME = "benchmark_class"
+BENCHMARK_POOL_NAME = "benchmark_pool"
+BENCHMARK_REPORT_VERSION = 1
+
+DEFAULT_CLASS_SIZES = [30, 1000, 10000]
+DEFAULT_HISTORY_SIZES = [0, 10000, 100000]
+DEFAULT_POOL_SIZE = 50
+DEFAULT_ITERATIONS = 30
+DEFAULT_WARMUP = 1
+DEFAULT_DRAW_COUNT = 1
+DEFAULT_THRESHOLD = 0.2
+
+# 合成历史记录中轮流使用的科目（None 表示无课程信息）
+SYNTHETIC_SUBJECTS = ["语文", "数学", "英语", None]
+SYNTHETIC_GROUPS = ["第一小组", "第二小组", "第三小组", "第四小组", "第五小组"]
+SYNTHETIC_GENDERS = ["男", "女"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="点名与抽奖抽取流程的性能基准测试。")
+    parser.add_argument(
+        "--class-sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_CLASS_SIZES,
+        help="合成班级人数列表",
+    )
+    parser.add_argument(
+        "--history-sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_HISTORY_SIZES,
+        help="合成历史记录的抽取次数列表",
+    )
+    parser.add_argument(
+        "--pool-size", type=int, default=DEFAULT_POOL_SIZE, help="合成奖池的奖品数量"
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=DEFAULT_ITERATIONS,
+        help="每个阶段的计时次数",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=DEFAULT_WARMUP,
+        help="每个阶段计时前的预热次数（不计入结果）",
+    )
+    parser.add_argument(
+        "--draw-count",
+        type=int,
+        default=DEFAULT_DRAW_COUNT,
+        help="每次抽取的人数/奖品数",
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        default=None,
+        help="只运行指定的阶段（默认运行全部阶段）",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="生成合成数据的随机种子")
+    parser.add_argument("-o", "--output", type=Path, help="把结果写入JSON文件")
+    parser.add_argument("--baseline", type=Path, help="与该基线结果文件比较")
+    parser.add_argument("--save-baseline", type=Path, help="把本次结果保存为基线")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="判定为性能退化的相对阈值（0.2 表示比基线慢 20%%）",
+    )
+    parser.add_argument(
+        "--keep-data", action="store_true", help="保留生成的临时数据目录"
+    )
+    parser.add_argument(
+        "--check-weights",
+        action="store_true",
+        help="校验权重引擎与逐个学生计算的结果是否一致",
+    )
+    return parser.parse_args()
+
+
+# ==================================================
+# 运行环境
+# ==================================================
+def _setup_data_root(data_root: Path) -> None:
+    """把应用数据目录指向临时目录，并关闭详细日志输出"""
+    from app.tools import path_utils
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    # 语言模块等只读文件仍从仓库读取
+    try:
+        (data_root / "app").symlink_to(ROOT_DIR / "app", target_is_directory=True)
+    except OSError as e:
+        logger.warning(f"无法链接应用目录，语言文本将使用默认值: {e}")
+    path_utils.path_manager._app_root = data_root
+
+
+def _load_pipeline() -> SimpleNamespace:
+    """导入抽取流程模块（必须在设置数据目录之后调用）"""
+    from app.common.data.list import get_student_list
+    from app.common.fair_draw.avg_gap_protection import apply_avg_gap_protection
+    from app.common.history import calculate_weight, save_roll_call_history
+    from app.common.history import weight_engine, weight_utils
+    from app.common.history.file_utils import apply_history_event, save_history_data
+    from app.common.history.roll_call_history import (
+        _create_history_entry,
+        _update_global_stats,
+    )
+    from app.common.history.stats_index import (
+        invalidate_stats_index,
+        load_roll_call_stats_index,
+    )
+    from app.common.lottery.lottery_utils import LotteryUtils
+    from app.common.roll_call.draw_session import DrawSession
+    from app.common.roll_call.roll_call_utils import RollCallUtils
+    from app.Language.obtain_language import get_content_combo_name_async
+    from app.tools.path_utils import get_data_path
+    from app.tools.settings_access import flush_settings, update_settings
+
+    return SimpleNamespace(
+        get_student_list=get_student_list,
+        apply_avg_gap_protection=apply_avg_gap_protection,
+        calculate_weight=calculate_weight,
+        weight_engine=weight_engine,
+        weight_utils=weight_utils,
+        save_roll_call_history=save_roll_call_history,
+        apply_history_event=apply_history_event,
+        save_history_data=save_history_data,
+        _create_history_entry=_create_history_entry,
+        _update_global_stats=_update_global_stats,
+        invalidate_stats_index=invalidate_stats_index,
+        load_roll_call_stats_index=load_roll_call_stats_index,
+        LotteryUtils=LotteryUtils,
+        DrawSession=DrawSession,
+        RollCallUtils=RollCallUtils,
+        get_content_combo_name_async=get_content_combo_name_async,
+        get_data_path=get_data_path,
+        flush_settings=flush_settings,
+        update_settings=update_settings,
+    )
+
+
+def _configure_settings(pipeline: SimpleNamespace) -> None:
+    """开启所有公平抽取相关功能，使基准测试覆盖完整的计算路径"""
+    for key in (
+        "fair_draw",
+        "fair_draw_group",
+        "fair_draw_gender",
+        "fair_draw_time",
+        "enable_avg_gap_protection",
+    ):
+        pipeline.update_settings("fair_draw_settings", key, True)
+    pipeline.flush_settings()
+
+
+# ==================================================
+# 合成数据
+# ==================================================
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(data, handle, ensure_ascii=False, indent=4)
+
+
+def generate_roster(
+    pipeline: SimpleNamespace, class_size: int, rng: random.Random
+) -> None:
+    """生成合成班级名单"""
+    roster = {
+        f"学生{index:05d}": {
+            "id": index + 1,
+            "gender": rng.choice(SYNTHETIC_GENDERS),
+            "group": rng.choice(SYNTHETIC_GROUPS),
+            "exist": rng.random() > 0.02,
+        }
+        for index in range(class_size)
+    }
+    _write_json(
+        pipeline.get_data_path("list/roll_call_list") / f"{BENCHMARK_CLASS_NAME}.json",
+        roster,
+    )
+
+
+def generate_pool(
+    pipeline: SimpleNamespace, pool_size: int, rng: random.Random
+) -> None:
+    """生成合成奖池"""
+    pool = {
+        f"奖品{index:04d}": {
+            "id": index + 1,
+            "weight": rng.choice([1, 1, 1, 2, 5]),
+            "exist": True,
+        }
+        for index in range(pool_size)
+    }
+    _write_json(
+        pipeline.get_data_path("list/lottery_list") / f"{BENCHMARK_POOL_NAME}.json",
+        pool,
+    )
+
+
+def _synthetic_time(round_index: int) -> str:
+    start = datetime(2024, 9, 1, 8, 0, 0)
+    return (start + timedelta(minutes=round_index)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def generate_roll_call_history(
+    pipeline: SimpleNamespace, draw_total: int, rng: random.Random
+) -> None:
+    """生成合成点名历史记录
+
+    记录结构与逐次保存的历史记录一致；逐次重放时每轮都要遍历全部学生更新
+    未选中轮数，这里改为最后统一计算，使十万条记录也能在数秒内生成
+    """
+    students = pipeline.get_student_list(BENCHMARK_CLASS_NAME)
+    all_group = pipeline.get_content_combo_name_async("roll_call", "range_combobox")[0]
+    all_gender = pipeline.get_content_combo_name_async("roll_call", "gender_combobox")[
+        0
+    ]
+    history_data = {
+        "students": {},
+        "group_stats": {},
+        "gender_stats": {},
+        "subject_stats": {},
+        "total_rounds": 0,
+        "total_stats": 0,
+    }
+    last_rounds = {}
+
+    for round_index in range(draw_total):
+        picked = rng.sample(students, min(len(students), rng.randint(1, 3)))
+        event = {
+            "time": _synthetic_time(round_index),
+            "subject": SYNTHETIC_SUBJECTS[round_index % len(SYNTHETIC_SUBJECTS)],
+            "group_filter": all_group,
+            "gender_filter": all_gender,
+            "students": [
+                {
+                    "name": student["name"],
+                    "group": student["group"],
+                    "gender": student["gender"],
+                    "weight": 1.0,
+                }
+                for student in picked
+            ],
+        }
+        for student in event["students"]:
+            student_name = student["name"]
+            student_data = history_data["students"].setdefault(
+                student_name,
+                {
+                    "total_count": 0,
+                    "group_gender_count": 0,
+                    "last_drawn_time": "",
+                    "rounds_missed": 0,
+                    "history": [],
+                    "subject_stats": {},
+                },
+            )
+            student_data["total_count"] += 1
+            student_data["last_drawn_time"] = event["time"]
+            history_entry = pipeline._create_history_entry(event, student)
+            subject_name = history_entry.get("class_name")
+            if subject_name:
+                subject_stats = student_data["subject_stats"].setdefault(
+                    subject_name, {"total_count": 0, "group_gender_count": 0}
+                )
+                subject_stats["total_count"] += 1
+            student_data["history"].append(history_entry)
+            last_rounds[student_name] = round_index
+        pipeline._update_global_stats(history_data, event)
+
+    for student_name, student_data in history_data["students"].items():
+        student_data["rounds_missed"] = draw_total - 1 - last_rounds[student_name]
+
+    pipeline.save_history_data("roll_call", BENCHMARK_CLASS_NAME, history_data)
+    pipeline.invalidate_stats_index(BENCHMARK_CLASS_NAME)
+
+
+def generate_lottery_history(
+    pipeline: SimpleNamespace, draw_total: int, pool_size: int, rng: random.Random
+) -> None:
+    """生成合成抽奖历史记录"""
+    prize_names = [f"奖品{index:04d}" for index in range(pool_size)]
+    history_data = {}
+    for round_index in range(draw_total):
+        event = {
+            "time": _synthetic_time(round_index),
+            "subject": SYNTHETIC_SUBJECTS[round_index % len(SYNTHETIC_SUBJECTS)],
+            "group_filter": None,
+            "gender_filter": None,
+            "names": [rng.choice(prize_names)],
+        }
+        pipeline.apply_history_event("lottery", history_data, event)
+    pipeline.save_history_data("lottery", BENCHMARK_POOL_NAME, history_data)
+
+
+# ==================================================
+# 计时与文件读写统计
+# ==================================================
+def _read_io_counters() -> Optional[Tuple[int, int]]:
+    """读取当前进程累计的文件读写字节数，平台不支持时返回 None"""
+    try:
+        import psutil
+
+        counters = psutil.Process().io_counters()
+    except Exception:
+        return None
+    # Linux 下 read_chars/write_chars 包含命中页缓存的读写，更接近实际的文件访问量
+    read_bytes = getattr(counters, "read_chars", None)
+    write_bytes = getattr(counters, "write_chars", None)
+    if read_bytes is None or write_bytes is None:
+        read_bytes = counters.read_bytes
+        write_bytes = counters.write_bytes
+    return int(read_bytes), int(write_bytes)
+
+
+def _wait_for_background_writes() -> None:
+    """等待保存历史记录时触发的后台合并完成，避免影响下一次计时"""
+    for thread in threading.enumerate():
+        if thread.name == "HistoryCompactThread":
+            thread.join()
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """线性插值计算百分位数"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return (
+        sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+    )
+
+
+def measure_stage(
+    fn: Callable[[], Any], iterations: int, warmup: int
+) -> Dict[str, Any]:
+    """计时一个阶段
+
+    延迟只统计调用本身；读写字节数额外包含该次调用触发的后台合并
+    """
+    for _ in range(warmup):
+        fn()
+        _wait_for_background_writes()
+
+    durations = []
+    read_total = 0
+    write_total = 0
+    io_available = True
+    for _ in range(iterations):
+        before = _read_io_counters()
+        start = time.perf_counter()
+        fn()
+        durations.append((time.perf_counter() - start) * 1000)
+        _wait_for_background_writes()
+        after = _read_io_counters()
+        if before is None or after is None:
+            io_available = False
+        else:
+            read_total += after[0] - before[0]
+            write_total += after[1] - before[1]
+
+    durations.sort()
+    return {
+        "samples": len(durations),
+        "p50_ms": round(_percentile(durations, 50), 4),
+        "p99_ms": round(_percentile(durations, 99), 4),
+        "mean_ms": round(sum(durations) / len(durations), 4) if durations else 0.0,
+        "read_bytes": round(read_total / iterations) if io_available else None,
+        "write_bytes": round(write_total / iterations) if io_available else None,
+    }
+
+
+# ==================================================
+# 抽取阶段
+# ==================================================
+def build_stages(
+    pipeline: SimpleNamespace, draw_count: int
+) -> Dict[str, Callable[[], Any]]:
+    """构建各阶段的计时函数，调用前合成数据必须已经生成"""
+    class_name = BENCHMARK_CLASS_NAME
+    roster = pipeline.get_student_list(class_name)
+    all_group = pipeline.get_content_combo_name_async("roll_call", "range_combobox")[0]
+    all_gender = pipeline.get_content_combo_name_async("roll_call", "gender_combobox")[
+        0
+    ]
+
+    def stats_index_load():
+        # 清除内存缓存，测量从索引文件加载的耗时
+        pipeline.invalidate_stats_index(class_name)
+        pipeline.load_roll_call_stats_index(class_name)
+
+    def calculate_weight():
+        pipeline.calculate_weight(roster, class_name)
+
+    def calculate_weight_per_student():
+        pipeline.calculate_weight(roster, class_name, vectorized=False)
+
+    def avg_gap_protection():
+        pipeline.apply_avg_gap_protection(roster, draw_count, class_name, "roll_call")
+
+    def draw_random_students():
+        return pipeline.RollCallUtils.draw_random_students(
+            class_name, 0, all_group, 0, all_gender, draw_count, 0
+        )
+
+    def save_roll_call_history():
+        selected = pipeline.RollCallUtils.draw_random_students(
+            class_name, 0, all_group, 0, all_gender, draw_count, 0
+        )["selected_students_dict"]
+        pipeline.save_roll_call_history(class_name, selected, all_group, all_gender)
+
+    def draw_and_save():
+        # 与 RollCallManager 相同：一次抽取共用一个 DrawSession
+        session = pipeline.DrawSession(
+            class_name=class_name, group_filter=all_group, gender_filter=all_gender
+        )
+        result = pipeline.RollCallUtils.draw_random_students(
+            class_name, 0, all_group, 0, all_gender, draw_count, 0, session
+        )
+        pipeline.RollCallUtils.record_drawn_students(
+            class_name,
+            result["selected_students"],
+            result["selected_students_dict"],
+            all_gender,
+            all_group,
+            0,
+            session,
+        )
+
+    def draw_random_prizes():
+        pipeline.LotteryUtils.draw_random_prizes(BENCHMARK_POOL_NAME, draw_count)
+
+    return {
+        "roll_call.stats_index_load": stats_index_load,
+        "roll_call.calculate_weight": calculate_weight,
+        "roll_call.weight_per_student": calculate_weight_per_student,
+        "roll_call.avg_gap_protection": avg_gap_protection,
+        "roll_call.draw_random_students": draw_random_students,
+        "roll_call.save_history": save_roll_call_history,
+        "roll_call.draw_and_save": draw_and_save,
+        "lottery.draw_random_prizes": draw_random_prizes,
+    }
+
+
+# ==================================================
+# 权重引擎校验
+# ==================================================
+def _weight_setting_variants(base: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """生成覆盖各计算分支的权重设置组合"""
+    variants = []
+    for frequency_function in (0, 1, 2):
+        for cold_start in (False, True):
+            for shield_unit in (0, 1, 2):
+                variants.append(
+                    dict(
+                        base,
+                        fair_draw_enabled=True,
+                        fair_draw_group_enabled=True,
+                        fair_draw_gender_enabled=True,
+                        fair_draw_time_enabled=True,
+                        frequency_function=frequency_function,
+                        cold_start_enabled=cold_start,
+                        cold_start_rounds=10**9,
+                        shield_enabled=True,
+                        shield_time=3.5,
+                        shield_time_unit=shield_unit,
+                        min_weight=0.5,
+                        max_weight=2.5,
+                    )
+                )
+    variants.append(
+        dict(
+            base,
+            fair_draw_enabled=False,
+            fair_draw_group_enabled=False,
+            fair_draw_gender_enabled=False,
+            fair_draw_time_enabled=False,
+            shield_enabled=False,
+        )
+    )
+    return variants
+
+
+def check_weight_parity(pipeline: SimpleNamespace) -> List[str]:
+    """比较权重引擎与逐个学生计算的结果，返回不一致的描述列表
+
+    当前时间固定为合成历史记录的最后一次抽取之后，使时间因子和屏蔽状态
+    都有不同的取值
+    """
+    weight_utils = pipeline.weight_utils
+    class_name = BENCHMARK_CLASS_NAME
+    roster = pipeline.get_student_list(class_name)
+    stats_index = pipeline.load_roll_call_stats_index(class_name)
+    last_times = [
+        stats["last_drawn_time"]
+        for stats in stats_index.get("students", {}).values()
+        if stats.get("last_drawn_time")
+    ]
+    now = (
+        datetime.fromisoformat(max(last_times)) + timedelta(hours=1)
+        if last_times
+        else datetime.now()
+    )
+    subjects = [""] + [subject for subject in SYNTHETIC_SUBJECTS if subject]
+
+    mismatches = []
+    load_settings = weight_utils._load_weight_settings
+    base_settings = load_settings()
+    try:
+        for variant_index, settings in enumerate(
+            _weight_setting_variants(base_settings)
+        ):
+            weight_utils._load_weight_settings = lambda settings=settings: dict(
+                settings
+            )
+            for subject in subjects:
+                expected = weight_utils.calculate_weight(
+                    [dict(student) for student in roster],
+                    class_name,
+                    subject,
+                    stats_index,
+                    now=now,
+                    vectorized=False,
+                )
+                actual = weight_utils.calculate_weight(
+                    [dict(student) for student in roster],
+                    class_name,
+                    subject,
+                    stats_index,
+                    now=now,
+                )
+                for want, got in zip(expected, actual, strict=True):
+                    if (want.get("next_weight"), want.get("weight_details")) != (
+                        got.get("next_weight"),
+                        got.get("weight_details"),
+                    ):
+                        mismatches.append(
+                            f"设置组合 {variant_index} 科目 '{subject}' "
+                            f"学生 {want.get('name')}: "
+                            f"{want.get('weight_details')} != {got.get('weight_details')}"
+                        )
+                        break
+    finally:
+        weight_utils._load_weight_settings = load_settings
+    return mismatches
+
+
+def run_benchmark(args: argparse.Namespace, pipeline: SimpleNamespace) -> Dict:
+    """运行所有场景并返回结果"""
+    results = {}
+    for class_size in args.class_sizes:
+        for history_size in args.history_sizes:
+            scenario = f"students={class_size},history={history_size}"
+            rng = random.Random(args.seed)
+            generate_start = time.perf_counter()
+            generate_roster(pipeline, class_size, rng)
+            generate_pool(pipeline, args.pool_size, rng)
+            generate_roll_call_history(pipeline, history_size, rng)
+            generate_lottery_history(pipeline, history_size, args.pool_size, rng)
+            print(
+                f"[{scenario}] 已生成合成数据，用时 "
+                f"{time.perf_counter() - generate_start:.1f}s"
+            )
+
+            if args.check_weights:
+                if not pipeline.weight_engine.is_available():
+                    raise RuntimeError("numpy 不可用，无法校验权重引擎")
+                mismatches = check_weight_parity(pipeline)
+                if mismatches:
+                    for line in mismatches:
+                        print(f"  权重结果不一致: {line}")
+                    raise RuntimeError(f"[{scenario}] 权重引擎校验失败")
+                print(f"[{scenario}] 权重引擎与逐个学生计算的结果一致")
+
+            scenario_results = {}
+            for stage_name, fn in build_stages(pipeline, args.draw_count).items():
+                if args.stages and stage_name not in args.stages:
+                    continue
+                scenario_results[stage_name] = measure_stage(
+                    fn, args.iterations, args.warmup
+                )
+                stats = scenario_results[stage_name]
+                print(
+                    f"  {stage_name:<32} p50 {stats['p50_ms']:>10.3f} ms"
+                    f"  p99 {stats['p99_ms']:>10.3f} ms"
+                    f"  读 {_format_bytes(stats['read_bytes']):>10}"
+                    f"  写 {_format_bytes(stats['write_bytes']):>10}"
+                )
+            results[scenario] = scenario_results
+    return results
+
+
+def _format_bytes(value: Optional[int]) -> str:
+    if value is None:
+        return "-"
+    for unit in ("B", "KB", "MB"):
+        if abs(value) < 1024:
+            return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+        value /= 1024
+    return f"{value:.1f}GB"
+
+
+# ==================================================
+# 基线比较
+# ==================================================
+def compare_with_baseline(
+    report: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """与基线结果比较，返回性能退化的描述列表
+
+    只比较两份结果中都存在的场景和阶段；基线延迟过小（低于 0.05 ms）时
+    计时误差占比过高，不参与比较
+    """
+    regressions = []
+    baseline_results = baseline.get("results", {})
+    for scenario, stages in report["results"].items():
+        for stage_name, stats in stages.items():
+            base_stats = baseline_results.get(scenario, {}).get(stage_name)
+            if not base_stats:
+                continue
+            for metric in ("p50_ms", "p99_ms"):
+                base_value = base_stats.get(metric, 0)
+                if base_value < 0.05:
+                    continue
+                ratio = stats[metric] / base_value
+                if ratio > 1 + threshold:
+                    regressions.append(
+                        f"[{scenario}] {stage_name} {metric}: "
+                        f"{base_value:.3f} -> {stats[metric]:.3f} ms (x{ratio:.2f})"
+                    )
+    return regressions
+
+
+def main() -> int:
+    args = parse_args()
+    data_root = Path(tempfile.mkdtemp(prefix="secrandom_benchmark_"))
+    try:
+        _setup_data_root(data_root)
+        pipeline = _load_pipeline()
+        _configure_settings(pipeline)
+
+        report = {
+            "version": BENCHMARK_REPORT_VERSION,
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {
+                "iterations": args.iterations,
+                "warmup": args.warmup,
+                "draw_count": args.draw_count,
+                "pool_size": args.pool_size,
+                "seed": args.seed,
+            },
+            "results": run_benchmark(args, pipeline),
+        }
+    finally:
+        if args.keep_data:
+            print(f"合成数据保留在 {data_root}")
+        else:
+            shutil.rmtree(data_root, ignore_errors=True)
+
+    for destination in (args.output, args.save_baseline):
+        if destination:
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            with destination.open("w", encoding="utf-8") as handle:
+                json.dump(report, handle, ensure_ascii=False, indent=2)
+            print(f"结果已写入 {destination}")
+
+    if args.baseline:
+        with args.baseline.open("r", encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        regressions = compare_with_baseline(report, baseline, args.threshold)
+        if regressions:
+            print(f"与基线相比发现 {len(regressions)} 项性能退化：")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("与基线相比未发现性能退化。")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
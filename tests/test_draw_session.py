@@ -0,0 +1,154 @@
+"""点名抽取会话：一次抽取中每个数据源只读取一次"""
+
+import sys
+from collections import Counter
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from app.common.behind_scenes import behind_scenes_utils  # noqa: E402
+from app.common.data import list as data_list  # noqa: E402
+from app.common.history import roll_call_history, stats_index  # noqa: E402
+from app.common.roll_call import roll_call_utils  # noqa: E402
+from app.common.roll_call.draw_session import DrawSession  # noqa: E402
+from app.common.roll_call.roll_call_utils import RollCallUtils  # noqa: E402
+from app.tools import config  # noqa: E402
+
+CLASS_NAME = "测试班级"
+SIGNATURE = [1, 1]
+ROSTER = [
+    {"id": i, "name": f"学生{i}", "gender": "男", "group": "一组", "exist": True}
+    for i in range(1, 31)
+]
+
+
+def _count_calls(monkeypatch, calls, original, replacement):
+    """替换所有已导入模块中对 original 的引用，并记录调用次数"""
+
+    def wrapper(*args, **kwargs):
+        calls[original.__name__] += 1
+        return replacement(*args, **kwargs)
+
+    for module in list(sys.modules.values()):
+        if not getattr(module, "__name__", "").startswith("app."):
+            continue
+        for attr, value in list(vars(module).items()):
+            if value is original:
+                monkeypatch.setattr(module, attr, wrapper)
+
+
+def _empty_stats_index(*_args):
+    return {
+        "version": stats_index.STATS_INDEX_VERSION,
+        "all_options": {"group": "全部小组", "gender": "全部性别"},
+        "history_signature": SIGNATURE,
+        "students": {},
+        "group_stats": {},
+        "gender_stats": {},
+        "subject_stats": {},
+        "total_stats": 0,
+        "total_rounds": 0,
+    }
+
+
+@pytest.fixture
+def loader_calls(monkeypatch):
+    calls = Counter()
+    _count_calls(
+        monkeypatch, calls, data_list.get_student_list, lambda *_: list(ROSTER)
+    )
+    _count_calls(
+        monkeypatch,
+        calls,
+        stats_index.load_roll_call_stats_index,
+        _empty_stats_index,
+    )
+    _count_calls(monkeypatch, calls, config.read_drawn_record, lambda *_: [])
+    _count_calls(
+        monkeypatch,
+        calls,
+        roll_call_history._get_subject_filter,
+        lambda: (None, ""),
+    )
+    _count_calls(
+        monkeypatch,
+        calls,
+        behind_scenes_utils.read_behind_scenes_settings,
+        lambda: {},
+    )
+    behind_scenes_utils.BehindScenesUtils.clear_cache()
+
+    # 不写入磁盘
+    monkeypatch.setattr(roll_call_utils, "record_drawn_student", lambda **_: None)
+    monkeypatch.setattr(roll_call_history, "append_history_event", lambda *_: True)
+    monkeypatch.setattr(
+        roll_call_history, "get_history_signature", lambda *_: SIGNATURE
+    )
+    monkeypatch.setattr(
+        roll_call_history, "update_roll_call_stats_index", lambda *_: None
+    )
+
+    original_settings = roll_call_utils.readme_settings_async
+    monkeypatch.setattr(
+        roll_call_utils,
+        "readme_settings_async",
+        lambda section, key: (
+            1
+            if (section, key) == ("roll_call_settings", "draw_type")
+            else original_settings(section, key)
+        ),
+    )
+    yield calls
+    behind_scenes_utils.BehindScenesUtils.clear_cache()
+
+
+def test_each_source_read_once_per_draw(loader_calls):
+    for draw in range(2):
+        loader_calls.clear()
+        session = DrawSession(class_name=CLASS_NAME, half_repeat=1)
+        result = RollCallUtils.draw_random_students(
+            CLASS_NAME, 0, "全部小组", 0, "全部性别", 3, 1, session
+        )
+        assert len(result["selected_students"]) == 3
+        RollCallUtils.record_drawn_students(
+            CLASS_NAME,
+            [name for _, name, _ in result["selected_students"]],
+            result["selected_students_dict"],
+            "全部性别",
+            "全部小组",
+            1,
+            session,
+        )
+
+        expected = {
+            "get_student_list": 1,
+            "load_roll_call_stats_index": 1,
+            "read_drawn_record": 1,
+            "_get_subject_filter": 1,
+        }
+        if draw == 0:
+            # 内幕设置按文件版本缓存，文件不变时之后的抽取不再解密
+            expected["read_behind_scenes_settings"] = 1
+        assert loader_calls == expected
+        assert set(session.read_counts.values()) == {1}
+
+
+def test_stats_index_update_does_not_mutate_session_snapshot(monkeypatch):
+    monkeypatch.setattr(stats_index, "get_history_signature", lambda *_: [2, 2])
+    snapshot = _empty_stats_index()
+    before = repr(snapshot)
+    try:
+        stats_index.update_roll_call_stats_index(
+            CLASS_NAME,
+            snapshot,
+            [("学生1", {"draw_time": "2024-01-01 08:00:00"})],
+            lambda index: index.update(total_stats=index["total_stats"] + 1),
+        )
+        updated = stats_index._index_cache[CLASS_NAME]
+        assert updated is not snapshot
+        assert updated["total_stats"] == 1
+        assert updated["students"]["学生1"]["total_count"] == 1
+        assert repr(snapshot) == before
+    finally:
+        stats_index.invalidate_stats_index(CLASS_NAME)
@@ -0,0 +1,118 @@
+"""语音合成工作线程：播放顺序、并发上限和重复请求合并"""
+
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from app.common.voice import voice_cache  # noqa: E402
+from app.common.voice.synthesis_worker import (  # noqa: E402
+    StaticAudioBackend,
+    VoiceSynthesisWorker,
+)
+from app.common.voice.voice import TTSHandler, VoiceCacheManager  # noqa: E402
+
+VOICE = "zh-CN-XiaoxiaoNeural"
+TIMEOUT = 10
+
+
+@pytest.fixture
+def make_worker():
+    workers = []
+
+    def factory(backend, max_concurrency=4):
+        worker = VoiceSynthesisWorker(backend, max_concurrency=max_concurrency)
+        workers.append(worker)
+        return worker
+
+    yield factory
+    for worker in workers:
+        worker.stop()
+
+
+@pytest.fixture(autouse=True)
+def no_transcoding(monkeypatch):
+    # 测试只关心调度，不依赖 soundfile 转码
+    monkeypatch.setattr(voice_cache, "VOICE_CACHE_COMPRESS_FORMAT", "")
+
+
+class _RecordingPlayback:
+    """记录提交顺序的播放系统"""
+
+    def __init__(self):
+        self.tasks = []
+
+    def set_volume(self, volume):
+        pass
+
+    def set_speed(self, speed):
+        pass
+
+    def add_task(self, task):
+        self.tasks.append(task)
+        return True
+
+
+def test_playback_follows_submission_order(tmp_path, make_worker, monkeypatch):
+    names = ["张三", "李四", "王五", "赵六"]
+    # 越早提交的名字合成越慢，后提交的先完成
+    delays = {name: 0.05 * (len(names) - i) for i, name in enumerate(names)}
+    backend = StaticAudioBackend(delay=lambda text: delays[text])
+    cache_manager = VoiceCacheManager(str(tmp_path), make_worker(backend))
+
+    handler = TTSHandler.__new__(TTSHandler)
+    handler.playback_system = _RecordingPlayback()
+    handler.cache_manager = cache_manager
+    handler._play_generation = 0
+    monkeypatch.setattr(handler, "_apply_system_volume", lambda: None)
+
+    handler._prepare_and_play(
+        names, {"voice_volume": 100, "voice_speed": 100}, VOICE, 0
+    )
+
+    assert backend.finished == list(reversed(names))
+    expected = [cache_manager.get_cached_voice(name, VOICE) for name in names]
+    assert None not in expected
+    assert handler.playback_system.tasks == expected
+
+
+def test_semaphore_caps_concurrency(tmp_path, make_worker):
+    backend = StaticAudioBackend(delay=0.05)
+    worker = make_worker(backend, max_concurrency=2)
+    futures = [
+        worker.submit(f"文本{i}", VOICE, str(tmp_path / f"{i}.wav")) for i in range(8)
+    ]
+    for future in futures:
+        future.result(timeout=TIMEOUT)
+
+    assert len(backend.finished) == 8
+    assert backend.max_active == 2
+
+
+def test_duplicate_requests_share_one_future(tmp_path, make_worker):
+    release = threading.Event()
+    backend = StaticAudioBackend(delay=0.0)
+    original = backend.synthesize
+
+    async def gated(text, voice, file_path, rate):
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+        await original(text, voice, file_path, rate)
+
+    backend.synthesize = gated
+    cache_manager = VoiceCacheManager(str(tmp_path), make_worker(backend))
+
+    first = cache_manager.request_voice("张三", VOICE)
+    second = cache_manager.request_voice("张三", VOICE)
+    assert second is first
+
+    release.set()
+    path = first.result(timeout=TIMEOUT)
+    assert backend.started == ["张三"]
+    assert cache_manager.get_cached_voice("张三", VOICE) == path
+
+    # 完成后再次请求直接命中缓存，不再合成
+    assert cache_manager.request_voice("张三", VOICE).result(timeout=TIMEOUT) == path
+    assert backend.started == ["张三"]
@@ -0,0 +1,175 @@
+"""权重引擎与逐个学生计算的结果一致性"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("PySide6")
+
+from app.common.history import weight_engine, weight_utils  # noqa: E402
+
+NOW = datetime(2024, 6, 1, 12, 0, 0)
+SUBJECTS = ["语文", "数学", "英语"]
+GROUPS = ["第一小组", "第二小组", "第三小组", "第四小组", "第五小组"]
+GENDERS = ["男", "女", "未知"]
+
+BASE_SETTINGS = {
+    "fair_draw_enabled": True,
+    "fair_draw_group_enabled": True,
+    "fair_draw_gender_enabled": True,
+    "fair_draw_time_enabled": True,
+    "base_weight": 1.0,
+    "min_weight": 0.5,
+    "max_weight": 2.5,
+    "frequency_function": 1,
+    "frequency_weight": 1.0,
+    "group_weight": 1.0,
+    "gender_weight": 1.0,
+    "time_weight": 1.0,
+    "cold_start_enabled": False,
+    "cold_start_rounds": 10,
+    "shield_enabled": True,
+    "shield_time": 3.5,
+    "shield_time_unit": 1,
+}
+
+
+def _setting_variants():
+    variants = []
+    for frequency_function in (0, 1, 2):
+        for cold_start in (False, True):
+            for shield_unit in (0, 1, 2):
+                variants.append(
+                    dict(
+                        BASE_SETTINGS,
+                        frequency_function=frequency_function,
+                        cold_start_enabled=cold_start,
+                        cold_start_rounds=10**9,
+                        shield_time_unit=shield_unit,
+                    )
+                )
+    variants.append(
+        dict(
+            BASE_SETTINGS,
+            fair_draw_enabled=False,
+            fair_draw_group_enabled=False,
+            fair_draw_gender_enabled=False,
+            fair_draw_time_enabled=False,
+            shield_enabled=False,
+        )
+    )
+    variants.append(
+        dict(BASE_SETTINGS, base_weight=0.3, frequency_weight=2.0, time_weight=0.7)
+    )
+    return variants
+
+
+def _random_draw_time(rng: random.Random):
+    """生成各种抽取时间：为空、无法解析、带时区、屏蔽时间内和很久以前"""
+    choice = rng.random()
+    if choice < 0.1:
+        return ""
+    if choice < 0.15:
+        return "not a time"
+    if choice < 0.2:
+        return (NOW - timedelta(hours=1)).replace(tzinfo=timezone.utc).isoformat()
+    if choice < 0.5:
+        moment = NOW - timedelta(seconds=rng.uniform(0, 4 * 3600))
+    else:
+        moment = NOW - timedelta(days=rng.uniform(0, 60))
+    return moment.isoformat(sep=" ", timespec=rng.choice(["seconds", "microseconds"]))
+
+
+def _generate_case(seed: int):
+    """生成随机名单和对应的统计索引（包含不在索引中的学生）"""
+    rng = random.Random(seed)
+    # 部分用例模拟新班级（没有任何抽取记录）
+    max_count = 0 if seed % 4 == 0 else 30
+    roster = []
+    students = {}
+    for i in range(rng.randint(1, 80)):
+        name = f"学生{i}"
+        roster.append(
+            {
+                "id": name,
+                "name": name,
+                "gender": rng.choice(GENDERS),
+                "group": rng.choice(GROUPS),
+                "exist": True,
+            }
+        )
+        if rng.random() < 0.15:
+            continue
+        total_count = rng.randint(0, max_count)
+        subjects = {}
+        for subject in rng.sample(SUBJECTS, rng.randint(0, len(SUBJECTS))):
+            subject_total = rng.randint(0, total_count)
+            subjects[subject] = {
+                "total_count": subject_total,
+                "group_count": rng.randint(0, subject_total),
+                "gender_count": rng.randint(0, subject_total),
+            }
+        students[name] = {
+            "total_count": total_count,
+            "group_count": rng.randint(0, total_count),
+            "gender_count": rng.randint(0, total_count),
+            "last_drawn_time": _random_draw_time(rng),
+            "rounds_missed": rng.randint(0, 20),
+            "subjects": subjects,
+        }
+
+    def class_stats(values):
+        # 有记录的取值数量分别覆盖不超过3个和超过3个两种计算方式
+        chosen = rng.sample(values, rng.randint(0, len(values)))
+        return {value: rng.randint(0, max_count) for value in chosen}
+
+    subject_stats = {
+        subject: {
+            "group_stats": class_stats(GROUPS),
+            "gender_stats": class_stats(GENDERS),
+            "total_stats": rng.randint(0, 100),
+        }
+        for subject in SUBJECTS
+    }
+    stats_index = {
+        "students": students,
+        "group_stats": class_stats(GROUPS),
+        "gender_stats": class_stats(GENDERS),
+        "subject_stats": subject_stats,
+        "total_stats": rng.randint(0, 200),
+        "total_rounds": rng.randint(0, 200),
+    }
+    return roster, stats_index
+
+
+@pytest.mark.skipif(not weight_engine.is_available(), reason="numpy 不可用")
+@pytest.mark.parametrize("seed", range(12))
+def test_weight_columns_match_per_student(monkeypatch, seed):
+    roster, stats_index = _generate_case(seed)
+    for settings in _setting_variants():
+        monkeypatch.setattr(
+            weight_utils, "_load_weight_settings", lambda s=settings: dict(s)
+        )
+        for subject in ["", *SUBJECTS]:
+            expected = weight_utils.calculate_weight(
+                [dict(student) for student in roster],
+                "测试班级",
+                subject,
+                stats_index,
+                now=NOW,
+                vectorized=False,
+            )
+            actual = weight_utils.calculate_weight(
+                [dict(student) for student in roster],
+                "测试班级",
+                subject,
+                stats_index,
+                now=NOW,
+            )
+            for want, got in zip(expected, actual, strict=True):
+                assert got.get("next_weight") == want.get("next_weight"), want["name"]
+                assert got.get("weight_details") == want.get("weight_details"), want[
+                    "name"
+                ]